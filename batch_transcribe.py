@@ -0,0 +1,113 @@
+"""
+Canto-beats headless batch transcription.
+
+Transcribes every media file in the given directories / globs and writes
+subtitles next to them (or into --output-dir). No Qt is imported; models are
+loaded once and reused for the whole batch.
+
+Examples:
+    python batch_transcribe.py ~/clips
+    python batch_transcribe.py "~/clips/**/*.mp4" --recursive -f srt,ass -o ~/subs
+    python batch_transcribe.py ~/clips -j 2 --cpu --set enable_llm_sentence_optimization=false
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+from dataclasses import fields
+from pathlib import Path
+
+# MLX compiles Metal shaders at runtime and needs a writable cache directory (see main.py)
+_mlx_cache_dir = Path.home() / "Library" / "Caches" / "canto-beats" / "mlx"
+_mlx_cache_dir.mkdir(parents=True, exist_ok=True)
+os.environ.setdefault('MLX_CACHE_DIR', str(_mlx_cache_dir))
+os.environ.setdefault('KMP_WARNINGS', '0')
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from core.path_setup import setup_all_paths
+setup_all_paths()
+
+
+def _apply_overrides(config, overrides):
+    """Apply --set key=value for this run only (not written to config.json)."""
+    from core.config import AppConfig
+    known = {f.name for f in fields(AppConfig)}
+    for item in overrides:
+        key, sep, raw = item.partition('=')
+        key = key.strip()
+        if not sep or key not in known:
+            raise SystemExit(f"Unknown setting: {item}")
+        current = getattr(config.app_config, key)
+        if isinstance(current, bool):
+            value = raw.strip().lower() in ('1', 'true', 'yes', 'on')
+        elif isinstance(current, (int, float)):
+            value = type(current)(raw)
+        else:
+            value = raw
+        setattr(config.app_config, key, value)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Canto-beats batch transcription (no GUI)")
+    parser.add_argument("inputs", nargs="+", help="Media files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", help="Write subtitles here instead of next to each input")
+    parser.add_argument("-f", "--formats", default="srt", help="Comma-separated: srt,ass,txt (default: srt)")
+    parser.add_argument("-j", "--concurrency", type=int, default=1,
+                        help="Parallel jobs sharing the loaded models (default: 1)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Recurse into directories / ** globs")
+    parser.add_argument("--force", action="store_true", help="Re-transcribe even if outputs are up to date")
+    parser.add_argument("--cpu", action="store_true", help="Force CPU inference")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a config setting for this run")
+    parser.add_argument("--summary", help="Summary JSON path (default: <output>/batch_summary.json)")
+    parser.add_argument("--dry-run", action="store_true", help="List the job queue and exit")
+    args = parser.parse_args(argv)
+
+    from core.config import Config
+    from pipeline.batch_runner import BatchTranscriber
+
+    config = Config()
+    _apply_overrides(config, args.set)
+
+    runner = BatchTranscriber(
+        config,
+        output_dir=args.output_dir,
+        formats=[f.strip().lower() for f in args.formats.split(',') if f.strip()],
+        concurrency=args.concurrency,
+        skip_existing=not args.force,
+        force_cpu=args.cpu,
+    )
+    jobs = runner.plan(args.inputs, recursive=args.recursive)
+    if not jobs:
+        print("No media files found.")
+        return 1
+
+    if args.dry_run:
+        for job in jobs:
+            print(f"[{job.status}] {job.input_path}")
+        return 0
+
+    def on_progress(job, finished, total):
+        detail = f"RTF {job.rtf:.3f}" if job.rtf else job.error or ""
+        print(f"[{finished}/{total}] {job.status:7s} {job.wall_s:7.1f}s  {job.input_path.name}  {detail}", flush=True)
+
+    summary = runner.run(jobs, progress_callback=on_progress)
+
+    summary_path = Path(args.summary) if args.summary else \
+        Path(args.output_dir or Path.cwd()) / "batch_summary.json"
+    BatchTranscriber.save_summary(summary, summary_path)
+
+    counts = summary['counts']
+    print(f"\nDone: {counts['done']}  Skipped: {counts['skipped']}  Failed: {counts['failed']}  "
+          f"Wall: {summary['wall_s']:.1f}s  RTF: {summary['rtf'] if summary['rtf'] is not None else '-'}")
+    print(f"Summary: {summary_path}")
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if sys.platform == 'darwin':
+        multiprocessing.set_start_method('spawn', force=True)
+    sys.exit(main())
@@ -21,6 +21,9 @@ def main():
     project_dir = Path(__file__).parent
     main_script = str(project_dir / "main.py")
     
+    # Precompile mapping dictionaries (src/resources, shipped with --add-data=src)
+    subprocess.run([sys.executable, "-m", "utils.resource_bundle"], cwd=str(project_dir / "src"), check=False)
+    
     # PyInstaller command
     cmd = [
         sys.executable, "-m", "PyInstaller",
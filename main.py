@@ -14,6 +14,7 @@ from pathlib import Path
 # ============================================
 # PERFORMANCE OPTIMIZATION - SET ENV VARS EARLY
 # ============================================
+# GUI process only: CPU ASR workers (utils/parallel_transcription.py) set their own thread counts
 os.environ['OMP_NUM_THREADS'] = '1'
 os.environ['MKL_NUM_THREADS'] = '1'
 os.environ['OPENBLAS_NUM_THREADS'] = '1'
@@ -111,6 +111,9 @@ def build_app():
     except Exception as e:
         print(f"⚠️ MLX 檢測失敗: {e}，跳過 metallib 打包")
     
+    # 預先建立字典資源包（src/resources，隨 --add-data=src 打包）
+    subprocess.run([sys.executable, "-m", "utils.resource_bundle"], cwd=str(project_dir / "src"), check=False)
+    
     # 基础 PyInstaller 命令
     cmd = [
         sys.executable, "-m", "PyInstaller",
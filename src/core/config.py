@@ -59,6 +59,15 @@ class AppConfig:
 
     # 終極轉錄模式
     enable_ultimate_transcription: bool = False  # 啟用終極模式（音頻增強 + 三階段轉錄 + 詞彙學習）
+    enable_vad_first_transcription: bool = False  # 先做 VAD，只將語音段打包成 ≤30 秒窗口送入 Whisper
+    overlap_window_mode: str = "off"  # 重疊窗口轉錄："off"、"wide"（每 15 秒開 30 秒窗口，約 2 倍工作量）、"narrow"（3 秒重疊 + 文字對齊，約 1.1 倍）
+    enable_transcription_checkpoints: bool = True  # 每個 chunk 完成後寫 checkpoint，崩潰 / 取消後可續傳
+    checkpoint_full_transcription: bool = False  # 完整轉錄模式都喺 VAD 停頓切 chunk 逐個寫 checkpoint（chunk 之間冇上文，輸出會同一次過轉錄唔同）
+    checkpoint_max_age_days: float = 7  # 超過呢個日數冇更新嘅 checkpoint 自動刪除（0 = 唔清理）
+    enable_pipeline_profiling: bool = True  # 每個 job 寫一份分階段效能報告（JSON，cache_dir/profiles）
+    enable_pipeline_cprofile: bool = False  # 同時輸出 cProfile .prof（有額外開銷，排查用；同一時間只分析一個 job 嘅主線程）
+    enable_cascade_transcription: bool = False  # 串聯模式：細模型先出草稿，大模型喺背景逐段取代（播放頭附近優先）
+    cascade_draft_model: str = "small"  # 草稿用嘅 Whisper 大小（粵語模式下所有後端都用 cantonese_model_lite 草稿、cantonese_model_flagship 精修）
     
     # Subtitle Language Style
     subtitle_language_style: str = "colloquial"  # "formal" (書面語/正式中文) or "colloquial" (口語/粵語口語字)
@@ -67,12 +76,27 @@ class AppConfig:
     default_language: str = "yue"  # "yue" for Cantonese (ISO 639-3 code, supported by faster-whisper)
     enable_word_timestamps: bool = True
     beam_size: int = 5  # Default value for faster transcription speed
+    enable_adaptive_decoding: bool = False  # 先全片 greedy（beam 1），只對有問題嘅段落用 beam_size + 溫度回退重新解碼
+    adaptive_logprob_threshold: float = -1.0  # avg_logprob 低於此值就重新解碼
+    adaptive_compression_ratio_threshold: float = 2.4  # 壓縮率高於此值（重複 / 幻覺）就重新解碼
+    adaptive_no_speech_threshold: float = 0.6  # no_speech_prob 高於此值就重新解碼
+    enable_speculative_decoding: bool = False  # CPU：用 cantonese_model_lite 起草、大模型一次驗證多個 token（輸出同 greedy 一樣）
+    speculative_draft_tokens: int = 5  # 每次驗證嘅草稿 token 數
     
     # Processing settings
     confidence_threshold: float = 0.7
     max_video_size_gb: int = 50
     chunk_audio: bool = True  # Chunk long audio for processing
     max_audio_chunk_s: float = 30.0  # Maximum audio chunk length
+    audio_cache_max_gb: float = 10.0  # 已提取音頻快取上限（GB），超出後按 LRU 淘汰
+    enable_feature_cache: bool = True  # 快取 Whisper log-mel / encoder 輸出，只改提示詞重新轉錄時只跑 decoder
+    feature_cache_max_gb: float = 2.0  # 特徵快取上限（GB），超出後按 LRU 淘汰
+    asr_workers: str = "auto"  # CPU-only 主機並行轉錄 worker 數："auto" 或整數（1 = 停用）
+    asr_batch_size: int = 8  # 批量解碼每次 forward pass 嘅 chunk 數（1 = 逐個轉錄）
+    model_ram_budget_gb: float = 0.0  # 常駐模型 RAM 預算（GB），0 = 自動（系統 RAM 60%），超出按 LRU 釋放；Apple Silicon 統一記憶體下 RAM / VRAM 共用呢個預算
+    model_vram_budget_gb: float = 0.0  # 常駐模型 VRAM 預算（GB），0 = 自動（偵測到嘅 VRAM）
+    enable_model_warmup: bool = True  # 啟動後喺背景預先加載 ASR / VAD
+    enable_llm_prefetch: bool = True  # 轉錄期間喺背景加載斷句 LLM（預算放得落先會預取）
     
     
     # Subtitle Line Splitting
@@ -93,6 +117,25 @@ class AppConfig:
     compute_type: str = "auto"  # "auto", "float16", "int8", "int8_float16" for faster-whisper
 
 
+class ConfigOverrides:
+    """Read-only view of a Config with a few values replaced (cascade draft pass, batch workers)."""
+
+    def __init__(self, config, **overrides):
+        self._config = config
+        self._overrides = overrides
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._overrides:
+            return self._overrides[key]
+        return self._config.get(key, default)
+
+    def __getattr__(self, name):
+        # Guard so pickling (parallel ASR workers) never recurses before _config exists
+        if name.startswith('__') or '_config' not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self._config, name)
+
+
 class Config:
     """Configuration manager"""
     
@@ -0,0 +1,321 @@
+"""
+Headless batch transcription.
+
+Expands files / directories / globs into a job queue and runs them through
+SubtitlePipelineV2 without any Qt. Models come from the shared model registry,
+so Whisper / VAD / LLM are loaded once and stay warm across jobs (on CPU-only
+hosts each worker also keeps its ASR process pool, sized so all workers together
+use the configured ``asr_workers``); subtitles are written with SubtitleExporter
+and a JSON summary is produced at the end. Inputs whose output names would
+collide get their source extension (then a counter) appended.
+
+Usage:
+    runner = BatchTranscriber(config, formats=("srt", "txt"), concurrency=1)
+    jobs = runner.plan(["/clips", "/more/*.mp4"])
+    summary = runner.run(jobs)
+"""
+
+import glob
+import json
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+MEDIA_EXTENSIONS = {
+    '.mp4', '.mov', '.mkv', '.avi', '.webm', '.m4v', '.flv', '.wmv', '.ts',
+    '.wav', '.mp3', '.m4a', '.flac', '.aac', '.ogg', '.opus', '.wma',
+}
+
+EXPORT_FORMATS = ('srt', 'ass', 'txt')
+
+
+def collect_inputs(patterns: Iterable[Union[str, Path]], recursive: bool = False) -> List[Path]:
+    """
+    Expand files, directories and glob patterns into a sorted list of media files.
+
+    Directories contribute their media files (recursively if requested); explicit
+    file paths are kept even with an unknown extension. Duplicates are dropped.
+    """
+    found = {}
+    for pattern in patterns:
+        pattern = str(pattern)
+        path = Path(pattern).expanduser()
+        if path.is_dir():
+            walker = path.rglob('*') if recursive else path.glob('*')
+            candidates = [p for p in walker if p.is_file() and p.suffix.lower() in MEDIA_EXTENSIONS]
+        elif path.is_file():
+            candidates = [path]
+        else:
+            matches = glob.glob(str(path), recursive=recursive)
+            if not matches:
+                logger.warning(f"No input matches: {pattern}")
+            candidates = [Path(m) for m in matches
+                          if Path(m).is_file() and Path(m).suffix.lower() in MEDIA_EXTENSIONS]
+        for candidate in candidates:
+            found.setdefault(candidate.resolve(), None)
+    return sorted(found)
+
+
+@dataclass
+class BatchJob:
+    """One input file and the subtitle files it produces."""
+    input_path: Path
+    outputs: Dict[str, Path]
+    status: str = "pending"  # pending | done | skipped | failed
+    error: Optional[str] = None
+    wall_s: float = 0.0
+    subtitles: int = 0
+    audio_seconds: Optional[float] = None
+    rtf: Optional[float] = None
+    refined_fraction: Optional[float] = None  # share of audio re-decoded with beam search
+    worker: Optional[int] = None
+
+    def is_up_to_date(self) -> bool:
+        """All outputs exist and are newer than the input."""
+        try:
+            source_mtime = self.input_path.stat().st_mtime
+        except OSError:
+            return False
+        return all(p.exists() and p.stat().st_mtime >= source_mtime for p in self.outputs.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['input_path'] = str(self.input_path)
+        data['outputs'] = {fmt: str(p) for fmt, p in self.outputs.items()}
+        return data
+
+
+def _default_pipeline_factory(config, force_cpu: bool):
+    from pipeline.subtitle_pipeline_v2 import SubtitlePipelineV2
+    return SubtitlePipelineV2(config, force_cpu=force_cpu)
+
+
+class BatchTranscriber:
+    """Runs a queue of transcription jobs on warm pipelines."""
+
+    def __init__(
+        self,
+        config,
+        output_dir: Optional[Union[str, Path]] = None,
+        formats: Sequence[str] = ('srt',),
+        concurrency: int = 1,
+        skip_existing: bool = True,
+        force_cpu: bool = False,
+        pipeline_factory: Optional[Callable] = None,
+    ):
+        """
+        Args:
+            config: Application configuration
+            output_dir: Where to write subtitles (default: next to each input)
+            formats: Any of "srt", "ass", "txt"
+            concurrency: Number of workers. Workers share the loaded models, so
+                extra workers overlap audio extraction and post-processing with
+                inference; keep this at 1 on Apple Silicon (MLX). On CPU-only
+                hosts the ASR worker processes are divided between them
+            skip_existing: Skip inputs whose outputs are already up to date
+            force_cpu: Force CPU inference
+            pipeline_factory: (config, force_cpu) -> pipeline, for alternative backends
+        """
+        unknown = [f for f in formats if f not in EXPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unsupported subtitle format(s): {', '.join(unknown)}")
+        self.config = config
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.formats = tuple(dict.fromkeys(formats))
+        self.concurrency = max(1, int(concurrency))
+        self.skip_existing = skip_existing
+        self.force_cpu = force_cpu
+        self.pipeline_factory = pipeline_factory or _default_pipeline_factory
+        self._lock = threading.Lock()
+        self._finished = 0
+
+    def plan(self, patterns: Iterable[Union[str, Path]], recursive: bool = False) -> List[BatchJob]:
+        """Build the job queue for the given inputs."""
+        jobs = []
+        taken = set()
+        for input_path in collect_inputs(patterns, recursive=recursive):
+            target_dir = self.output_dir or input_path.parent
+            base = self._output_base(target_dir, input_path, taken)
+            outputs = {fmt: target_dir / f"{base}.{fmt}" for fmt in self.formats}
+            job = BatchJob(input_path=input_path, outputs=outputs)
+            if self.skip_existing and job.is_up_to_date():
+                job.status = "skipped"
+            jobs.append(job)
+        return jobs
+
+    @staticmethod
+    def _output_base(target_dir: Path, input_path: Path, taken: set) -> str:
+        """
+        Output file name (without format extension) that no earlier input uses.
+
+        "clip.mp4" -> "clip"; a later "clip.wav" (or another "clip.mp4" written
+        to the same output_dir) -> "clip.wav", then "clip.wav-2", ... Compared
+        case-insensitively for macOS / Windows file systems.
+        """
+        candidates = [input_path.stem, input_path.name]
+        base = next((c for c in candidates if (target_dir, c.lower()) not in taken), None)
+        counter = 2
+        while base is None:
+            candidate = f"{input_path.name}-{counter}"
+            if (target_dir, candidate.lower()) not in taken:
+                base = candidate
+            counter += 1
+        taken.add((target_dir, base.lower()))
+        return base
+
+    def _worker_config(self, worker_count: int):
+        """
+        Config for each batch worker.
+
+        On CPU-only hosts every pipeline runs its own pool of ASR processes, so
+        with several batch workers the ``asr_workers`` budget is split between
+        them instead of each one spawning the full count.
+        """
+        if worker_count <= 1 or self.config is None:
+            return self.config
+        from core.config import ConfigOverrides
+        from utils.parallel_transcription import resolve_asr_workers
+
+        total = resolve_asr_workers(self.config.get("asr_workers", "auto"))
+        per_worker = max(1, total // worker_count)
+        logger.info(f"Batch: {total} ASR process(es) split over {worker_count} workers -> {per_worker} each")
+        return ConfigOverrides(self.config, asr_workers=per_worker)
+
+    def run(self, jobs: List[BatchJob], progress_callback: Optional[Callable[[BatchJob, int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Process all pending jobs and return the summary report.
+
+        Args:
+            jobs: Jobs from plan()
+            progress_callback: Called as (job, finished, total) after each job
+        """
+        started_at = datetime.now()
+        wall_start = time.perf_counter()
+        pending = [job for job in jobs if job.status == "pending"]
+        # Longest first so a big file does not end up alone at the tail of the run
+        pending.sort(key=lambda job: job.input_path.stat().st_size, reverse=True)
+
+        work = queue.Queue()
+        for job in pending:
+            work.put(job)
+
+        self._finished = 0
+        total = len(pending)
+        worker_count = min(self.concurrency, total)
+        logger.info(f"Batch: {total} job(s) to run, {len(jobs) - total} skipped, {worker_count} worker(s)")
+
+        worker_config = self._worker_config(worker_count)
+        threads = [
+            threading.Thread(target=self._worker, args=(i, work, total, progress_callback, worker_config),
+                             name=f"batch-worker-{i}", daemon=True)
+            for i in range(worker_count)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        return self.summary(jobs, time.perf_counter() - wall_start, started_at)
+
+    def _worker(self, index: int, work: queue.Queue, total: int, progress_callback, config=None):
+        config = self.config if config is None else config
+        pipeline = None
+        try:
+            while True:
+                try:
+                    job = work.get_nowait()
+                except queue.Empty:
+                    return
+                job.worker = index
+                if pipeline is None:
+                    try:
+                        pipeline = self.pipeline_factory(config, self.force_cpu)
+                    except Exception as e:
+                        logger.error(f"Batch worker {index} could not create pipeline: {e}", exc_info=True)
+                        job.status, job.error = "failed", f"pipeline init: {e}"
+                        self._job_finished(job, total, progress_callback)
+                        continue
+                self._run_job(pipeline, job)
+                self._job_finished(job, total, progress_callback)
+        finally:
+            if pipeline is not None:
+                try:
+                    pipeline.cleanup()
+                except Exception as e:
+                    logger.warning(f"Batch worker {index} cleanup error: {e}")
+
+    def _job_finished(self, job: BatchJob, total: int, progress_callback):
+        with self._lock:
+            self._finished += 1
+            finished = self._finished
+        if progress_callback:
+            try:
+                progress_callback(job, finished, total)
+            except Exception as e:
+                logger.warning(f"Batch progress callback failed: {e}")
+
+    def _run_job(self, pipeline, job: BatchJob):
+        """Transcribe one input and export it; failures are recorded on the job."""
+        from pipeline.subtitle_pipeline_v2 import entries_to_segment_dicts
+        from subtitle.subtitle_exporter import SubtitleExporter
+
+        logger.info(f"Batch: transcribing {job.input_path.name}")
+        start = time.perf_counter()
+        try:
+            subtitles = pipeline.process(str(job.input_path))
+            segments, _ = entries_to_segment_dicts(subtitles)
+            job.subtitles = len(segments)
+
+            exporter = SubtitleExporter()
+            for fmt, out_path in job.outputs.items():
+                out_path.parent.mkdir(parents=True, exist_ok=True)
+                if fmt == 'srt':
+                    ok = exporter.export_srt(segments, str(out_path))
+                elif fmt == 'ass':
+                    ok = exporter.export_ass(segments, str(out_path))
+                else:
+                    ok = exporter.export_txt(segments, str(out_path), include_timestamps=False)
+                if not ok:
+                    raise RuntimeError(f"export to {out_path.name} failed")
+            job.status = "done"
+        except Exception as e:
+            logger.error(f"Batch job failed: {job.input_path}: {e}", exc_info=True)
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.wall_s = round(time.perf_counter() - start, 3)
+            report = getattr(pipeline, 'last_profile_report', None) or {}
+            job.audio_seconds = report.get('meta', {}).get('audio_seconds')
+            job.rtf = report.get('rtf')
+            job.refined_fraction = report.get('meta', {}).get('refined_fraction')
+
+    def summary(self, jobs: List[BatchJob], wall_s: float, started_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Aggregate report of a batch run."""
+        counts = {status: sum(1 for job in jobs if job.status == status)
+                  for status in ("done", "skipped", "failed", "pending")}
+        audio_total = sum(job.audio_seconds or 0.0 for job in jobs if job.status == "done")
+        return {
+            'started_at': (started_at or datetime.now()).isoformat(timespec="seconds"),
+            'wall_s': round(wall_s, 3),
+            'concurrency': self.concurrency,
+            'formats': list(self.formats),
+            'counts': counts,
+            'audio_seconds': round(audio_total, 3),
+            'rtf': round(wall_s / audio_total, 4) if audio_total else None,
+            'jobs': [job.to_dict() for job in jobs],
+        }
+
+    @staticmethod
+    def save_summary(summary: Dict[str, Any], path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+        return path
@@ -7,7 +7,6 @@ import os
 import torch
 import logging
 import tempfile
-import torchaudio
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
@@ -17,6 +16,8 @@ from models.vad_processor import VADProcessor, VoiceSegment
 from models.whisper_asr import WhisperASR, TranscriptionSegment
 from models.llm_processor import LLMProcessor
 from utils.audio_utils import AudioPreprocessor
+from utils.audio_cache import get_audio_cache
+from utils.asr_utils import transcribe_array
 from utils.logger import setup_logger
 
 logger = setup_logger()
@@ -75,12 +76,8 @@ class SubtitlePipeline:
         
         if input_path.suffix.lower() in video_extensions:
             logger.info("Input appears to be video, extracting audio for processing...")
-            extracted_audio_path = self.temp_dir / f"{input_path.stem}_extracted.wav"
             try:
-                process_audio_path = self.audio_preprocessor.extract_audio_from_video(
-                    input_path, 
-                    output_path=extracted_audio_path
-                )
+                process_audio_path = get_audio_cache(self.config).get_wav(input_path)
                 extracted_audio = True
             except Exception as e:
                 logger.error(f"Failed to extract audio from video: {e}")
@@ -122,7 +119,7 @@ class SubtitlePipeline:
         final_subtitles = []
         total_batches = len(batches)
         
-        # Reuse temp file for batch audio
+        # Temp file only used by backends without in-memory transcribe
         batch_audio_path = self.temp_dir / "batch_temp.wav"
         
         for i, batch in enumerate(batches):
@@ -147,16 +144,11 @@ class SubtitlePipeline:
                     
                 batch_waveform = waveform[start_sample:end_sample]
                 
-                # Save batch audio to temp file (Whisper needs file path)
-                torchaudio.save(
-                    str(batch_audio_path), 
-                    batch_waveform.unsqueeze(0), 
-                    sr
-                )
-                
-                # ASR
+                # ASR (in-memory; falls back to a temp WAV if the backend needs a path)
                 # We use specific prompts for Cantonese if needed, but config default is usually good
-                asr_result = self.asr.transcribe(str(batch_audio_path))
+                asr_result = transcribe_array(
+                    self.asr, batch_waveform, sr, fallback_path=batch_audio_path
+                )
                 raw_text = asr_result.get('text', '').strip()
                 
                 if not raw_text:
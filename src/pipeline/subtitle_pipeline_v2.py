@@ -4,17 +4,33 @@ Subtitle Pipeline V2 - AI-powered transcription with context-aware conversion.
 Uses Whisper for ASR + Qwen2 LLM for intelligent colloquial-to-written conversion.
 """
 
+import dataclasses
+import re
 import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Tuple
 from dataclasses import dataclass
 
-from core.config import Config
-from core.hardware_detector import HardwareDetector, PerformanceProfile
+from core.config import Config, ConfigOverrides
+from core.hardware_detector import HardwareDetector, PerformanceProfile, get_hardware_detector
 from models.whisper_asr import WhisperASR
 # QwenLLM removed - 書面語 conversion handled by StyleControlPanel
 from models.vad_processor import VADProcessor
+from utils.adaptive_decoding import QualityThresholds, greedy_kwargs, refine_segments
+from utils.asr_utils import asr_registry_key, cascade_asr_overrides, resolve_asr_model_id
+from utils.audio_cache import get_audio_cache
+from utils.transcription_checkpoint import TranscriptionCheckpoint
+from utils.resource_bundle import ResourceBundle, get_resource_bundle
+from utils.text_replacer import CHAINED, TextReplacer
+from utils.vad_cache import CachingVADProcessor, get_vad_cache
 from utils.logger import setup_logger
+from utils.model_registry import (
+    POOL_RAM, POOL_VRAM, VAD_SIZE_GB, WHISPER_SIZE_GB, get_model_registry
+)
+from utils.particle_punctuation import fix_particle_punctuation
+from utils.pipeline_profiler import PipelineProfiler
 
 # Try to import MLX Whisper for Apple Silicon acceleration
 try:
@@ -23,6 +39,13 @@ try:
 except ImportError:
     HAS_MLX_WHISPER = False
 
+# Speculative decoding backend (optional, needs transformers)
+try:
+    from utils.whisper_speculative import SpeculativeWhisperASR
+    HAS_SPECULATIVE_WHISPER = SpeculativeWhisperASR.is_available()
+except ImportError:
+    HAS_SPECULATIVE_WHISPER = False
+
 # 高級轉錄模組（可選）
 try:
     from utils.audio_enhancer import AudioEnhancer
@@ -34,6 +57,20 @@ except ImportError:
 
 logger = setup_logger()
 
+# Sentence-boundary optimization LLM (shared with the style panel through the model registry)
+SENTENCE_LLM_MODEL_ID = "mlx-community/Qwen2.5-3B-Instruct-bf16"
+
+# VAD settings for smart segmentation (修復字幕遺漏問題：優化 VAD 參數，減少漏檢)
+PIPELINE_VAD_PARAMS = dict(
+    threshold=0.10,                # 降低門檻 (0.15→0.10)，更敏感，減少漏檢輕聲說話
+    min_silence_duration_ms=300,   # 縮短靜音判斷 (500→300ms)，避免過度拆分
+    min_speech_duration_ms=50,     # 允許更短語音 (100→50ms)，保留快速說話
+    speech_pad_ms=500              # 增加填充 (300→500ms)，保留完整語句
+)
+
+# 簡單校正刪走嘅括號 / 引號（預編譯字符類，一次過刪走）
+CORRECTION_BRACKETS_RE = re.compile('[' + re.escape(')(）（﹚﹙」「】【') + ']')
+
 
 @dataclass
 class SubtitleEntryV2:
@@ -44,6 +81,51 @@ class SubtitleEntryV2:
     formal: Optional[str] = None  # 書面語 - written Chinese
 
 
+@dataclass
+class SubtitleUpdate:
+    """
+    Progressive result event passed to ``partial_callback``.
+
+    ``append`` carries newly transcribed entries (a chunk finished);
+    ``replace`` carries the full list after a correction pass and
+    supersedes everything emitted before it; ``splice`` replaces only the
+    entries whose midpoint lies inside ``span`` (cascade refinement).
+    """
+    action: str  # "append", "replace" or "splice"
+    entries: List[SubtitleEntryV2]
+    stage: str = ""
+    span: Optional[Tuple[float, float]] = None
+
+
+def entries_to_segment_dicts(subtitles: List[SubtitleEntryV2]):
+    """
+    Convert SubtitleEntryV2 list to the segment dicts used by the UI and exporters.
+
+    Returns:
+        (segments, formal_segments) - formal only for entries that have 書面語
+    """
+    segments = []
+    formal_segments = []
+    
+    for i, sub in enumerate(subtitles):
+        segments.append({
+            'id': i,
+            'start': sub.start,
+            'end': sub.end,
+            'text': sub.colloquial,
+        })
+        
+        if sub.formal:
+            formal_segments.append({
+                'id': i,
+                'start': sub.start,
+                'end': sub.end,
+                'text': sub.formal,
+            })
+    
+    return segments, formal_segments
+
+
 class SubtitlePipelineV2:
     """
     V2 pipeline with AI-powered colloquial-to-written conversion.
@@ -56,7 +138,13 @@ class SubtitlePipelineV2:
     5. Optional LLM refinement (context-aware conversion)
     """
     
-    def __init__(self, config: Config, force_cpu: bool = False, enable_llm: bool = False):
+    def __init__(
+        self,
+        config: Config,
+        force_cpu: bool = False,
+        enable_llm: bool = False,
+        asr_model: Optional[str] = None
+    ):
         """
         Initialize pipeline.
         
@@ -64,14 +152,22 @@ class SubtitlePipelineV2:
             config: Application configuration
             force_cpu: Force CPU mode
             enable_llm: Deprecated, kept for API compatibility (always False)
+            asr_model: Whisper size to use instead of the hardware profile's choice
         """
         self.config = config
         self.force_cpu = force_cpu
         self.enable_llm = False  # LLM is handled by StyleControlPanel, not here
         self.profile = None
         self.asr = None
+        self._asr_key = None  # Registry key of self.asr
         self.vad = None  # VAD processor for smart segmentation
         self._models_loaded = False
+        self._registry = get_model_registry(config)
+        self._held_models = set()  # Registry keys this pipeline is using (never evicted while held)
+        self.last_profile_report = None  # Per-stage metrics of the last job (see PipelineProfiler)
+        self._refine_scheduler = None  # Cascade refinement order (focus follows the playhead)
+        self._vad_executor = None  # Runs VAD concurrently with Whisper
+        self._parallel_transcriber = None  # CPU-only worker pool, kept warm across jobs until cleanup()
         
         # Create temp directory
         self.temp_dir = Path(tempfile.gettempdir()) / "canto_beats_v2"
@@ -79,11 +175,15 @@ class SubtitlePipelineV2:
         
         # Initialize hardware detection
         self._setup_hardware()
+        if asr_model:
+            # Copy: the detector's cached profile is shared with other pipelines
+            self.profile = dataclasses.replace(self.profile, asr_model=asr_model)
     
     def _setup_hardware(self):
         """Detect hardware and determine optimal configuration."""
         logger.info("Detecting hardware configuration...")
-        detector = HardwareDetector()
+        # The shared detector caches its profile; a forced-CPU profile must not replace it
+        detector = HardwareDetector() if self.force_cpu else get_hardware_detector()
         self.profile = detector.detect(force_cpu=self.force_cpu)
         
         logger.info(f"Hardware tier: {self.profile.tier.value}")
@@ -91,32 +191,73 @@ class SubtitlePipelineV2:
         logger.info(f"VRAM: {self.profile.vram_gb} GB")
         logger.info(f"LLM refinement: {'enabled' if self.enable_llm else 'disabled'}")
     
-    def _load_asr(self, progress_callback: Optional[Callable] = None, status_callback: Optional[Callable] = None):
+    def _use_model(self, key, loader, size_gb: float, pool: str):
+        """Get a shared model from the registry and hold it until cleanup()."""
+        model = self._registry.get(key, loader, size_gb=size_gb, pool=pool)
+        if key not in self._held_models:
+            self._registry.hold(key)
+            self._held_models.add(key)
+        return model
+
+    def _asr_keys(self, config=None) -> dict:
+        """Registry keys of the ASR backends this pipeline may use."""
+        config = config or self.config
+        model_size = self.profile.asr_model
+        return {
+            'mlx': asr_registry_key(config, "mlx", model_size),
+            'faster-whisper': asr_registry_key(config, "faster-whisper", model_size, self.profile.device),
+            'speculative': ("asr", "speculative") + self._speculative_model_ids(),
+        }
+
+    def _speculative_model_ids(self) -> tuple:
+        """(target, draft) transformers checkpoints for speculative decoding."""
+        if self.config.get("use_cantonese_model", True):
+            return (self.config.get("cantonese_model_flagship", "khleeloo/whisper-large-v3-cantonese"),
+                    self.config.get("cantonese_model_lite", "alvanlii/whisper-small-cantonese"))
+        return f"openai/whisper-{self.profile.asr_model}", "openai/whisper-small"
+
+    def _load_asr(self, progress_callback: Optional[Callable] = None, status_callback: Optional[Callable] = None,
+                  config=None):
         """Load ASR model with Apple Silicon priority: CoreML > MPS > CPU.
+
+        Models come from the process-wide registry, so back-to-back jobs reuse
+        the already loaded Whisper instead of loading it again.
         
         Args:
             progress_callback: Callback for progress percentage (0-100)
             status_callback: Callback for status message updates (e.g., "正在下載模型...")
+            config: Config to load the ASR under (cascade refine pass); defaults to self.config
         """
-        if self.asr is not None and self.asr.is_loaded:
+        config = config or self.config
+        keys = self._asr_keys(config)
+        if self.asr is not None and self.asr.is_loaded and self._asr_key in keys.values():
             return
 
         if progress_callback:
             progress_callback(10)
 
+        size_gb = WHISPER_SIZE_GB.get(self.profile.asr_model, 3.5)
+
         # Priority: MLX Whisper (CoreML/MPS) > faster-whisper (CPU)
         if HAS_MLX_WHISPER:
-            logger.info(f"🍎 Loading MLX Whisper (Apple Silicon optimized): {self.profile.asr_model}")
+            warm = self._registry.is_resident(keys['mlx'])
+            if not warm:
+                logger.info(f"🍎 Loading MLX Whisper (Apple Silicon optimized): {self.profile.asr_model}")
             try:
-                if status_callback:
+                if status_callback and not warm:
                     status_callback("正在準備 AI 工具...")
+
+                def load_mlx():
+                    asr = MLXWhisperASR(model_size=self.profile.asr_model,
+                                        repo_id=resolve_asr_model_id(config, "mlx", self.profile.asr_model))
+                    # Pass status callback to load_model for download progress
+                    asr.load_model(progress_callback=status_callback)
+                    return asr
+
+                self.asr = self._use_model(keys['mlx'], load_mlx, size_gb, POOL_VRAM)
+                self._asr_key = keys['mlx']
                 
-                self.asr = MLXWhisperASR(model_size=self.profile.asr_model)
-                
-                # Pass status callback to load_model for download progress
-                self.asr.load_model(progress_callback=status_callback)
-                
-                logger.info(f"⚡ MLX Whisper loaded on {self.asr.get_backend_type().upper()}")
+                logger.info(f"⚡ MLX Whisper {'reused' if warm else 'loaded'} on {self.asr.get_backend_type().upper()}")
                 
                 if status_callback:
                     status_callback("AI 工具加載完成！")
@@ -126,100 +267,494 @@ class SubtitlePipelineV2:
                 if status_callback:
                     status_callback("正在切換 AI 工具...")
 
+        # Opt-in on CPU: large model verifies tokens proposed by the lite model (same transcript)
+        if (self.config.get("enable_speculative_decoding", False) and HAS_SPECULATIVE_WHISPER
+                and self.profile.device == "cpu"):
+            target_id, draft_id = self._speculative_model_ids()
+            try:
+                if status_callback and not self._registry.is_resident(keys['speculative']):
+                    status_callback("正在加載 AI 工具...")
+
+                def load_speculative():
+                    asr = SpeculativeWhisperASR(
+                        target_id, draft_id,
+                        num_draft_tokens=self.config.get("speculative_draft_tokens", 5)
+                    )
+                    asr.load_model(progress_callback=status_callback)
+                    return asr
+
+                self.asr = self._use_model(
+                    keys['speculative'], load_speculative,
+                    size_gb + WHISPER_SIZE_GB.get("small", 0.8), POOL_RAM
+                )
+                self._asr_key = keys['speculative']
+                logger.info(f"ASR model ready (speculative decoding: {draft_id} -> {target_id})")
+                return
+            except Exception as e:
+                logger.warning(f"Speculative Whisper failed, falling back to faster-whisper: {e}")
+
         # Fallback: faster-whisper (CPU)
-        logger.info(f"Loading faster-whisper ASR model: {self.profile.asr_model}")
-        if status_callback:
-            status_callback("正在加載 AI 工具...")
-        self.asr = WhisperASR(self.config, model_size=self.profile.asr_model)
-        self.asr.load_model()
-        logger.info("ASR model loaded successfully (CPU mode)")
+        if self._registry.is_resident(keys['faster-whisper']):
+            logger.info(f"Reusing loaded faster-whisper ASR model: {self.profile.asr_model}")
+        else:
+            logger.info(f"Loading faster-whisper ASR model: {self.profile.asr_model}")
+            if status_callback:
+                status_callback("正在加載 AI 工具...")
+
+        def load_faster_whisper():
+            asr = WhisperASR(config, model_size=self.profile.asr_model)
+            asr.load_model()
+            return asr
+
+        pool = POOL_RAM if self.profile.device == "cpu" else POOL_VRAM
+        self.asr = self._use_model(keys['faster-whisper'], load_faster_whisper, size_gb, pool)
+        self._asr_key = keys['faster-whisper']
+        logger.info(f"ASR model ready ({self.profile.device} mode)")
+
+    def asr_model_cached(self) -> bool:
+        """Whether the ASR weights are already on disk (loading will not trigger a download)."""
+        try:
+            from huggingface_hub import try_to_load_from_cache
+            if HAS_MLX_WHISPER:
+                repo, filename = resolve_asr_model_id(self.config, "mlx", self.profile.asr_model), "config.json"
+            else:
+                from faster_whisper.utils import _MODELS
+                repo, filename = _MODELS.get(self.profile.asr_model, self.profile.asr_model), "model.bin"
+            return isinstance(try_to_load_from_cache(repo, filename), str)
+        except Exception:
+            return False
+
+    def warmup(self):
+        """Load the models a job will need (used by start_model_warmup)."""
+        if self._resolve_asr_workers() <= 1:
+            self._load_asr()
+        self._get_vad()
     
-    def _unload_asr(self):
-        """Unload ASR model to free GPU memory for LLM."""
-        import gc
-        import torch
+    def _resolve_asr_workers(self) -> int:
+        """Number of ASR worker processes for the CPU-only parallel mode (1 = disabled)."""
+        if HAS_MLX_WHISPER or self.profile.device != "cpu":
+            return 1
+
+        from utils.parallel_transcription import resolve_asr_workers
+        workers = resolve_asr_workers(self.config.get("asr_workers", "auto"))
+        if workers > 1:
+            logger.info(f"CPU-only host: parallel transcription with {workers} workers")
+        return workers
+
+    def _transcribe_parallel(
+        self,
+        audio_path: str,
+        workers: int,
+        transcribe_kwargs: dict,
+        progress_callback: Optional[Callable] = None,
+        status_callback: Optional[Callable] = None,
+        checkpoint=None,
+        segments_callback: Optional[Callable] = None
+    ) -> list:
+        """
+        Fan VAD pre-split chunks out to a pool of CPU worker processes.
+
+        Each worker holds its own faster-whisper model; segments come back
+        offset to absolute time and merged in timestamp order.
+        """
+        from utils.parallel_transcription import ParallelChunkTranscriber
+
+        chunks = self._presplit_chunks(audio_path)
+        if status_callback:
+            status_callback(f"正在並行轉錄（{workers} 個進程）...")
+
+        def chunk_progress(done, total):
+            if progress_callback:
+                progress_callback(20 + int(40 * done / total))
+
+        # Reuse the pool (and the Whisper model in each worker) across jobs, e.g. in batch runs
+        transcriber = self._parallel_transcriber
+        if transcriber is None or (transcriber.model_size, transcriber.workers) != (self.profile.asr_model, workers):
+            if transcriber is not None:
+                transcriber.close()
+            transcriber = ParallelChunkTranscriber(
+                self.config, model_size=self.profile.asr_model, workers=workers
+            )
+            self._parallel_transcriber = transcriber
+        return transcriber.transcribe(
+            audio_path, chunks, progress_callback=chunk_progress, checkpoint=checkpoint,
+            chunk_callback=(lambda index, segments: segments_callback(segments)) if segments_callback else None,
+            **transcribe_kwargs
+        )
+
+    def _presplit_chunks(self, audio_path: str) -> list:
+        """Cut the audio into <=30 s chunks at VAD pauses (fixed steps without advanced features).
+
+        Uses the pipeline's registry-held VAD, whose per-audio cache also
+        serves the background VAD of the same job (one VAD pass per file).
+        """
+        if HAS_ADVANCED_FEATURES:
+            return AdvancedTranscriber(self.config).vad_presplit(audio_path, vad_processor=self._get_vad())
+
+        import soundfile as sf
+        duration = sf.info(audio_path).duration
+        step = self.config.get("max_audio_chunk_s", 30.0)
+        chunks = []
+        start = 0.0
+        while start < duration:
+            chunks.append((start, min(start + step, duration)))
+            start += step
+        return chunks
+
+    def _create_profiler(self, job: str, input_path: str) -> PipelineProfiler:
+        """Start per-stage profiling for one job (cProfile only when configured)."""
+        profiler = PipelineProfiler(
+            job, input_path,
+            enable_cprofile=self.config.get("enable_pipeline_cprofile", False)
+        )
+        profiler.meta.update({
+            'device': self.profile.device if self.profile else None,
+            'tier': self.profile.tier.value if self.profile else None,
+            'asr_model': self.profile.asr_model if self.profile else None,
+        })
+        return profiler
+
+    def _finish_profiler(self, profiler: PipelineProfiler, status: str = "ok"):
+        """Close the job's profile and write its JSON report (never raises)."""
+        profiler.finish(status)
+        self.last_profile_report = profiler.report()
+        if not self.config.get("enable_pipeline_profiling", True):
+            return
+        try:
+            cache_dir = self.config.get("cache_dir") or str(self.temp_dir)
+            profiler.save(Path(cache_dir) / "profiles")
+        except Exception as e:
+            logger.warning(f"Failed to save pipeline profile: {e}")
+
+    @staticmethod
+    def _record_audio_meta(profiler: PipelineProfiler, audio_path: str):
+        """Store the audio duration so the report can show a real-time factor."""
+        try:
+            import soundfile as sf
+            profiler.meta['audio_seconds'] = sf.info(audio_path).duration
+        except Exception:
+            pass
+
+    def _ensure_llm_downloaded(self, status_callback: Optional[Callable] = None):
+        """Pre-download the sentence-optimization LLM so transcription doesn't stall midway."""
+        from huggingface_hub import try_to_load_from_cache
+
+        # 檢查 LLM 是否已下載
+        llm_model_id = SENTENCE_LLM_MODEL_ID
+        cache_result = try_to_load_from_cache(llm_model_id, "config.json")
+        llm_cached = cache_result is not None
+
+        if not llm_cached:
+            logger.warning(f"⚠️ LLM 模型未下載，首次使用需下載 3-6GB 模型")
+            if status_callback:
+                status_callback("首次使用需下載 AI 模型（3-6GB），請稍候...")
+
+            # 預下載 LLM 模型（避免轉譯中途卡住），加載咗嘅模型留喺註冊表俾斷句優化用
+            try:
+                from utils.qwen_mlx import get_shared_mlx_qwen
+
+                def llm_progress_callback(msg):
+                    if status_callback:
+                        status_callback(f"正在下載 AI 模型：{msg}")
+                    logger.info(msg)
+
+                get_shared_mlx_qwen(llm_model_id, self.config, progress_callback=llm_progress_callback)
+                logger.info("✅ LLM 模型預下載完成")
+                if status_callback:
+                    status_callback("AI 模型下載完成，開始轉譯...")
+            except Exception as e:
+                logger.warning(f"LLM 預下載失敗: {e}")
+                logger.info("將在轉譯過程中自動下載（可能較慢）")
+                if status_callback:
+                    status_callback("AI 模型下載失敗，將使用基礎模式...")
+
+    def _start_llm_prefetch(self, profiler: PipelineProfiler):
+        """
+        Load the sentence-optimization LLM in the background while Whisper runs.
+
+        The registry only prefetches when the LLM fits next to the loaded ASR
+        model, so _optimize_sentence_boundaries gets a ready (or still loading,
+        then awaited) instance instead of loading it at the 90% mark. With MLX
+        Whisper the Metal part of the load is serialized with decoding through
+        utils.mlx_lock.MLX_LOCK; only the download truly overlaps.
+        """
+        if not self.config.get("enable_llm_prefetch", True):
+            return
+        try:
+            from utils.qwen_mlx import prefetch_shared_mlx_qwen
+            thread = prefetch_shared_mlx_qwen(SENTENCE_LLM_MODEL_ID, self.config)
+        except Exception as e:
+            logger.debug(f"LLM prefetch not started: {e}")
+            thread = None
+        profiler.meta['llm_prefetch'] = thread is not None
+        if thread is not None:
+            logger.info("LLM prefetch started alongside transcription")
+
+    @staticmethod
+    def _emit_partial(
+        partial_callback: Optional[Callable[[SubtitleUpdate], None]],
+        action: str,
+        entries: List[SubtitleEntryV2],
+        stage: str
+    ):
+        """Send a progressive result event; UI errors never abort the pipeline."""
+        if partial_callback is None:
+            return
+        try:
+            partial_callback(SubtitleUpdate(action=action, entries=list(entries), stage=stage))
+        except Exception as e:
+            logger.warning(f"partial_callback failed ({action}/{stage}): {e}")
+
+    def _transcribe_kwargs(self) -> dict:
+        """Whisper kwargs shared by every pass (language style, domain vocabulary, custom prompt)."""
+        # Get language style from config
+        language_style = self.config.get("subtitle_language_style", "formal")
+        
+        # Get custom prompt from config (user-defined vocabulary for better recognition)
+        custom_prompt = self.config.get("whisper_custom_prompt", "")
+
+        # Build kwargs for transcribe based on language style
+        transcribe_kwargs = {
+            'language': 'yue',
+            'language_style': language_style,
+        }
+
+        # 修復字幕辨識錯誤：自動啟用旅遊+購物詞彙（涵蓋大部分日常影片場景）
+        # 啟用 travel 和 shopping domain 可大幅提升地名、商品名稱的辨識準確度
+        transcribe_kwargs['domain'] = 'travel'  # 預設使用旅遊詞彙（涵蓋地名、景點、酒店等）
+        logger.info("🗺️ Enabled travel domain vocabulary for better location/place name recognition")
+
+        # Add custom prompt if provided
+        if custom_prompt:
+            transcribe_kwargs['custom_prompt'] = custom_prompt
+            logger.info(f"Using custom prompt: {custom_prompt[:50]}...")
         
+        logger.info(f"📝 Transcription language style: {language_style}")
+        return transcribe_kwargs
+
+    def _get_vad(self) -> VADProcessor:
+        """VAD processor for smart segmentation (優化斷句連貫性), results cached per audio."""
+        if self.vad is None:
+            key = ("vad",) + tuple(sorted(PIPELINE_VAD_PARAMS.items()))
+            vad = self._use_model(
+                key, lambda: VADProcessor(self.config, **PIPELINE_VAD_PARAMS), VAD_SIZE_GB, POOL_RAM
+            )
+            self.vad = CachingVADProcessor(vad, PIPELINE_VAD_PARAMS, get_vad_cache(self.config))
+        return self.vad
+
+    def _start_background_vad(self, audio_path: str) -> Future:
+        """
+        Run VAD on a worker thread so it overlaps with Whisper.
+
+        VAD only depends on the audio; the result is joined right before
+        merge_with_transcription. The future yields (voice_segments, seconds).
+        """
+        vad = self._get_vad()  # Load on this thread; the registry is not shared with the worker
+        if self._vad_executor is None:
+            self._vad_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vad")
+
+        def run():
+            started = time.perf_counter()
+            voice_segments = vad.detect_voice_segments(audio_path)
+            return voice_segments, time.perf_counter() - started
+
+        return self._vad_executor.submit(run)
+
+    def _transcribe_speech_windows(
+        self,
+        audio_path: str,
+        voice_segments: list,
+        transcribe_kwargs: dict,
+        progress_callback: Optional[Callable] = None,
+        checkpoint=None,
+        segments_callback: Optional[Callable] = None
+    ) -> list:
+        """
+        Transcribe only VAD speech, packed into <=30 s windows.
+
+        Speech regions are concatenated with short silences in between; each
+        window's remap table converts Whisper timestamps back to source time.
+        """
+        import soundfile as sf
+        from utils.asr_utils import remap_segment, to_whisper_input, transcribe_array
+        from utils.speech_windows import build_window_audio, pack_speech_windows
+        from utils.transcription_checkpoint import chunk_key
+
+        audio, sr = sf.read(audio_path, dtype='float32')
+        audio = to_whisper_input(audio, sr)
+        sr = 16000
+
+        regions = [(seg.start, seg.end) for seg in voice_segments]
+        windows = pack_speech_windows(regions, max_window=self.config.get("max_audio_chunk_s", 30.0))
+        speech_seconds = sum(w.duration for w in windows)
+        logger.info(
+            f"VAD-first: {len(regions)} speech regions -> {len(windows)} windows "
+            f"({speech_seconds:.1f}s of {len(audio) / sr:.1f}s audio)"
+        )
+
+        segments = []
+        for i, window in enumerate(windows):
+            if progress_callback:
+                progress_callback(20 + int(40 * i / len(windows)))
+
+            key = chunk_key("window", window.pieces[0].source_start, window.pieces[-1].source_end)
+            cached = checkpoint.get(key) if checkpoint is not None else None
+            if cached is not None:
+                segments.extend(cached)
+                if segments_callback:
+                    segments_callback(cached)
+                continue
+
+            result = transcribe_array(
+                self.asr, build_window_audio(audio, sr, window), sr,
+                fallback_path=self.temp_dir / f"vad_window_{i}.wav",
+                **transcribe_kwargs
+            )
+            window_segments = []
+            for seg in result.get('segments', []):
+                mapped = remap_segment(seg, window.to_source)
+                if mapped.end > mapped.start:
+                    window_segments.append(mapped)
+
+            if checkpoint is not None:
+                checkpoint.put(key, window_segments)
+            segments.extend(window_segments)
+            if segments_callback:
+                segments_callback(window_segments)
+
+        return segments
+
+    def _transcribe_full(
+        self,
+        audio_path: str,
+        transcribe_kwargs: dict,
+        checkpoint=None,
+        progress_callback: Optional[Callable] = None,
+        segments_callback: Optional[Callable] = None
+    ) -> list:
+        """
+        Transcribe the whole file.
+
+        By default this is one Whisper pass (each window keeps the previous
+        window's context), checkpointed as a whole once it finishes. With
+        checkpoint_full_transcription the audio is cut at VAD pauses (the same
+        chunks as parallel mode) and every chunk is checkpointed as it
+        completes, so a crash at 80% resumes at 80%.
+        """
+        cached = checkpoint.get("full") if checkpoint is not None else None
+        if cached is not None:
+            logger.info("Using checkpointed transcription, skipping Whisper")
+            if segments_callback:
+                segments_callback(cached)
+            return cached
+
+        if checkpoint is None or not self.config.get("checkpoint_full_transcription", False):
+            result = self.asr.transcribe(audio_path, **transcribe_kwargs)
+            segments = result.get('segments', [])
+            if checkpoint is not None:
+                checkpoint.put("full", segments)
+            if segments_callback:
+                segments_callback(segments)
+            return segments
+
+        import soundfile as sf
+        from utils.asr_utils import to_whisper_input, transcribe_array
+        from utils.parallel_transcription import offset_segment
+        from utils.transcription_checkpoint import chunk_key
+
+        chunks = self._presplit_chunks(audio_path)
+        audio, sr = sf.read(audio_path, dtype='float32')
+        audio = to_whisper_input(audio, sr)
+        sr = 16000
+        resumed = sum(1 for start, end in chunks if chunk_key("full", start, end) in checkpoint)
+        logger.info(
+            f"Checkpointed transcription: {len(chunks)} chunks"
+            + (f" ({resumed} already done)" if resumed else "")
+        )
+
+        segments = []
+        for i, (start, end) in enumerate(chunks):
+            if progress_callback:
+                progress_callback(20 + int(40 * i / len(chunks)))
+
+            key = chunk_key("full", start, end)
+            chunk_segments = checkpoint.get(key)
+            if chunk_segments is None:
+                result = transcribe_array(
+                    self.asr, audio[int(start * sr):int(end * sr)], sr,
+                    fallback_path=self.temp_dir / f"full_chunk_{i}.wav",
+                    **transcribe_kwargs
+                )
+                chunk_segments = [offset_segment(seg, start) for seg in result.get('segments', [])]
+                checkpoint.put(key, chunk_segments)
+
+            segments.extend(chunk_segments)
+            if segments_callback:
+                segments_callback(chunk_segments)
+        return segments
+
+    def _refine_segments(self, audio_path: str, segments: list, transcribe_kwargs: dict, checkpoint=None):
+        """
+        Adaptive decoding second pass: re-decode flagged greedy segments with beam search.
+
+        Returns:
+            (segments, stats) - stats include the fraction of audio that needed the expensive pass
+        """
+        import soundfile as sf
+        from utils.asr_utils import to_whisper_input
+
+        if self.asr is None:
+            # Parallel mode transcribed in worker processes; refinement runs in-process
+            self._load_asr()
+
+        audio, sr = sf.read(audio_path, dtype='float32')
+        audio = to_whisper_input(audio, sr)
+        return refine_segments(
+            self.asr, audio, 16000, segments, transcribe_kwargs,
+            thresholds=QualityThresholds.from_config(self.config),
+            beam_size=self.config.get("beam_size", 5),
+            fallback_dir=self.temp_dir,
+            checkpoint=checkpoint
+        )
+
+    def _open_checkpoint(self, audio_path: str, settings: dict):
+        """Open the per-job checkpoint for resumable transcription (None if disabled)."""
+        if not self.config.get("enable_transcription_checkpoints", True):
+            return None
+        try:
+            return TranscriptionCheckpoint.for_job(self.config, audio_path, settings)
+        except Exception as e:
+            logger.warning(f"Checkpoint unavailable, transcription will not be resumable: {e}")
+            return None
+
+    def _unload_asr(self):
+        """Unload the ASR model from the registry to free GPU memory."""
         if self.asr:
             logger.info("Unloading ASR model to free GPU memory...")
-            try:
-                self.asr.unload_model()
-            except Exception as e:
-                logger.warning(f"ASR unload error: {e}")
+            key = self._asr_key
+            if key in self._held_models:
+                self._held_models.discard(key)
+                self._registry.release(key)
+                self._registry.evict(key)
             self.asr = None
-            
-            # Force garbage collection and clear GPU cache
-            gc.collect()
-            # Cross-platform GPU memory cleanup
-            if torch.backends.mps.is_available():
-                torch.mps.empty_cache()
-            elif torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                torch.cuda.synchronize()
+            self._asr_key = None
             logger.info("ASR unloaded, GPU memory freed")
     
     # _load_llm removed - 書面語 conversion is handled by StyleControlPanel
 
     
     def _extract_audio(self, video_path: Path) -> str:
-        """Extract audio from video file."""
-        import numpy as np
-        
-        audio_path = self.temp_dir / f"{video_path.stem}_audio.wav"
+        """Extract audio from video file.
         
+        Goes through the shared content-addressed audio cache, so a file
+        that was already processed is never decoded again. On a miss the
+        audio is streamed (decode → 16kHz mono resample → WAV) frame by
+        frame, so memory use does not grow with video length.
+        """
         logger.info(f"Extracting audio from video: {video_path}")
         
         try:
-            # Use PyAV for audio extraction (includes FFmpeg libraries internally)
-            import av
-            import soundfile as sf
-            
-            container = av.open(str(video_path))
-            
-            # Get audio stream
-            if not container.streams.audio:
-                raise RuntimeError("影片中沒有找到音頻軌道")
-            
-            audio_stream = container.streams.audio[0]
-            logger.info(f"Audio stream: {audio_stream.rate}Hz, {audio_stream.channels} channels")
-            
-            # Extract and decode audio frames
-            audio_frames = []
-            for frame in container.decode(audio_stream):
-                # Convert frame to numpy array
-                audio_frames.append(frame.to_ndarray())
-            
-            container.close()
-            
-            if not audio_frames:
-                raise RuntimeError("無法從影片提取音頻幀")
-            
-            # Concatenate all frames
-            audio_data = np.concatenate(audio_frames, axis=1)
-            
-            # Resample to 16kHz if needed
-            target_sr = 16000
-            if audio_stream.rate != target_sr:
-                try:
-                    import scipy.signal
-                    num_samples = int(len(audio_data[0]) * target_sr / audio_stream.rate)
-                    audio_data = scipy.signal.resample(audio_data, num_samples, axis=1)
-                    sample_rate = target_sr
-                    logger.info(f"Resampled from {audio_stream.rate}Hz to {target_sr}Hz")
-                except ImportError:
-                    # Fallback: use original sample rate if scipy not available
-                    sample_rate = audio_stream.rate
-                    logger.warning("scipy not available, using original sample rate")
-            else:
-                sample_rate = audio_stream.rate
-            
-            # Convert to mono if stereo
-            if audio_data.shape[0] > 1:
-                audio_data = np.mean(audio_data, axis=0)
-            else:
-                audio_data = audio_data[0]
-            
-            # Save as WAV
-            sf.write(str(audio_path), audio_data, sample_rate, subtype='PCM_16')
+            audio_path = get_audio_cache(self.config).get_wav(video_path, sample_rate=16000)
             
             logger.info(f"Audio extracted to: {audio_path}")
             return str(audio_path)
@@ -445,17 +980,26 @@ class SubtitlePipelineV2:
     
     def _apply_simple_corrections(self, text: str) -> str:
         """應用簡單字符替換（無需 LLM）。"""
-        result = text
-        # 刪除多餘嘅括號（所有類型）
-        result = result.replace(")", "").replace("(", "")
-        result = result.replace("）", "").replace("（", "")
-        result = result.replace("﹚", "").replace("﹙", "")  # 特殊全角括號
-        result = result.replace("」", "").replace("「", "")  # 引號
-        result = result.replace("】", "").replace("【", "")  # 方括號
-        # 應用錯字校正
-        for error, correction in self.CANTONESE_CORRECTIONS.items():
-            result = result.replace(error, correction)
-        return result
+        # 刪除多餘嘅括號（所有類型，包括特殊全角括號、引號、方括號）
+        result = CORRECTION_BRACKETS_RE.sub('', text)
+        # 應用錯字校正（一次過套用成張表，結果同逐條 replace 一樣）
+        return self._corrections_replacer().replace(result)
+
+    @classmethod
+    def _corrections_replacer(cls, bundle: Optional[ResourceBundle] = None) -> TextReplacer:
+        """
+        CANTONESE_CORRECTIONS compiled once; order-dependent, so chained mode.
+
+        Served from the resource bundle (default: the shared one) unless the table changed.
+        """
+        cached = cls.__dict__.get('_compiled_corrections')
+        if bundle is not None or cached is None or cached[0] is not cls.CANTONESE_CORRECTIONS:
+            bundle = bundle or get_resource_bundle()
+            replacer = bundle.replacer('cantonese_corrections', cls.CANTONESE_CORRECTIONS, mode=CHAINED)
+            bundle.save()
+            cached = (cls.CANTONESE_CORRECTIONS, replacer)
+            cls._compiled_corrections = cached
+        return cached[1]
 
     def _fix_particle_punctuation(self, text: str) -> str:
         """
@@ -472,66 +1016,7 @@ class SubtitlePipelineV2:
         Returns:
             Corrected text
         """
-        result = text
-        
-        # Define punctuation that can appear after particles
-        movable_punctuation = ['，', ',', '。', '.', '！', '!', '？', '?']
-        
-        # Common word patterns that should NOT be treated as particles
-        # 呢個, 呢啲, 嗰個, 嗰啲, etc.
-        demonstrative_words = {
-            '呢個', '呢啲', '呢度', '呢邊', '呢次', '呢樣', '呢陣',
-            '嗰個', '嗰啲', '嗰度', '嗰邊', '嗰次', '嗰樣', '嗰陣',
-        }
-        
-        # For each punctuation
-        for punct in movable_punctuation:
-            # For each particle
-            for particle in self.SENTENCE_FINAL_PARTICLES:
-                # Pattern: [punct][particle]
-                wrong_pattern = f"{punct}{particle}"
-                
-                # Find all occurrences
-                index = 0
-                while True:
-                    index = result.find(wrong_pattern, index)
-                    if index == -1:
-                        break
-                    
-                    # Check what comes after the particle
-                    char_after_index = index + len(wrong_pattern)
-                    
-                    # If at end of string, it's a true particle
-                    if char_after_index >= len(result):
-                        result = result[:index] + f"{particle}{punct}" + result[char_after_index:]
-                        index += len(f"{particle}{punct}")
-                        continue
-                    
-                    char_after = result[char_after_index]
-                    
-                    # Check if this forms a demonstrative word
-                    is_word = False
-                    for word in demonstrative_words:
-                        if result[index + len(punct):].startswith(word):
-                            is_word = True
-                            break
-                    
-                    if is_word:
-                        # Skip this occurrence (it's part of a word like 呢個)
-                        index += len(wrong_pattern)
-                        continue
-                    
-                    # If followed by punctuation, whitespace, or end of string, it's a true particle
-                    if char_after in movable_punctuation or char_after.isspace():
-                        # Move punctuation after particle
-                        result = result[:index] + f"{particle}{punct}" + result[char_after_index:]
-                        index += len(f"{particle}{punct}")
-                    else:
-                        # Followed by another character, might be part of a word
-                        # Be conservative and skip
-                        index += len(wrong_pattern)
-        
-        return result
+        return fix_particle_punctuation(text, self.SENTENCE_FINAL_PARTICLES)
 
     def _fix_sentence_final_particles(
         self,
@@ -547,105 +1032,73 @@ class SubtitlePipelineV2:
         1. 檢測句首是否有語氣詞
         2. 如果有，將語氣詞移到上一句句尾
         3. 調整時間戳以反映變化
+        4. 修正句內語氣詞前面嘅標點
 
         Args:
             subtitles: 字幕列表
 
         Returns:
-            修正後的字幕列表
+            修正後的字幕列表（冇改動嘅句保留原物件）
         """
         if len(subtitles) < 2:
             return subtitles
 
-        fixed_subtitles = []
+        particles = self.SENTENCE_FINAL_PARTICLES
+        # 先喺 [start, end, colloquial, formal, 原物件] 上面改，最後先為改過嘅句建立新物件
+        # （原物件 = None 代表改過）
+        rows = []
         fixed_count = 0
 
         for i, sub in enumerate(subtitles):
             text = sub.colloquial.strip()
 
             # 檢查是否以語氣詞開頭
-            if text and text[0] in self.SENTENCE_FINAL_PARTICLES:
-                # 找出連續的語氣詞（可能有多個，如「呀啦」）
-                particle_end = 0
-                for j, char in enumerate(text):
-                    if char in self.SENTENCE_FINAL_PARTICLES:
-                        particle_end = j + 1
-                    else:
-                        break
-
-                particles = text[:particle_end]
-                remaining_text = text[particle_end:].strip()
-
-                # 只有當有上一句且剩餘文字不為空時才修正
-                if fixed_subtitles and remaining_text:
-                    # 將語氣詞移到上一句句尾
-                    prev_sub = fixed_subtitles[-1]
-                    prev_text = prev_sub.colloquial.strip()
-
-                    # 更新上一句（加入語氣詞）
-                    fixed_subtitles[-1] = SubtitleEntryV2(
-                        start=prev_sub.start,
-                        end=prev_sub.end,  # 保持原時間
-                        colloquial=prev_text + particles,
-                        formal=prev_sub.formal
-                    )
-
-                    # 更新當前句（移除語氣詞）
-                    fixed_subtitles.append(SubtitleEntryV2(
-                        start=sub.start,
-                        end=sub.end,
-                        colloquial=remaining_text,
-                        formal=sub.formal
-                    ))
+            if not text or text[0] not in particles or not rows:
+                rows.append([sub.start, sub.end, sub.colloquial, sub.formal, sub])
+                continue
 
-                    fixed_count += 1
-                    logger.info(f"[語氣詞修正] 移動 '{particles}' 從句 {i+1} 到句 {i}: "
-                               f"'{prev_text}' → '{prev_text}{particles}'")
-                elif not remaining_text:
-                    # 如果移除語氣詞後沒有剩餘文字，整句都是語氣詞
-                    if fixed_subtitles:
-                        # 直接加到上一句
-                        prev_sub = fixed_subtitles[-1]
-                        prev_text = prev_sub.colloquial.strip()
-                        fixed_subtitles[-1] = SubtitleEntryV2(
-                            start=prev_sub.start,
-                            end=sub.end,  # 延長時間到當前句結束
-                            colloquial=prev_text + particles,
-                            formal=prev_sub.formal
-                        )
-                        fixed_count += 1
-                        logger.info(f"[語氣詞修正] 合併純語氣詞句 '{particles}' 到上一句")
-                    else:
-                        # 第一句就是純語氣詞，保持原樣
-                        fixed_subtitles.append(sub)
-                else:
-                    # 沒有上一句，保持原樣
-                    fixed_subtitles.append(sub)
+            # 找出連續的語氣詞（可能有多個，如「呀啦」）
+            particle_end = 1
+            while particle_end < len(text) and text[particle_end] in particles:
+                particle_end += 1
+            leading = text[:particle_end]
+            remaining_text = text[particle_end:].strip()
+
+            # 將語氣詞移到上一句句尾
+            prev = rows[-1]
+            prev_text = prev[2].strip()
+            prev[2] = prev_text + leading
+            prev[4] = None
+            fixed_count += 1
+            if remaining_text:
+                rows.append([sub.start, sub.end, remaining_text, sub.formal, None])
+                logger.debug(f"[語氣詞修正] 移動 '{leading}' 從句 {i+1} 到句 {i}: "
+                             f"'{prev_text}' → '{prev_text}{leading}'")
             else:
-                # 不是以語氣詞開頭，保持原樣
-                fixed_subtitles.append(sub)
+                # 整句都是語氣詞：合併到上一句，延長時間到當前句結束
+                prev[1] = sub.end
+                logger.debug(f"[語氣詞修正] 合併純語氣詞句 '{leading}' 到上一句")
 
         if fixed_count > 0:
             logger.info(f"📊 語氣詞後處理：修正了 {fixed_count} 處句首語氣詞")
 
-        # NEW: Also fix punctuation appearing before particles within segments
+        # Also fix punctuation appearing before particles within segments
         punctuation_fixed_count = 0
         final_subtitles = []
-        for sub in fixed_subtitles:
-            text = sub.colloquial
+        for start, end, text, formal, original in rows:
             corrected_text = self._fix_particle_punctuation(text)
-            
             if corrected_text != text:
-                final_subtitles.append(SubtitleEntryV2(
-                    start=sub.start,
-                    end=sub.end,
-                    colloquial=corrected_text,
-                    formal=sub.formal
-                ))
                 punctuation_fixed_count += 1
-                logger.info(f"[標點修正] '{text}' → '{corrected_text}'")
-            else:
-                final_subtitles.append(sub)
+                logger.debug(f"[標點修正] '{text}' → '{corrected_text}'")
+            elif original is not None:
+                final_subtitles.append(original)
+                continue
+            final_subtitles.append(SubtitleEntryV2(
+                start=start,
+                end=end,
+                colloquial=corrected_text,
+                formal=formal
+            ))
         
         if punctuation_fixed_count > 0:
             logger.info(f"📊 標點修正：修正了 {punctuation_fixed_count} 處標點位置")
@@ -796,12 +1249,12 @@ class SubtitlePipelineV2:
         if not subtitles or len(subtitles) < 2:
             return subtitles
 
-        # 初始化 LLM（使用 MLX Qwen）
-        from utils.qwen_mlx import MLXQwenLLM
+        # 初始化 LLM（使用 MLX Qwen，經模型註冊表共用，唔使每次重新加載）
+        from utils.qwen_mlx import get_shared_mlx_qwen
 
         try:
-            llm = MLXQwenLLM(model_id="mlx-community/Qwen2.5-3B-Instruct-bf16")
-            logger.info("LLM loaded for sentence boundary optimization")
+            llm = get_shared_mlx_qwen(SENTENCE_LLM_MODEL_ID, self.config)
+            logger.info("LLM ready for sentence boundary optimization")
         except Exception as e:
             logger.warning(f"Failed to load LLM for sentence optimization: {e}")
             logger.info("Skipping sentence optimization, returning original subtitles")
@@ -955,11 +1408,6 @@ class SubtitlePipelineV2:
                 optimized_subtitles.append(subtitles[i])
                 i += 1
 
-        # 清理 LLM
-        del llm
-        import gc
-        gc.collect()
-
         # 增強日誌：記錄 LLM 優化結果
         merged_count = len(subtitles) - len(optimized_subtitles)
         logger.info(f"📊 LLM optimization: {len(subtitles)} -> {len(optimized_subtitles)} segments (merged {merged_count} segments)")
@@ -973,7 +1421,8 @@ class SubtitlePipelineV2:
         self,
         input_path: str,
         progress_callback: Optional[Callable] = None,
-        status_callback: Optional[Callable] = None
+        status_callback: Optional[Callable] = None,
+        partial_callback: Optional[Callable[[SubtitleUpdate], None]] = None
     ) -> List[SubtitleEntryV2]:
         """
         終極轉錄模式 - 極致準確度
@@ -991,39 +1440,54 @@ class SubtitlePipelineV2:
             input_path: 音頻/視頻文件路徑
             progress_callback: 進度回調 (0-100)
             status_callback: 狀態訊息回調
+            partial_callback: 逐步結果回調（SubtitleUpdate）
 
         Returns:
             字幕列表
         """
         if not HAS_ADVANCED_FEATURES:
             logger.warning("高級轉錄模組未安裝，使用標準模式")
-            return self.process(input_path, progress_callback, status_callback)
+            return self.process(input_path, progress_callback, status_callback, partial_callback)
 
+        profiler = self._create_profiler("process_ultimate", input_path)
+        try:
+            subtitles = self._process_ultimate(
+                input_path, progress_callback, status_callback, partial_callback, profiler
+            )
+        except BaseException:
+            self._finish_profiler(profiler, "failed")
+            raise
+        self._finish_profiler(profiler)
+        return subtitles
+
+    def _process_ultimate(
+        self,
+        input_path: str,
+        progress_callback: Optional[Callable],
+        status_callback: Optional[Callable],
+        partial_callback: Optional[Callable[[SubtitleUpdate], None]],
+        profiler: PipelineProfiler
+    ) -> List[SubtitleEntryV2]:
+        """process_ultimate() 主體（分階段計時）"""
         logger.info("🚀 啟動終極轉錄模式...")
         input_file = Path(input_path)
 
-        import gc
-        import torch
-
         if progress_callback:
             progress_callback(0)
 
-        # Step 1: 清理內存
-        gc.collect()
-        if torch.backends.mps.is_available():
-            torch.mps.empty_cache()
-        elif torch.cuda.is_available():
-            torch.cuda.empty_cache()
+        # Step 1: 模型由註冊表管理（超出預算時自動按 LRU 釋放），唔使預先清理內存
 
         # Step 2: 準備音頻
         if status_callback:
             status_callback("準備音頻...")
 
         video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v'}
-        if input_file.suffix.lower() in video_extensions:
-            audio_path = self._extract_audio(input_file)
-        else:
-            audio_path = str(input_file)
+        with profiler.stage("extraction"):
+            if input_file.suffix.lower() in video_extensions:
+                audio_path = self._extract_audio(input_file)
+            else:
+                audio_path = str(input_file)
+        self._record_audio_meta(profiler, audio_path)
 
         if progress_callback:
             progress_callback(5)
@@ -1032,13 +1496,15 @@ class SubtitlePipelineV2:
         if status_callback:
             status_callback("音頻預處理（降噪增強）...")
 
-        enhancer = AudioEnhancer(self.temp_dir)
-        quality = enhancer.analyze_audio_quality(audio_path)
-        logger.info(f"音頻質量: SNR={quality['snr_estimate']:.1f}dB")
+        with profiler.stage("enhancement") as stage:
+            enhancer = AudioEnhancer(self.temp_dir)
+            quality = enhancer.analyze_audio_quality(audio_path)
+            logger.info(f"音頻質量: SNR={quality['snr_estimate']:.1f}dB")
 
-        if quality['needs_enhancement']:
-            logger.info("音頻需要增強...")
-            audio_path = enhancer.quick_enhance(audio_path)
+            if quality['needs_enhancement']:
+                logger.info("音頻需要增強...")
+                audio_path = enhancer.quick_enhance(audio_path)
+            stage.extra['enhanced'] = bool(quality['needs_enhancement'])
 
         if progress_callback:
             progress_callback(15)
@@ -1047,7 +1513,11 @@ class SubtitlePipelineV2:
         if status_callback:
             status_callback("加載 AI 模型...")
 
-        self._load_asr(progress_callback, status_callback)
+        with profiler.stage("asr_load"):
+            self._load_asr(progress_callback, status_callback)
+
+        if self.config.get("enable_llm_sentence_optimization", True):
+            self._start_llm_prefetch(profiler)
 
         if progress_callback:
             progress_callback(25)
@@ -1056,14 +1526,7 @@ class SubtitlePipelineV2:
         advanced_transcriber = AdvancedTranscriber(self.config)
 
         # 初始化 VAD
-        if self.vad is None:
-            self.vad = VADProcessor(
-                self.config,
-                threshold=0.10,
-                min_silence_duration_ms=300,
-                min_speech_duration_ms=50,
-                speech_pad_ms=500
-            )
+        self._get_vad()
 
         # Step 6: 執行三階段轉錄
         if status_callback:
@@ -1074,13 +1537,34 @@ class SubtitlePipelineV2:
                 # 映射 0-100 到 25-80
                 progress_callback(25 + int(p * 0.55))
 
-        transcription_chunks = advanced_transcriber.three_stage_transcribe(
-            audio_path,
-            self.asr,
-            self.vad,
-            progress_callback=transcribe_progress,
-            status_callback=status_callback
-        )
+        checkpoint = self._open_checkpoint(audio_path, {
+            'pipeline': 'process_ultimate',
+            'model': self.profile.asr_model,
+            'backend': type(self.asr).__name__,
+            'batch_size': self.config.get("asr_batch_size", 8),
+            'adaptive': self.config.get("enable_adaptive_decoding", False),
+        })
+
+        with profiler.stage("asr") as stage:
+            transcription_chunks = advanced_transcriber.three_stage_transcribe(
+                audio_path,
+                self.asr,
+                self.vad,
+                progress_callback=transcribe_progress,
+                status_callback=status_callback,
+                checkpoint=checkpoint,
+                chunk_callback=lambda chunks: self._emit_partial(
+                    partial_callback, "append", [
+                        SubtitleEntryV2(start=c.start, end=c.end,
+                                        colloquial=self._apply_simple_corrections(c.text.strip()))
+                        for c in chunks
+                    ], "asr"
+                )
+            )
+            stage.items_out = len(transcription_chunks)
+            stage.extra.update(advanced_transcriber.last_decode_stats)
+        if advanced_transcriber.last_decode_stats:
+            profiler.meta['refined_fraction'] = advanced_transcriber.last_decode_stats['refined_fraction']
 
         if progress_callback:
             progress_callback(80)
@@ -1095,26 +1579,33 @@ class SubtitlePipelineV2:
         if user_prompt:
             logger.info(f"應用用戶詞彙: {len(vocab_learner.vocabulary)} 個")
 
-        final_subtitles = []
-        for chunk in transcription_chunks:
-            # 應用簡單校正
-            text = self._apply_simple_corrections(chunk.text.strip())
+        with profiler.stage("corrections", items_in=len(transcription_chunks)) as stage:
+            final_subtitles = []
+            for chunk in transcription_chunks:
+                # 應用簡單校正
+                text = self._apply_simple_corrections(chunk.text.strip())
 
-            # 應用用戶詞彙自動校正
-            text = auto_correct_text(text)
+                # 應用用戶詞彙自動校正
+                text = auto_correct_text(text)
 
-            final_subtitles.append(SubtitleEntryV2(
-                start=chunk.start,
-                end=chunk.end,
-                colloquial=text,
-                formal=None
-            ))
+                final_subtitles.append(SubtitleEntryV2(
+                    start=chunk.start,
+                    end=chunk.end,
+                    colloquial=text,
+                    formal=None
+                ))
+            stage.items_out = len(final_subtitles)
 
         # Step 8: 語氣詞修正
-        final_subtitles = self._fix_sentence_final_particles(final_subtitles)
+        with profiler.stage("particle_fix", items_in=len(final_subtitles)) as stage:
+            final_subtitles = self._fix_sentence_final_particles(final_subtitles)
+            stage.items_out = len(final_subtitles)
 
         # Step 9: 幻覺移除
-        final_subtitles = self._remove_ending_hallucinations(final_subtitles)
+        with profiler.stage("hallucination_removal", items_in=len(final_subtitles)) as stage:
+            final_subtitles = self._remove_ending_hallucinations(final_subtitles)
+            stage.items_out = len(final_subtitles)
+        self._emit_partial(partial_callback, "replace", final_subtitles, "corrections")
 
         if progress_callback:
             progress_callback(90)
@@ -1125,29 +1616,208 @@ class SubtitlePipelineV2:
             if status_callback:
                 status_callback("AI 斷句優化...")
 
-            gc.collect()
-            if torch.backends.mps.is_available():
-                torch.mps.empty_cache()
-
-            final_subtitles = self._optimize_sentence_boundaries(
-                final_subtitles, progress_callback
-            )
+            with profiler.stage("llm_boundary", items_in=len(final_subtitles)) as stage:
+                final_subtitles = self._optimize_sentence_boundaries(
+                    final_subtitles, progress_callback
+                )
+                stage.items_out = len(final_subtitles)
+            self._emit_partial(partial_callback, "replace", final_subtitles, "llm")
 
         if progress_callback:
             progress_callback(100)
 
         # 清理
+        if checkpoint is not None:
+            checkpoint.discard()
         advanced_transcriber.cleanup()
         enhancer.cleanup()
 
+        profiler.meta['subtitles'] = len(final_subtitles)
         logger.info(f"✅ 終極轉錄完成：{len(final_subtitles)} 個字幕")
         return final_subtitles
 
+    # ==================== 串聯模式（細模型草稿 → 大模型精修） ====================
+
+    def set_refine_focus(self, time_pos: Optional[float]):
+        """Refine the cascade windows around ``time_pos`` (playhead / selection) first."""
+        scheduler = self._refine_scheduler
+        if scheduler is not None:
+            scheduler.set_focus(time_pos)
+
+    def process_cascade(
+        self,
+        input_path: str,
+        progress_callback: Optional[Callable] = None,
+        status_callback: Optional[Callable] = None,
+        partial_callback: Optional[Callable[[SubtitleUpdate], None]] = None
+    ) -> List[SubtitleEntryV2]:
+        """
+        串聯轉錄：細模型快速出草稿，大模型喺背景逐個窗口取代
+
+        1. 草稿：whisper-small-cantonese 轉錄全片，照常推送逐步結果（0-30%）
+        2. 精修：大模型按窗口重新轉錄，播放頭 / 選中字幕附近優先，
+           每個窗口完成即推送 ``splice`` 事件取代該範圍嘅草稿（30-60%）
+        3. 大模型結果行同標準模式一樣嘅後處理（VAD 斷句、糾正、LLM 斷句），最終質量不變
+
+        Args:
+            input_path: 音頻/視頻文件路徑
+            progress_callback: 進度回調 (0-100)
+            status_callback: 狀態訊息回調
+            partial_callback: 逐步結果回調（SubtitleUpdate）
+
+        Returns:
+            字幕列表
+        """
+        profiler = self._create_profiler("process_cascade", input_path)
+        try:
+            subtitles = self._process_cascade(
+                input_path, progress_callback, status_callback, partial_callback, profiler
+            )
+        except BaseException:
+            self._finish_profiler(profiler, "failed")
+            raise
+        finally:
+            self._refine_scheduler = None
+        self._finish_profiler(profiler)
+        return subtitles
+
+    def _process_cascade(
+        self,
+        input_path: str,
+        progress_callback: Optional[Callable],
+        status_callback: Optional[Callable],
+        partial_callback: Optional[Callable[[SubtitleUpdate], None]],
+        profiler: PipelineProfiler
+    ) -> List[SubtitleEntryV2]:
+        """process_cascade() 主體（分階段計時）"""
+        import soundfile as sf
+        from utils.asr_utils import to_whisper_input
+        from utils.cascade_refinement import (
+            RefineScheduler, plan_refine_windows, refine_windows, splice_by_span
+        )
+
+        draft_model = self.config.get("cascade_draft_model", "small")
+        logger.info(f"⚡ 串聯模式：{draft_model} 草稿 → {self.profile.asr_model} 精修")
+
+        # 進度只會向前（後處理由 60% 開始報）
+        reported = [0]
+
+        def report(p):
+            if progress_callback and p > reported[0]:
+                reported[0] = p
+                progress_callback(p)
+
+        # Step 1: 草稿（lite 粵語模型，唔做 LLM 斷句 / 自適應解碼）
+        draft_pipeline = SubtitlePipelineV2(
+            ConfigOverrides(
+                self.config,
+                **cascade_asr_overrides(self.config, "draft"),
+                enable_llm_sentence_optimization=False,
+                enable_adaptive_decoding=False,
+                enable_ultimate_transcription=False,
+                enable_cascade_transcription=False,
+                enable_pipeline_profiling=False,
+            ),
+            force_cpu=self.force_cpu,
+            asr_model=draft_model
+        )
+
+        def draft_partial(update):
+            self._emit_partial(partial_callback, update.action, update.entries, f"draft_{update.stage}")
+
+        with profiler.stage("draft") as stage:
+            try:
+                draft = draft_pipeline.process(
+                    input_path, lambda p: report(int(p * 0.3)), status_callback, draft_partial
+                )
+            finally:
+                # 放手，模型留喺註冊表，記憶體唔夠時先被淘汰
+                draft_pipeline.cleanup()
+            stage.items_out = len(draft)
+        self._emit_partial(partial_callback, "replace", draft, "draft")
+        if status_callback:
+            status_callback("草稿完成，正在背景精修...")
+
+        # Step 2: 大模型（flagship 粵語模型）按焦點優先逐個窗口精修
+        refine_config = ConfigOverrides(self.config, **cascade_asr_overrides(self.config, "refine"))
+        with profiler.stage("asr_load"):
+            self._load_asr(status_callback=status_callback, config=refine_config)
+
+        input_file = Path(input_path)
+        video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v'}
+        with profiler.stage("extraction"):
+            if input_file.suffix.lower() in video_extensions:
+                audio_path = self._extract_audio(input_file)
+            else:
+                audio_path = str(input_file)
+        self._record_audio_meta(profiler, audio_path)
+
+        audio, sr = sf.read(audio_path, dtype='float32')
+        audio = to_whisper_input(audio, sr)
+        sr = 16000
+
+        transcribe_kwargs = self._transcribe_kwargs()
+        checkpoint = self._open_checkpoint(audio_path, {
+            'pipeline': 'cascade',
+            'model': self.profile.asr_model,
+            'model_id': self._asr_key,
+            'backend': type(self.asr).__name__,
+            'kwargs': transcribe_kwargs,
+        })
+
+        windows = plan_refine_windows(
+            [(entry.start, entry.end) for entry in draft], len(audio) / sr,
+            max_window=self.config.get("max_audio_chunk_s", 30.0)
+        )
+        self._refine_scheduler = RefineScheduler(windows)
+        logger.info(f"Cascade refinement: {len(windows)} windows")
+
+        current = list(draft)
+
+        def on_window(window, segments):
+            nonlocal current
+            entries = [
+                SubtitleEntryV2(start=seg.start, end=seg.end,
+                                colloquial=self._apply_simple_corrections(seg.text.strip()))
+                for seg in segments
+            ]
+            current = splice_by_span(current, entries, window.start, window.end)
+            if partial_callback is not None:
+                try:
+                    partial_callback(SubtitleUpdate(
+                        action="splice", entries=entries, stage="refine", span=(window.start, window.end)
+                    ))
+                except Exception as e:
+                    logger.warning(f"partial_callback failed (splice/refine): {e}")
+            done = len(windows) - self._refine_scheduler.remaining
+            report(30 + int(30 * done / len(windows)))
+
+        with profiler.stage("asr_refine", items_in=len(windows)) as stage:
+            whisper_segments = refine_windows(
+                self.asr, audio, sr, self._refine_scheduler, transcribe_kwargs,
+                on_window=on_window, fallback_dir=self.temp_dir, checkpoint=checkpoint
+            )
+            stage.items_out = len(whisper_segments)
+        profiler.meta['draft_model'] = draft_model
+        profiler.meta['refine_windows'] = len(windows)
+
+        if not whisper_segments:
+            logger.warning("No segments from Whisper")
+            return []
+
+        # Step 3: 同標準模式一樣嘅後處理
+        return self._finalize_segments(
+            whisper_segments, audio_path, None, profiler, report, partial_callback, checkpoint
+        )
+
+    # ==================== 標準模式 ====================
+
     def process(
         self,
         input_path: str,
         progress_callback: Optional[Callable] = None,
-        status_callback: Optional[Callable] = None
+        status_callback: Optional[Callable] = None,
+        partial_callback: Optional[Callable[[SubtitleUpdate], None]] = None
     ) -> List[SubtitleEntryV2]:
         """
         Run the subtitle generation pipeline with sequential model loading.
@@ -1164,6 +1834,8 @@ class SubtitlePipelineV2:
             input_path: Path to audio/video file
             progress_callback: Progress callback (0-100)
             status_callback: Status message callback for UI updates
+            partial_callback: Receives SubtitleUpdate events as chunks finish
+                and after each correction pass (progressive display)
             
         Returns:
             List of SubtitleEntryV2 with colloquial (and optional formal) text
@@ -1172,8 +1844,32 @@ class SubtitlePipelineV2:
         ultimate_mode = self.config.get("enable_ultimate_transcription", False)
         if ultimate_mode and HAS_ADVANCED_FEATURES:
             logger.info("🚀 終極模式已啟用，使用高精度轉錄...")
-            return self.process_ultimate(input_path, progress_callback, status_callback)
+            return self.process_ultimate(input_path, progress_callback, status_callback, partial_callback)
+
+        # 串聯模式：細模型草稿先出，大模型背景精修
+        if self.config.get("enable_cascade_transcription", False):
+            return self.process_cascade(input_path, progress_callback, status_callback, partial_callback)
+
+        profiler = self._create_profiler("process", input_path)
+        try:
+            subtitles = self._process_standard(
+                input_path, progress_callback, status_callback, partial_callback, profiler
+            )
+        except BaseException:
+            self._finish_profiler(profiler, "failed")
+            raise
+        self._finish_profiler(profiler)
+        return subtitles
 
+    def _process_standard(
+        self,
+        input_path: str,
+        progress_callback: Optional[Callable],
+        status_callback: Optional[Callable],
+        partial_callback: Optional[Callable[[SubtitleUpdate], None]],
+        profiler: PipelineProfiler
+    ) -> List[SubtitleEntryV2]:
+        """Standard-mode body of process(), instrumented per stage."""
         logger.info(f"Starting V2 pipeline for: {input_path}")
         logger.info("Using sequential model loading (memory efficient mode)")
         input_file = Path(input_path)
@@ -1183,62 +1879,23 @@ class SubtitlePipelineV2:
         enable_llm_optimization = self.config.get("enable_llm_sentence_optimization", True)
 
         if enable_llm_optimization:
-            from huggingface_hub import try_to_load_from_cache
-
-            # 檢查 LLM 是否已下載
-            llm_model_id = "mlx-community/Qwen2.5-3B-Instruct-bf16"
-            cache_result = try_to_load_from_cache(llm_model_id, "config.json")
-            llm_cached = cache_result is not None
-
-            if not llm_cached:
-                logger.warning(f"⚠️ LLM 模型未下載，首次使用需下載 3-6GB 模型")
-                if status_callback:
-                    status_callback("首次使用需下載 AI 模型（3-6GB），請稍候...")
-
-                # 預下載 LLM 模型（避免轉譯中途卡住）
-                try:
-                    from utils.qwen_mlx import MLXQwenLLM
-                    llm_temp = MLXQwenLLM(model_id=llm_model_id)
+            with profiler.stage("llm_precheck"):
+                self._ensure_llm_downloaded(status_callback)
 
-                    def llm_progress_callback(msg):
-                        if status_callback:
-                            status_callback(f"正在下載 AI 模型：{msg}")
-                        logger.info(msg)
-
-                    llm_temp.load_model(progress_callback=llm_progress_callback)
-                    del llm_temp
-                    logger.info("✅ LLM 模型預下載完成")
-                    if status_callback:
-                        status_callback("AI 模型下載完成，開始轉譯...")
-                except Exception as e:
-                    logger.warning(f"LLM 預下載失敗: {e}")
-                    logger.info("將在轉譯過程中自動下載（可能較慢）")
-                    if status_callback:
-                        status_callback("AI 模型下載失敗，將使用基礎模式...")
-
-        # Step 0.5: Pre-clear GPU memory (0-5%)
-        import gc
-        import torch
-
-        if progress_callback:
-            progress_callback(0)
-        
-        logger.info("Pre-clearing GPU memory before pipeline start...")
-        gc.collect()
-        # Cross-platform GPU memory cleanup
-        if torch.backends.mps.is_available():
-            torch.mps.empty_cache()
-            logger.info("MPS memory cache cleared, ready for model loading")
-        elif torch.cuda.is_available():
-            torch.cuda.empty_cache()
-            torch.cuda.synchronize()
-            logger.info("CUDA memory cache cleared, ready for model loading")
-        
+        # Step 0.5: GPU memory is managed by the model registry (LRU eviction under budget)
         if progress_callback:
             progress_callback(5)
         
         # Step 1: Load ASR model only (5-15%)
-        self._load_asr(progress_callback, status_callback=status_callback)
+        # CPU-only 並行模式：每個 worker 自己加載模型，主進程唔使加載
+        asr_workers = self._resolve_asr_workers()
+        if asr_workers <= 1:
+            with profiler.stage("asr_load"):
+                self._load_asr(progress_callback, status_callback=status_callback)
+
+        # LLM 喺 90% 先用：預算夠就趁 Whisper 轉錄時喺背景加載
+        if enable_llm_optimization:
+            self._start_llm_prefetch(profiler)
         
         # Step 2: Prepare audio (15-20%)
         if progress_callback:
@@ -1246,10 +1903,12 @@ class SubtitlePipelineV2:
         
         # Check if video needs audio extraction
         video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v'}
-        if input_file.suffix.lower() in video_extensions:
-            audio_path = self._extract_audio(input_file)
-        else:
-            audio_path = str(input_file)
+        with profiler.stage("extraction"):
+            if input_file.suffix.lower() in video_extensions:
+                audio_path = self._extract_audio(input_file)
+            else:
+                audio_path = str(input_file)
+        self._record_audio_meta(profiler, audio_path)
         
         # Step 3: Transcribe with Whisper (20-60%)
         if progress_callback:
@@ -1257,39 +1916,134 @@ class SubtitlePipelineV2:
         
         logger.info("Running Whisper transcription...")
 
-        # Get language style from config
-        language_style = self.config.get("subtitle_language_style", "formal")
-        
-        # Get custom prompt from config (user-defined vocabulary for better recognition)
-        custom_prompt = self.config.get("whisper_custom_prompt", "")
+        transcribe_kwargs = self._transcribe_kwargs()
 
-        # Build kwargs for transcribe based on language style
-        transcribe_kwargs = {
-            'language': 'yue',
-            'language_style': language_style,
-        }
+        # Adaptive decoding: greedy first pass, beam search only on flagged segments afterwards
+        adaptive = self.config.get("enable_adaptive_decoding", False)
+        if adaptive:
+            transcribe_kwargs = greedy_kwargs(self.asr, transcribe_kwargs)
 
-        # 修復字幕辨識錯誤：自動啟用旅遊+購物詞彙（涵蓋大部分日常影片場景）
-        # 啟用 travel 和 shopping domain 可大幅提升地名、商品名稱的辨識準確度
-        transcribe_kwargs['domain'] = 'travel'  # 預設使用旅遊詞彙（涵蓋地名、景點、酒店等）
-        logger.info("🗺️ Enabled travel domain vocabulary for better location/place name recognition")
+        vad_first = self.config.get("enable_vad_first_transcription", False)
+        overlap_mode = self.config.get("overlap_window_mode", "off")
+        if asr_workers > 1:
+            mode = "parallel"
+        elif overlap_mode in ("wide", "narrow") and HAS_ADVANCED_FEATURES:
+            mode = "overlap"
+        else:
+            mode = "vad_first" if vad_first else "full"
+
+        # 斷點續傳：每個完成嘅 chunk 寫入 checkpoint，重啟後跳過
+        checkpoint = self._open_checkpoint(audio_path, {
+            'pipeline': 'process',
+            'mode': mode,
+            'model': self.profile.asr_model,
+            'backend': type(self.asr).__name__ if self.asr is not None else 'WhisperASR',
+            'kwargs': transcribe_kwargs,
+        })
+
+        # 逐步結果：每個 chunk 完成即推送（糾正前嘅初稿）
+        def emit_segments(segments):
+            self._emit_partial(partial_callback, "append", [
+                SubtitleEntryV2(start=seg.start, end=seg.end,
+                                colloquial=self._apply_simple_corrections(seg.text.strip()))
+                for seg in segments
+            ], "asr")
+
+        # VAD 只取決於音頻：同 Whisper 並行，合併前先 join（VAD 優先模式要先有 VAD）
+        vad_future = None
+        if mode != "vad_first":
+            try:
+                vad_future = self._start_background_vad(audio_path)
+            except Exception as e:
+                logger.warning(f"Background VAD unavailable, running it after Whisper: {e}")
+
+        with profiler.stage("asr") as stage:
+            voice_segments = None
+            if mode == "parallel":
+                whisper_segments = self._transcribe_parallel(
+                    audio_path, asr_workers, transcribe_kwargs, progress_callback, status_callback,
+                    checkpoint=checkpoint, segments_callback=emit_segments
+                )
+            elif mode == "overlap":
+                # 重疊窗口：窗口邊界附近嘅字由相鄰兩個窗口對齊 / 按信心揀
+                def overlap_progress(p):
+                    if progress_callback:
+                        progress_callback(20 + int(p * 0.5))
+
+                whisper_segments = AdvancedTranscriber(self.config).transcribe_with_overlap(
+                    audio_path, self.asr, overlap_progress,
+                    narrow_overlap=overlap_mode == "narrow", **transcribe_kwargs
+                )
+                emit_segments(whisper_segments)
+                stage.extra['overlap_window_mode'] = overlap_mode
+            elif mode == "vad_first":
+                # VAD 優先：只轉錄語音窗口，跳過靜音 / 純音樂
+                try:
+                    voice_segments = self._get_vad().detect_voice_segments(audio_path)
+                    whisper_segments = self._transcribe_speech_windows(
+                        audio_path, voice_segments, transcribe_kwargs, progress_callback,
+                        checkpoint=checkpoint, segments_callback=emit_segments
+                    )
+                except Exception as e:
+                    logger.warning(f"VAD-first transcription failed, transcribing full audio: {e}")
+                    voice_segments = None
+                    self._emit_partial(partial_callback, "replace", [], "asr")
+                    whisper_segments = self._transcribe_full(
+                        audio_path, transcribe_kwargs, checkpoint, progress_callback, emit_segments
+                    )
+            else:
+                whisper_segments = self._transcribe_full(
+                    audio_path, transcribe_kwargs, checkpoint, progress_callback, emit_segments
+                )
+            stage.items_out = len(whisper_segments)
+            stage.extra['mode'] = mode
 
-        # Add custom prompt if provided
-        if custom_prompt:
-            transcribe_kwargs['custom_prompt'] = custom_prompt
-            logger.info(f"Using custom prompt: {custom_prompt[:50]}...")
-        
-        logger.info(f"📝 Transcription language style: {language_style}")
+        if adaptive and whisper_segments:
+            with profiler.stage("asr_refine", items_in=len(whisper_segments)) as stage:
+                try:
+                    whisper_segments, decode_stats = self._refine_segments(
+                        audio_path, whisper_segments, transcribe_kwargs, checkpoint
+                    )
+                    stage.extra.update(decode_stats)
+                    profiler.meta['refined_fraction'] = decode_stats['refined_fraction']
+                    if decode_stats['refined_segments']:
+                        self._emit_partial(partial_callback, "replace", [
+                            SubtitleEntryV2(start=seg.start, end=seg.end,
+                                            colloquial=self._apply_simple_corrections(seg.text.strip()))
+                            for seg in whisper_segments
+                        ], "asr_refine")
+                except Exception as e:
+                    logger.warning(f"Adaptive decoding pass failed, keeping greedy segments: {e}")
+                stage.items_out = len(whisper_segments)
 
-        result = self.asr.transcribe(audio_path, **transcribe_kwargs)
-        
-        whisper_segments = result.get('segments', [])
         logger.info(f"Whisper produced {len(whisper_segments)} segments")
         
         if not whisper_segments:
             logger.warning("No segments from Whisper")
             return []
         
+        return self._finalize_segments(
+            whisper_segments, audio_path, voice_segments, profiler,
+            progress_callback, partial_callback, checkpoint, vad_future
+        )
+    
+    def _finalize_segments(
+        self,
+        whisper_segments: list,
+        audio_path: str,
+        voice_segments: Optional[list],
+        profiler: PipelineProfiler,
+        progress_callback: Optional[Callable],
+        partial_callback: Optional[Callable[[SubtitleUpdate], None]],
+        checkpoint=None,
+        vad_future: Optional[Future] = None
+    ) -> List[SubtitleEntryV2]:
+        """
+        Post-ASR stages (60-100%): VAD segmentation, corrections, LLM sentence boundaries.
+
+        ``vad_future`` is the background VAD started alongside Whisper (see
+        _start_background_vad); without it VAD runs here.
+        """
         if progress_callback:
             progress_callback(60)
         
@@ -1298,43 +2052,40 @@ class SubtitlePipelineV2:
         if progress_callback:
             progress_callback(62)
         
-        try:
-            # Initialize VAD processor (優化斷句連貫性)
-            if self.vad is None:
-                # 修復字幕遺漏問題：優化 VAD 參數，減少漏檢
-                self.vad = VADProcessor(
-                    self.config,
-                    threshold=0.10,                # 降低門檻 (0.15→0.10)，更敏感，減少漏檢輕聲說話
-                    min_silence_duration_ms=300,   # 縮短靜音判斷 (500→300ms)，避免過度拆分
-                    min_speech_duration_ms=50,     # 允許更短語音 (100→50ms)，保留快速說話
-                    speech_pad_ms=500              # 增加填充 (300→500ms)，保留完整語句
+        with profiler.stage("vad_segmentation", items_in=len(whisper_segments)) as stage:
+            try:
+                # Detect voice segments (VAD-first mode already has them)
+                if voice_segments is None and vad_future is not None:
+                    wait_started = time.perf_counter()
+                    voice_segments, vad_seconds = vad_future.result()
+                    stage.extra['vad_seconds'] = round(vad_seconds, 3)
+                    stage.extra['vad_wait_seconds'] = round(time.perf_counter() - wait_started, 3)
+                if voice_segments is None:
+                    voice_segments = self._get_vad().detect_voice_segments(audio_path)
+                logger.info(f"VAD detected {len(voice_segments)} voice segments")
+
+                if progress_callback:
+                    progress_callback(68)
+
+                # Merge Whisper + VAD for smart segmentation
+                # 修復字幕過度合併問題：縮短合併參數，保持 1-2 句的短字幕
+                # 啟用保守模式：保留無 VAD 重疊但有意義的段落，減少文字遺漏
+                optimized_segments = self.vad.merge_with_transcription(
+                    whisper_segments,
+                    voice_segments,
+                    max_gap=0.8,           # 縮短停頓閾值 (1.5→0.8s)，減少合併，保持短句
+                    max_chars=30,          # 縮短字數限制 (50→30字)，強制拆分長句
+                    conservative_mode=True # 保守模式：保留可疑段落，減少文字遺漏
                 )
-
-            # Detect voice segments
-            voice_segments = self.vad.detect_voice_segments(audio_path)
-            logger.info(f"VAD detected {len(voice_segments)} voice segments")
-
-            if progress_callback:
-                progress_callback(68)
-
-            # Merge Whisper + VAD for smart segmentation
-            # 修復字幕過度合併問題：縮短合併參數，保持 1-2 句的短字幕
-            # 啟用保守模式：保留無 VAD 重疊但有意義的段落，減少文字遺漏
-            optimized_segments = self.vad.merge_with_transcription(
-                whisper_segments,
-                voice_segments,
-                max_gap=0.8,           # 縮短停頓閾值 (1.5→0.8s)，減少合併，保持短句
-                max_chars=30,          # 縮短字數限制 (50→30字)，強制拆分長句
-                conservative_mode=True # 保守模式：保留可疑段落，減少文字遺漏
-            )
-            logger.info(f"VAD optimization: {len(whisper_segments)} -> {len(optimized_segments)} segments")
+                logger.info(f"VAD optimization: {len(whisper_segments)} -> {len(optimized_segments)} segments")
             
-            # Use optimized segments
-            whisper_segments = optimized_segments
+                # Use optimized segments
+                whisper_segments = optimized_segments
             
-        except Exception as e:
-            logger.warning(f"VAD segmentation failed, using original Whisper segments: {e}")
-            # Continue with original Whisper segments
+            except Exception as e:
+                logger.warning(f"VAD segmentation failed, using original Whisper segments: {e}")
+                # Continue with original Whisper segments
+            stage.items_out = len(whisper_segments)
         
         if progress_callback:
             progress_callback(75)
@@ -1344,15 +2095,17 @@ class SubtitlePipelineV2:
         if progress_callback:
             progress_callback(85)
 
-        final_subtitles = [
-            SubtitleEntryV2(
-                start=seg.start,
-                end=seg.end,
-                colloquial=self._apply_simple_corrections(seg.text.strip()),
-                formal=None  # Will be filled by StyleControlPanel if user selects 書面語
-            )
-            for seg in whisper_segments
-        ]
+        with profiler.stage("corrections", items_in=len(whisper_segments)) as stage:
+            final_subtitles = [
+                SubtitleEntryV2(
+                    start=seg.start,
+                    end=seg.end,
+                    colloquial=self._apply_simple_corrections(seg.text.strip()),
+                    formal=None  # Will be filled by StyleControlPanel if user selects 書面語
+                )
+                for seg in whisper_segments
+            ]
+            stage.items_out = len(final_subtitles)
 
         # Step 5.4: Fix sentence-final particles at wrong position (82-85%)
         # 修正 VAD 斷句錯誤導致語氣詞出現喺句首（如「嗎茶葉蛋的味道呀」）
@@ -1360,14 +2113,19 @@ class SubtitlePipelineV2:
             progress_callback(82)
 
         logger.info("Fixing sentence-final particles at wrong position...")
-        final_subtitles = self._fix_sentence_final_particles(final_subtitles)
+        with profiler.stage("particle_fix", items_in=len(final_subtitles)) as stage:
+            final_subtitles = self._fix_sentence_final_particles(final_subtitles)
+            stage.items_out = len(final_subtitles)
 
         # Step 5.5: Remove Whisper hallucination at the end (85-90%)
         # Whisper often hallucinates repetitive short words at the end when only background music exists
         if progress_callback:
             progress_callback(85)
 
-        final_subtitles = self._remove_ending_hallucinations(final_subtitles)
+        with profiler.stage("hallucination_removal", items_in=len(final_subtitles)) as stage:
+            final_subtitles = self._remove_ending_hallucinations(final_subtitles)
+            stage.items_out = len(final_subtitles)
+        self._emit_partial(partial_callback, "replace", final_subtitles, "corrections")
 
         # Step 6: LLM intelligent sentence boundary optimization (90-100%)
         # Use LLM to merge incomplete sentences and ensure semantic completeness
@@ -1377,70 +2135,83 @@ class SubtitlePipelineV2:
         # Check if LLM sentence optimization is enabled
         enable_llm_segmentation = self.config.get("enable_llm_sentence_optimization", True)
         if enable_llm_segmentation:
-            # 清理 VRAM（在加載 LLM 之前釋放 Whisper/VAD 使用的內存）
-            logger.info("Pre-clearing VRAM before LLM sentence optimization...")
-            gc.collect()
-            if torch.backends.mps.is_available():
-                torch.mps.empty_cache()
-                logger.info("MPS cache cleared for LLM")
-            elif torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                torch.cuda.synchronize()
-                logger.info("CUDA cache cleared for LLM")
-
+            # 如果 VRAM 預算唔夠，註冊表加載 LLM 時會先釋放最少用嘅模型
             logger.info("Starting LLM sentence boundary optimization...")
-            final_subtitles = self._optimize_sentence_boundaries(final_subtitles, progress_callback)
+            with profiler.stage("llm_boundary", items_in=len(final_subtitles)) as stage:
+                final_subtitles = self._optimize_sentence_boundaries(final_subtitles, progress_callback)
+                stage.items_out = len(final_subtitles)
+            self._emit_partial(partial_callback, "replace", final_subtitles, "llm")
         else:
             logger.info("LLM sentence optimization disabled, skipping...")
 
         if progress_callback:
             progress_callback(100)
 
+        if checkpoint is not None:
+            checkpoint.discard()
+
+        profiler.meta['subtitles'] = len(final_subtitles)
         logger.info(f"Pipeline complete. Generated {len(final_subtitles)} subtitles")
         return final_subtitles
     
-    def cleanup(self):
-        """Release all resources."""
-        import gc
-        import torch
-        
+    def cleanup(self, unload_models: bool = False):
+        """
+        Release this pipeline's hold on its models.
+
+        The models stay resident in the shared registry so the next job reuses
+        them; the registry evicts them (LRU) when another model needs the room.
+
+        Args:
+            unload_models: Also unload the models from the registry right away
+        """
         logger.info("Cleaning up pipeline resources...")
-        
-        if self.asr:
-            try:
-                self.asr.unload_model()
-            except Exception as e:
-                logger.warning(f"ASR cleanup error: {e}")
-            self.asr = None
-        
-        # LLM cleanup removed - LLM is handled by StyleControlPanel
-        
-        if self.vad:
-            try:
-                self.vad.unload_model()
-            except Exception as e:
-                logger.warning(f"VAD cleanup error: {e}")
-            self.vad = None
-        
+
+        for key in list(self._held_models):
+            self._registry.release(key)
+            if unload_models:
+                self._registry.evict(key)
+        self._held_models.clear()
+
+        self.asr = None
+        self._asr_key = None
+        self.vad = None
         self._models_loaded = False
-        
-        # Force garbage collection
-        gc.collect()
-        
-        # Cross-platform GPU memory cleanup
-        try:
-            if torch.backends.mps.is_available():
-                torch.mps.empty_cache()
-                logger.info("MPS memory cache cleared")
-            elif torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                torch.cuda.synchronize()
-                logger.info("CUDA memory cache cleared")
-        except Exception as e:
-            logger.warning(f"GPU cache clear error: {e}")
+        if self._vad_executor is not None:
+            self._vad_executor.shutdown(wait=False)
+            self._vad_executor = None
+        if self._parallel_transcriber is not None:
+            self._parallel_transcriber.close()
+            self._parallel_transcriber = None
         
         logger.info("Pipeline cleanup complete")
     
     def get_profile(self) -> Optional[PerformanceProfile]:
         """Get the current hardware profile."""
         return self.profile
+
+
+def start_model_warmup(config: Config, force_cpu: bool = False):
+    """
+    Load ASR and VAD into the model registry on a background thread.
+
+    Skipped when disabled in config or when the ASR weights are not downloaded
+    yet (the first job shows download progress instead).
+
+    Returns:
+        The warmup thread, or None if skipped
+    """
+    if not config.get("enable_model_warmup", True):
+        return None
+
+    pipeline = SubtitlePipelineV2(config, force_cpu=force_cpu)
+    if not pipeline.asr_model_cached():
+        logger.info("ASR model not downloaded yet, skipping background warmup")
+        return None
+
+    def warm():
+        try:
+            pipeline.warmup()
+        finally:
+            pipeline.cleanup()
+
+    return get_model_registry(config).warmup([warm])
@@ -2,43 +2,108 @@
 Style Processor for subtitle text transformation.
 """
 
-import json
 import re
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 
 from utils.logger import setup_logger
+from utils.opencc_batch import HAS_OPENCC, convert_bulk, get_s2t_converter
+from utils.resource_bundle import ResourceBundle, get_resource_bundle
+from utils.text_replacer import CHAINED, LONGEST, Pairs, TextReplacer
 # NOTE: TranslationModel is NOT imported here to avoid triggering
 # full transformers loading at startup (causes torchcodec issues in PyInstaller).
 # Import it lazily in _translate_with_ai() when needed.
 from core.config import Config
 
-# OpenCC for simplified to traditional conversion
-try:
-    from opencc import OpenCC
-    HAS_OPENCC = True
-except ImportError:
-    HAS_OPENCC = False
-
 logger = setup_logger()
 
+# 分階段快取上限（每個階段；超出就清空嗰個階段）
+STAGE_CACHE_MAX_ENTRIES = 200_000
+# 保留幾多次 AI 批量轉換結果（唔同風格 / 唔同字幕）
+AI_BATCH_CACHE_MAX_ENTRIES = 4
+
+# 預編譯刪字正則（一個字符類一次過刪走，唔使逐個字 replace）
+BRACKETS_RE = re.compile('[' + re.escape('()（）﹙﹚[]【】「」') + ']')
+ALL_PUNCTUATION_RE = re.compile('[' + re.escape('，。！？、；：,.!?;:；—…「」『』【】《》〈〉()（）﹙﹚[]') + ']')
+
 class StyleProcessor:
     """
     Process subtitle text based on style options.
     """
+
+    # Universal homophone fixes (apply in ALL modes)
+    UNIVERSAL_HOMOPHONE_FIXES = {
+        # Common transcription errors
+        "原費": "月費",
+        "財源名單": "裁員名單",
+        "財源": "裁員",
+        "博殺": "搏殺",
+        "禁入去": "撳入去",
+        "友誼": "猶豫",
+        "告名": "報名",
+        "講濃": "講NO",
+        "濃嘅底氣": "NO嘅底氣",
+        "濃厚的底氣": "NO的底氣",  # 書面語版本
+        "濃的底氣": "NO的底氣",
+        "半份量": "半份糧",
+        "第二份量": "第二份糧",
+        "份量": "份糧",  # 通用修正
+        "a啲ul": "Aesop",
+        "pow啲er": "powder",
+        "olivian": "Olive Young",
+        "iPa啲": "iPad",
+        "不知道道": "不知道",
+        "知道道": "知道",
+        "無人": "無印",  # Context: 無印良品
+        "不看不看": "唔推唔推",
+        "关闭电话": "解僱",  # call off
+        "call off": "取消",  # 英文直譯錯誤
+        "俾人call off": "被取消",
+        "我才是": "我是",  # "我才是Linxia" 應該是 "我是Linxia"
+        "即刻告名": "即刻報名",
+        "立刻禁入": "立刻撳入",
+        "撳入去": "點入去",  # 正確粵語用法
+
+        # 從長影片分析發現的錯誤
+        "處於一種": "陷入一個",  # 「處於一種兩難」→「陷入一個兩難」
+        "那塊面": "嗰塊面",  # 書面語錯誤
+        "那盞燈": "嗰盞燈",
+        "那個": "嗰個",  # 除非已經是書面語模式
+        "這樣做": "咁樣做",
+        "這樣的": "咁樣嘅",
+        "衝動消費": "衝動消費",  # 保持正確
+        "淡剔": "清淡",  # 粵語→書面語
+
+        # Simplified to Traditional Chinese fixes
+        "灵": "靈",
+        "迈克尔": "Michael",
+        "一个": "一個",
+        "这个": "這個",
+        "觉得": "覺得",
+    }
     
-    def __init__(self, config: Optional[Config] = None):
+    # Spoken-mode-only fixes (書面語→粵語口語)
+    # These should NOT apply in written mode
+    SPOKEN_ONLY_HOMOPHONE_FIXES = {
+        "哪一個": "邊一個",  # Whisper outputs 書面語, fix to 口語
+    }
+    
+    def __init__(self, config: Optional[Config] = None, resource_bundle: Optional[ResourceBundle] = None):
         self.config = config or Config() # Fallback for tests
+        self._bundle = resource_bundle  # Precompiled mappings/replacers (None = shared bundle in cache_dir)
         self.cantonese_map = {}
         self.profanity_map = {}
         self.english_map = {}  # Initialize to prevent AttributeError
         self.translation_model = None
         self.llm_processor = None  # For AI-powered style conversion
         self.translation_cache = {}  # Cache for English translations: {english: chinese}
+        self._replacers = {}  # Compiled dictionaries: {name: (source mapping, TextReplacer)}
+        self._stage_cache = {}  # {stage name: {(input text, option): output text}}
+        self._ai_batch_cache = {}  # {(style, segment texts): {index: converted text}}
         
-        # Initialize OpenCC for S2T conversion
+        # Initialize OpenCC for S2T conversion (dictionaries loaded once per process)
         if HAS_OPENCC:
-            self.s2t_converter = OpenCC('s2hk')  # Simplified to Traditional (Hong Kong)
+            self.s2t_converter = get_s2t_converter()  # Simplified to Traditional (Hong Kong)
             logger.info("OpenCC S2HK converter initialized")
         else:
             self.s2t_converter = None
@@ -46,10 +111,40 @@ class StyleProcessor:
             logger.warning("    Install with: pip install opencc-python-reimplemented")
         
         self._load_resources()
-        
+        self.precompile()
+
+    def _resource_bundle(self) -> ResourceBundle:
+        if self._bundle is None:
+            self._bundle = get_resource_bundle(self.config)
+        return self._bundle
+
+    def precompile(self):
+        """
+        Build every dictionary replacer now (served from the resource bundle when
+        the mappings are unchanged) and persist any new ones, so the first
+        process() call does not pay for compilation. The bundle file is only
+        written when something actually had to be built.
+        """
+        bundle = self._resource_bundle()
+        misses = bundle.misses
+        for style in ('semi', 'written'):
+            self._cantonese_replacer(style)
+        for style in ('spoken', 'written'):
+            self._homophone_replacer(style)
+        for mode in ('mask', 'mild'):
+            self._profanity_replacer(mode)
+        if bundle.misses > misses:
+            bundle.save()
+
     def _load_resources(self):
-        """Load mapping resources - uses get_resource_path for PyInstaller compatibility"""
+        """
+        Load mapping resources - uses get_resource_path for PyInstaller compatibility.
+
+        Parsed mappings come from the resource bundle while the JSON files are unchanged.
+        """
         from core.path_setup import get_resource_path
+
+        bundle = self._resource_bundle()
         
         try:
             # Use get_resource_path for PyInstaller compatibility
@@ -58,24 +153,21 @@ class StyleProcessor:
             # Load Cantonese mapping
             canto_path = get_resource_path('resources/cantonese_mapping.json')
             if Path(canto_path).exists():
-                with open(canto_path, 'r', encoding='utf-8') as f:
-                    self.cantonese_map = json.load(f)
+                self.cantonese_map = dict(bundle.json_file(canto_path))
             else:
                 logger.warning(f"Cantonese mapping not found at: {canto_path}")
             
             # Load Profanity mapping
             prof_path = get_resource_path('resources/profanity_mapping.json')
             if Path(prof_path).exists():
-                with open(prof_path, 'r', encoding='utf-8') as f:
-                    self.profanity_map = json.load(f)
+                self.profanity_map = dict(bundle.json_file(prof_path))
             else:
                 logger.warning(f"Profanity mapping not found at: {prof_path}")
 
             # Load English mapping
             eng_path = get_resource_path('resources/english_mapping.json')
             if Path(eng_path).exists():
-                with open(eng_path, 'r', encoding='utf-8') as f:
-                    self.english_map = json.load(f)
+                self.english_map = dict(bundle.json_file(eng_path))
             else:
                 self.english_map = {}
                 logger.warning(f"English mapping not found at: {eng_path}")
@@ -88,6 +180,15 @@ class StyleProcessor:
     def process(self, segments: List[Dict], options: Dict, progress_callback=None) -> List[Dict]:
         """
         Main processing method - applies all style transformations.
+
+        Each segment runs through the Cantonese stage and then
+        _downstream_stages() in order; the Simplified → Traditional stage
+        then converts all segments in one OpenCC call. Stage results are
+        memoized on (input text, the options that stage reads), so changing one
+        option only recomputes that stage and the stages whose input changed;
+        switching back is served from the cache. The AI conversion batch is
+        memoized on (style, all segment texts), so the LLM is not re-invoked
+        when only downstream options change.
         
         Args:
             segments: List of subtitle segments with 'start', 'end', 'text'
@@ -111,19 +212,22 @@ class StyleProcessor:
         use_ai = style in ('semi', 'written')
         
         ai_converted_texts = {}  # index -> converted text
-        if use_ai and style in ('semi', 'written'):
-            result = self._batch_ai_convert(segments, style, progress_callback)
+        if use_ai:
+            result = self._cached_batch_ai_convert(segments, style, progress_callback)
             if result is not None:
                 ai_converted_texts = result
             else:
                 logger.warning("_batch_ai_convert returned None, using dictionary fallback")
-        
+
+        stages = [(name, options.get(option, default), method)
+                  for name, option, default, method in self._downstream_stages()]
+
+        processed = []  # (segment index, segment, text before Simplified → Traditional)
         for i, seg in enumerate(segments):
             original_text = seg.get('text', '')
-            text = original_text
 
             # 1. Convert Cantonese style (use batch result if available)
-            if use_ai and style in ('semi', 'written'):
+            if use_ai:
                 # When using AI mode, skip segments not in ai_converted_texts
                 # (they were removed as duplicates or failed processing)
                 if i not in ai_converted_texts:
@@ -131,38 +235,20 @@ class StyleProcessor:
                     continue
                 text = ai_converted_texts[i]
                 # Homophone corrections already applied in _batch_ai_convert preprocessing
-            elif style != 'spoken':
-                text = self._convert_cantonese_dict(text, style)  # Dictionary fallback for semi/written
-                # Apply homophone corrections for dictionary-only mode
-                text = self._apply_homophone_corrections(text, style)
-            else:
-                # Spoken mode: apply homophone corrections
-                text = self._apply_homophone_corrections(text, style)
-            
-            # 2. Handle English
-            eng_mode = options.get('english', 'keep')
-            text = self._process_english(text, eng_mode)
-            
-            # 3. Format numbers
-            num_mode = options.get('numbers', 'arabic')
-            text = self._format_numbers(text, num_mode)
-            
-            # 4. Filter profanity
-            prof_mode = options.get('profanity', 'keep')
-            text = self._filter_profanity(text, prof_mode)
-            
-            # 5. Handle punctuation based on user option
-            punct_mode = options.get('punctuation', 'keep')
-            if punct_mode == 'remove':
-                text = self._remove_all_punctuation(text)
             else:
-                # 5b. Remove trailing punctuation only (default behavior)
-                text = self._remove_trailing_punctuation(text)
-            
-            # 6. Convert any simplified Chinese to Traditional (final step)
-            if self.s2t_converter:
-                text = self.s2t_converter.convert(text)
-            
+                text = self._run_stage('cantonese', original_text, style, self._convert_style_dict)
+
+            # 2-5. English, numbers, profanity, punctuation
+            for name, mode, method in stages:
+                text = self._run_stage(name, text, mode, method)
+            processed.append((i, seg, text))
+
+        # 6. Convert any simplified Chinese to Traditional (all segments in one OpenCC call)
+        final_texts = self._to_traditional_many([text for _, _, text in processed])
+
+        for (i, seg, _), text in zip(processed, final_texts):
+            original_text = seg.get('text', '')
+
             # Log changes for debugging
             if text != original_text:
                 changes_made += 1
@@ -185,7 +271,118 @@ class StyleProcessor:
         
         logger.info(f"Processing complete: {len(result_segments)} segments, {changes_made} changes made")
         return result_segments
+
+    # ==================== 分階段快取 ====================
+
+    def _downstream_stages(self):
+        """
+        (stage name, option key, default, method(text, mode)) after the Cantonese stage, in order.
+
+        The final Simplified → Traditional stage runs on all segments at once (_to_traditional_many).
+        """
+        return (
+            ('english', 'english', 'keep', self._process_english),                 # 2. Handle English
+            ('numbers', 'numbers', 'arabic', self._format_numbers),                # 3. Format numbers
+            ('profanity', 'profanity', 'keep', self._filter_profanity),            # 4. Filter profanity
+            ('punctuation', 'punctuation', 'keep', self._apply_punctuation_mode),  # 5. Punctuation option
+        )
+
+    def _run_stage(self, name: str, text: str, mode, method: Callable[[str, object], str]) -> str:
+        """Run one stage on one segment, memoized on (text, mode)."""
+        cache = self._stage_cache.setdefault(name, {})
+        key = (text, mode)
+        result = cache.get(key)
+        if result is None:
+            if len(cache) >= STAGE_CACHE_MAX_ENTRIES:
+                cache.clear()
+            result = cache[key] = method(text, mode)
+        return result
+
+    def _cached_batch_ai_convert(self, segments: List[Dict], style: str, progress_callback=None) -> Optional[Dict[int, str]]:
+        """_batch_ai_convert memoized on (style, segment texts); failures are not cached."""
+        key = (style, tuple(seg.get('text', '') for seg in segments))
+        result = self._ai_batch_cache.get(key)
+        if result is not None:
+            logger.info(f"♻️ Reusing AI conversion for {len(segments)} segments ({style})")
+            return dict(result)
+        result = self._batch_ai_convert(segments, style, progress_callback)
+        if result is not None:
+            if len(self._ai_batch_cache) >= AI_BATCH_CACHE_MAX_ENTRIES:
+                self._ai_batch_cache.pop(next(iter(self._ai_batch_cache)))
+            self._ai_batch_cache[key] = dict(result)
+        return result
+
+    def clear_stage_cache(self):
+        """Forget memoized stage results (e.g. after the mapping resources change)."""
+        self._stage_cache.clear()
+        self._ai_batch_cache.clear()
+
+    def _convert_style_dict(self, text: str, style: str) -> str:
+        """Stage 1 without AI: dictionary conversion for semi/written, then homophone corrections."""
+        if style != 'spoken':
+            text = self._convert_cantonese_dict(text, style)  # Dictionary fallback for semi/written
+        return self._apply_homophone_corrections(text, style)
+
+    def _apply_punctuation_mode(self, text: str, mode: str) -> str:
+        """Stage 5: remove all punctuation, or only trailing punctuation (default)."""
+        if mode == 'remove':
+            return self._remove_all_punctuation(text)
+        return self._remove_trailing_punctuation(text)
+
+    def _to_traditional(self, text: str, _mode=None) -> str:
+        """Stage 6: convert any simplified Chinese to Traditional (final step)."""
+        if self.s2t_converter:
+            return self.s2t_converter.convert(text)
+        return text
+
+    def _to_traditional_many(self, texts: List[str]) -> List[str]:
+        """Stage 6 for many segments, memoized like _run_stage; cache misses share one OpenCC call."""
+        cache = self._stage_cache.setdefault('traditional', {})
+        misses = [text for text in dict.fromkeys(texts) if (text, None) not in cache]
+        if misses:
+            if len(cache) + len(misses) > STAGE_CACHE_MAX_ENTRIES:
+                cache.clear()
+                misses = list(dict.fromkeys(texts))
+            converted = convert_bulk(self.s2t_converter, misses) if self.s2t_converter else misses
+            cache.update(((text, None), result) for text, result in zip(misses, converted))
+        return [cache[(text, None)] for text in texts]
     
+    def _replacer(self, name: str, source, pairs: Callable[[], Pairs], mode: str = LONGEST) -> TextReplacer:
+        """
+        Compiled replacer for a mapping, fetched on first use.
+
+        Refetched only when the mapping object itself is replaced (e.g. resources reloaded);
+        the resource bundle only recompiles it when the rules actually changed.
+        """
+        cached = self._replacers.get(name)
+        if cached is None or cached[0] is not source:
+            cached = (source, self._resource_bundle().replacer(name, pairs(), mode))
+            self._replacers[name] = cached
+        return cached[1]
+
+    def _cantonese_replacer(self, style: str) -> TextReplacer:
+        """cantonese_map compiled for 'semi' or 'written' (longest words first, chained)."""
+        def pairs():
+            # 半書面語：只保留最核心嘅粵語字
+            # 轉換：係、喺、佢、咗、嚟 等
+            # 保留：嘅、唔、冇（呢啲係粵語嘅靈魂，包含呢啲字嘅詞組都要保留）
+            # 保留但唔做字符匹配：啲、咁、睇、靚（單字保留，但詞組可轉換）
+            keep_chars_semi = set('嘅唔冇')  # 字符級保留
+            keep_words_semi = ['啲', '咁', '睇', '靚']  # 單字保留
+
+            # Sort by length (longest first) to avoid partial replacements.
+            # 簡體 → 繁體 → 書面語靠次序連鎖替換，所以用 CHAINED 模式
+            rules = []
+            for canto_word in sorted(self.cantonese_map.keys(), key=len, reverse=True):
+                if style == 'semi' and not keep_chars_semi.isdisjoint(canto_word):
+                    continue
+                if style == 'semi' and canto_word in keep_words_semi:
+                    continue
+                rules.append((canto_word, self.cantonese_map[canto_word]))
+            return rules
+
+        return self._replacer(f'cantonese_{style}', self.cantonese_map, pairs, mode=CHAINED)
+
     def _remove_trailing_punctuation(self, text: str) -> str:
         """
         Remove trailing punctuation from subtitle text.
@@ -200,9 +397,7 @@ class StyleProcessor:
             return text
         
         # 首先清理所有類型嘅括號（Whisper 經常產生）
-        brackets_to_remove = '()（）﹙﹚[]【】「」'
-        for bracket in brackets_to_remove:
-            text = text.replace(bracket, '')
+        text = BRACKETS_RE.sub('', text)
         
         # Define punctuation to remove (Chinese and English)
         trailing_punct = '。，！？；：、.!?,;:'
@@ -228,81 +423,26 @@ class StyleProcessor:
         if not text:
             return text
         
-        # Universal homophone fixes (apply in ALL modes)
-        universal_fixes = {
-            # Common transcription errors
-            "原費": "月費",
-            "財源名單": "裁員名單",
-            "財源": "裁員",
-            "博殺": "搏殺",
-            "禁入去": "撳入去",
-            "友誼": "猶豫",
-            "告名": "報名",
-            "講濃": "講NO",
-            "濃嘅底氣": "NO嘅底氣",
-            "濃厚的底氣": "NO的底氣",  # 書面語版本
-            "濃的底氣": "NO的底氣",
-            "半份量": "半份糧",
-            "第二份量": "第二份糧",
-            "份量": "份糧",  # 通用修正
-            "a啲ul": "Aesop",
-            "pow啲er": "powder",
-            "olivian": "Olive Young",
-            "iPa啲": "iPad",
-            "不知道道": "不知道",
-            "知道道": "知道",
-            "無人": "無印",  # Context: 無印良品
-            "不看不看": "唔推唔推",
-            "关闭电话": "解僱",  # call off
-            "call off": "取消",  # 英文直譯錯誤
-            "俾人call off": "被取消",
-            "我才是": "我是",  # "我才是Linxia" 應該是 "我是Linxia"
-            "即刻告名": "即刻報名",
-            "立刻禁入": "立刻撳入",
-            "撳入去": "點入去",  # 正確粵語用法
-
-            # 從長影片分析發現的錯誤
-            "處於一種": "陷入一個",  # 「處於一種兩難」→「陷入一個兩難」
-            "那塊面": "嗰塊面",  # 書面語錯誤
-            "那盞燈": "嗰盞燈",
-            "那個": "嗰個",  # 除非已經是書面語模式
-            "這樣做": "咁樣做",
-            "這樣的": "咁樣嘅",
-            "衝動消費": "衝動消費",  # 保持正確
-            "淡剔": "清淡",  # 粵語→書面語
-
-            # Simplified to Traditional Chinese fixes
-            "灵": "靈",
-            "迈克尔": "Michael",
-            "一个": "一個",
-            "这个": "這個",
-            "觉得": "覺得",
-        }
-        
-        # Spoken-mode-only fixes (書面語→粵語口語)
-        # These should NOT apply in written mode
-        spoken_only_fixes = {
-            "哪一個": "邊一個",  # Whisper outputs 書面語, fix to 口語
-        }
-        
         original = text
         
-        # Apply universal fixes
-        for wrong, correct in universal_fixes.items():
-            if wrong in text:
-                text = text.replace(wrong, correct)
-        
-        # Apply spoken-only fixes ONLY in spoken mode
-        if style == 'spoken':
-            for wrong, correct in spoken_only_fixes.items():
-                if wrong in text:
-                    text = text.replace(wrong, correct)
+        # Apply universal fixes, then spoken-only fixes ONLY in spoken mode
+        # (one compiled pass; later fixes still see earlier replacements)
+        text = self._homophone_replacer(style).replace(text)
         
         if text != original:
             logger.debug(f"[Homophone] Fixed: '{original[:30]}...' -> '{text[:30]}...'")
         
         return text
 
+    def _homophone_replacer(self, style: str) -> TextReplacer:
+        """Homophone fixes compiled for one style (spoken adds the spoken-only fixes)."""
+        if style == 'spoken':
+            return self._replacer('homophone_spoken', self.UNIVERSAL_HOMOPHONE_FIXES, lambda: (
+                list(self.UNIVERSAL_HOMOPHONE_FIXES.items()) + list(self.SPOKEN_ONLY_HOMOPHONE_FIXES.items())
+            ), mode=CHAINED)
+        return self._replacer('homophone', self.UNIVERSAL_HOMOPHONE_FIXES,
+                              lambda: list(self.UNIVERSAL_HOMOPHONE_FIXES.items()), mode=CHAINED)
+
     def _remove_all_punctuation(self, text: str) -> str:
         """
         Remove all punctuation marks from subtitle text.
@@ -319,16 +459,52 @@ class StyleProcessor:
         original_text = text
         
         # All punctuation to remove (Chinese and English)
-        all_punct = '，。！？、；：,.!?;:；—…「」『』【】《》〈〉()（）﹙﹚[]'
-        
-        for p in all_punct:
-            text = text.replace(p, '')
+        text = ALL_PUNCTUATION_RE.sub('', text)
         
         if text != original_text:
             logger.info(f"[PUNCT] Removed punctuation: '{original_text[:30]}...' -> '{text[:30]}...'")
         
         return text
 
+    # ==================== 共用模型（model registry） ====================
+
+    @staticmethod
+    def _transformers_llm_key(profile):
+        return ("llm", "transformers", profile.llm_a_model, profile.llm_a_quantization, profile.device)
+
+    def _transformers_llm_resident(self, profile) -> bool:
+        from utils.model_registry import get_model_registry
+        return get_model_registry(self.config).is_resident(self._transformers_llm_key(profile))
+
+    def _shared_transformers_llm(self, profile):
+        """Transformers Qwen from the model registry (loaded once per process)"""
+        from utils.model_registry import POOL_RAM, POOL_VRAM, estimate_llm_gb, get_model_registry
+
+        def load():
+            from models.qwen_llm import QwenLLM
+            llm = QwenLLM(self.config, profile)
+            llm.load_models()
+            return llm
+
+        return get_model_registry(self.config).get(
+            self._transformers_llm_key(profile), load,
+            size_gb=estimate_llm_gb(profile.llm_a_model),
+            pool=POOL_RAM if profile.device == "cpu" else POOL_VRAM
+        )
+
+    def _shared_translation_model(self):
+        """MarianMT from the model registry (loaded once per process)"""
+        from utils.model_registry import MARIAN_SIZE_GB, POOL_RAM, get_model_registry
+
+        def load():
+            logger.info("Initializing MarianMT Translation Model...")
+            from models.translation_model import TranslationModel
+            return TranslationModel(self.config)
+
+        return get_model_registry(self.config).get(
+            ("translation", "marian"), load, size_gb=MARIAN_SIZE_GB, pool=POOL_RAM
+        )
+
     def _batch_ai_convert(self, segments: List[Dict], style: str, progress_callback=None) -> Dict[int, str]:
         """
         Batch convert segments using AI.
@@ -356,38 +532,32 @@ class StyleProcessor:
         # 使用預處理後的 segments
         segments = preprocessed_segments
         
+        # 註冊表喺 VRAM 預算不足時可能已釋放之前用嘅模型，重新攞過
+        if self.llm_processor is not None and getattr(self.llm_processor, 'is_loaded', True) is False:
+            self.llm_processor = None
+
         # Initialize LLM if needed - auto-detect best backend
+        # (models are shared through the model registry; memory is freed by its LRU eviction)
         if self.llm_processor is None:
             try:
-                import gc
-                import torch
-                
-                # Clear GPU memory before loading model
-                logger.info("Clearing GPU memory before loading Qwen model...")
-                gc.collect()
-                if torch.backends.mps.is_available():
-                    torch.mps.empty_cache()
-                    logger.info("MPS memory cleared")
-                elif torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-                    logger.info("CUDA memory cleared")
-                
                 # Auto-detect hardware and get best backend
-                from utils.qwen_mlx import get_qwen_for_hardware, MLXQwenLLM
+                from utils.qwen_mlx import get_qwen_for_hardware, get_shared_mlx_qwen
+                from utils.model_registry import get_model_registry
                 
                 hw_config = get_qwen_for_hardware()
                 logger.info(f"🔍 Hardware detection: {hw_config['description']}")
                 
                 if hw_config['backend'] == 'mlx':
                     # Use MLX Qwen (Apple Silicon optimized)
-                    from utils.qwen_mlx import MLXQwenLLM
                     from huggingface_hub import try_to_load_from_cache
                     
                     model_id = hw_config['model_id']
                     
-                    # Check if model is cached
-                    cache_result = try_to_load_from_cache(model_id, "config.json")
-                    model_cached = cache_result is not None
+                    # Check if model is cached (skip when it's already loaded, e.g. by the pipeline)
+                    model_cached = get_model_registry(self.config).is_resident(("llm", "mlx", model_id))
+                    if not model_cached:
+                        cache_result = try_to_load_from_cache(model_id, "config.json")
+                        model_cached = cache_result is not None
                     
                     if not model_cached:
                         # 模型未缓存 - 应该已在主线程预先下载（main_window._ensure_llm_model_ready）
@@ -396,10 +566,9 @@ class StyleProcessor:
                         logger.warning("Falling back to dictionary mode (UI dialogs cannot be shown from worker thread)")
                         return result
 
-                    # 模型已缓存，直接加载
+                    # 模型已缓存，直接加载（已加載就直接共用）
                     try:
-                        self.llm_processor = MLXQwenLLM(model_id=model_id)
-                        self.llm_processor.load_model()
+                        self.llm_processor = get_shared_mlx_qwen(model_id, self.config)
                         self._using_mlx = True
                         logger.info(f"⚡ {hw_config['description']} loaded")
                     except Exception as load_error:
@@ -410,25 +579,23 @@ class StyleProcessor:
                 else:
                     # Use Transformers Qwen (MPS/CUDA/CPU)
                     self._using_mlx = False
-                    from ui.download_dialog import check_and_download_model
-                    from core.hardware_detector import HardwareDetector
-                    from models.qwen_llm import QwenLLM
+                    from core.hardware_detector import get_hardware_detector
                     
-                    detector = HardwareDetector()
-                    profile = detector.detect()
-                    
-                    model_ready = check_and_download_model(
-                        profile.llm_a_model,
-                        profile.llm_a_quantization,
-                        parent=None
-                    )
+                    profile = get_hardware_detector().detect()
                     
-                    if not model_ready:
-                        logger.warning("Model not ready, using dictionary")
-                        return result
+                    if not self._transformers_llm_resident(profile):
+                        from ui.download_dialog import check_and_download_model
+                        model_ready = check_and_download_model(
+                            profile.llm_a_model,
+                            profile.llm_a_quantization,
+                            parent=None
+                        )
+                        
+                        if not model_ready:
+                            logger.warning("Model not ready, using dictionary")
+                            return result
                     
-                    self.llm_processor = QwenLLM(self.config, profile)
-                    self.llm_processor.load_models()
+                    self.llm_processor = self._shared_transformers_llm(profile)
                     logger.info(f"✅ {hw_config['description']} loaded")
                     
             except Exception as e:
@@ -590,6 +757,7 @@ class StyleProcessor:
                 logger.info("=== END RAW RESPONSE ===")
                 
                 # Parse numbered response
+                parsed = []  # (segment number, cleaned text) before Simplified → Traditional
                 for line in response.strip().split('\n'):
                     line = line.strip()
                     if line and line[0].isdigit():
@@ -612,8 +780,7 @@ class StyleProcessor:
                                     text = text.split('->')[-1].strip()
                                 
                                 # 2. 移除所有類型括號
-                                for bracket in '()（）﹙﹚[]【】「」':
-                                    text = text.replace(bracket, '')
+                                text = BRACKETS_RE.sub('', text)
                                 
                                 # 3. 清除異常尾部字符（不包括「是」因為是有效書面語）
                                 while text and text[-1] in ')）」】呢啦':
@@ -621,16 +788,19 @@ class StyleProcessor:
                                 
                                 # 4. 去除多餘空白
                                 text = ' '.join(text.split())
-                                
-                                # ⚠️ 【關鍵】強制轉換為繁體中文（絕對禁忌簡體字）
-                                if self.s2t_converter:
-                                    text = self.s2t_converter.convert(text)
-                                    logger.debug(f"[S2T] Converted AI output to Traditional: '{text[:30]}'")
-                                
-                                if 0 <= num < len(batch_texts) and text:
-                                    result[batch_start + num] = text
+                                parsed.append((num, text))
                             except ValueError:
                                 pass
+
+                # ⚠️ 【關鍵】強制轉換為繁體中文（絕對禁忌簡體字）- 成個 batch 一次 OpenCC 調用
+                if self.s2t_converter and parsed:
+                    converted = convert_bulk(self.s2t_converter, [text for _, text in parsed])
+                    parsed = [(num, text) for (num, _), text in zip(parsed, converted)]
+                    logger.debug(f"[S2T] Converted {len(parsed)} AI output lines to Traditional")
+
+                for num, text in parsed:
+                    if 0 <= num < len(batch_texts) and text:
+                        result[batch_start + num] = text
                 
                 # Log how many were successfully parsed
                 parsed_count = sum(1 for i in range(batch_start, batch_end) if i in result)
@@ -1007,9 +1177,9 @@ class StyleProcessor:
 
         if self.s2t_converter:
             simplified_detected_count = 0
-            for idx, text in result.items():
-                # 使用 OpenCC 強制轉換
-                text_traditional = self.s2t_converter.convert(text)
+            # 使用 OpenCC 強制轉換（所有段落一次調用）
+            traditional_texts = convert_bulk(self.s2t_converter, list(result.values()))
+            for (idx, text), text_traditional in zip(list(result.items()), traditional_texts):
                 if text != text_traditional:
                     simplified_detected_count += 1
                     logger.warning(f"❌ Simplified Chinese detected in segment {idx}: '{text[:50]}'")
@@ -1046,27 +1216,8 @@ class StyleProcessor:
         if style == 'spoken':
             return text
         
-        # 半書面語：只保留最核心嘅粵語字
-        # 轉換：係、喺、佢、咗、嚟 等
-        # 保留：嘅、唔、冇（呢啲係粵語嘅靈魂，包含呢啲字嘅詞組都要保留）
-        # 保留但唔做字符匹配：啲、咁、睇、靚（單字保留，但詞組可轉換）
-        keep_chars_semi = set('嘅唔冇')  # 字符級保留
-        keep_words_semi = ['啲', '咁', '睇', '靚']  # 單字保留
-        
-        result = text
-        sorted_keys = sorted(self.cantonese_map.keys(), key=len, reverse=True)
-        
-        for canto_word, written_word in [(k, self.cantonese_map[k]) for k in sorted_keys]:
-            # 如果詞組包含核心字符（嘅、唔、冇），跳過轉換
-            if style == 'semi' and any(c in keep_chars_semi for c in canto_word):
-                continue
-            # 如果係單字保留詞，跳過轉換
-            if style == 'semi' and canto_word in keep_words_semi:
-                continue
-            if canto_word in result:
-                result = result.replace(canto_word, written_word)
-        
-        return result
+        # 半書面語保留核心粵語字（見 _cantonese_replacer）
+        return self._cantonese_replacer(style).replace(text)
 
     def _convert_cantonese(self, text: str, style: str, use_ai: bool = False) -> str:
         """
@@ -1087,32 +1238,32 @@ class StyleProcessor:
         # AI conversion with Qwen2.5-3B (better quality than 1.5B)
         if use_ai and style in ('semi', 'written'):
             try:
+                if self.llm_processor is not None and getattr(self.llm_processor, 'is_loaded', True) is False:
+                    self.llm_processor = None  # evicted by the model registry
                 if self.llm_processor is None:
                     # Check if model needs to be downloaded first
                     try:
-                        from ui.download_dialog import check_and_download_model
-                        from core.hardware_detector import HardwareDetector
+                        from core.hardware_detector import get_hardware_detector
                         
-                        detector = HardwareDetector()
-                        profile = detector.detect()
+                        profile = get_hardware_detector().detect()
                         
-                        # Show download dialog if model not cached
-                        model_ready = check_and_download_model(
-                            profile.llm_a_model,
-                            profile.llm_a_quantization,
-                            parent=None
-                        )
+                        # Show download dialog if model not cached (and not already loaded)
+                        model_ready = self._transformers_llm_resident(profile)
+                        if not model_ready:
+                            from ui.download_dialog import check_and_download_model
+                            model_ready = check_and_download_model(
+                                profile.llm_a_model,
+                                profile.llm_a_quantization,
+                                parent=None
+                            )
                         
                         if not model_ready:
                             logger.warning("Model download cancelled or failed, using dictionary")
                             # Fall through to dictionary conversion
                         else:
-                            # Load the model
-                            logger.info("Initializing Qwen2.5-3B for AI style conversion...")
-                            from models.qwen_llm import QwenLLM
-                            self.llm_processor = QwenLLM(self.config, profile)
-                            self.llm_processor.load_models()
-                            logger.info("Qwen2.5-3B loaded successfully")
+                            # Load the model (shared through the model registry)
+                            self.llm_processor = self._shared_transformers_llm(profile)
+                            logger.info("Qwen2.5-3B ready for AI style conversion")
                     except Exception as load_error:
                         logger.warning(f"Failed to load model for AI conversion: {load_error}")
                         # Fall through to dictionary conversion
@@ -1150,32 +1301,12 @@ class StyleProcessor:
                 logger.warning(f"AI conversion failed, falling back to dictionary: {e}")
         
         # Dictionary-based conversion (fallback or default)
-        # 半書面語：只保留最核心嘅粵語字
-        # 轉換：係、喺、佢、咗、嚟 等
-        # 保留：嘅、唔、冇（呢啲係粵語嘅靈魂，包含呢啲字嘅詞組都要保留）
-        # 保留但唔做字符匹配：啲、咁、睇、靚（單字保留，但詞組可轉換）
-        keep_chars_semi = set('嘅唔冇')  # 字符級保留
-        keep_words_semi = ['啲', '咁', '睇', '靚']  # 單字保留
+        # 半書面語保留核心粵語字（見 _cantonese_replacer）
+        fired = []
+        result = self._cantonese_replacer(style).replace(text, fired)
         
-        result = text
-        conversions = []
-        
-        # Sort by length (longest first) to avoid partial replacements
-        sorted_keys = sorted(self.cantonese_map.keys(), key=len, reverse=True)
-        
-        for canto_word, written_word in [(k, self.cantonese_map[k]) for k in sorted_keys]:
-            # 如果詞組包含核心字符（嘅、唔、冇），跳過轉換
-            if style == 'semi' and any(c in keep_chars_semi for c in canto_word):
-                continue
-            # 如果係單字保留詞，跳過轉換
-            if style == 'semi' and canto_word in keep_words_semi:
-                continue  # Skip conversion for semi-written style
-            
-            if canto_word in result:
-                result = result.replace(canto_word, written_word)
-                conversions.append(f"{canto_word}→{written_word}")
-        
-        if conversions:
+        if fired:
+            conversions = [f"{canto_word}→{written_word}" for canto_word, written_word in fired]
             logger.debug(f"[Cantonese] Conversions: {', '.join(conversions[:5])}")
         
         return result
@@ -1185,19 +1316,17 @@ class StyleProcessor:
         if mode == 'keep':
             return text
         
-        result = text    
-        # Sort by length to match phrases first
-        sorted_keys = sorted(self.profanity_map.keys(), key=len, reverse=True)
-        
-        for prof_word in sorted_keys:
-            if prof_word in result:
-                if mode == 'mask':
-                    result = result.replace(prof_word, '★' * len(prof_word))
-                elif mode == 'mild':
-                    mild_replacement = self.profanity_map[prof_word]
-                    result = result.replace(prof_word, mild_replacement)
-        
-        return result
+        if mode not in ('mask', 'mild'):
+            return text
+        return self._profanity_replacer(mode).replace(text)
+
+    def _profanity_replacer(self, mode: str) -> TextReplacer:
+        """profanity_map compiled for 'mask' or 'mild' (leftmost-longest, so phrases win over the words inside them)."""
+        if mode == 'mask':
+            return self._replacer('profanity_mask', self.profanity_map, lambda: [
+                (prof_word, '★' * len(prof_word)) for prof_word in self.profanity_map
+            ])
+        return self._replacer('profanity_mild', self.profanity_map, lambda: list(self.profanity_map.items()))
 
     def _format_numbers(self, text: str, mode: str) -> str:
         """Format numbers to Arabic or Chinese."""
@@ -1433,10 +1562,7 @@ class StyleProcessor:
         
         # === LAYER 3: MarianMT (fallback) ===
         try:
-            if not self.translation_model:
-                logger.info("Initializing MarianMT Translation Model...")
-                from models.translation_model import TranslationModel
-                self.translation_model = TranslationModel(self.config)
+            self.translation_model = self._shared_translation_model()
 
             result = self.translation_model.translate(text)
 
@@ -24,7 +24,7 @@ from ui.video_player import VideoPlayer, create_video_player
 from ui.timeline_editor import TimelineEditor
 from ui.style_panel import StyleControlPanel
 from subtitle.subtitle_exporter import SubtitleExporter
-from subtitle.style_processor import StyleProcessor
+from subtitle.style_processor import ALL_PUNCTUATION_RE, StyleProcessor
 
 
 class MainWindow(QMainWindow):
@@ -76,6 +76,19 @@ class MainWindow(QMainWindow):
         if self.config.get("auto_check_update", True):
             from PySide6.QtCore import QTimer
             QTimer.singleShot(3000, self._auto_check_update_on_startup)
+
+        # 啟動後背景預熱 ASR / VAD（第一次轉錄唔使再等模型加載）
+        if self.config.get("enable_model_warmup", True):
+            from PySide6.QtCore import QTimer
+            QTimer.singleShot(1500, self._start_model_warmup)
+
+    def _start_model_warmup(self):
+        """背景加載常用模型到共用模型註冊表"""
+        try:
+            from pipeline.subtitle_pipeline_v2 import start_model_warmup
+            start_model_warmup(self.config)
+        except Exception as e:
+            self.logger.warning(f"Model warmup skipped: {e}")
     
     def _toggle_maximize(self):
         """Toggle between maximize and normal window state."""
@@ -791,6 +804,28 @@ class MainWindow(QMainWindow):
         # self.debug_btn.clicked.connect(self._show_debug_menu)
         # utils_layout.addWidget(self.debug_btn)
         
+        # Cascade refinement indicator - shown while the large model refines the draft
+        self.refine_indicator = QToolButton()
+        self.refine_indicator.setText("✨ 精修中")
+        self.refine_indicator.setToolTip("大模型背景精修中，可以照常編輯字幕（按一下取消精修）")
+        self.refine_indicator.setCursor(Qt.PointingHandCursor)
+        self.refine_indicator.setStyleSheet("""
+            QToolButton {
+                background: rgba(6,182,212,0.15);
+                color: #22d3ee;
+                border: none;
+                padding: 4px 8px;
+                border-radius: 4px;
+                font-size: 12px;
+            }
+            QToolButton:hover {
+                background: rgba(6,182,212,0.3);
+            }
+        """)
+        self.refine_indicator.clicked.connect(self._on_transcription_canceled)
+        self.refine_indicator.hide()
+        utils_layout.addWidget(self.refine_indicator)
+        
         # Export button (moved here after swapping with purchase button)
         utils_layout.addWidget(self.export_btn)
         
@@ -851,6 +886,7 @@ class MainWindow(QMainWindow):
         self.timeline.seek_requested.connect(self.video_player.seek)
         # Connect subtitle edit signal
         self.timeline.segment_edited.connect(self._on_subtitle_edited)
+        self.timeline.subtitle_track.selection_changed.connect(self._on_subtitle_selection_changed)
         
         layout.addWidget(self.video_player, stretch=3)
         layout.addWidget(self.timeline, stretch=2)
@@ -861,6 +897,15 @@ class MainWindow(QMainWindow):
         """Sync timeline with player - update all three tracks"""
         # Use the centralized method that handles auto-scrolling
         self.timeline.set_playhead_position(time_pos)
+        # 串聯模式：優先精修播放頭附近
+        if getattr(self, 'worker', None):
+            self.worker.set_focus(time_pos)
+
+    def _on_subtitle_selection_changed(self, index: int):
+        """串聯模式：優先精修選中嘅字幕"""
+        segments = self.timeline.subtitle_track.segments or []
+        if getattr(self, 'worker', None) and 0 <= index < len(segments):
+            self.worker.set_focus(segments[index]['start'])
         
     def _on_player_duration_changed(self, duration: float):
         """Update timeline duration for all tracks"""
@@ -1106,7 +1151,8 @@ class MainWindow(QMainWindow):
         self.timeline.subtitle_track.update()
         self.logger.info("[OK] Cleared all segment data and cache")
         
-        # Clear pipeline audio cache to avoid using stale audio
+        # Clear pipeline temp files (extracted audio lives in the content-addressed
+        # audio cache, which is keyed by file content and cannot go stale)
         import tempfile
         import shutil
         cache_dir = Path(tempfile.gettempdir()) / "canto_beats_v2"
@@ -1279,8 +1325,12 @@ class MainWindow(QMainWindow):
             is_first_time=False  # Download already done
         )
         self.worker.progress.connect(self._on_transcription_progress)
+        self.worker.partial.connect(self._on_transcription_partial)
         self.worker.completed.connect(self._on_transcription_finished)
         self.worker.error.connect(self._on_transcription_error)
+        self._partial_received = False
+        self._refining = False
+        self._deleted_spans = []
         
         # Show pulse progress dialog (modern animation)
         from ui.pulse_progress_dialog import PulseProgressDialog
@@ -1321,7 +1371,8 @@ class MainWindow(QMainWindow):
         
         # Re-enable button
         self.transcribe_btn.setEnabled(True)
-        QApplication.restoreOverrideCursor()
+        if not self._end_background_refinement():
+            QApplication.restoreOverrideCursor()
         self.status_bar.showMessage("已取消轉寫", 3000)
 
         
@@ -1336,8 +1387,56 @@ class MainWindow(QMainWindow):
             except RuntimeError:
                 # Dialog already deleted, ignore
                 pass
+        elif getattr(self, '_refining', False) and value >= 0:
+            self.refine_indicator.setText(f"✨ 精修中 {value}%")
         self.status_bar.showMessage(msg)
         
+    def _on_transcription_partial(self, update: dict):
+        """Show subtitles progressively while the rest is still transcribing"""
+        try:
+            segments = update.get('segments', [])
+            if update.get('action') == 'replace' and self._refining:
+                # 精修期間成份字幕更新（校正 / LLM）：保留用戶改過嘅字幕
+                self.timeline.splice_segments(segments, float('-inf'), float('inf'), self._deleted_spans)
+            elif update.get('action') == 'replace':
+                self.timeline.set_segments(segments)
+                if update.get('stage') == 'draft':
+                    self._start_background_refinement()
+            elif update.get('action') == 'splice':
+                # 串聯模式：大模型精修完一個窗口，只取代該範圍嘅草稿
+                self.timeline.splice_segments(segments, *update['span'], self._deleted_spans)
+            else:
+                if not self._partial_received:
+                    # First chunk of a new job - drop the previous video's subtitles
+                    self.timeline.set_segments([])
+                self.timeline.append_segments(segments)
+            self._partial_received = True
+            
+            self.current_segments = list(self.timeline.subtitle_track.segments)
+            self._update_video_subtitles()
+            self.status_bar.showMessage(f"已生成 {len(self.current_segments)} 個字幕片段...")
+        except Exception as e:
+            self.logger.warning(f"Error displaying partial results: {e}")
+
+    def _start_background_refinement(self):
+        """Cascade draft is ready: release the editor and keep refining in the background"""
+        self._refining = True
+        if self.progress_dialog:
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        QApplication.restoreOverrideCursor()
+        self.refine_indicator.setText("✨ 精修中")
+        self.refine_indicator.show()
+        if hasattr(self, 'log_view'):
+            self.log_view.append("草稿完成，可以開始編輯；大模型背景精修中...")
+
+    def _end_background_refinement(self) -> bool:
+        """Leave refinement mode; returns True if the editor had already been released"""
+        was_refining = getattr(self, '_refining', False)
+        self._refining = False
+        self.refine_indicator.hide()
+        return was_refining
+        
     def _on_transcription_finished(self, result: dict):
         """Handle successful transcription"""
         try:
@@ -1346,7 +1445,9 @@ class MainWindow(QMainWindow):
                 self.progress_dialog.close()
                 self.progress_dialog = None
             
-            QApplication.restoreOverrideCursor()
+            was_refining = self._end_background_refinement()
+            if not was_refining:
+                QApplication.restoreOverrideCursor()
 
             
             # Cleanup worker
@@ -1380,6 +1481,17 @@ class MainWindow(QMainWindow):
                         'end': seg.end,
                         'text': getattr(seg, 'text', getattr(seg, 'colloquial', '')),
                     })
+
+            if was_refining:
+                # 串聯模式：用戶喺精修期間改過 / 刪咗嘅字幕唔俾最終結果覆蓋
+                from utils.cascade_refinement import USER_EDITED_KEY, is_user_edited, splice_by_span
+                segments_dicts = splice_by_span(
+                    list(self.timeline.subtitle_track.segments or []), segments_dicts,
+                    float('-inf'), float('inf'), keep=is_user_edited, deleted_spans=self._deleted_spans
+                )
+                for seg in segments_dicts:
+                    seg.pop(USER_EDITED_KEY, None)
+                self._deleted_spans = []
             
             # Store segments for export and processing
             self.original_segments = segments_dicts
@@ -1440,7 +1552,8 @@ class MainWindow(QMainWindow):
             self.progress_dialog.close()
             self.progress_dialog = None
         
-        QApplication.restoreOverrideCursor()
+        if not self._end_background_refinement():
+            QApplication.restoreOverrideCursor()
 
         
         # Cleanup worker
@@ -1552,10 +1665,17 @@ class MainWindow(QMainWindow):
 
     def _on_subtitle_edited(self, index: int, new_text: str):
         """Handle subtitle text edit/add/delete from timeline"""
+        refining = getattr(self, '_refining', False)
         
         # Handle deletion (index = -1)
         if index == -1:
             self.logger.info("Subtitle deleted from timeline")
+            if refining:
+                # 記低刪咗嘅範圍，精修結果唔再加返呢度
+                remaining = {id(seg) for seg in self.timeline.track.segments}
+                self._deleted_spans.extend(
+                    (seg['start'], seg['end']) for seg in self.current_segments or [] if id(seg) not in remaining
+                )
             # Sync current_segments with timeline
             self.current_segments = self.timeline.track.segments.copy()
             # self.log_view.append(f"🗑️ 已刪除字幕")
@@ -1568,6 +1688,10 @@ class MainWindow(QMainWindow):
         
         # Sync current_segments with timeline (handles both edit and add)
         self.current_segments = self.timeline.track.segments.copy()
+        if refining and 0 <= index < len(self.current_segments):
+            # 精修期間改過嘅字幕唔俾大模型結果覆蓋
+            from utils.cascade_refinement import USER_EDITED_KEY
+            self.current_segments[index][USER_EDITED_KEY] = True
         
         # Log the operation
         if index >= 0 and index < len(self.current_segments):
@@ -1722,12 +1846,7 @@ class MainWindow(QMainWindow):
             return text
         
         # All punctuation to remove (Chinese and English)
-        all_punct = '，。！？、；：,.!?;:；—…「」『』【】《》〈〉()（）﹙﹚[]'
-        
-        for p in all_punct:
-            text = text.replace(p, '')
-        
-        return text
+        return ALL_PUNCTUATION_RE.sub('', text)
         
     def _update_video_subtitles(self):
         """Generate temp SRT and update video player"""
@@ -855,6 +855,26 @@ class TimelineEditor(QWidget):
         """Set subtitle segments to display on timeline"""
         self.subtitle_track.set_segments(segments)
         
+    def append_segments(self, segments: List[Dict]):
+        """Insert segments (e.g. a freshly transcribed chunk) keeping start-time order
+
+        Every batch is numbered from 0, so ids are renumbered to row order afterwards.
+        """
+        from utils.cascade_refinement import insert_by_start, renumber
+        merged = insert_by_start(self.subtitle_track.segments or [], segments)
+        self.subtitle_track.set_segments(renumber(merged))
+
+    def splice_segments(self, segments: List[Dict], start: float, end: float, deleted_spans=()):
+        """Replace the segments inside [start, end) (e.g. a refined cascade window)
+
+        Segments the user edited during refinement are kept, and refined segments
+        landing in ``deleted_spans`` (subtitles the user deleted) are dropped.
+        """
+        from utils.cascade_refinement import is_user_edited, renumber, splice_by_span
+        merged = splice_by_span(list(self.subtitle_track.segments or []), segments, start, end,
+                                keep=is_user_edited, deleted_spans=deleted_spans)
+        self.subtitle_track.set_segments(renumber(merged))
+        
     def wheelEvent(self, event: QWheelEvent):
         # Zoom: Ctrl or Alt + Scroll
         modifiers = event.modifiers()
@@ -12,7 +12,7 @@ from typing import Optional, Callable
 from PySide6.QtCore import QObject, Signal, QTimer
 
 from core.config import Config
-from pipeline.subtitle_pipeline_v2 import SubtitlePipelineV2
+from pipeline.subtitle_pipeline_v2 import SubtitlePipelineV2, entries_to_segment_dicts
 from utils.logger import setup_logger
 
 logger = setup_logger()
@@ -25,6 +25,7 @@ class TranscribeWorkerV2(QObject):
     """
     
     progress = Signal(str, int)
+    partial = Signal(dict)  # {'action': 'append'|'replace'|'splice', 'stage': str, 'segments': [...], 'span': (start, end)}
     completed = Signal(dict)
     error = Signal(str)
     
@@ -97,36 +98,30 @@ class TranscribeWorkerV2(QObject):
                 # Emit status message while keeping current progress
                 self._emit_progress(msg, -1)  # -1 means keep current progress
             
+            # Progressive results: forward chunk batches / correction passes to the timeline
+            def on_partial(update):
+                if self._is_cancelled:
+                    return
+                segments, _ = entries_to_segment_dicts(update.entries)
+                self.partial.emit({
+                    'action': update.action,
+                    'stage': update.stage,
+                    'segments': segments,
+                    'span': update.span,
+                })
+            
             subtitles = self._pipeline.process(
                 str(input_path), 
                 progress_callback=on_progress,
-                status_callback=on_status
+                status_callback=on_status,
+                partial_callback=on_partial
             )
             
             if self._is_cancelled:
                 return
             
             # Convert to result format
-            segments = []
-            formal_segments = []
-            
-            for i, sub in enumerate(subtitles):
-                seg = {
-                    'id': i,
-                    'start': sub.start,
-                    'end': sub.end,
-                    'text': sub.colloquial,
-                }
-                segments.append(seg)
-                
-                if sub.formal:
-                    formal_seg = {
-                        'id': i,
-                        'start': sub.start,
-                        'end': sub.end,
-                        'text': sub.formal,
-                    }
-                    formal_segments.append(formal_seg)
+            segments, formal_segments = entries_to_segment_dicts(subtitles)
             
             # Build result
             full_text = "\n".join([s['text'] for s in segments])
@@ -168,6 +163,11 @@ class TranscribeWorkerV2(QObject):
             self._current_pct = pct
         self.progress.emit(msg, pct)
         
+    def set_focus(self, time_pos: float):
+        """Cascade mode: refine the subtitles around the playhead / selection first."""
+        if self._pipeline:
+            self._pipeline.set_refine_focus(time_pos)
+
     def cancel(self):
         """Cancel the operation."""
         self._is_cancelled = True
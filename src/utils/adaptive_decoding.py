@@ -0,0 +1,247 @@
+"""
+自適應解碼：先 greedy，再只對有問題嘅段落用 beam search
+
+全片用 beam_size=5 解碼好貴，但大部分段落 greedy（beam 1）已經夠準。流程：
+1. 第一遍 greedy 解碼全部音頻
+2. 按 avg_logprob / compression_ratio / no_speech_prob 標記有問題嘅段落
+3. 標記段落前後加少少上下文，重疊 / 相接嘅窗口合併，用 beam search + 溫度回退重新解碼
+4. 重新解碼嘅段落按時間取代原本被標記嘅段落
+
+閾值同 Whisper 自己嘅 fallback 判斷一致（logprob -1.0、壓縮率 2.4、no_speech 0.6），可喺配置調整。
+"""
+
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from utils.asr_utils import remap_segment, transcribe_array
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Whisper 標準溫度回退序列
+TEMPERATURE_FALLBACK = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+
+@dataclass
+class QualityThresholds:
+    """段落需要重新解碼嘅閾值"""
+    logprob: float = -1.0           # avg_logprob 低於此值
+    compression_ratio: float = 2.4  # 壓縮率高於此值（重複 / 幻覺）
+    no_speech: float = 0.6          # no_speech_prob 高於此值
+
+    @classmethod
+    def from_config(cls, config) -> "QualityThresholds":
+        if config is None:
+            return cls()
+        return cls(
+            logprob=config.get("adaptive_logprob_threshold", -1.0),
+            compression_ratio=config.get("adaptive_compression_ratio_threshold", 2.4),
+            no_speech=config.get("adaptive_no_speech_threshold", 0.6),
+        )
+
+
+def compression_ratio(text: str) -> float:
+    """同 Whisper 一樣嘅 gzip 壓縮率（重複文字壓縮率高）"""
+    data = text.encode('utf-8')
+    if not data:
+        return 0.0
+    return len(data) / len(zlib.compress(data))
+
+
+def segment_quality(segment) -> Dict[str, Optional[float]]:
+    """段落質量指標；backend 冇提供嘅指標返回 None（壓縮率由文字計）"""
+    def field(name):
+        value = segment.get(name) if isinstance(segment, dict) else getattr(segment, name, None)
+        return None if value is None else float(value)
+
+    ratio = field('compression_ratio')
+    if ratio is None:
+        text = segment.get('text', '') if isinstance(segment, dict) else getattr(segment, 'text', '')
+        ratio = compression_ratio(text or '')
+    return {
+        'avg_logprob': field('avg_logprob'),
+        'compression_ratio': ratio,
+        'no_speech_prob': field('no_speech_prob'),
+    }
+
+
+def flag_reason(segment, thresholds: QualityThresholds) -> Optional[str]:
+    """段落需要重新解碼嘅原因（"logprob" / "compression" / "no_speech"），唔需要返回 None"""
+    quality = segment_quality(segment)
+    if quality['avg_logprob'] is not None and quality['avg_logprob'] < thresholds.logprob:
+        return "logprob"
+    if quality['compression_ratio'] > thresholds.compression_ratio:
+        return "compression"
+    if quality['no_speech_prob'] is not None and quality['no_speech_prob'] > thresholds.no_speech:
+        return "no_speech"
+    return None
+
+
+def supports_beam_search(asr_model) -> bool:
+    """MLX Whisper 未支援 beam search（只可以用溫度回退）"""
+    return not type(asr_model).__name__.startswith("MLX")
+
+
+def greedy_kwargs(asr_model, kwargs: Dict) -> Dict:
+    """第一遍 greedy 解碼嘅參數"""
+    kwargs = dict(kwargs)
+    if supports_beam_search(asr_model):
+        kwargs['beam_size'] = 1
+    return kwargs
+
+
+def refine_kwargs(asr_model, kwargs: Dict, beam_size: int = 5) -> Dict:
+    """第二遍解碼參數：beam search（backend 支援嘅話）+ 溫度回退"""
+    kwargs = dict(kwargs)
+    if supports_beam_search(asr_model):
+        kwargs['beam_size'] = max(1, int(beam_size))
+    kwargs['temperature'] = TEMPERATURE_FALLBACK
+    return kwargs
+
+
+def coalesce_windows(
+    spans: List[Tuple[float, float]],
+    total_duration: float,
+    padding: float = 2.0,
+    max_region: float = 30.0
+) -> List[Tuple[float, float, List[int]]]:
+    """
+    段落前後各加 padding 秒，重疊或相接嘅窗口合併成區域
+
+    每個區域最長 max_region 秒（Whisper 一個窗口）。合併會超長嘅時候，新區域由段落自己嘅
+    窗口開始（可以同上一個區域重疊）：每個段落一定喺佢所屬區域入面有完整嘅前後 padding，
+    重新解碼先唔會切走段落開頭。
+
+    Args:
+        spans: [(start, end), ...]（按開始時間排序）
+        total_duration: 音頻總長度
+
+    Returns:
+        [(區域開始, 區域結束, [span index, ...]), ...]
+    """
+    regions: List[Tuple[float, float, List[int]]] = []
+    for index, (start, end) in enumerate(spans):
+        window_start = max(0.0, start - padding)
+        window_end = min(total_duration, end + padding)
+        if regions:
+            region_start, region_end, members = regions[-1]
+            merged_end = max(region_end, window_end)
+            if window_start <= region_end and merged_end - region_start <= max_region:
+                regions[-1] = (region_start, merged_end, members + [index])
+                continue
+        regions.append((window_start, window_end, [index]))
+    return regions
+
+
+def refine_segments(
+    asr_model,
+    audio,
+    sample_rate: int,
+    segments: List,
+    transcribe_kwargs: Dict,
+    thresholds: Optional[QualityThresholds] = None,
+    beam_size: int = 5,
+    fallback_dir: Optional[Union[str, Path]] = None,
+    checkpoint=None,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> Tuple[List, Dict]:
+    """
+    重新解碼 greedy 結果入面有問題嘅段落
+
+    Args:
+        asr_model: ASR backend
+        audio: 完整音頻波形（同 segments 同一時間軸）
+        sample_rate: ``audio`` 嘅採樣率
+        segments: 第一遍段落（絕對時間，按時間排序）
+        transcribe_kwargs: 第一遍用嘅參數（語言 / 提示等）
+        thresholds: 標記閾值
+        beam_size: 第二遍 beam 大小
+        fallback_dir: backend 唔支援陣列輸入時寫臨時 WAV 嘅目錄
+        checkpoint: TranscriptionCheckpoint（可選），每個區域完成即記錄
+        progress_callback: (已完成區域, 總區域) 回調
+
+    Returns:
+        (新段落列表, 統計)
+    """
+    from utils.transcription_checkpoint import chunk_key
+
+    thresholds = thresholds or QualityThresholds()
+    total_duration = len(audio) / sample_rate
+
+    reasons: Dict[str, int] = {}
+    flagged = []
+    for i, seg in enumerate(segments):
+        reason = flag_reason(seg, thresholds)
+        if reason:
+            reasons[reason] = reasons.get(reason, 0) + 1
+            flagged.append(i)
+
+    regions = coalesce_windows([(segments[i].start, segments[i].end) for i in flagged], total_duration)
+    stats = {
+        'segments': len(segments),
+        'flagged': len(flagged),
+        'reasons': reasons,
+        'regions': len(regions),
+        'audio_s': round(total_duration, 3),
+        'refined_s': round(sum(end - start for start, end, _ in regions), 3),
+        'refined_segments': 0,
+    }
+    stats['refined_fraction'] = round(stats['refined_s'] / total_duration, 4) if total_duration else 0.0
+    if not regions:
+        return list(segments), stats
+
+    logger.info(
+        f"🎯 自適應解碼：{len(flagged)}/{len(segments)} 個段落需要 beam search，"
+        f"合併成 {len(regions)} 個區域（{stats['refined_fraction']:.0%} 音頻）"
+    )
+
+    kwargs = refine_kwargs(asr_model, transcribe_kwargs, beam_size)
+    replacements: Dict[int, List] = {}
+    for r, (region_start, region_end, members) in enumerate(regions):
+        key = chunk_key("refine", region_start, region_end)
+        new_segments = checkpoint.get(key) if checkpoint is not None else None
+        if new_segments is None:
+            try:
+                result = transcribe_array(
+                    asr_model, audio[int(region_start * sample_rate):int(region_end * sample_rate)],
+                    sample_rate,
+                    fallback_path=Path(fallback_dir) / "refine_region.wav" if fallback_dir else None,
+                    **kwargs
+                )
+            except Exception as e:
+                logger.warning(f"自適應解碼區域 {region_start:.1f}-{region_end:.1f}s 失敗，保留 greedy 結果: {e}")
+                continue
+            new_segments = [
+                remap_segment(seg, lambda t, is_end, offset=region_start: offset + t)
+                for seg in result.get('segments', [])
+            ]
+            if checkpoint is not None:
+                checkpoint.put(key, new_segments)
+
+        # 新段落按中點歸屬被標記嘅段落；冇新段落對應嘅保留原本結果
+        used = set()
+        for member in members:
+            original = segments[flagged[member]]
+            matched = [
+                k for k, seg in enumerate(new_segments)
+                if k not in used and original.start <= (seg.start + seg.end) / 2 <= original.end
+            ]
+            if matched:
+                used.update(matched)
+                replacements[flagged[member]] = [new_segments[k] for k in matched]
+
+        if progress_callback:
+            progress_callback(r + 1, len(regions))
+
+    refined = []
+    for i, seg in enumerate(segments):
+        if i in replacements:
+            refined.extend(replacements[i])
+            stats['refined_segments'] += 1
+        else:
+            refined.append(seg)
+    refined.sort(key=lambda seg: seg.start)
+    return refined, stats
+
@@ -8,12 +8,19 @@ Advanced Transcription - 高級轉錄模組
 4. 錨點系統 - 高信心區域驗證低信心區域
 """
 
+import bisect
 import tempfile
 from pathlib import Path
 from typing import List, Optional, Callable, Dict, Tuple
 from dataclasses import dataclass, field
 import numpy as np
 
+from utils.adaptive_decoding import (
+    QualityThresholds, coalesce_windows, flag_reason, greedy_kwargs, refine_kwargs
+)
+from utils.asr_utils import remap_segment, transcribe_array
+from utils.transcription_checkpoint import chunk_key
+from utils.window_alignment import merge_window_results, plan_windows
 from utils.logger import setup_logger
 
 logger = setup_logger()
@@ -71,6 +78,9 @@ class AdvancedTranscriber:
         self.overlap_duration = 3.0     # 重疊區域長度（秒）
         self.anchor_confidence_threshold = 0.85  # 錨點信心閾值
 
+        # 最近一次三階段轉錄嘅解碼統計（重轉咗幾多音頻）
+        self.last_decode_stats: Dict = {}
+
     # ==================== VAD 預分割 ====================
 
     def vad_presplit(
@@ -105,14 +115,17 @@ class AdvancedTranscriber:
         if vad_processor is None:
             from models.vad_processor import VADProcessor
             from core.config import Config
-            vad_processor = VADProcessor(
-                Config() if self.config is None else self.config,
+            from utils.vad_cache import CachingVADProcessor
+            presplit_params = dict(
                 threshold=0.3,  # 較低閾值，減少漏檢
                 min_speech_duration_ms=100,
                 min_silence_duration_ms=300,
                 speech_pad_ms=200
             )
+            vad_processor = VADProcessor(Config() if self.config is None else self.config, **presplit_params)
             vad_processor.load_model()
+            # 同一段音頻再 presplit（並行模式、重新轉錄）唔使重新計 VAD
+            vad_processor = CachingVADProcessor(vad_processor, presplit_params)
 
         voice_segments = vad_processor.detect_voice_segments(audio_path)
         logger.info(f"VAD 檢測到 {len(voice_segments)} 個語音段落")
@@ -238,7 +251,9 @@ class AdvancedTranscriber:
         self,
         audio_path: str,
         asr_model,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        narrow_overlap: bool = False,
+        **transcribe_kwargs
     ) -> List[TranscriptionChunk]:
         """
         重疊窗口轉錄
@@ -248,15 +263,22 @@ class AdvancedTranscriber:
         2. 重疊區域（3 秒）進行共識投票
         3. 選擇信心分數更高的版本
 
+        narrow_overlap=True 時改用窄重疊（self.overlap_duration 秒）：
+        相鄰窗口按重疊區文字對齊合併，對唔齊先按信心揀，
+        ASR 總工作量由約 2 倍降到約 1.1 倍音頻長度。
+
         Args:
             audio_path: 音頻路徑
             asr_model: ASR 模型
             progress_callback: 進度回調
+            narrow_overlap: 使用窄重疊 + 文字對齊合併（pipeline 由 overlap_window_mode 決定）
+            **transcribe_kwargs: 傳畀 ASR 嘅參數（預設 language='yue'）
 
         Returns:
             轉錄結果列表
         """
         logger.info("🔄 執行重疊窗口轉錄...")
+        transcribe_kwargs.setdefault('language', 'yue')
 
         import soundfile as sf
         audio, sr = sf.read(audio_path)
@@ -266,14 +288,17 @@ class AdvancedTranscriber:
         window_size = 30.0  # 秒
         step_size = 15.0    # 步長（= 窗口 - 重疊）
 
-        windows = []
-        start = 0
-        while start < total_duration:
-            end = min(start + window_size, total_duration)
-            windows.append((start, end))
-            start += step_size
-            if end >= total_duration:
-                break
+        if narrow_overlap:
+            windows = plan_windows(total_duration, window_size, self.overlap_duration)
+        else:
+            windows = []
+            start = 0
+            while start < total_duration:
+                end = min(start + window_size, total_duration)
+                windows.append((start, end))
+                start += step_size
+                if end >= total_duration:
+                    break
 
         logger.info(f"生成 {len(windows)} 個重疊窗口")
 
@@ -288,37 +313,39 @@ class AdvancedTranscriber:
             end_sample = int(win_end * sr)
             chunk_audio = audio[start_sample:end_sample]
 
-            # 保存臨時文件
-            chunk_path = self.temp_dir / f"overlap_chunk_{i}.wav"
-            sf.write(str(chunk_path), chunk_audio, sr)
-
-            # 轉錄
+            # 轉錄（直接傳入音頻陣列，唔使寫臨時文件）
             try:
-                result = asr_model.transcribe(
-                    str(chunk_path),
-                    language='yue'
+                result = transcribe_array(
+                    asr_model, chunk_audio, sr,
+                    fallback_path=self.temp_dir / f"overlap_chunk_{i}.wav",
+                    **transcribe_kwargs
                 )
 
                 segments = result.get('segments', [])
                 for seg in segments:
-                    # 調整時間戳（相對於整個音頻）
+                    # 調整時間戳（相對於整個音頻，包括詞級時間戳）
+                    seg = remap_segment(seg, lambda t, is_end, offset=win_start: offset + t)
                     chunk = TranscriptionChunk(
-                        start=win_start + seg.start,
-                        end=win_start + seg.end,
+                        start=seg.start,
+                        end=seg.end,
                         text=seg.text,
                         confidence=getattr(seg, 'confidence', 0.8),
-                        words=getattr(seg, 'words', [])
+                        words=getattr(seg, 'words', None) or []
                     )
                     all_results.append((i, chunk))  # 保存窗口索引
 
             except Exception as e:
                 logger.warning(f"窗口 {i} 轉錄失敗: {e}")
 
-            # 清理臨時文件
-            chunk_path.unlink(missing_ok=True)
-
         # 合併重疊區域
-        final_results = self._merge_overlapping_results(all_results, windows)
+        if narrow_overlap:
+            per_window = [[] for _ in windows]
+            for i, chunk in all_results:
+                per_window[i].append(chunk)
+            final_results, stats = merge_window_results(per_window, windows)
+            logger.info(f"窄重疊合併：文字對齊 {stats['aligned']} 處，信心回退 {stats['confidence']} 處")
+        else:
+            final_results = self._merge_overlapping_results(all_results, windows)
 
         logger.info(f"✅ 重疊窗口轉錄完成：{len(final_results)} 個段落")
         return final_results
@@ -332,12 +359,19 @@ class AdvancedTranscriber:
         合併重疊區域的轉錄結果
 
         策略：對於重疊區域，比較兩個版本並選擇更好的
+
+        按開始時間排序後用區間索引搵重疊候選：任何同 chunk 有重疊嘅段落，
+        開始時間必定喺 (chunk.start - 最長段落時長, chunk.end) 之內，
+        所以只需要掃描呢個範圍（O(n log n)），結果同逐對比較完全一樣。
         """
         if not all_results:
             return []
 
         # 按時間排序
         sorted_results = sorted(all_results, key=lambda x: x[1].start)
+        starts = [c.start for _, c in sorted_results]
+        # 掃描下限多留少少餘量（浮點誤差），多出嚟嘅候選會被 _time_overlap 過濾
+        reach = max(c.end - c.start for _, c in sorted_results) + 1e-6
 
         final_chunks = []
         processed_times = set()
@@ -348,27 +382,22 @@ class AdvancedTranscriber:
             if time_key in processed_times:
                 continue
 
-            # 查找同一時間段的其他版本
-            alternatives = [
-                (idx, c) for idx, c in sorted_results
-                if idx != window_idx
-                and self._time_overlap(chunk, c) > 0.5  # 重疊超過 50%
-            ]
-
-            if alternatives:
-                # 有替代版本，比較並選擇最佳
-                best_chunk = chunk
-                best_confidence = chunk.confidence
-
-                for _, alt_chunk in alternatives:
-                    if alt_chunk.confidence > best_confidence:
-                        best_chunk = alt_chunk
-                        best_confidence = alt_chunk.confidence
-
-                final_chunks.append(best_chunk)
-            else:
-                final_chunks.append(chunk)
-
+            # 查找同一時間段的其他版本（只掃描可能重疊嘅範圍，保持原本順序）
+            lo = bisect.bisect_right(starts, chunk.start - reach)
+            hi = bisect.bisect_left(starts, chunk.end)
+
+            # 有替代版本就比較並選擇最佳（信心相同時保留先出現嘅版本）
+            best_chunk = chunk
+            best_confidence = chunk.confidence
+            for k in range(lo, hi):
+                idx, alt_chunk = sorted_results[k]
+                if (idx != window_idx
+                        and self._time_overlap(chunk, alt_chunk) > 0.5  # 重疊超過 50%
+                        and alt_chunk.confidence > best_confidence):
+                    best_chunk = alt_chunk
+                    best_confidence = alt_chunk.confidence
+
+            final_chunks.append(best_chunk)
             processed_times.add(time_key)
 
         # 按時間排序
@@ -391,13 +420,83 @@ class AdvancedTranscriber:
 
     # ==================== 三階段轉錄 ====================
 
+    def _batched_decode(
+        self,
+        asr_model,
+        audio,
+        sr: int,
+        chunks: List[Tuple[float, float]],
+        progress_callback: Optional[Callable] = None,
+        progress_range: Tuple[int, int] = (10, 40),
+        **kwargs
+    ) -> Optional[List[List]]:
+        """
+        批量解碼多個 chunk（一次 forward pass 處理多個）
+
+        Args:
+            chunks: [(start, end), ...]（秒，每個 ≤30 秒，唔重疊）
+            progress_range: 進度回調嘅起止百分比
+            **kwargs: 傳畀 backend（例如 temperature）
+
+        Returns:
+            每個 chunk 嘅段落列表；backend 唔支援或者 batch_size <= 1 時返回 None
+        """
+        batch_size = self.config.get("asr_batch_size", 8) if self.config is not None else 8
+        if batch_size <= 1 or not chunks:
+            return None
+
+        from utils.batched_whisper import BatchedChunkTranscriber
+        batched = BatchedChunkTranscriber.from_asr(asr_model, batch_size=batch_size)
+        if batched is None:
+            return None
+
+        low, high = progress_range
+
+        def batch_progress(done, total):
+            if progress_callback:
+                progress_callback(low + int((done / total) * (high - low)))
+
+        logger.info(f"⚡ 批量解碼 {len(chunks)} 個 chunk（batch_size={batch_size}）")
+        try:
+            return batched.transcribe_chunks(
+                audio, chunks, sr, language='yue', progress_callback=batch_progress, **kwargs
+            )
+        except Exception as e:
+            logger.warning(f"批量解碼失敗，改用逐個轉錄: {e}")
+            return None
+
+    def _coalesce_retry_windows(
+        self,
+        spans: List[Tuple[float, float]],
+        total_duration: float,
+        padding: float = 2.0,
+        max_region: float = 30.0
+    ) -> List[Tuple[float, float, List[int]]]:
+        """
+        將低信心段落嘅重轉窗口（前後各加 padding 秒）合併成區域
+
+        相鄰低信心段落嘅擴展窗口大幅重疊，逐個重轉會重複解碼同一段音頻。
+        重疊或相接嘅窗口合併成一個區域（最長 max_region 秒，Whisper 一個窗口）；
+        因為長度上限而分開嘅區域可以少少重疊，保證每個段落嘅窗口完整。
+
+        Args:
+            spans: 低信心段落 [(start, end), ...]（按開始時間排序）
+            total_duration: 音頻總長度
+
+        Returns:
+            [(區域開始, 區域結束, [段落 index, ...]), ...]
+        """
+        return coalesce_windows(spans, total_duration, padding, max_region)
+
     def three_stage_transcribe(
         self,
         audio_path: str,
         asr_model,
         vad_processor=None,
         progress_callback: Optional[Callable] = None,
-        status_callback: Optional[Callable] = None
+        status_callback: Optional[Callable] = None,
+        checkpoint=None,
+        chunk_callback: Optional[Callable[[List[TranscriptionChunk]], None]] = None
     ) -> List[TranscriptionChunk]:
         """
         三階段轉錄流程
@@ -412,12 +511,20 @@ class AdvancedTranscriber:
             vad_processor: VAD 處理器
             progress_callback: 進度回調
             status_callback: 狀態回調
+            checkpoint: TranscriptionCheckpoint（可選），階段 1/2 每個 chunk 完成即記錄，重啟時跳過
+            chunk_callback: 階段 1 每個 chunk 完成後收到該 chunk 嘅段落（逐步顯示初稿）
 
         Returns:
             最終轉錄結果
         """
         logger.info("🎯 執行三階段轉錄...")
 
+        # 自適應解碼：階段 1 用 greedy，階段 2 只對標記段落用 beam search + 溫度回退
+        adaptive = bool(self.config.get("enable_adaptive_decoding", False)) if self.config is not None else False
+        thresholds = QualityThresholds.from_config(self.config)
+        beam_size = self.config.get("beam_size", 5) if self.config is not None else 5
+        stage1_kwargs = greedy_kwargs(asr_model, {'language': 'yue'}) if adaptive else {'language': 'yue'}
+
         # ========== 階段 1：快速粗轉錄 ==========
         if status_callback:
             status_callback("階段 1/3：快速轉錄...")
@@ -431,11 +538,30 @@ class AdvancedTranscriber:
 
         # 轉錄每個 chunk
         stage1_results = []
+        flagged_ids = set()  # 自適應解碼標記要重新解碼嘅段落
         import soundfile as sf
         audio, sr = sf.read(audio_path)
 
+        # 斷點續傳：已完成嘅 chunk 直接用 checkpoint 結果
+        done_segments = {}
+        if checkpoint is not None:
+            for i, (start, end) in enumerate(chunks):
+                cached = checkpoint.get(chunk_key("stage1", start, end))
+                if cached is not None:
+                    done_segments[i] = cached
+            if done_segments:
+                logger.info(f"♻️ 階段 1 從 checkpoint 恢復 {len(done_segments)}/{len(chunks)} 個 chunk")
+
+        # 批量解碼：backend 支援嘅話一次 forward pass 處理多個 chunk
+        pending = [i for i in range(len(chunks)) if i not in done_segments]
+        batched = self._batched_decode(
+            asr_model, audio, sr, [chunks[i] for i in pending], progress_callback,
+            **({'beam_size': 1} if adaptive else {})
+        )
+        batched_segments = dict(zip(pending, batched)) if batched is not None else None
+
         for i, (start, end) in enumerate(chunks):
-            if progress_callback:
+            if progress_callback and batched_segments is None:
                 progress_callback(10 + int((i / len(chunks)) * 30))
 
             # 提取音頻片段
@@ -443,30 +569,45 @@ class AdvancedTranscriber:
             end_sample = int(end * sr)
             chunk_audio = audio[start_sample:end_sample]
 
-            # 保存臨時文件
-            chunk_path = self.temp_dir / f"stage1_chunk_{i}.wav"
-            sf.write(str(chunk_path), chunk_audio, sr)
-
-            # 轉錄
+            # 轉錄（直接傳入音頻陣列，唔使寫臨時文件）
             try:
-                result = asr_model.transcribe(str(chunk_path), language='yue')
-                segments = result.get('segments', [])
+                if i in done_segments:
+                    segments = done_segments[i]
+                elif batched_segments is not None:
+                    segments = batched_segments[i]
+                else:
+                    result = transcribe_array(
+                        asr_model, chunk_audio, sr,
+                        fallback_path=self.temp_dir / f"stage1_chunk_{i}.wav",
+                        **stage1_kwargs
+                    )
+                    segments = result.get('segments', [])
 
-                for seg in segments:
-                    chunk = TranscriptionChunk(
+                if checkpoint is not None and i not in done_segments:
+                    checkpoint.put(chunk_key("stage1", start, end), segments)
+
+                chunk_results = [
+                    TranscriptionChunk(
                         start=start + seg.start,
                         end=start + seg.end,
                         text=seg.text,
                         confidence=getattr(seg, 'confidence', 0.7),
                         words=getattr(seg, 'words', [])
                     )
-                    stage1_results.append(chunk)
+                    for seg in segments
+                ]
+                stage1_results.extend(chunk_results)
+                if adaptive:
+                    flagged_ids.update(
+                        id(chunk) for seg, chunk in zip(segments, chunk_results) if flag_reason(seg, thresholds)
+                    )
+
+                if chunk_callback and chunk_results:
+                    chunk_callback(chunk_results)
 
             except Exception as e:
                 logger.warning(f"階段 1 chunk {i} 失敗: {e}")
 
-            chunk_path.unlink(missing_ok=True)
-
         logger.info(f"階段 1 完成：{len(stage1_results)} 個段落")
 
         # ========== 階段 2：重轉錄低信心區域 ==========
@@ -491,58 +632,94 @@ class AdvancedTranscriber:
         logger.info(f"錨點：{len(anchors)} 個，低信心：{len(low_confidence)} 個")
 
         # 重轉錄低信心區域（使用更長的上下文）
-        stage2_results = []
-        for chunk in stage1_results:
-            if chunk.confidence < 0.6:
-                # 擴展時間範圍，包含更多上下文
-                extended_start = max(0, chunk.start - 2.0)
-                extended_end = min(len(audio) / sr, chunk.end + 2.0)
+        # 重疊 / 相接嘅擴展窗口先合併，每個區域只解碼一次，再按原本段落範圍分返結果
+        retry_indices = [
+            i for i, chunk in enumerate(stage1_results)
+            if chunk.confidence < 0.6 or id(chunk) in flagged_ids
+        ]
+        regions = self._coalesce_retry_windows(
+            [(stage1_results[i].start, stage1_results[i].end) for i in retry_indices],
+            len(audio) / sr
+        )
+        if regions:
+            logger.info(f"{len(retry_indices)} 個低信心段落合併成 {len(regions)} 個重轉區域")
 
-                start_sample = int(extended_start * sr)
-                end_sample = int(extended_end * sr)
-                extended_audio = audio[start_sample:end_sample]
+        total_duration = len(audio) / sr
+        refined_seconds = sum(end - start for start, end, _ in regions)
+        self.last_decode_stats = {
+            'adaptive': adaptive,
+            'segments': len(stage1_results),
+            'flagged': len(flagged_ids),
+            'retried': len(retry_indices),
+            'regions': len(regions),
+            'audio_s': round(total_duration, 3),
+            'refined_s': round(refined_seconds, 3),
+            'refined_fraction': round(refined_seconds / total_duration, 4) if total_duration else 0.0,
+        }
+
+        # 重轉參數：自適應模式用 beam search + 溫度回退，否則 temperature=0
+        retry_kwargs = refine_kwargs(asr_model, {}, beam_size) if adaptive else {'temperature': 0.0}
+
+        region_segments: Dict[int, List] = {}
+        pending_regions = []
+        for r, (region_start, region_end, _) in enumerate(regions):
+            cached = checkpoint.get(chunk_key("stage2", region_start, region_end)) if checkpoint is not None else None
+            if cached is not None:
+                region_segments[r] = cached
+            else:
+                pending_regions.append(r)
 
-                chunk_path = self.temp_dir / "stage2_retry.wav"
-                sf.write(str(chunk_path), extended_audio, sr)
+        batched = self._batched_decode(
+            asr_model, audio, sr, [regions[r][:2] for r in pending_regions],
+            progress_callback, progress_range=(45, 70), **retry_kwargs
+        )
+        if batched is not None:
+            region_segments.update(zip(pending_regions, batched))
 
-                try:
-                    result = asr_model.transcribe(
-                        str(chunk_path),
+        for n, r in enumerate(pending_regions):
+            region_start, region_end, _ = regions[r]
+            try:
+                if r not in region_segments:
+                    if progress_callback:
+                        progress_callback(45 + int((n / len(pending_regions)) * 25))
+                    result = transcribe_array(
+                        asr_model, audio[int(region_start * sr):int(region_end * sr)], sr,
+                        fallback_path=self.temp_dir / "stage2_retry.wav",
                         language='yue',
-                        temperature=0.0  # 更確定性的輸出
+                        **retry_kwargs
                     )
-
-                    segments = result.get('segments', [])
-                    if segments:
-                        # 找到對應時間段的結果
-                        for seg in segments:
-                            seg_start = extended_start + seg.start
-                            seg_end = extended_start + seg.end
-
-                            # 只保留原始時間範圍內的結果
-                            if seg_start >= chunk.start - 0.5 and seg_end <= chunk.end + 0.5:
-                                new_chunk = TranscriptionChunk(
-                                    start=seg_start,
-                                    end=seg_end,
-                                    text=seg.text,
-                                    confidence=min(getattr(seg, 'confidence', 0.7) + 0.1, 1.0),
-                                    words=getattr(seg, 'words', [])
-                                )
-                                stage2_results.append(new_chunk)
-                                break
-                        else:
-                            # 沒找到對應結果，保留原始
-                            stage2_results.append(chunk)
-                    else:
-                        stage2_results.append(chunk)
-
-                except Exception as e:
-                    logger.warning(f"階段 2 重轉錄失敗: {e}")
-                    stage2_results.append(chunk)
-
-                chunk_path.unlink(missing_ok=True)
-            else:
-                stage2_results.append(chunk)
+                    region_segments[r] = result.get('segments', [])
+                if checkpoint is not None:
+                    checkpoint.put(chunk_key("stage2", region_start, region_end), region_segments[r])
+            except Exception as e:
+                logger.warning(f"階段 2 重轉錄失敗: {e}")
+
+        # 每個低信心段落揀區域入面第一個喺佢時間範圍內（±0.5 秒）而未被用過嘅段落
+        replacements: Dict[int, TranscriptionChunk] = {}
+        for r, (region_start, _, members) in enumerate(regions):
+            used = set()
+            for member in members:
+                chunk = stage1_results[retry_indices[member]]
+                for k, seg in enumerate(region_segments.get(r) or []):
+                    if k in used:
+                        continue
+                    seg_start = region_start + seg.start
+                    seg_end = region_start + seg.end
+                    # 只保留原始時間範圍內的結果
+                    if seg_start >= chunk.start - 0.5 and seg_end <= chunk.end + 0.5:
+                        seg = remap_segment(seg, lambda t, is_end, offset=region_start: offset + t)
+                        replacements[retry_indices[member]] = TranscriptionChunk(
+                            start=seg.start,
+                            end=seg.end,
+                            text=seg.text,
+                            confidence=min(getattr(seg, 'confidence', 0.7) + 0.1, 1.0),
+                            words=getattr(seg, 'words', [])
+                        )
+                        used.add(k)
+                        break
+
+        # 沒找到對應結果就保留原始
+        stage2_results = [replacements.get(i, chunk) for i, chunk in enumerate(stage1_results)]
 
         if progress_callback:
             progress_callback(70)
@@ -582,6 +759,21 @@ class AdvancedTranscriber:
 
         logger.info("⚓ 執行錨點校正...")
 
+        # 預先計算每個位置前後最近嘅錨點（兩次線性掃描）
+        n = len(results)
+        prev_anchors: List[Optional[TranscriptionChunk]] = [None] * n
+        next_anchors: List[Optional[TranscriptionChunk]] = [None] * n
+        last = None
+        for i in range(n):
+            prev_anchors[i] = last
+            if results[i].is_anchor:
+                last = results[i]
+        last = None
+        for i in range(n - 1, -1, -1):
+            next_anchors[i] = last
+            if results[i].is_anchor:
+                last = results[i]
+
         corrected = []
 
         for i, chunk in enumerate(results):
@@ -590,18 +782,8 @@ class AdvancedTranscriber:
                 continue
 
             # 找到相鄰的錨點
-            prev_anchor = None
-            next_anchor = None
-
-            for j in range(i - 1, -1, -1):
-                if results[j].is_anchor:
-                    prev_anchor = results[j]
-                    break
-
-            for j in range(i + 1, len(results)):
-                if results[j].is_anchor:
-                    next_anchor = results[j]
-                    break
+            prev_anchor = prev_anchors[i]
+            next_anchor = next_anchors[i]
 
             # 使用錨點上下文進行校正
             if prev_anchor or next_anchor:
@@ -0,0 +1,197 @@
+"""
+ASR helper utilities shared by the transcription pipelines.
+
+Lets chunk loops hand NumPy/torch slices straight to the ASR backend
+instead of writing a temp WAV per chunk and decoding it again, and
+resolves which checkpoint each ASR backend will load for a config.
+"""
+
+import copy
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Whisper expects 16kHz mono float32
+WHISPER_SAMPLE_RATE = 16000
+
+DEFAULT_CANTONESE_MODELS = {
+    'flagship': "khleeloo/whisper-large-v3-cantonese",
+    'lite': "alvanlii/whisper-small-cantonese",
+}
+
+
+def mlx_repo_id(model_size: str) -> str:
+    """Generic MLX Whisper checkpoint for a model size."""
+    return f"mlx-community/whisper-{model_size}-mlx"
+
+
+def cantonese_model_id(config, build_type: str) -> str:
+    """Cantonese fine-tuned checkpoint of a build type ("lite" / "flagship")."""
+    build_type = build_type if build_type in DEFAULT_CANTONESE_MODELS else "lite"
+    return config.get(f"cantonese_model_{build_type}", DEFAULT_CANTONESE_MODELS[build_type])
+
+
+def resolve_asr_model_id(config, backend: str, model_size: str) -> str:
+    """
+    Checkpoint the ASR loader of ``backend`` will load for ``config``.
+
+    ``asr_model_id`` pins the checkpoint on every backend (the cascade draft /
+    refine passes use it). Otherwise faster-whisper follows ``build_type`` when
+    ``use_cantonese_model`` is on, and MLX uses the generic checkpoint of the size.
+
+    Args:
+        config: Config or ConfigOverrides
+        backend: "mlx" or "faster-whisper"
+        model_size: Whisper size from the hardware profile
+    """
+    pinned = config.get("asr_model_id", "")
+    if pinned:
+        return pinned
+    if backend == "mlx":
+        return mlx_repo_id(model_size)
+    if config.get("use_cantonese_model", True):
+        return cantonese_model_id(config, config.get("build_type", "lite"))
+    return model_size
+
+
+def cascade_asr_overrides(config, stage: str) -> Dict[str, str]:
+    """
+    Config overrides for the cascade "draft" (lite) or "refine" (flagship) ASR pass.
+
+    In Cantonese mode both passes pin their checkpoint so every backend decodes
+    the draft with ``cantonese_model_lite`` and the refinement with
+    ``cantonese_model_flagship``; otherwise the Whisper sizes tell them apart.
+    On MLX the pinned repo has to be an MLX conversion; if it is not, the
+    pipeline falls back to faster-whisper, which loads the same checkpoint.
+    """
+    build_type = "lite" if stage == "draft" else "flagship"
+    overrides = {'build_type': build_type, 'asr_model_id': ""}
+    if config.get("use_cantonese_model", True):
+        overrides['asr_model_id'] = cantonese_model_id(config, build_type)
+    return overrides
+
+
+
+def asr_registry_key(config, backend: str, model_size: str, device: str = "") -> tuple:
+    """Model registry key of an ASR backend: everything that changes which weights get loaded."""
+    model_id = resolve_asr_model_id(config, backend, model_size)
+    if backend == "mlx":
+        return ("asr", "mlx", model_id)
+    return ("asr", backend, model_id, model_size, device, config.get("compute_type", "auto"))
+
+def to_whisper_input(audio, sample_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """
+    Convert a waveform into Whisper's input format (16kHz mono float32, 1-D).
+
+    Args:
+        audio: NumPy array or torch tensor; 1-D, (channels, n) or (n, channels)
+        sample_rate: Sample rate of ``audio``
+
+    Returns:
+        Contiguous float32 array at 16kHz
+    """
+    if hasattr(audio, 'detach'):  # torch.Tensor
+        audio = audio.detach().cpu().numpy()
+    audio = np.asarray(audio)
+
+    if audio.ndim == 2:
+        # Average over the (smaller) channel axis
+        channel_axis = 0 if audio.shape[0] < audio.shape[1] else 1
+        audio = audio.mean(axis=channel_axis)
+    elif audio.ndim != 1:
+        raise ValueError(f"Unsupported audio shape: {audio.shape}")
+
+    if sample_rate != WHISPER_SAMPLE_RATE:
+        from math import gcd
+        from scipy.signal import resample_poly
+        g = gcd(int(sample_rate), WHISPER_SAMPLE_RATE)
+        audio = resample_poly(audio, WHISPER_SAMPLE_RATE // g, int(sample_rate) // g)
+
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+def transcribe_array(
+    asr_model,
+    audio,
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    fallback_path: Optional[Union[str, Path]] = None,
+    **kwargs
+) -> Dict:
+    """
+    Transcribe an in-memory chunk with whichever API the backend offers.
+
+    Backends exposing ``transcribe_array`` (MLXWhisperASR) get the array
+    directly. Others fall back to the old temp-WAV round-trip via
+    ``fallback_path``.
+
+    Args:
+        asr_model: ASR backend
+        audio: Waveform chunk
+        sample_rate: Sample rate of ``audio``
+        fallback_path: Temp WAV path for backends without array support
+        **kwargs: Passed through to the backend's transcribe call
+
+    Returns:
+        Backend transcription result dict
+    """
+    if hasattr(asr_model, 'transcribe_array'):
+        return asr_model.transcribe_array(audio, sample_rate=sample_rate, **kwargs)
+
+    if fallback_path is None:
+        raise ValueError("ASR backend has no transcribe_array and no fallback_path was given")
+
+    import soundfile as sf
+    fallback_path = Path(fallback_path)
+    data = audio.detach().cpu().numpy() if hasattr(audio, 'detach') else np.asarray(audio)
+    if data.ndim == 2 and data.shape[0] < data.shape[1]:
+        data = data.T  # soundfile expects (frames, channels)
+    sf.write(str(fallback_path), data, sample_rate)
+    try:
+        return asr_model.transcribe(str(fallback_path), **kwargs)
+    finally:
+        fallback_path.unlink(missing_ok=True)
+
+
+def remap_segment(segment, map_time: Callable[[float, bool], float]):
+    """
+    Return a copy of ``segment`` with its (and its words') times remapped.
+
+    Works on dataclass segments (TranscriptionSegment / MLXTranscriptionSegment)
+    and on dicts. ``map_time(t, is_end)`` gets ``is_end=True`` for end times.
+    """
+    if isinstance(segment, dict):
+        mapped = dict(segment)
+        mapped['start'] = map_time(segment['start'], False)
+        mapped['end'] = map_time(segment['end'], True)
+        words = segment.get('words')
+    else:
+        mapped = copy.copy(segment)
+        mapped.start = map_time(segment.start, False)
+        mapped.end = map_time(segment.end, True)
+        words = getattr(segment, 'words', None)
+
+    if words:
+        mapped_words = []
+        for word in words:
+            is_dict = isinstance(word, dict)
+            word = dict(word) if is_dict else copy.copy(word)
+            for key, is_end in (('start', False), ('end', True)):
+                value = word.get(key) if is_dict else getattr(word, key, None)
+                if value is None:
+                    continue
+                if is_dict:
+                    word[key] = map_time(value, is_end)
+                else:
+                    setattr(word, key, map_time(value, is_end))
+            mapped_words.append(word)
+        if isinstance(mapped, dict):
+            mapped['words'] = mapped_words
+        else:
+            mapped.words = mapped_words
+
+    return mapped
@@ -0,0 +1,287 @@
+"""
+Audio Cache - 已提取音頻快取
+
+同一個檔案只解碼一次：
+1. 以全檔內容哈希 + 目標採樣率作為 key（檔案搬位/改名都照樣命中；任何位置改過都會 miss）
+2. 用 (路徑, 大小, mtime) 記住內容哈希，每個版本只讀一次全檔；記錄有上限，同一路徑只留最新
+3. 16-bit 單聲道 WAV 存喺 cache_dir/audio，超出容量時按 LRU 淘汰
+4. 命中只更新記憶體入面嘅 LRU 時間，索引最多每 INDEX_SAVE_INTERVAL 秒寫一次（flush() / 程式結束時寫返）
+
+Pipeline、終極模式、波形圖同 MLX Whisper 都經呢度攞音頻。
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class AudioCache:
+    """
+    Content-addressed cache of decoded 16-bit mono WAV files.
+
+    Cache entries survive across runs, so re-transcribing a file that was
+    already processed skips audio extraction entirely.
+    """
+
+    # Read size while hashing a whole file
+    HASH_BLOCK_SIZE = 1024 * 1024
+    # Bumped when the content hash changes; older indexes are discarded
+    HASH_VERSION = 2
+    # Most (path, size, mtime) -> hash memo entries kept
+    MAX_FINGERPRINTS = 1024
+    # Minimum seconds between index writes caused by cache hits
+    INDEX_SAVE_INTERVAL = 30.0
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = 10 * 1024 ** 3):
+        """
+        Initialize audio cache.
+
+        Args:
+            cache_dir: Directory holding cached WAV files
+            max_bytes: Total size budget; least recently used entries are evicted beyond this
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        # key -> {"size": int, "last_access": float, "source": str}
+        self._entries: Dict[str, Dict] = {}
+        # "path|size|mtime_ns" -> content hash (oldest first)
+        self._fingerprints: Dict[str, str] = {}
+        self._dirty = False
+        self._last_save = 0.0
+
+        self._load_index()
+
+    # ==================== 索引持久化 ====================
+
+    def _load_index(self):
+        index_path = self.cache_dir / self.INDEX_FILE
+        if not index_path.exists():
+            return
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('hash_version') != self.HASH_VERSION:
+                # Keys from the old (sampled) hash can never be looked up again
+                logger.info("Audio cache index uses an older content hash, starting fresh")
+                for key in data.get('entries', {}):
+                    self._entry_path(key).unlink(missing_ok=True)
+                return
+            self._entries = data.get('entries', {})
+            self._fingerprints = data.get('fingerprints', {})
+        except Exception as e:
+            logger.warning(f"Failed to load audio cache index, starting fresh: {e}")
+            self._entries = {}
+            self._fingerprints = {}
+
+        # Drop entries whose files have been removed behind our back
+        missing = [k for k in self._entries if not self._entry_path(k).exists()]
+        for key in missing:
+            del self._entries[key]
+
+    def _save_index(self):
+        index_path = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_path.with_suffix('.json.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'hash_version': self.HASH_VERSION, 'entries': self._entries,
+                     'fingerprints': self._fingerprints},
+                    f, ensure_ascii=False
+                )
+            os.replace(tmp_path, index_path)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Failed to save audio cache index: {e}")
+
+    def flush(self):
+        """Write pending LRU / fingerprint updates to the index."""
+        with self._lock:
+            if self._dirty and self.cache_dir.exists():
+                self._save_index()
+
+    # ==================== Key 計算 ====================
+
+    def content_hash(self, source: Union[str, Path]) -> str:
+        """
+        Compute (or recall) the content hash of a source file.
+
+        Hashes the whole file, so an edit anywhere changes the key (checkpoints
+        and the VAD / feature caches use it as the audio's identity too). The
+        result is memoized by (path, size, mtime) in the persistent index, so
+        each version of a file is read once.
+        """
+        source = Path(source).resolve()
+        stat = source.stat()
+        path_prefix = f"{source}|"
+        stat_key = f"{path_prefix}{stat.st_size}|{stat.st_mtime_ns}"
+
+        with self._lock:
+            cached = self._fingerprints.get(stat_key)
+        if cached:
+            return cached
+
+        hasher = hashlib.sha256()
+        hasher.update(str(stat.st_size).encode())
+        with open(source, 'rb') as f:
+            while chunk := f.read(self.HASH_BLOCK_SIZE):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+        with self._lock:
+            # Older versions of the same path can never match again
+            for key in [k for k in self._fingerprints if k.startswith(path_prefix)]:
+                del self._fingerprints[key]
+            self._fingerprints[stat_key] = digest
+            while len(self._fingerprints) > self.MAX_FINGERPRINTS:
+                del self._fingerprints[next(iter(self._fingerprints))]
+            self._dirty = True
+        return digest
+
+    def key_for(self, source: Union[str, Path], sample_rate: int) -> str:
+        """Cache key for ``source`` decoded at ``sample_rate``."""
+        return f"{self.content_hash(source)[:32]}_{sample_rate}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.wav"
+
+    # ==================== 查詢 / 提取 ====================
+
+    def lookup(self, source: Union[str, Path], sample_rate: int = 16000) -> Optional[Path]:
+        """Return the cached WAV for ``source`` if present, without decoding."""
+        key = self.key_for(source, sample_rate)
+        path = self._entry_path(key)
+        with self._lock:
+            if key in self._entries and path.exists():
+                self._entries[key]['last_access'] = time.time()
+                self._dirty = True
+                if time.monotonic() - self._last_save >= self.INDEX_SAVE_INTERVAL:
+                    self._save_index()
+                return path
+        return None
+
+    def get_wav(self, source: Union[str, Path], sample_rate: int = 16000) -> Path:
+        """
+        Get a 16-bit mono WAV of ``source`` at ``sample_rate``, decoding on a miss.
+
+        Args:
+            source: Video or audio file
+            sample_rate: Target sample rate
+
+        Returns:
+            Path to the cached WAV (or ``source`` itself if it already is one)
+        """
+        source = Path(source)
+
+        # Already one of ours, or already in the exact target format
+        if source.parent.resolve() == self.cache_dir.resolve():
+            return source
+        if self._is_target_wav(source, sample_rate):
+            return source
+
+        cached = self.lookup(source, sample_rate)
+        if cached is not None:
+            logger.info(f"♻️ Audio cache hit: {source.name}")
+            return cached
+
+        from utils.audio_utils import AudioPreprocessor
+
+        key = self.key_for(source, sample_rate)
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(f".partial-{os.getpid()}-{threading.get_ident()}.wav")
+
+        logger.info(f"Audio cache miss, extracting: {source.name}")
+        try:
+            AudioPreprocessor.stream_audio_to_wav(source, tmp_path, target_sr=sample_rate)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        with self._lock:
+            self._entries[key] = {
+                'size': path.stat().st_size,
+                'last_access': time.time(),
+                'source': str(source.resolve()),
+            }
+            self._evict()
+            self._save_index()
+
+        return path
+
+    @staticmethod
+    def _is_target_wav(source: Path, sample_rate: int) -> bool:
+        if source.suffix.lower() != '.wav':
+            return False
+        try:
+            import soundfile as sf
+            info = sf.info(str(source))
+            return info.samplerate == sample_rate and info.channels == 1 and info.subtype == 'PCM_16'
+        except Exception:
+            return False
+
+    # ==================== 淘汰 ====================
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(entry['size'] for entry in self._entries.values())
+
+    def _evict(self):
+        """Evict least recently used entries until within ``max_bytes``."""
+        total = sum(entry['size'] for entry in self._entries.values())
+        if total <= self.max_bytes:
+            return
+
+        by_age = sorted(self._entries.items(), key=lambda item: item[1]['last_access'])
+        # Never evict the newest entry, even if it alone exceeds the budget
+        for key, entry in by_age[:-1]:
+            if total <= self.max_bytes:
+                break
+            self._entry_path(key).unlink(missing_ok=True)
+            total -= entry['size']
+            del self._entries[key]
+            logger.info(f"🗑️ Evicted cached audio: {Path(entry['source']).name}")
+
+    def clear(self):
+        """Remove every cached file."""
+        with self._lock:
+            for key in list(self._entries):
+                self._entry_path(key).unlink(missing_ok=True)
+            self._entries.clear()
+            self._fingerprints.clear()
+            self._save_index()
+        logger.info("🗑️ Audio cache cleared")
+
+
+# ==================== 便利函數 ====================
+
+_cache_instance: Optional[AudioCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_audio_cache(config=None) -> AudioCache:
+    """獲取全局音頻快取實例"""
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            if config is None:
+                from core.config import Config
+                config = Config()
+            cache_dir = Path(config.get('cache_dir')) / 'audio'
+            max_gb = config.get('audio_cache_max_gb', 10.0)
+            _cache_instance = AudioCache(cache_dir, max_bytes=int(max_gb * 1024 ** 3))
+            atexit.register(_cache_instance.flush)
+        return _cache_instance
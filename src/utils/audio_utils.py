@@ -79,10 +79,10 @@ class AudioPreprocessor:
         if file_path.suffix.lower() in video_formats:
             logger.info(f"Detected video format {file_path.suffix}, extracting audio with FFmpeg...")
             try:
-                # Extract audio to temporary WAV file
-                temp_audio = file_path.with_suffix('.temp.wav')
-                AudioPreprocessor.extract_audio_from_video(file_path, temp_audio)
-                file_path = temp_audio
+                # Shared audio cache: reuses the pipeline's extraction instead of
+                # writing a .temp.wav next to the user's file
+                from utils.audio_cache import get_audio_cache
+                file_path = get_audio_cache().get_wav(file_path, AudioPreprocessor.TARGET_SAMPLE_RATE)
             except Exception as e:
                 logger.error(f"Failed to extract audio from video: {e}", exc_info=True)
                 raise RuntimeError(f"無法從影片提取音頻: {e}")
@@ -160,62 +160,86 @@ class AudioPreprocessor:
         logger.info(f"Extracting audio from video: {video_path}")
         
         try:
-            import av  # PyAV provides FFmpeg functionality without external binary
-            
-            # Open video file with PyAV
-            container = av.open(str(video_path))
-            
-            # Get audio stream
-            audio_stream = container.streams.audio[0]
-            
-            # Extract and decode audio frames
-            audio_frames = []
-            for frame in container.decode(audio_stream):
-                # Convert frame to numpy array
-                audio_frames.append(frame.to_ndarray())
-            
-            container.close()
-            
-            if not audio_frames:
-                raise RuntimeError("No audio frames found in video")
-            
-            # Concatenate all frames
-            import numpy as np
-            audio_data = np.concatenate(audio_frames, axis=1)
-            
-            # Convert to PyTorch tensor and save as WAV
-            import soundfile as sf
-            
-            # PyAV returns float data, soundfile expects it in range [-1, 1]
-            # Resample to target sample rate if needed
-            if audio_stream.rate != AudioPreprocessor.TARGET_SAMPLE_RATE:
-                import scipy.signal
-                num_samples = int(len(audio_data[0]) * AudioPreprocessor.TARGET_SAMPLE_RATE / audio_stream.rate)
-                audio_data = scipy.signal.resample(audio_data, num_samples, axis=1)
-                sample_rate = AudioPreprocessor.TARGET_SAMPLE_RATE
-            else:
-                sample_rate = audio_stream.rate
-            
-            # Convert to mono if stereo
-            if audio_data.shape[0] > 1:
-                audio_data = np.mean(audio_data, axis=0)
-            else:
-                audio_data = audio_data[0]
-            
-            # Save as WAV
-            sf.write(str(output_path), audio_data, sample_rate, subtype='PCM_16')
+            AudioPreprocessor.stream_audio_to_wav(video_path, output_path)
             
             logger.info(f"Audio extracted to: {output_path}")
             return output_path
             
         except ImportError as e:
             logger.error(f"Required library not available: {e}")
-            logger.error("Please ensure av (PyAV), soundfile, and scipy are installed")
+            logger.error("Please ensure av (PyAV) and soundfile are installed")
             raise
         except Exception as e:
             logger.error(f"Failed to extract audio: {e}")
             raise
     
+    @staticmethod
+    def stream_audio_to_wav(
+        input_path: Union[str, Path],
+        output_path: Union[str, Path],
+        target_sr: int = TARGET_SAMPLE_RATE
+    ) -> int:
+        """
+        Decode, downmix and resample audio frame by frame into a 16-bit WAV.
+        
+        PyAV's AudioResampler converts each decoded frame to planar float32 at
+        ``target_sr`` (keeping the source channel layout), the channels are
+        averaged to mono and the result is appended to the output file straight
+        away, so peak memory stays constant regardless of input duration
+        (the previous implementation held the whole stereo stream in memory
+        and ran a full-length FFT resample over it). Averaging rather than
+        letting swresample downmix keeps the level: swresample mixes stereo at
+        0.707 per channel, which lifts loud audio by ~3 dB and clips in PCM_16.
+        
+        Args:
+            input_path: Path to video/audio file
+            output_path: Destination WAV path
+            target_sr: Output sample rate (default: 16000 for Whisper)
+            
+        Returns:
+            Number of samples written
+        """
+        import av  # PyAV provides FFmpeg functionality without external binary
+        import soundfile as sf
+        
+        container = av.open(str(input_path))
+        try:
+            if not container.streams.audio:
+                raise RuntimeError("影片中沒有找到音頻軌道")
+            
+            audio_stream = container.streams.audio[0]
+            logger.info(f"Audio stream: {audio_stream.rate}Hz, {audio_stream.channels} channels")
+            
+            # layout=None: keep the source layout, downmix ourselves below
+            resampler = av.AudioResampler(format='fltp', layout=None, rate=target_sr)
+            samples_written = 0
+            
+            with sf.SoundFile(
+                str(output_path), mode='w', samplerate=target_sr,
+                channels=1, subtype='PCM_16'
+            ) as wav:
+                def _write(frames):
+                    nonlocal samples_written
+                    for out_frame in frames:
+                        # Planar float -> shape (channels, n); mean of channels = mono
+                        data = out_frame.to_ndarray().mean(axis=0)
+                        wav.write(data)
+                        samples_written += len(data)
+                
+                for frame in container.decode(audio_stream):
+                    _write(resampler.resample(frame))
+                
+                # Flush samples buffered inside the resampler
+                _write(resampler.resample(None))
+        finally:
+            container.close()
+        
+        if samples_written == 0:
+            raise RuntimeError("無法從影片提取音頻幀")
+        
+        logger.debug(f"Streamed {samples_written / target_sr:.2f}s of audio at {target_sr}Hz")
+        return samples_written
+    
     @staticmethod
     def get_audio_duration(file_path: Union[str, Path]) -> float:
         """
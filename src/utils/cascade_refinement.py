@@ -0,0 +1,253 @@
+"""
+草稿 → 精修串聯轉錄（cascade）
+
+細模型（whisper-small-cantonese）好快出一份全片草稿先俾用戶編輯，
+大模型（large-v3）之後喺背景逐個窗口重新轉錄，完成一個就取代該時間範圍嘅草稿：
+1. 按草稿段落之間嘅停頓切 ≤30 秒窗口，窗口首尾相接覆蓋全片（草稿漏咗嘅語音都會重轉）
+2. 排程器優先處理播放頭 / 選中字幕附近嘅窗口，焦點隨時可以改
+3. 每個窗口完成後，中點落喺窗口內嘅草稿段落換成大模型結果
+4. 用戶精修期間改過 / 加嘅字幕（標記 USER_EDITED_KEY）同刪咗嘅字幕唔會俾精修結果覆蓋
+5. 時間軸逐批插入 / 取代字幕之後用 renumber 重新編 'id'（每批都由 0 編起，唔重編就會撞 id）
+"""
+
+import bisect
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from utils.asr_utils import remap_segment, transcribe_array
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# 字幕字典上嘅標記：用戶喺精修期間改過 / 加嘅字幕
+USER_EDITED_KEY = 'user_edited'
+
+
+@dataclass(frozen=True)
+class RefineWindow:
+    """一個精修窗口（源音頻時間）"""
+    index: int
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def distance_to(self, t: float) -> float:
+        """焦點到窗口嘅距離（焦點喺窗口內為 0）"""
+        if t < self.start:
+            return self.start - t
+        if t >= self.end:
+            return t - self.end
+        return 0.0
+
+
+def plan_refine_windows(
+    spans: Sequence[Tuple[float, float]],
+    total_duration: float,
+    max_window: float = 30.0
+) -> List[RefineWindow]:
+    """
+    將全片切成首尾相接、每個 ≤ max_window 秒嘅窗口，切點盡量放喺草稿段落之間嘅停頓中間
+
+    Args:
+        spans: 草稿段落 [(start, end), ...]
+        total_duration: 音頻總長度
+        max_window: 窗口上限（Whisper 一個窗口 30 秒）
+
+    Returns:
+        按時間排序嘅 RefineWindow 列表
+    """
+    if total_duration <= 0:
+        return []
+
+    # 候選切點：相鄰段落之間停頓嘅中點（段落可能重疊，用累計最大結束時間）
+    cuts = []
+    reach = None
+    for start, end in sorted(spans):
+        if reach is not None and start > reach:
+            cuts.append((reach + start) / 2)
+        reach = end if reach is None else max(reach, end)
+
+    windows: List[RefineWindow] = []
+    window_start = 0.0
+    c = 0
+    while total_duration - window_start > max_window:
+        limit = window_start + max_window
+        best = None
+        while c < len(cuts) and cuts[c] <= limit:
+            if cuts[c] > window_start:
+                best = cuts[c]
+            c += 1
+        # 冇停頓可以切（長段落）就硬切
+        window_end = best if best is not None else limit
+        windows.append(RefineWindow(len(windows), window_start, window_end))
+        window_start = window_end
+    windows.append(RefineWindow(len(windows), window_start, total_duration))
+    return windows
+
+
+class RefineScheduler:
+    """
+    精修窗口排程器（線程安全）
+
+    冇焦點時由頭到尾；有焦點時先做包含焦點嘅窗口，之後按距離由近到遠，
+    距離一樣時優先焦點之後嘅窗口（編輯者通常向前播放）。
+    """
+
+    def __init__(self, windows: Sequence[RefineWindow], focus: Optional[float] = None):
+        self._lock = threading.Lock()
+        self._pending: Dict[int, RefineWindow] = {w.index: w for w in windows}
+        self._focus = focus
+
+    def set_focus(self, t: Optional[float]):
+        """更新焦點（播放頭 / 選中字幕嘅時間），下一個窗口即按新焦點揀"""
+        with self._lock:
+            self._focus = t
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def next_window(self) -> Optional[RefineWindow]:
+        """取出下一個要精修嘅窗口；全部完成返回 None"""
+        with self._lock:
+            if not self._pending:
+                return None
+            focus = self._focus
+            if focus is None:
+                window = min(self._pending.values(), key=lambda w: w.start)
+            else:
+                window = min(
+                    self._pending.values(),
+                    key=lambda w: (w.distance_to(focus), w.end <= focus, w.start)
+                )
+            del self._pending[window.index]
+            return window
+
+
+def _bounds(item) -> Tuple[float, float]:
+    if isinstance(item, dict):
+        return item['start'], item['end']
+    return item.start, item.end
+
+
+def _midpoint(item) -> float:
+    return sum(_bounds(item)) / 2
+
+
+def is_user_edited(item) -> bool:
+    """用戶改過 / 加嘅字幕（字典帶 USER_EDITED_KEY）"""
+    return isinstance(item, dict) and bool(item.get(USER_EDITED_KEY))
+
+
+def splice_by_span(
+    items: List,
+    new_items: List,
+    start: float,
+    end: float,
+    keep: Optional[Callable[[object], bool]] = None,
+    deleted_spans: Sequence[Tuple[float, float]] = ()
+) -> List:
+    """
+    用 new_items 取代中點落喺 [start, end) 嘅項目，結果按開始時間排序
+
+    items 可以係段落物件（.start/.end）或者字典（'start'/'end'）。
+    keep(item) 為真嘅舊項目（例如 is_user_edited）照留，同佢時間重疊嘅新項目唔要；
+    中點落喺 deleted_spans（用戶刪咗嘅字幕範圍）嘅新項目亦唔要。
+    """
+    protected = [item for item in items if keep is not None and keep(item)]
+    protected_ids = {id(item) for item in protected}
+    kept = [item for item in items if id(item) in protected_ids or not start <= _midpoint(item) < end]
+    protected_spans = [_bounds(item) for item in protected]
+    added = [
+        item for item in new_items
+        if not any(s < _bounds(item)[1] and _bounds(item)[0] < e for s, e in protected_spans)
+        and not any(s <= _midpoint(item) < e for s, e in deleted_spans)
+    ]
+    return sorted(kept + added, key=lambda item: _bounds(item)[0])
+
+
+def insert_by_start(items: List[Dict], new_items: List[Dict]) -> List[Dict]:
+    """將新一批字幕按開始時間插入（同一時間排喺舊字幕後面）"""
+    merged = list(items)
+    starts = [item['start'] for item in merged]
+    for item in new_items:
+        index = bisect.bisect_right(starts, item['start'])
+        starts.insert(index, item['start'])
+        merged.insert(index, item)
+    return merged
+
+
+def renumber(segments: List[Dict]) -> List[Dict]:
+    """將字幕字典嘅 'id' 重新編成行號（同 set_segments 嘅編號一樣），返回同一個 list"""
+    for index, segment in enumerate(segments):
+        segment['id'] = index
+    return segments
+
+
+def refine_windows(
+    asr_model,
+    audio,
+    sample_rate: int,
+    scheduler: RefineScheduler,
+    transcribe_kwargs: Dict,
+    on_window: Optional[Callable[[RefineWindow, List], None]] = None,
+    fallback_dir: Optional[Union[str, Path]] = None,
+    checkpoint=None
+) -> List:
+    """
+    按排程器順序用大模型重新轉錄每個窗口
+
+    Args:
+        asr_model: 精修用嘅 ASR backend
+        audio: 完整音頻波形
+        sample_rate: ``audio`` 嘅採樣率
+        scheduler: RefineScheduler（轉錄期間可以 set_focus）
+        transcribe_kwargs: 轉錄參數
+        on_window: 每個窗口完成後回調 (窗口, 絕對時間段落)
+        fallback_dir: backend 唔支援陣列輸入時寫臨時 WAV 嘅目錄
+        checkpoint: TranscriptionCheckpoint（可選），每個窗口完成即記錄
+
+    Returns:
+        全部窗口嘅段落（絕對時間，按時間排序）
+    """
+    from utils.transcription_checkpoint import chunk_key
+
+    segments = []
+    while True:
+        window = scheduler.next_window()
+        if window is None:
+            break
+
+        key = chunk_key("cascade", window.start, window.end)
+        window_segments = checkpoint.get(key) if checkpoint is not None else None
+        if window_segments is None:
+            result = transcribe_array(
+                asr_model,
+                audio[int(window.start * sample_rate):int(window.end * sample_rate)],
+                sample_rate,
+                fallback_path=Path(fallback_dir) / "cascade_window.wav" if fallback_dir else None,
+                **transcribe_kwargs
+            )
+            window_segments = []
+            for seg in result.get('segments', []):
+                # Whisper 時間戳可能超出窗口少少，夾返窗口內，避免同隔籬窗口重疊
+                mapped = remap_segment(
+                    seg, lambda t, is_end, offset=window.start, limit=window.end: min(offset + t, limit)
+                )
+                if mapped.end > mapped.start:
+                    window_segments.append(mapped)
+            if checkpoint is not None:
+                checkpoint.put(key, window_segments)
+
+        segments.extend(window_segments)
+        if on_window:
+            on_window(window, window_segments)
+
+    segments.sort(key=lambda seg: seg.start)
+    return segments
@@ -0,0 +1,327 @@
+"""
+Feature Cache - Whisper log-mel / encoder 輸出快取
+
+只改提示詞（whisper_custom_prompt、subtitle_language_style、domain 詞彙）重新轉錄時，
+音頻冇變，log-mel 同 encoder 輸出都一樣，只有 decoder 要重新跑：
+1. log-mel：以音頻內容哈希 + n_mels + padding 作為 key
+2. encoder 輸出：以模型 id + 該 chunk 嘅 mel 內容哈希作為 key（chunk 範圍由 mel 內容決定，
+   同一段音頻喺同一位置切出嚟先會命中）；溫度回退重試同一個 chunk 都會命中
+3. .npy 存喺 cache_dir/features，超出容量時按 LRU 淘汰
+
+目前 MLX Whisper 支援 encoder 快取（DecodingTask 接受預先計好嘅 audio features）。
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+KIND_MEL = "mel"
+KIND_ENCODER = "encoder"
+
+
+class FeatureCache:
+    """
+    Content-addressed on-disk cache of numpy feature arrays.
+
+    Entries survive across runs; least recently used entries are evicted
+    once the total size exceeds ``max_bytes``.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = 2 * 1024 ** 3):
+        """
+        Initialize feature cache.
+
+        Args:
+            cache_dir: Directory holding cached .npy files
+            max_bytes: Total size budget; least recently used entries are evicted beyond this
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        # key -> {"size": int, "last_access": float}
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self.hits = {KIND_MEL: 0, KIND_ENCODER: 0}
+        self.misses = {KIND_MEL: 0, KIND_ENCODER: 0}
+
+        self._load_index()
+
+    # ==================== 索引持久化 ====================
+
+    def _load_index(self):
+        index_path = self.cache_dir / self.INDEX_FILE
+        if not index_path.exists():
+            return
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f).get('entries', {})
+        except Exception as e:
+            logger.warning(f"Failed to load feature cache index, starting fresh: {e}")
+            self._entries = {}
+
+        missing = [k for k in self._entries if not self._entry_path(k).exists()]
+        for key in missing:
+            del self._entries[key]
+
+    def _save_index(self):
+        index_path = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_path.with_suffix('.json.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': self._entries}, f)
+            os.replace(tmp_path, index_path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Failed to save feature cache index: {e}")
+
+    def flush(self):
+        """Persist access times recorded by get() since the last write."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    # ==================== Key 計算 ====================
+
+    @staticmethod
+    def make_key(kind: str, *parts) -> str:
+        """Cache key for a feature of ``kind`` identified by ``parts``."""
+        digest = hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:40]
+        return f"{kind}_{digest}"
+
+    @staticmethod
+    def array_digest(array) -> str:
+        """Content hash of an array (shape + dtype + bytes)."""
+        data = np.ascontiguousarray(array)
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(f"{data.shape}|{data.dtype}".encode())
+        hasher.update(data.tobytes())
+        return hasher.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    # ==================== 讀寫 ====================
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached array for ``key`` or None."""
+        kind = key.split('_', 1)[0]
+        path = self._entry_path(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or not path.exists():
+            self.misses[kind] = self.misses.get(kind, 0) + 1
+            return None
+        try:
+            array = np.load(path, allow_pickle=False)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable feature cache entry {key}: {e}")
+            with self._lock:
+                self._entries.pop(key, None)
+                path.unlink(missing_ok=True)
+                self._dirty = True
+            self.misses[kind] = self.misses.get(kind, 0) + 1
+            return None
+        with self._lock:
+            entry['last_access'] = time.time()
+            self._dirty = True
+        self.hits[kind] = self.hits.get(kind, 0) + 1
+        return array
+
+    def put(self, key: str, array) -> None:
+        """Store ``array`` under ``key``."""
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(f".partial-{os.getpid()}-{threading.get_ident()}.npy")
+        try:
+            np.save(tmp_path, np.asarray(array), allow_pickle=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write feature cache entry {key}: {e}")
+            return
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        with self._lock:
+            self._entries[key] = {'size': path.stat().st_size, 'last_access': time.time()}
+            self._evict()
+            self._save_index()
+
+    # ==================== 淘汰 ====================
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(entry['size'] for entry in self._entries.values())
+
+    def _evict(self):
+        """Evict least recently used entries until within ``max_bytes``."""
+        total = sum(entry['size'] for entry in self._entries.values())
+        if total <= self.max_bytes:
+            return
+
+        by_age = sorted(self._entries.items(), key=lambda item: item[1]['last_access'])
+        # Never evict the newest entry, even if it alone exceeds the budget
+        for key, entry in by_age[:-1]:
+            if total <= self.max_bytes:
+                break
+            self._entry_path(key).unlink(missing_ok=True)
+            total -= entry['size']
+            del self._entries[key]
+
+    def clear(self):
+        """Remove every cached file."""
+        with self._lock:
+            for key in list(self._entries):
+                self._entry_path(key).unlink(missing_ok=True)
+            self._entries.clear()
+            self._save_index()
+        logger.info("🗑️ Feature cache cleared")
+
+    def stats(self) -> Dict:
+        return {'hits': dict(self.hits), 'misses': dict(self.misses), 'bytes': self.total_bytes()}
+
+
+# ==================== 解碼時嘅快取範圍 ====================
+
+_scope = threading.local()
+
+
+@contextmanager
+def feature_cache_scope(cache: Optional[FeatureCache], model_id: str):
+    """喺呢個範圍入面，已安裝嘅 hook 用 ``cache`` 同 ``model_id``（cache 為 None 即停用）"""
+    previous = getattr(_scope, 'active', None)
+    _scope.active = (cache, model_id) if cache is not None else None
+    try:
+        yield
+    finally:
+        _scope.active = previous
+
+
+def _active():
+    return getattr(_scope, 'active', None)
+
+
+def _source_digest(audio) -> str:
+    """音頻來源嘅內容哈希：檔案用音頻快取嘅取樣哈希，陣列就哈希內容"""
+    if isinstance(audio, (str, Path)):
+        try:
+            from utils.audio_cache import get_audio_cache
+            return get_audio_cache().content_hash(audio)
+        except Exception:
+            stat = Path(audio).stat()
+            return f"{Path(audio).resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+    return FeatureCache.array_digest(np.asarray(audio))
+
+
+def wrap_log_mel(fn: Callable, to_native: Callable = lambda a: a) -> Callable:
+    """
+    包裝 log_mel_spectrogram(audio, n_mels, padding)，按音頻內容快取
+
+    Args:
+        fn: 原本嘅函數
+        to_native: numpy 陣列轉返 backend 陣列（例如 mx.array）
+    """
+    def cached_log_mel(audio, n_mels: int = 80, padding: int = 0):
+        active = _active()
+        if active is None:
+            return fn(audio, n_mels=n_mels, padding=padding)
+        cache, _ = active
+        key = cache.make_key(KIND_MEL, _source_digest(audio), n_mels, padding)
+        cached = cache.get(key)
+        if cached is not None:
+            return to_native(cached)
+        mel = fn(audio, n_mels=n_mels, padding=padding)
+        cache.put(key, np.asarray(mel))
+        return mel
+
+    cached_log_mel.__wrapped__ = fn
+    return cached_log_mel
+
+
+def wrap_audio_features(method: Callable, to_native: Callable = lambda a: a) -> Callable:
+    """
+    包裝 DecodingTask._get_audio_features(self, mel)，按模型 + mel 內容快取 encoder 輸出
+
+    Args:
+        method: 原本嘅方法
+        to_native: numpy 陣列轉返 backend 陣列（例如 mx.array）
+    """
+    def cached_audio_features(task, mel):
+        active = _active()
+        if active is None:
+            return method(task, mel)
+        cache, model_id = active
+        fp16 = bool(getattr(getattr(task, 'options', None), 'fp16', False))
+        key = cache.make_key(KIND_ENCODER, model_id, fp16, FeatureCache.array_digest(np.asarray(mel)))
+        cached = cache.get(key)
+        if cached is not None:
+            return to_native(cached)
+        features = method(task, mel)
+        cache.put(key, np.asarray(features))
+        return features
+
+    cached_audio_features.__wrapped__ = method
+    return cached_audio_features
+
+
+_mlx_installed = False
+_install_lock = threading.Lock()
+
+
+def install_mlx_feature_cache() -> bool:
+    """將快取 hook 裝入 mlx_whisper（只裝一次；只喺 feature_cache_scope 入面生效）"""
+    global _mlx_installed
+    with _install_lock:
+        if _mlx_installed:
+            return True
+        try:
+            import importlib
+            import mlx.core as mx
+            from mlx_whisper.decoding import DecodingTask
+            transcribe_module = importlib.import_module("mlx_whisper.transcribe")
+        except ImportError as e:
+            logger.debug(f"mlx_whisper not available, feature cache not installed: {e}")
+            return False
+
+        transcribe_module.log_mel_spectrogram = wrap_log_mel(transcribe_module.log_mel_spectrogram, mx.array)
+        DecodingTask._get_audio_features = wrap_audio_features(DecodingTask._get_audio_features, mx.array)
+        _mlx_installed = True
+        logger.info("🔧 Installed Whisper mel / encoder feature cache")
+        return True
+
+
+# ==================== 便利函數 ====================
+
+_cache_instance: Optional[FeatureCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_feature_cache(config=None) -> Optional[FeatureCache]:
+    """獲取全局特徵快取實例（配置停用時返回 None）"""
+    global _cache_instance
+    with _cache_lock:
+        if config is None:
+            if _cache_instance is not None:
+                return _cache_instance
+            from core.config import Config
+            config = Config()
+        if not config.get('enable_feature_cache', True):
+            return None
+        if _cache_instance is None:
+            cache_dir = Path(config.get('cache_dir')) / 'features'
+            max_gb = config.get('feature_cache_max_gb', 2.0)
+            _cache_instance = FeatureCache(cache_dir, max_bytes=int(max_gb * 1024 ** 3))
+        return _cache_instance
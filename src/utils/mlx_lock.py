@@ -0,0 +1,20 @@
+"""
+Process-wide lock for MLX / Metal work.
+
+MLX is not thread-safe: two threads building or evaluating graphs on the
+same Metal device at once can corrupt the command queue or crash the
+process. Every MLX entry point (MLX Whisper transcription, MLX Qwen
+weight loading and generation) runs under MLX_LOCK, so a background
+prefetch can overlap the network download and file I/O with Whisper but
+never touches Metal while Whisper is decoding.
+
+Usage:
+    from utils.mlx_lock import MLX_LOCK
+    with MLX_LOCK:
+        result = mlx_whisper.transcribe(...)
+"""
+
+import threading
+
+# Re-entrant: generate() may lazily call load_model() while holding the lock
+MLX_LOCK = threading.RLock()
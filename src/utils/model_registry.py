@@ -0,0 +1,400 @@
+"""
+Model Registry - 進程內共用模型
+
+ASR / VAD / LLM / MarianMT 全部經呢度攞，唔再每次 job 都加載同銷毀：
+1. 同一個 key 只加載一次，之後嘅 job 直接重用（pipeline、StyleProcessor、批量轉錄共用）
+2. RAM / VRAM 各自有預算，超出時按 LRU 淘汰冇人使用緊嘅模型；
+   Apple Silicon（MPS / MLX）係統一記憶體，兩個 pool 共用一個預算
+3. 使用中嘅模型（hold）唔會被淘汰
+4. 可以喺啟動後喺背景線程預熱模型
+5. 預算夠先喺背景預取模型（唔會為咗預取淘汰其他模型）
+
+Usage:
+    registry = get_model_registry(config)
+    asr = registry.get(("asr", "large-v3"), load_asr, size_gb=3.5, pool=POOL_VRAM)
+    with registry.in_use(("asr", "large-v3")):
+        asr.transcribe(...)
+"""
+
+import gc
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+POOL_RAM = "ram"
+POOL_VRAM = "vram"
+
+# 預設預算：系統 RAM 嘅比例（model_ram_budget_gb = 0 時）
+DEFAULT_RAM_FRACTION = 0.6
+
+# 估算模型佔用（GB），只用嚟做預算，唔需要好準
+WHISPER_SIZE_GB = {
+    'tiny': 0.2, 'base': 0.3, 'small': 0.8, 'medium': 2.0,
+    'large': 3.5, 'large-v2': 3.5, 'large-v3': 3.5, 'large-v3-turbo': 1.8, 'turbo': 1.8,
+}
+VAD_SIZE_GB = 0.05
+MARIAN_SIZE_GB = 0.3
+
+
+def estimate_llm_gb(model_id: str) -> float:
+    """按模型名估算 LLM 佔用（同 MLXQwenLLM 揀模型嘅門檻一致）"""
+    name = model_id.lower()
+    if '4bit' in name or 'int4' in name:
+        return 2.5
+    if '0.5b' in name:
+        return 1.2
+    if '1.5b' in name:
+        return 3.5
+    return 6.5
+
+
+def _default_unload(model):
+    """調用模型自己嘅釋放方法"""
+    for method in ('unload_model', 'unload_models', 'cleanup'):
+        fn = getattr(model, method, None)
+        if callable(fn):
+            fn()
+            return
+
+
+def _free_accelerator_memory():
+    """淘汰模型後清 GPU 快取（冇 torch 就跳過）"""
+    gc.collect()
+    try:
+        import torch
+        if torch.backends.mps.is_available():
+            torch.mps.empty_cache()
+        elif torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except Exception:
+        pass
+
+
+class _Entry:
+    __slots__ = ('model', 'size_gb', 'pool', 'unloader', 'last_used', 'holds')
+
+    def __init__(self, model, size_gb: float, pool: str, unloader: Callable):
+        self.model = model
+        self.size_gb = size_gb
+        self.pool = pool
+        self.unloader = unloader
+        self.last_used = time.monotonic()
+        self.holds = 0
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models with per-pool memory budgets.
+
+    Models are identified by a hashable key (e.g. ("asr", "faster-whisper",
+    "large-v3", "cpu")). Loading the same key twice returns the same instance;
+    concurrent requests for a key that is still loading wait for it instead of
+    loading a second copy.
+    """
+
+    def __init__(self, ram_budget_gb: float, vram_budget_gb: float, unified_memory: bool = False):
+        """
+        Args:
+            ram_budget_gb: Budget for models held in system RAM
+            vram_budget_gb: Budget for models held on GPU / MPS / MLX
+            unified_memory: RAM and VRAM are the same memory (Apple Silicon); both
+                pools then share ram_budget_gb and evict from each other
+        """
+        self.unified_memory = unified_memory
+        if unified_memory:
+            vram_budget_gb = ram_budget_gb
+        self.budgets = {POOL_RAM: ram_budget_gb, POOL_VRAM: vram_budget_gb}
+        self._lock = threading.RLock()
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._loading: Dict[Hashable, threading.Lock] = {}
+
+    # ==================== 查詢 ====================
+
+    def is_resident(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """已加載就返回模型（唔會觸發加載）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.last_used = time.monotonic()
+            return entry.model
+
+    def _shares_budget(self, entry_pool: str, pool: str) -> bool:
+        return self.unified_memory or entry_pool == pool
+
+    def used_gb(self, pool: str) -> float:
+        with self._lock:
+            return sum(e.size_gb for e in self._entries.values() if self._shares_budget(e.pool, pool))
+
+    def fits(self, pool: str, size_gb: float) -> bool:
+        """唔使淘汰任何模型都放得落"""
+        with self._lock:
+            return self.used_gb(pool) + size_gb <= self.budgets.get(pool, 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'budgets_gb': dict(self.budgets),
+                'unified_memory': self.unified_memory,
+                'used_gb': {pool: round(self.used_gb(pool), 2) for pool in self.budgets},
+                'models': [
+                    {'key': repr(key), 'pool': e.pool, 'size_gb': e.size_gb, 'holds': e.holds}
+                    for key, e in self._entries.items()
+                ],
+            }
+
+    # ==================== 加載 / 淘汰 ====================
+
+    def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        size_gb: float = 0.0,
+        pool: str = POOL_RAM,
+        unloader: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        """
+        返回已加載嘅模型；未加載就調用 loader() 加載並登記
+
+        Args:
+            key: 模型 key
+            loader: 返回已加載模型嘅函數（失敗時拋異常，唔會登記）
+            size_gb: 估算佔用，用嚟計預算
+            pool: POOL_RAM 或 POOL_VRAM
+            unloader: 淘汰時調用（預設：unload_model() / cleanup()）
+        """
+        model = self.peek(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # 可能另一個線程啱啱加載完
+            model = self.peek(key)
+            if model is not None:
+                return model
+
+            try:
+                self._make_room(pool, size_gb)
+                start = time.perf_counter()
+                model = loader()
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self._entries[key] = _Entry(model, size_gb, pool, unloader or _default_unload)
+            finally:
+                # 失敗都要移除，否則 prefetch() 會當佢一直「加載緊」
+                with self._lock:
+                    self._loading.pop(key, None)
+            logger.info(
+                f"📦 模型已加載: {key} ({elapsed:.1f}s, ~{size_gb:.1f} GB {pool}, "
+                f"{self.used_gb(pool):.1f}/{self.budgets[pool]:.1f} GB)"
+            )
+            return model
+
+    def _make_room(self, pool: str, size_gb: float):
+        """按 LRU 淘汰冇人使用緊嘅模型，直到新模型放得落"""
+        budget = self.budgets.get(pool, 0.0)
+        evicted = False
+        while True:
+            with self._lock:
+                if self.used_gb(pool) + size_gb <= budget:
+                    break
+                candidates = [(e.last_used, k) for k, e in self._entries.items()
+                              if self._shares_budget(e.pool, pool) and e.holds == 0]
+                if not candidates:
+                    logger.warning(
+                        f"⚠️ {pool.upper()} 預算不足 ({self.used_gb(pool):.1f} + {size_gb:.1f} > {budget:.1f} GB)，"
+                        f"但所有模型都使用緊，照樣加載"
+                    )
+                    break
+                _, victim = min(candidates, key=lambda c: c[0])
+            self._evict(victim, free_memory=False)
+            evicted = True
+        if evicted:
+            _free_accelerator_memory()
+
+    def _evict(self, key: Hashable, free_memory: bool = True) -> bool:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        try:
+            entry.unloader(entry.model)
+        except Exception as e:
+            logger.warning(f"Model unload error ({key}): {e}")
+        logger.info(f"♻️ 模型已釋放: {key} (~{entry.size_gb:.1f} GB {entry.pool})")
+        if free_memory:
+            _free_accelerator_memory()
+        return True
+
+    def evict(self, key: Hashable) -> bool:
+        """即刻釋放指定模型（使用緊都會釋放，由調用者負責）"""
+        return self._evict(key)
+
+    def clear(self):
+        """釋放所有模型（程式退出時用）"""
+        with self._lock:
+            keys = list(self._entries)
+        for key in keys:
+            self._evict(key, free_memory=False)
+        if keys:
+            _free_accelerator_memory()
+
+    # ==================== 使用中標記 ====================
+
+    def hold(self, key: Hashable):
+        """標記模型使用中（唔會被 LRU 淘汰）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.holds += 1
+                entry.last_used = time.monotonic()
+
+    def release(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.holds > 0:
+                entry.holds -= 1
+                entry.last_used = time.monotonic()
+
+    @contextmanager
+    def in_use(self, key: Hashable):
+        self.hold(key)
+        try:
+            yield self.peek(key)
+        finally:
+            self.release(key)
+
+    # ==================== 背景預熱 ====================
+
+    def warmup(self, tasks: Iterable[Callable[[], Any]], name: str = "model-warmup") -> threading.Thread:
+        """
+        喺背景線程逐個執行預熱任務（每個任務通常係一次 get()）
+
+        任務失敗只記錄日誌；同一個 key 嘅前台請求會等預熱完成，唔會重複加載。
+        """
+        tasks = list(tasks)
+
+        def run():
+            for task in tasks:
+                try:
+                    task()
+                except Exception as e:
+                    logger.warning(f"Model warmup task failed: {e}")
+            logger.info(f"🔥 模型預熱完成 ({len(tasks)} 個任務)")
+
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    def prefetch(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        size_gb: float = 0.0,
+        pool: str = POOL_RAM,
+        unloader: Optional[Callable[[Any], None]] = None,
+        name: str = "model-prefetch",
+    ) -> Optional[threading.Thread]:
+        """
+        預算夠就喺背景線程加載模型，等稍後嘅 get() 直接攞到（加載緊就等佢完成）
+
+        同 warmup() 唔同：放唔落就唔預取（返回 None），唔會淘汰使用緊嘅工作模型；
+        已加載或者加載緊都返回 None。
+        """
+        with self._lock:
+            if key in self._entries or key in self._loading:
+                return None
+            if not self.fits(pool, size_gb):
+                logger.info(
+                    f"Skipping prefetch of {key}: {pool.upper()} budget "
+                    f"({self.used_gb(pool):.1f} + {size_gb:.1f} > {self.budgets.get(pool, 0.0):.1f} GB)"
+                )
+                return None
+            # 先登記加載鎖：線程未開始之前嘅 get() 都會等預取，唔會重複加載
+            key_lock = self._loading.setdefault(key, threading.Lock())
+            key_lock.acquire()
+
+        def run():
+            try:
+                start = time.perf_counter()
+                model = loader()
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self._entries[key] = _Entry(model, size_gb, pool, unloader or _default_unload)
+                logger.info(f"📦 模型已預取: {key} ({elapsed:.1f}s, ~{size_gb:.1f} GB {pool})")
+            except Exception as e:
+                logger.warning(f"Model prefetch failed ({key}): {e}")
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+                key_lock.release()
+
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        thread.start()
+        return thread
+
+
+def _detect_unified_memory() -> bool:
+    """Apple Silicon：MPS 或者 MLX 可用，GPU 同 CPU 用同一份記憶體"""
+    try:
+        from core.hardware_detector import get_hardware_detector
+        if get_hardware_detector().detect().device == "mps":
+            return True
+    except Exception:
+        pass
+    try:
+        import importlib.util
+        return importlib.util.find_spec("mlx") is not None
+    except Exception:
+        return False
+
+
+def _detect_budgets(config) -> Tuple[float, float]:
+    """由配置或硬件推算 RAM / VRAM 預算（GB）"""
+    ram_gb = float(config.get('model_ram_budget_gb', 0.0) or 0.0) if config is not None else 0.0
+    vram_gb = float(config.get('model_vram_budget_gb', 0.0) or 0.0) if config is not None else 0.0
+
+    if ram_gb <= 0:
+        try:
+            import psutil
+            ram_gb = psutil.virtual_memory().total / (1024 ** 3) * DEFAULT_RAM_FRACTION
+        except Exception:
+            ram_gb = 8.0
+    if vram_gb <= 0:
+        try:
+            from core.hardware_detector import get_hardware_detector
+            vram_gb = get_hardware_detector().detect().vram_gb
+        except Exception:
+            vram_gb = 0.0
+    return ram_gb, vram_gb
+
+
+_registry_instance: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry(config=None) -> ModelRegistry:
+    """獲取全局模型註冊表"""
+    global _registry_instance
+    with _registry_lock:
+        if _registry_instance is None:
+            ram_gb, vram_gb = _detect_budgets(config)
+            unified = _detect_unified_memory()
+            _registry_instance = ModelRegistry(ram_gb, vram_gb, unified_memory=unified)
+            if unified:
+                logger.info(f"Model registry budget: {ram_gb:.1f} GB shared (unified memory)")
+            else:
+                logger.info(f"Model registry budgets: RAM {ram_gb:.1f} GB, VRAM {vram_gb:.1f} GB")
+        return _registry_instance
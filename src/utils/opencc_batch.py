@@ -0,0 +1,85 @@
+"""
+OpenCC 批量轉換 - 多段字幕一次過轉換
+
+逐段 converter.convert(text) 每段都要行一次 Python → OpenCC 嘅調用（C++ 版有綁定開銷，
+純 Python 版每次都要 split + 建 parse tree）。convert_bulk 將唔重複嘅段落用分隔符串埋，
+一次 convert，再 split 返：
+1. 分隔符用 ASCII 資訊分隔符（\\x1f 等）：Python 當佢係空白，純 Python 版會喺呢度斷開；
+   C++ 版字典冇任何詞包含控制字符，所以轉換結果同逐段轉換一樣
+2. 所有段落都已經包含某個分隔符就試下一個；全部用唔到、或者 split 後段數唔啱，就退返逐段轉換
+
+get_s2t_converter() 俾成個進程共用一個 s2hk 轉換器（載入字典要幾十毫秒，唔使每個 StyleProcessor /
+每次 AI 批量轉換都重新載入）。
+"""
+
+import threading
+from typing import List, Optional, Sequence
+
+from utils.logger import setup_logger
+
+try:
+    from opencc import OpenCC
+    HAS_OPENCC = True
+except ImportError:
+    HAS_OPENCC = False
+
+logger = setup_logger()
+
+# 候選分隔符（按次序揀第一個冇出現過喺任何段落嘅）
+BULK_SEPARATORS = ('\x1f', '\x1e', '\x1d', '\x1c')
+
+
+def _pick_separator(texts: Sequence[str]) -> Optional[str]:
+    for separator in BULK_SEPARATORS:
+        if not any(separator in text for text in texts):
+            return separator
+    return None
+
+
+def convert_bulk(converter, texts: Sequence[str]) -> List[str]:
+    """
+    一次 OpenCC 調用轉換多段文字
+
+    Args:
+        converter: 有 convert(text) 方法嘅 OpenCC 實例
+        texts: 要轉換嘅段落
+
+    Returns:
+        轉換後嘅段落（次序、數量同輸入一樣；結果同逐段 convert 一樣）
+    """
+    # 重複段落只轉一次（字幕成日有「係呀」「唔該」之類）
+    unique = list(dict.fromkeys(texts))
+    if len(unique) < 2:
+        converted = {text: converter.convert(text) for text in unique}
+        return [converted[text] for text in texts]
+
+    separator = _pick_separator(unique)
+    parts = None
+    if separator is not None:
+        parts = converter.convert(separator.join(unique)).split(separator)
+        if len(parts) != len(unique):
+            logger.warning(f"OpenCC bulk conversion split mismatch ({len(parts)} != {len(unique)}), "
+                           f"converting per segment")
+            parts = None
+    if parts is None:
+        parts = [converter.convert(text) for text in unique]
+
+    converted = dict(zip(unique, parts))
+    return [converted[text] for text in texts]
+
+
+# ==================== 便利函數 ====================
+
+_converter_instance = None
+_converter_lock = threading.Lock()
+
+
+def get_s2t_converter():
+    """獲取全局 OpenCC 簡轉繁（香港）轉換器；OpenCC 未安裝就返回 None"""
+    global _converter_instance
+    if not HAS_OPENCC:
+        return None
+    with _converter_lock:
+        if _converter_instance is None:
+            _converter_instance = OpenCC('s2hk')
+        return _converter_instance
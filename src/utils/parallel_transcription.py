@@ -0,0 +1,301 @@
+"""
+多進程並行轉錄 - CPU-only 主機專用
+
+將 VAD 預分割嘅 chunk 分派畀 N 個 worker 進程，每個 worker 持有自己嘅
+CPU 模型（faster-whisper），結果按時間戳合併返。進程池喺 transcribe() 之間保留，
+批量處理時每個檔案唔使重新 spawn worker 同加載模型；用完要 close()。
+
+用法：
+    with ParallelChunkTranscriber(config, model_size="large-v3", workers=8) as transcriber:
+        segments = transcriber.transcribe(audio_path, chunks, language='yue')
+"""
+
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from utils.asr_utils import remap_segment
+from utils.logger import setup_logger
+from utils.transcription_checkpoint import chunk_key
+
+logger = setup_logger()
+
+# 每個 worker 至少分到嘅 CPU 線程數（CTranslate2 喺 4 線程附近效率最好）
+THREADS_PER_WORKER = 4
+
+# 每個 CPU 模型大約佔用嘅 RAM（GB），用嚟限制 auto 模式嘅 worker 數
+MODEL_RAM_GB = 3.0
+
+# Worker 進程內嘅全局 ASR 模型（由 initializer 加載）
+_WORKER_ASR = None
+_WORKER_TEMP_DIR: Optional[Path] = None
+
+
+def resolve_asr_workers(
+    setting: Union[str, int, None] = "auto",
+    cpu_count: Optional[int] = None,
+    ram_gb: Optional[float] = None
+) -> int:
+    """
+    解析 ``asr_workers`` 配置
+
+    Args:
+        setting: "auto"、整數或整數字串；0 / "auto" 代表自動
+        cpu_count: CPU 核心數（默認自動檢測）
+        ram_gb: 可用 RAM（GB，默認自動檢測）
+
+    Returns:
+        worker 數量（>= 1，1 代表唔並行）
+    """
+    if setting not in (None, "", "auto"):
+        try:
+            workers = int(setting)
+        except (TypeError, ValueError):
+            logger.warning(f"無效嘅 asr_workers 設定: {setting!r}，改用 auto")
+            workers = 0
+        if workers > 0:
+            return workers
+
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = max(1, cpu_count // THREADS_PER_WORKER)
+
+    if ram_gb is None:
+        try:
+            import psutil
+            ram_gb = psutil.virtual_memory().available / (1024 ** 3)
+        except ImportError:
+            ram_gb = None
+    if ram_gb is not None:
+        workers = min(workers, max(1, int(ram_gb // MODEL_RAM_GB)))
+
+    return workers
+
+
+def offset_segment(segment, offset: float):
+    """
+    返回時間戳加上 offset 嘅 segment 副本（包括 word-level 時間戳）
+
+    支援 dataclass（TranscriptionSegment / MLXTranscriptionSegment）同 dict。
+    """
+    return remap_segment(segment, lambda t, is_end: t + offset)
+
+
+def merge_chunk_results(results: Dict[int, List]) -> List:
+    """
+    按時間戳合併各 chunk 嘅結果
+
+    排序鍵係 (start, chunk 索引, chunk 內序號)，所以無論 worker 完成次序點樣，
+    輸出都係確定嘅。segment 有 ``id`` 欄位嘅話會重新編號。
+
+    Args:
+        results: {chunk 索引: 已 offset 嘅 segments}
+
+    Returns:
+        合併後嘅 segment 列表
+    """
+    keyed = []
+    for chunk_index, segments in results.items():
+        for order, seg in enumerate(segments):
+            start = seg['start'] if isinstance(seg, dict) else seg.start
+            keyed.append(((start, chunk_index, order), seg))
+    keyed.sort(key=lambda item: item[0])
+
+    merged = []
+    for new_id, (_, seg) in enumerate(keyed):
+        if isinstance(seg, dict):
+            if 'id' in seg:
+                seg['id'] = new_id
+        elif hasattr(seg, 'id') and hasattr(seg, '__dict__'):  # namedtuple 唔可改
+            seg.id = new_id
+        merged.append(seg)
+    return merged
+
+
+def _default_asr_factory(config, model_size: str):
+    """Worker 內加載 faster-whisper CPU 模型"""
+    from models.whisper_asr import WhisperASR
+    asr = WhisperASR(config, model_size=model_size)
+    asr.load_model()
+    return asr
+
+
+def _init_worker(config, model_size: str, threads: int, asr_factory: Callable, temp_dir: str):
+    """Worker initializer：設定線程數並加載模型（喺 import 推理庫之前）"""
+    global _WORKER_ASR, _WORKER_TEMP_DIR
+
+    # main.py 為 GUI 進程強制 OMP_NUM_THREADS=1，worker 要用返自己嘅份額
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['MKL_NUM_THREADS'] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    _WORKER_TEMP_DIR = Path(temp_dir)
+    _WORKER_ASR = asr_factory(config, model_size)
+
+
+def _transcribe_chunk(task: Tuple[int, str, float, float, Dict]) -> Tuple[int, List]:
+    """Worker 任務：讀取 chunk 音頻、轉錄並 offset 時間戳"""
+    import soundfile as sf
+    from utils.asr_utils import transcribe_array
+
+    chunk_index, audio_path, start, end, kwargs = task
+
+    info = sf.info(audio_path)
+    sr = info.samplerate
+    audio, _ = sf.read(
+        audio_path,
+        start=int(start * sr),
+        stop=min(int(end * sr), info.frames),
+        dtype='float32'
+    )
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+
+    fallback_path = _WORKER_TEMP_DIR / f"parallel_{os.getpid()}_{chunk_index}.wav"
+    result = transcribe_array(_WORKER_ASR, audio, sr, fallback_path=fallback_path, **kwargs)
+
+    segments = [offset_segment(seg, start) for seg in result.get('segments', [])]
+    return chunk_index, segments
+
+
+class ParallelChunkTranscriber:
+    """
+    多進程 chunk 轉錄器
+
+    每個 worker 係獨立進程（spawn），各自持有一個 CPU 模型，
+    避開 GIL 同單一推理流嘅限制。進程池第一次 transcribe() 先建立，之後重用到 close()。
+    """
+
+    def __init__(
+        self,
+        config,
+        model_size: str,
+        workers: int,
+        asr_factory: Callable = _default_asr_factory
+    ):
+        """
+        Args:
+            config: 應用配置（會 pickle 到 worker）
+            model_size: ASR 模型名稱
+            workers: worker 進程數量
+            asr_factory: ``(config, model_size) -> asr``，必須係模組級函數（可 pickle）
+        """
+        self.config = config
+        self.model_size = model_size
+        self.workers = max(1, int(workers))
+        self.asr_factory = asr_factory
+        self.threads_per_worker = max(1, (os.cpu_count() or 1) // self.workers)
+        self.temp_dir = Path(tempfile.gettempdir()) / "canto_beats_parallel"
+        self.temp_dir.mkdir(exist_ok=True)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """建立（或重用）進程池；worker 由 initializer 加載模型，之後一直保留"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.config, self.model_size, self.threads_per_worker,
+                          self.asr_factory, str(self.temp_dir))
+            )
+        return self._pool
+
+    def close(self):
+        """關閉進程池（釋放 worker 入面嘅模型）"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def transcribe(
+        self,
+        audio_path: str,
+        chunks: Sequence[Tuple[float, float]],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        checkpoint=None,
+        chunk_callback: Optional[Callable[[int, List], None]] = None,
+        **kwargs
+    ) -> List:
+        """
+        並行轉錄所有 chunk
+
+        Args:
+            audio_path: 音頻路徑（worker 各自按 chunk 範圍讀取）
+            chunks: [(start, end), ...]（秒）
+            progress_callback: (已完成, 總數) 回調
+            checkpoint: TranscriptionCheckpoint（可選），跳過已完成 chunk 並記錄新結果
+            chunk_callback: (chunk 索引, segments) 回調，每個 chunk 完成即調用（完成次序）
+            **kwargs: 傳畀 ASR 嘅參數（language, domain 等）
+
+        Returns:
+            按時間戳排序嘅 segment 列表
+        """
+        if not chunks:
+            return []
+
+        results: Dict[int, List] = {}
+        keys = [chunk_key("parallel", start, end) for start, end in chunks]
+        if checkpoint is not None:
+            for i, key in enumerate(keys):
+                cached = checkpoint.get(key)
+                if cached is not None:
+                    results[i] = cached
+                    if chunk_callback:
+                        chunk_callback(i, cached)
+
+        tasks = [
+            (i, str(audio_path), float(start), float(end), kwargs)
+            for i, (start, end) in enumerate(chunks)
+            if i not in results
+        ]
+        if not tasks:
+            logger.info(f"♻️ 所有 {len(chunks)} 個 chunk 已喺 checkpoint 完成")
+            return merge_chunk_results(results)
+        # 長 chunk 先派（LPT 排程），減少尾段 worker 閒置；唔影響輸出次序
+        tasks.sort(key=lambda t: (-(t[3] - t[2]), t[0]))
+
+        workers = min(self.workers, len(tasks))
+        logger.info(
+            f"⚡ 並行轉錄: {len(tasks)} 個 chunk, {workers} 個 worker × "
+            f"{self.threads_per_worker} 線程"
+            + (f"（checkpoint 跳過 {len(results)} 個）" if results else "")
+        )
+
+        pool = self._get_pool()
+        futures = [pool.submit(_transcribe_chunk, task) for task in tasks]
+        skipped = len(results)
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                chunk_index, segments = future.result()
+                results[chunk_index] = segments
+                if checkpoint is not None:
+                    checkpoint.put(keys[chunk_index], segments)
+                if chunk_callback:
+                    chunk_callback(chunk_index, segments)
+                if progress_callback:
+                    progress_callback(skipped + done, len(chunks))
+        except BrokenProcessPool:
+            # worker 死咗：成個池用唔返，下次重新建立
+            self.close()
+            raise
+        finally:
+            # 出錯（或者取消）時唔好留低未開始嘅 chunk 喺共用池度
+            for future in futures:
+                future.cancel()
+
+        merged = merge_chunk_results(results)
+        logger.info(f"✅ 並行轉錄完成: {len(merged)} 個段落")
+        return merged
@@ -0,0 +1,56 @@
+"""
+語氣詞標點修正 - 將語氣詞前面嘅標點搬到語氣詞後面
+
+Whisper / VAD 斷句有時會輸出「嘅話,呢」「咁樣，啦」，應該係「嘅話呢,」「咁樣啦，」。
+每個標點預先編譯一條正則（[標點][語氣詞] 而後面係標點、空白或者句尾），
+按標點次序各做一次由左到右嘅替換，唔使逐個標點 × 逐個語氣詞 find + 切片。
+
+「嘅話,呢個」唔會改：語氣詞後面係普通字（例如「呢個」「嗰啲」呢類詞）一律保留。
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Pattern, Tuple
+
+# 可以搬到語氣詞後面嘅標點（按呢個次序逐個處理）
+MOVABLE_PUNCTUATION = ('，', ',', '。', '.', '！', '!', '？', '?')
+
+
+@lru_cache(maxsize=8)
+def _compile(particles: FrozenSet[str], punctuation: Tuple[str, ...]) -> Tuple[Pattern, Tuple[Tuple[Pattern, str], ...]]:
+    particle_class = "[" + "".join(re.escape(p) for p in sorted(particles)) + "]"
+    punct_class = "[" + "".join(re.escape(p) for p in punctuation) + "]"
+    # 後面要係標點、空白（同 str.isspace 一樣）或者句尾
+    follow = r"(?=" + punct_class + r"|\s|\Z)"
+    gate = re.compile(punct_class + particle_class)
+    passes = tuple(
+        (re.compile(re.escape(punct) + "(" + particle_class + ")" + follow), "\\1" + punct.replace("\\", "\\\\"))
+        for punct in punctuation
+    )
+    return gate, passes
+
+
+def fix_particle_punctuation(
+    text: str,
+    particles: Iterable[str],
+    punctuation: Tuple[str, ...] = MOVABLE_PUNCTUATION
+) -> str:
+    """
+    將「標點 + 語氣詞」改成「語氣詞 + 標點」
+
+    Args:
+        text: 字幕文字
+        particles: 句尾語氣詞（單字）
+        punctuation: 可以搬嘅標點（按次序處理：前面標點搬完，後面標點會見到新位置）
+
+    Returns:
+        修正後文字
+    """
+    if not text:
+        return text
+    gate, passes = _compile(frozenset(particles), tuple(punctuation))
+    if gate.search(text) is None:
+        return text
+    for pattern, replacement in passes:
+        text = pattern.sub(replacement, text)
+    return text
@@ -0,0 +1,237 @@
+"""
+Per-stage profiling for the subtitle pipelines.
+
+Records wall time, CPU time, peak RSS delta and item counts for each stage
+and writes one JSON report per job. Optionally wraps the whole job in
+cProfile and dumps the stats next to the report.
+
+cProfile is process-global, so only one job at a time can use it (e.g. in a
+batch run with concurrency > 1 the other jobs just skip it). It records only
+the thread that runs the job on Python < 3.12; helper threads (background VAD,
+LLM prefetch) and ASR worker processes never appear in the .prof.
+
+Usage:
+    profiler = PipelineProfiler("process", input_path)
+    with profiler.stage("asr") as stage:
+        segments = asr.transcribe(...)
+        stage.items_out = len(segments)
+    profiler.finish()
+    profiler.save(report_dir)
+"""
+
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+# RSS sampling interval while a stage runs (seconds)
+RSS_SAMPLE_INTERVAL = 0.05
+
+# Keep at most this many reports in the profile directory
+MAX_REPORTS = 200
+
+# Only one profiler may own cProfile at a time (Python >= 3.12 refuses a second one)
+_cprofile_lock = threading.Lock()
+_cprofile_owner: Optional["PipelineProfiler"] = None
+
+
+def _current_rss_mb() -> float:
+    """Current resident set size of this process in MB."""
+    if HAS_PSUTIL:
+        return psutil.Process().memory_info().rss / (1024 ** 2)
+    try:
+        import resource
+        # ru_maxrss is a high-water mark (KB on Linux, bytes on macOS)
+        scale = 1024 ** 2 if os.uname().sysname == "Darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    except (ImportError, AttributeError):
+        return 0.0
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process plus reaped child processes (ASR workers)."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class _RssSampler:
+    """Background thread tracking peak RSS during a stage."""
+
+    def __init__(self):
+        self.peak_mb = _current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not HAS_PSUTIL:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self.peak_mb = max(self.peak_mb, _current_rss_mb())
+
+    def stop(self) -> float:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak_mb = max(self.peak_mb, _current_rss_mb())
+        return self.peak_mb
+
+
+@dataclass
+class StageMetrics:
+    """Metrics for one pipeline stage."""
+    name: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rss_start_mb: float = 0.0
+    rss_end_mb: float = 0.0
+    peak_rss_delta_mb: float = 0.0
+    items_in: Optional[int] = None
+    items_out: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+class PipelineProfiler:
+    """Collects per-stage metrics for one pipeline job."""
+
+    def __init__(self, job: str, input_path: Union[str, Path] = "", enable_cprofile: bool = False):
+        """
+        Args:
+            job: Job type (e.g. "process", "process_ultimate")
+            input_path: Input file being processed
+            enable_cprofile: Also run the whole job under cProfile (skipped, with a
+                log line, while another job in this process is being profiled)
+        """
+        self.job = job
+        self.input_path = str(input_path)
+        self.meta: Dict[str, Any] = {}
+        self.stages: List[StageMetrics] = []
+        self.status = "running"
+        self._started_at = datetime.now()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = _cpu_seconds()
+        self._rss_start = _current_rss_mb()
+        self._wall_total = 0.0
+        self._cpu_total = 0.0
+        self._profile = self._start_cprofile() if enable_cprofile else None
+        self.meta['cprofile'] = self._profile is not None
+
+    def _start_cprofile(self) -> Optional[cProfile.Profile]:
+        """Enable cProfile for this job if no other job (or tool) is profiling."""
+        global _cprofile_owner
+        with _cprofile_lock:
+            if _cprofile_owner is not None:
+                logger.info(f"cProfile already active for another job, skipping it for {self.job}")
+                return None
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                # "Another profiling tool is already active" (debugger, coverage, ...)
+                logger.warning(f"cProfile unavailable for {self.job}: {e}")
+                return None
+            _cprofile_owner = self
+            return profile
+
+    @contextmanager
+    def stage(self, name: str, items_in: Optional[int] = None):
+        """
+        Measure a stage. Set ``items_out`` (and ``extra``) on the yielded
+        StageMetrics to record counts.
+        """
+        metrics = StageMetrics(name=name, items_in=items_in)
+        sampler = _RssSampler()
+        metrics.rss_start_mb = sampler.peak_mb
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds()
+        sampler.start()
+        try:
+            yield metrics
+        finally:
+            peak = sampler.stop()
+            metrics.wall_s = time.perf_counter() - wall_start
+            metrics.cpu_s = _cpu_seconds() - cpu_start
+            metrics.rss_end_mb = _current_rss_mb()
+            metrics.peak_rss_delta_mb = max(0.0, peak - metrics.rss_start_mb)
+            self.stages.append(metrics)
+            logger.debug(
+                f"[profile] {name}: {metrics.wall_s:.2f}s wall, {metrics.cpu_s:.2f}s CPU, "
+                f"+{metrics.peak_rss_delta_mb:.0f} MB peak"
+            )
+
+    def finish(self, status: str = "ok"):
+        """Stop timing the job."""
+        global _cprofile_owner
+        if self._profile is not None:
+            with _cprofile_lock:
+                self._profile.disable()
+                if _cprofile_owner is self:
+                    _cprofile_owner = None
+        self.status = status
+        self._wall_total = time.perf_counter() - self._wall_start
+        self._cpu_total = _cpu_seconds() - self._cpu_start
+
+    def report(self) -> Dict[str, Any]:
+        """Machine-readable report of the job."""
+        audio_seconds = self.meta.get("audio_seconds")
+        return {
+            "job": self.job,
+            "input": self.input_path,
+            "started_at": self._started_at.isoformat(timespec="seconds"),
+            "status": self.status,
+            "wall_s": round(self._wall_total, 4),
+            "cpu_s": round(self._cpu_total, 4),
+            "rss_start_mb": round(self._rss_start, 1),
+            "rtf": round(self._wall_total / audio_seconds, 4) if audio_seconds else None,
+            "meta": self.meta,
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+
+    def save(self, report_dir: Union[str, Path]) -> Path:
+        """
+        Write the JSON report (and .prof stats if cProfile was enabled).
+
+        Returns:
+            Path of the JSON report
+        """
+        report_dir = Path(report_dir)
+        report_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{self._started_at:%Y%m%d_%H%M%S}_{self.job}_{Path(self.input_path).stem or 'job'}"
+
+        report_path = report_dir / f"{stem}.json"
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2, default=str)
+
+        if self._profile is not None:
+            self._profile.dump_stats(str(report_dir / f"{stem}.prof"))
+
+        self._prune(report_dir)
+        logger.info(f"Pipeline profile saved: {report_path}")
+        return report_path
+
+    @staticmethod
+    def _prune(report_dir: Path):
+        """Drop the oldest reports beyond MAX_REPORTS."""
+        reports = sorted(report_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for old in reports[:-MAX_REPORTS]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".prof").unlink(missing_ok=True)
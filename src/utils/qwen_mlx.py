@@ -148,8 +148,10 @@ class MLXQwenLLM:
             if progress_callback:
                 progress_callback("正在加載模型...")
             
-            # Load model and tokenizer with mlx_lm
-            self.model, self.tokenizer = load(self.model_id)
+            # Load model and tokenizer with mlx_lm (touches Metal: never alongside MLX Whisper)
+            from utils.mlx_lock import MLX_LOCK
+            with MLX_LOCK:
+                self.model, self.tokenizer = load(self.model_id)
             
             self.is_loaded = True
             logger.info(f"⚡ MLX Qwen ready")
@@ -205,13 +207,15 @@ class MLXQwenLLM:
                 logger.debug(f"[MLX] Attempt {attempt+1}: Prompt tokens = {prompt_tokens}")
                 
                 # Generate response (mlx_lm doesn't support temperature directly)
-                response = generate(
-                    self.model,
-                    self.tokenizer,
-                    prompt=formatted_prompt,
-                    max_tokens=max_tokens,
-                    verbose=False
-                )
+                from utils.mlx_lock import MLX_LOCK
+                with MLX_LOCK:
+                    response = generate(
+                        self.model,
+                        self.tokenizer,
+                        prompt=formatted_prompt,
+                        max_tokens=max_tokens,
+                        verbose=False
+                    )
                 
                 result = response.strip() if response else ""
                 
@@ -372,19 +376,19 @@ class MLXQwenLLM:
             progress_callback(total_batches, total_batches, "AI 轉換完成")
         
         # ⚠️ 【關鍵】強制簡轉繁（防止 Qwen 輸出簡體字）
-        try:
-            from opencc import OpenCC
-            s2t = OpenCC('s2hk')  # Simplified to Traditional (Hong Kong)
-            for idx, text in result.items():
-                converted = s2t.convert(text)
-                if converted != text:
-                    logger.debug(f"[S2T] Seg {idx}: '{text[:30]}' -> '{converted[:30]}'")
-                result[idx] = converted
-            logger.info("✅ All AI outputs converted to Traditional Chinese (s2hk)")
-        except ImportError:
+        from utils.opencc_batch import convert_bulk, get_s2t_converter
+        s2t = get_s2t_converter()  # Simplified to Traditional (Hong Kong), shared per process
+        if s2t is None:
             logger.warning("⚠️ OpenCC not available - AI outputs may contain Simplified Chinese!")
-        except Exception as e:
-            logger.error(f"Failed to convert to Traditional Chinese: {e}")
+        else:
+            try:
+                for (idx, text), converted in zip(list(result.items()), convert_bulk(s2t, list(result.values()))):
+                    if converted != text:
+                        logger.debug(f"[S2T] Seg {idx}: '{text[:30]}' -> '{converted[:30]}'")
+                    result[idx] = converted
+                logger.info("✅ All AI outputs converted to Traditional Chinese (s2hk)")
+            except Exception as e:
+                logger.error(f"Failed to convert to Traditional Chinese: {e}")
         
         return result
     
@@ -404,6 +408,60 @@ class MLXQwenLLM:
         self.cleanup()
 
 
+def get_shared_mlx_qwen(model_id: str, config=None, progress_callback=None) -> "MLXQwenLLM":
+    """
+    Get the process-wide MLX Qwen instance for model_id, loading it once.
+
+    The sentence-boundary optimizer and the style panel share this instance
+    through the model registry instead of each loading (and destroying) their own.
+
+    Args:
+        model_id: Requested MLX model ID (the loaded model may be the 4-bit variant on low VRAM)
+        config: Application configuration (for the registry budget)
+        progress_callback: Optional callback(message: str) used only if the model must be loaded
+    """
+    from utils.model_registry import POOL_VRAM, estimate_llm_gb, get_model_registry
+
+    def load():
+        llm = MLXQwenLLM(model_id=model_id)
+        llm.load_model(progress_callback=progress_callback)
+        return llm
+
+    return get_model_registry(config).get(
+        ("llm", "mlx", model_id), load, size_gb=estimate_llm_gb(model_id), pool=POOL_VRAM
+    )
+
+
+def prefetch_shared_mlx_qwen(model_id: str, config=None):
+    """
+    Start loading the shared MLX Qwen instance in the background if it fits.
+
+    A later get_shared_mlx_qwen() for the same model waits for this load
+    instead of starting its own. The download runs freely, but the weight
+    load takes MLX_LOCK, so it waits for any MLX Whisper call in progress
+    (MLX/Metal is not thread-safe). Nothing is prefetched when MLX is unavailable,
+    the model is already resident, or it would not fit in the VRAM budget
+    without evicting another model (e.g. the Whisper model in use).
+
+    Returns:
+        The loader thread, or None if no prefetch was started
+    """
+    from utils.model_registry import POOL_VRAM, estimate_llm_gb, get_model_registry
+
+    if not MLXQwenLLM.is_available():
+        return None
+
+    def load():
+        llm = MLXQwenLLM(model_id=model_id)
+        llm.load_model()
+        return llm
+
+    return get_model_registry(config).prefetch(
+        ("llm", "mlx", model_id), load, size_gb=estimate_llm_gb(model_id), pool=POOL_VRAM,
+        name="llm-prefetch"
+    )
+
+
 def get_best_llm_backend(model_size: str = "3B"):
     """
     Get the best available LLM backend for the current system.
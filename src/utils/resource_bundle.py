@@ -0,0 +1,244 @@
+"""
+預編譯資源包 - 字典 JSON 同編譯好嘅替換器一次過載入
+
+StyleProcessor 每次建立都要 json.load 三本字典，第一次處理又要逐本建 TextReplacer。
+ResourceBundle 將呢啲結果存成一個有版本號嘅檔案（cache_dir/resources），下次直接讀返：
+1. 每個項目 = 名稱 → (來源指紋, 資料)；指紋係來源內容嘅 hash（JSON 檔案內容 / 替換規則 + 模式
+   + TEXT_REPLACER_FORMAT），來源或者替換器格式改咗就自動重建嗰一項，其他照用
+2. 內容係純 JSON 資料（替換器用 TextReplacer.to_state / from_state），唔用 pickle：
+   快取檔喺用戶可寫嘅目錄，被改過或者壞咗最多係 cache miss，唔會執行任何代碼
+3. 檔頭 = magic + 版本號；版本唔啱、檔案壞咗、某項資料結構唔啱就當冇快取 / 重建嗰項
+4. 打包前可以預先建好（python -m utils.resource_bundle），放喺 resources/ 隨程式發佈，
+   用戶快取未有嘅時候先讀佢
+
+Usage:
+    bundle = get_resource_bundle(config)
+    mapping = bundle.json_file('resources/cantonese_mapping.json')
+    replacer = bundle.replacer('profanity_mask', pairs, mode=LONGEST)
+    bundle.save()  # 有新項目先寫
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+from utils.logger import setup_logger
+from utils.text_replacer import LONGEST, TEXT_REPLACER_FORMAT, Pairs, TextReplacer
+
+logger = setup_logger()
+
+RESOURCE_BUNDLE_VERSION = 2
+BUNDLE_FILENAME = f"mapping_bundle-v{RESOURCE_BUNDLE_VERSION}.bin"
+# 打包時預建、隨程式發佈嘅資源包（相對 get_resource_path）
+PREBUILT_BUNDLE_PATH = f"resources/{BUNDLE_FILENAME}"
+
+_MAGIC = b"CBRB"
+_HEADER = struct.Struct("<4sH")  # magic, 版本號
+
+T = TypeVar('T')
+
+
+def _identity(value):
+    return value
+
+
+def _require_dict(value) -> Dict:
+    if not isinstance(value, dict):
+        raise ValueError("expected a JSON object")
+    return value
+
+
+def fingerprint(*parts) -> str:
+    """來源內容指紋（bytes 直接 hash，其他用 JSON 序列化）"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()[:32]
+
+
+class ResourceBundle:
+    """名稱 → (來源指紋, JSON 資料)，存喺一個有版本號嘅檔案；讀返嚟嘅物件喺記憶體快取"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 seed_path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            path: 資源包檔案（None = 只用記憶體）；save() 寫返呢度
+            seed_path: path 未存在時讀嘅預建資源包（唯讀）
+        """
+        self.path = Path(path) if path else None
+        # 會寫返檔案嘅資料：名稱 → (指紋, JSON 資料)
+        self._entries: Dict[str, Tuple[str, Any]] = {}
+        # 已解碼 / 已建好嘅物件：名稱 → (指紋, 物件)
+        self._values: Dict[str, Tuple[str, object]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+        source = self.path if self.path is not None and self.path.exists() else None
+        if source is None and seed_path and Path(seed_path).exists():
+            source = Path(seed_path)
+            self._dirty = self.path is not None  # 第一次用預建包：抄一份去用戶快取
+        if source is not None:
+            self._entries = self._read(source)
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, Tuple[str, Any]]:
+        try:
+            data = path.read_bytes()
+            if len(data) < _HEADER.size:
+                raise ValueError("truncated header")
+            magic, version = _HEADER.unpack_from(data)
+            if magic != _MAGIC or version != RESOURCE_BUNDLE_VERSION:
+                logger.info(f"Ignoring resource bundle {path.name} (version {version})")
+                return {}
+            entries = json.loads(data[_HEADER.size:].decode('utf-8'))
+            if not isinstance(entries, dict):
+                raise ValueError("not a mapping")
+            return {
+                name: (entry[0], entry[1]) for name, entry in entries.items()
+                if isinstance(entry, list) and len(entry) == 2 and isinstance(entry[0], str)
+            }
+        except Exception as e:
+            logger.warning(f"Dropping unreadable resource bundle {path}: {e}")
+            return {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str, source_fingerprint: str, build: Callable[[], T],
+            encode: Callable[[T], Any] = _identity, decode: Callable[[Any], T] = _identity) -> T:
+        """
+        取預編譯物件；冇、指紋唔啱或者資料解碼失敗就 build() 再記低
+
+        Args:
+            name: 項目名稱
+            source_fingerprint: 來源指紋（fingerprint(...)）
+            build: 重建函數
+            encode: 物件 → JSON 資料（預設物件本身就係 JSON 資料）
+            decode: JSON 資料 → 物件；資料唔啱要 raise
+        """
+        with self._lock:
+            cached = self._values.get(name)
+            if cached is not None and cached[0] == source_fingerprint:
+                self.hits += 1
+                return cached[1]
+            entry = self._entries.get(name)
+        if entry is not None and entry[0] == source_fingerprint:
+            try:
+                value = decode(entry[1])
+            except Exception as e:
+                logger.warning(f"Rebuilding invalid resource bundle entry {name}: {e}")
+            else:
+                with self._lock:
+                    self.hits += 1
+                    self._values[name] = (source_fingerprint, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        value = build()
+        data = encode(value)
+        with self._lock:
+            self._entries[name] = (source_fingerprint, data)
+            self._values[name] = (source_fingerprint, value)
+            self._dirty = True
+        return value
+
+    def json_file(self, path: Union[str, Path]) -> Dict:
+        """讀 JSON 字典（檔案內容冇改就直接用資源包入面解析好嘅版本）"""
+        data = Path(path).read_bytes()
+        return self.get(f"json:{Path(path).name}", fingerprint(data), lambda: json.loads(data.decode('utf-8')),
+                        decode=_require_dict)
+
+    def replacer(self, name: str, pairs: Pairs, mode: str = LONGEST) -> TextReplacer:
+        """預編譯嘅 TextReplacer（規則、模式或者替換器格式改咗就重建）"""
+        items = list(pairs.items()) if isinstance(pairs, dict) else list(pairs)
+        return self.get(f"replacer:{name}", fingerprint(TEXT_REPLACER_FORMAT, mode, items),
+                        lambda: TextReplacer(items, mode=mode),
+                        encode=TextReplacer.to_state, decode=TextReplacer.from_state)
+
+    def save(self):
+        """有新 / 改咗嘅項目就寫返檔案（原子替換）"""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".tmp-{os.getpid()}-{threading.get_ident()}")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, RESOURCE_BUNDLE_VERSION))
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to write resource bundle {self.path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+
+# ==================== 便利函數 ====================
+
+_bundle_instance: Optional[ResourceBundle] = None
+_bundle_lock = threading.Lock()
+
+
+def _prebuilt_path() -> Optional[str]:
+    try:
+        from core.path_setup import get_resource_path
+        return get_resource_path(PREBUILT_BUNDLE_PATH)
+    except Exception:
+        return None
+
+
+def get_resource_bundle(config=None) -> ResourceBundle:
+    """獲取全局資源包實例"""
+    global _bundle_instance
+    with _bundle_lock:
+        if _bundle_instance is None:
+            if config is None:
+                from core.config import Config
+                config = Config()
+            cache_dir = config.get('cache_dir')
+            path = Path(cache_dir) / 'resources' / BUNDLE_FILENAME if cache_dir else None
+            _bundle_instance = ResourceBundle(path, seed_path=_prebuilt_path())
+        return _bundle_instance
+
+
+def build_bundle(output: Union[str, Path]) -> ResourceBundle:
+    """建一個完整資源包（StyleProcessor 字典 + 替換器，可以嘅話加埋 pipeline 錯字表）"""
+    from core.config import Config
+    from subtitle.style_processor import StyleProcessor
+
+    output = Path(output)
+    output.unlink(missing_ok=True)
+    bundle = ResourceBundle(output)
+    StyleProcessor(Config(), resource_bundle=bundle).precompile()
+    try:
+        from pipeline.subtitle_pipeline_v2 import SubtitlePipelineV2
+        SubtitlePipelineV2._corrections_replacer(bundle)
+    except Exception as e:
+        logger.warning(f"Skipping pipeline correction table (pipeline unavailable: {e})")
+    bundle.save()
+    return bundle
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="預先建立字典資源包（打包前執行）")
+    parser.add_argument('--output', type=str, default=None,
+                        help=f"輸出檔案（預設 src/{PREBUILT_BUNDLE_PATH}）")
+    args = parser.parse_args()
+    target = args.output or Path(__file__).resolve().parent.parent / PREBUILT_BUNDLE_PATH
+    built = build_bundle(target)
+    print(f"✅ Resource bundle: {target} ({len(built)} entries, {Path(target).stat().st_size / 1024:.0f} KB)")
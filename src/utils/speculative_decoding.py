@@ -0,0 +1,334 @@
+"""
+推測解碼（speculative decoding）- 細模型起草，大模型一次 forward pass 驗證
+
+CPU 上 large-v3 嘅時間主要花喺 decoder 逐個 token 嘅 forward pass。流程：
+1. 草稿模型（whisper-small-cantonese）greedy 連續估 k 個 token（細模型，好平）
+2. 目標模型將「上一個 token + k 個草稿」一次過送入 decoder，計齊 k+1 個位置嘅 logits
+3. 接受同目標 argmax 一致嘅最長前綴，再加目標喺第一個唔一致位置自己揀嘅 token
+
+每一步都係目標模型自己嘅 argmax，所以輸出同目標模型 greedy 解碼逐個 token 一樣；
+草稿估得準，目標 forward pass 次數就大減。
+
+兩個模型嘅文字 token 一樣，特殊 token（eot / 時間戳）id 可能唔同（large-v3 多咗 <|yue|>，
+之後嘅特殊 token 全部移後一位），由 VocabMap 對應；對應唔到嘅 token 草稿就唔再估。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Whisper 時間戳：<|0.00|> 到 <|30.00|>，每格 0.02 秒
+N_TIMESTAMPS = 1501
+TIMESTAMP_SECONDS = 0.02
+
+
+class DecoderSession:
+    """
+    一個音頻窗口嘅增量 decoder 狀態（提示 token 已經喺建立時決定）
+
+    子類實現 ``start`` / ``score`` / ``rollback``，返回嘅 logits 已套用該位置嘅規則
+    （suppress tokens、時間戳規則等），即係 greedy 解碼直接取 argmax 嘅 logits。
+    """
+
+    @property
+    def length(self) -> int:
+        """已送入 decoder 嘅生成 token 數（唔計提示）"""
+        raise NotImplementedError
+
+    def start(self) -> np.ndarray:
+        """送入提示，返回第一個生成位置嘅 logits（1-D）"""
+        raise NotImplementedError
+
+    def score(self, tokens: Sequence[int]) -> np.ndarray:
+        """
+        一次 forward pass 送入 ``tokens``
+
+        Returns:
+            (len(tokens), vocab) logits，第 i 行係 tokens[i] 之後下一個 token 嘅 logits
+        """
+        raise NotImplementedError
+
+    def rollback(self, length: int):
+        """只保留頭 ``length`` 個生成 token（丟棄未被接受嘅草稿）"""
+        raise NotImplementedError
+
+
+class VocabMap:
+    """
+    草稿 / 目標模型之間嘅 token id 對應
+
+    文字 token（id < eot）兩個模型一樣；eot 同時間戳按位置對應；其他特殊 token 對應唔到。
+    """
+
+    def __init__(self, text_vocab_size: int = 0, draft_to_target: Optional[Dict[int, int]] = None):
+        self.text_vocab_size = text_vocab_size
+        self._to_target = dict(draft_to_target or {})
+        self._to_draft = {t: d for d, t in self._to_target.items()}
+        self._identity = not text_vocab_size and not self._to_target
+
+    @classmethod
+    def for_whisper(
+        cls,
+        draft_eot: int,
+        draft_timestamp_begin: int,
+        target_eot: int,
+        target_timestamp_begin: int
+    ) -> "VocabMap":
+        """兩個 Whisper tokenizer（文字部分相同）之間嘅對應"""
+        if draft_eot == target_eot and draft_timestamp_begin == target_timestamp_begin:
+            return cls()
+        mapping = {draft_eot: target_eot}
+        for i in range(N_TIMESTAMPS):
+            mapping[draft_timestamp_begin + i] = target_timestamp_begin + i
+        return cls(min(draft_eot, target_eot), mapping)
+
+    def to_target(self, token: int) -> Optional[int]:
+        if self._identity or token < self.text_vocab_size:
+            return token
+        return self._to_target.get(token)
+
+    def to_draft(self, token: int) -> Optional[int]:
+        if self._identity or token < self.text_vocab_size:
+            return token
+        return self._to_draft.get(token)
+
+
+@dataclass
+class SpeculativeStats:
+    """解碼統計（目標 / 草稿 forward pass 次數、草稿接受率）"""
+    tokens: int = 0
+    target_passes: int = 0
+    draft_passes: int = 0
+    proposed: int = 0
+    accepted: int = 0
+    decode_seconds: float = 0.0
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.proposed if self.proposed else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.decode_seconds if self.decode_seconds else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'tokens': self.tokens,
+            'target_passes': self.target_passes,
+            'draft_passes': self.draft_passes,
+            'acceptance_rate': round(self.acceptance_rate, 4),
+            'decode_seconds': round(self.decode_seconds, 3),
+            'tokens_per_second': round(self.tokens_per_second, 2),
+        }
+
+
+def _log_softmax_at(row: np.ndarray, token: int) -> float:
+    """``row`` 經 log-softmax 之後 ``token`` 嘅值"""
+    finite = row[np.isfinite(row)]
+    peak = finite.max()
+    return float(row[token] - peak - np.log(np.exp(finite - peak).sum()))
+
+
+def speculative_greedy_decode(
+    target: DecoderSession,
+    draft: Optional[DecoderSession],
+    eot: int,
+    max_new_tokens: int = 224,
+    num_draft_tokens: int = 5,
+    vocab_map: Optional[VocabMap] = None,
+    stats: Optional[SpeculativeStats] = None
+) -> Tuple[List[int], List[float]]:
+    """
+    Greedy 解碼，可選用草稿模型加速；輸出同冇草稿時逐個 token 一樣
+
+    Args:
+        target: 目標模型（large-v3）嘅 decoder session
+        draft: 草稿模型嘅 session；None = 普通 greedy（每個 token 一次 forward pass）
+        eot: 目標模型嘅 end-of-text token
+        max_new_tokens: 生成 token 上限
+        num_draft_tokens: 每輪草稿估幾多個 token
+        vocab_map: 草稿 / 目標 token id 對應（預設兩邊相同）
+        stats: 累加統計
+
+    Returns:
+        (生成 token（目標 id，唔包 eot）, 每個 token 嘅 log 概率)
+    """
+    vocab_map = vocab_map or VocabMap()
+    stats = stats if stats is not None else SpeculativeStats()
+
+    tokens: List[int] = []
+    logprobs: List[float] = []
+    draft_tokens: List[int] = []  # 同 tokens 一樣，但係草稿 id
+
+    row = target.start()
+    stats.target_passes += 1
+    next_token = int(np.argmax(row))
+    next_logprob = _log_softmax_at(row, next_token)
+    drafting = draft is not None and num_draft_tokens > 0
+
+    while next_token != eot and len(tokens) < max_new_tokens:
+        tokens.append(next_token)
+        logprobs.append(next_logprob)
+
+        # 草稿追上目前進度，再連續估 k 個 token
+        proposal: List[int] = []
+        if drafting:
+            mapped = vocab_map.to_draft(next_token)
+            if mapped is None:
+                drafting = False  # 草稿模型冇呢個 token，之後普通 greedy
+            else:
+                draft_tokens.append(mapped)
+                budget = min(num_draft_tokens, max_new_tokens - len(tokens))
+                if budget > 0:
+                    draft_row = draft.score(draft_tokens[draft.length:])[-1]
+                    stats.draft_passes += 1
+                    while True:
+                        guess = vocab_map.to_target(int(np.argmax(draft_row)))
+                        # eot / 對應唔到嘅特殊 token 留俾目標模型自己決定
+                        if guess is None or guess == eot:
+                            break
+                        proposal.append(guess)
+                        if len(proposal) >= budget:
+                            break
+                        draft_row = draft.score([vocab_map.to_draft(guess)])[-1]
+                        stats.draft_passes += 1
+
+        # 目標模型一次 forward pass 驗證全部草稿
+        rows = target.score(tokens[target.length:] + proposal)
+        stats.target_passes += 1
+        base = len(rows) - len(proposal) - 1
+        accepted = 0
+        while accepted < len(proposal) and int(np.argmax(rows[base + accepted])) == proposal[accepted]:
+            tokens.append(proposal[accepted])
+            logprobs.append(_log_softmax_at(rows[base + accepted], proposal[accepted]))
+            draft_tokens.append(vocab_map.to_draft(proposal[accepted]))
+            accepted += 1
+        stats.proposed += len(proposal)
+        stats.accepted += accepted
+
+        row = rows[base + accepted]
+        next_token = int(np.argmax(row))
+        next_logprob = _log_softmax_at(row, next_token)
+
+        # 丟棄未被接受嘅草稿
+        target.rollback(len(tokens))
+        if drafting:
+            draft.rollback(min(draft.length, len(draft_tokens)))
+
+    stats.tokens += len(tokens)
+    return tokens, logprobs
+
+
+class WhisperLogitFilter:
+    """
+    Whisper greedy 解碼嘅 logit 規則（同 openai-whisper 一致）
+
+    - suppress_tokens：永遠唔出
+    - begin_suppress_tokens：第一個 token 唔出（空白 / eot）
+    - 時間戳規則：成對出現、單調遞增、第一個 token 必須係 ≤1 秒嘅時間戳、
+      時間戳總概率高過任何文字 token 時強制出時間戳
+    """
+
+    def __init__(
+        self,
+        eot: int,
+        timestamp_begin: int,
+        no_timestamps: int,
+        suppress_tokens: Sequence[int] = (),
+        begin_suppress_tokens: Sequence[int] = (),
+        max_initial_timestamp_index: int = 50
+    ):
+        self.eot = eot
+        self.timestamp_begin = timestamp_begin
+        self.no_timestamps = no_timestamps
+        self.suppress_tokens = np.array(sorted(set(suppress_tokens) | {no_timestamps}), dtype=np.int64)
+        self.begin_suppress_tokens = np.array(sorted(set(begin_suppress_tokens)), dtype=np.int64)
+        self.max_initial_timestamp_index = max_initial_timestamp_index
+
+    def apply(self, history: Sequence[int], logits: np.ndarray) -> np.ndarray:
+        """按已生成 token ``history`` 處理下一個位置嘅 logits（返回新陣列）"""
+        logits = np.array(logits, dtype=np.float32)
+        vocab = logits.shape[-1]
+        ts = self.timestamp_begin
+        logits[self.suppress_tokens[self.suppress_tokens < vocab]] = -np.inf
+
+        if not history:
+            logits[self.begin_suppress_tokens[self.begin_suppress_tokens < vocab]] = -np.inf
+            # 第一個 token 必須係時間戳，而且唔可以遲過 max_initial_timestamp
+            logits[:ts] = -np.inf
+            logits[ts + self.max_initial_timestamp_index + 1:] = -np.inf
+            return logits
+
+        last_was_timestamp = history[-1] >= ts
+        penultimate_was_timestamp = len(history) < 2 or history[-2] >= ts
+        if last_was_timestamp:
+            if penultimate_was_timestamp:
+                logits[ts:] = -np.inf  # 一對時間戳之後一定係文字
+            else:
+                logits[:self.eot] = -np.inf  # 文字之後嘅時間戳要成對
+
+        timestamps = [t for t in history if t >= ts]
+        if timestamps:
+            # 時間戳唔可以倒退；成對時間戳嘅第二個可以同第一個一樣
+            last = timestamps[-1] if last_was_timestamp and not penultimate_was_timestamp else timestamps[-1] + 1
+            logits[ts:last] = -np.inf
+
+        finite = logits[np.isfinite(logits)]
+        if finite.size:
+            peak = finite.max()
+            logprobs = logits - peak - np.log(np.exp(finite - peak).sum())
+            timestamp_logprobs = logprobs[ts:]
+            timestamp_logprobs = timestamp_logprobs[np.isfinite(timestamp_logprobs)]
+            if timestamp_logprobs.size:
+                top = timestamp_logprobs.max()
+                timestamp_total = top + np.log(np.exp(timestamp_logprobs - top).sum())
+                if timestamp_total > logprobs[:ts].max():
+                    logits[:ts] = -np.inf
+        return logits
+
+
+def split_timestamped_tokens(
+    tokens: Sequence[int],
+    logprobs: Sequence[float],
+    timestamp_begin: int,
+    window_seconds: float
+) -> Tuple[List[Tuple[float, float, List[int], List[float]]], float]:
+    """
+    將帶時間戳嘅 token 切成段落
+
+    Returns:
+        ([(開始, 結束, 文字 token, log 概率), ...], 下一個窗口由幾多秒開始)
+    """
+    segments = []
+    start = None
+    text: List[int] = []
+    text_logprobs: List[float] = []
+    last_end = None
+    for token, logprob in zip(tokens, logprobs):
+        if token >= timestamp_begin:
+            t = (token - timestamp_begin) * TIMESTAMP_SECONDS
+            if start is not None and text:
+                segments.append((start, t, text, text_logprobs))
+                last_end = t
+                start, text, text_logprobs = None, [], []
+            else:
+                start = t
+        else:
+            if start is None:
+                start = last_end if last_end is not None else 0.0
+            text.append(token)
+            text_logprobs.append(logprob)
+
+    # 尾段未完（有文字冇結束時間戳），或者以一對時間戳結尾（下一段啱啱開始）：
+    # 下一個窗口由最後一個完整段落結束處開始
+    ends_with_pair = len(tokens) >= 2 and tokens[-1] >= timestamp_begin and tokens[-2] >= timestamp_begin
+    if segments and last_end and (text or ends_with_pair):
+        return segments, last_end
+    if text:
+        segments.append((start or 0.0, window_seconds, text, text_logprobs))
+    return segments, window_seconds
@@ -0,0 +1,131 @@
+"""
+VAD-first 語音窗口打包
+
+先用 VAD 搵出語音段，再將語音段打包成 ≤30 秒嘅窗口（段與段之間插入短靜音），
+Whisper 只轉錄呢啲窗口。每個窗口帶一張時間重映射表，將窗口內時間
+換算返原始音頻時間。
+
+好處：
+- 跳過長靜音 / 純音樂，減少 ASR 時間
+- 唔畀 Whisper 對住背景音樂「作故仔」（結尾幻覺嘅主要來源）
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass
+class RemapPiece:
+    """窗口內一段語音：窗口時間 [window_start, window_start + duration) ↔ 原始時間"""
+    window_start: float
+    source_start: float
+    duration: float
+
+    @property
+    def window_end(self) -> float:
+        return self.window_start + self.duration
+
+    @property
+    def source_end(self) -> float:
+        return self.source_start + self.duration
+
+
+@dataclass
+class SpeechWindow:
+    """一個打包好嘅轉錄窗口"""
+    pieces: List[RemapPiece] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return self.pieces[-1].window_end if self.pieces else 0.0
+
+    def to_source(self, t: float, is_end: bool = False) -> float:
+        """
+        窗口時間 → 原始音頻時間
+
+        落喺插入靜音入面嘅時間：開始時間對齊下一段語音開頭，
+        結束時間對齊上一段語音結尾。
+        """
+        starts = [p.window_start for p in self.pieces]
+        index = bisect.bisect_right(starts, t) - 1
+        if index < 0:
+            return self.pieces[0].source_start
+
+        piece = self.pieces[index]
+        if t <= piece.window_end:
+            return piece.source_start + (t - piece.window_start)
+
+        # 插入靜音區
+        if is_end or index + 1 >= len(self.pieces):
+            return piece.source_end
+        return self.pieces[index + 1].source_start
+
+
+def pack_speech_windows(
+    speech_regions: Sequence[Tuple[float, float]],
+    max_window: float = 30.0,
+    separator: float = 0.3
+) -> List[SpeechWindow]:
+    """
+    將語音段打包成 ≤ max_window 秒嘅窗口
+
+    Args:
+        speech_regions: [(start, end), ...] 原始時間（秒）
+        max_window: 窗口最長秒數（Whisper 上限 30 秒）
+        separator: 段與段之間插入嘅靜音秒數
+
+    Returns:
+        SpeechWindow 列表（按時間順序）
+    """
+    # 排序並合併重疊 / 相接嘅段落
+    merged: List[List[float]] = []
+    for start, end in sorted(speech_regions):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    windows: List[SpeechWindow] = []
+    current = SpeechWindow()
+
+    for start, end in merged:
+        while start < end:
+            offset = current.duration + (separator if current.pieces else 0.0)
+            room = max_window - offset
+            length = end - start
+
+            if length > room:
+                # 放唔落：有其他段就開新窗口；空窗口就切開呢段
+                if current.pieces and length <= max_window:
+                    windows.append(current)
+                    current = SpeechWindow()
+                    continue
+                if current.pieces and room < 1.0:
+                    windows.append(current)
+                    current = SpeechWindow()
+                    continue
+                length = room
+
+            current.pieces.append(RemapPiece(window_start=offset, source_start=start, duration=length))
+            start += length
+
+    if current.pieces:
+        windows.append(current)
+
+    return windows
+
+
+def build_window_audio(audio: np.ndarray, sr: int, window: SpeechWindow) -> np.ndarray:
+    """按重映射表拼接窗口音頻（段之間填靜音）"""
+    out = np.zeros(int(round(window.duration * sr)), dtype=np.float32)
+    for piece in window.pieces:
+        src = audio[int(piece.source_start * sr):int(piece.source_end * sr)]
+        dst_start = int(piece.window_start * sr)
+        src = src[:len(out) - dst_start]
+        out[dst_start:dst_start + len(src)] = src
+    return out
@@ -0,0 +1,252 @@
+"""
+多詞替換引擎 - 一次過套用成本字典
+
+錯字表 / 粵語字典 / 粗口表 / 用戶詞彙以前逐條 str.replace，每段字幕掃幾百次。
+TextReplacer 每本字典只建一次：
+1. LONGEST（預設）：字典樹，由左到右一次掃描，每個位置揀最長嘅詞（leftmost-longest），
+   替換後嘅文字唔會再被匹配
+2. CHAINED（兼容模式）：結果同按次序逐條 str.replace 完全一樣（後面嘅規則會匹配前面替換出嚟嘅字），
+   但只試索引字出現喺文字入面嘅規則
+
+Usage:
+    replacer = TextReplacer({"點解": "為什麼", "佢": "他"})
+    replacer.replace("佢點解唔嚟")  # → "他為什麼唔嚟"
+
+    legacy = TextReplacer(CORRECTIONS, mode=CHAINED)  # 依賴替換次序嘅舊表
+"""
+
+import re
+from bisect import bisect_right
+from heapq import heapify, heappop, heappush
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+LONGEST = "longest"
+CHAINED = "chained"
+
+# 編譯後內部結構（字典樹 / 索引，見 to_state）嘅格式版本：改咗就加一，資源包入面嘅舊替換器會自動重建
+TEXT_REPLACER_FORMAT = 1
+
+_END = ""  # 字典樹終點標記（詞本身唔會係空字串）
+
+Pairs = Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+
+
+class TextReplacer:
+    """
+    Compiled multi-pattern replacer for one dictionary.
+
+    Empty patterns are ignored and patterns mapped to themselves are dropped
+    (they never change the text). In LONGEST mode a pattern listed twice keeps
+    its first replacement; in CHAINED mode every rule is kept in order, exactly
+    like the str.replace loop it replaces.
+    """
+
+    def __init__(self, pairs: Pairs, mode: str = LONGEST):
+        """
+        Args:
+            pairs: dict 或 (詞, 替換) 序列；CHAINED 模式下次序就係替換次序
+            mode: LONGEST 或 CHAINED
+        """
+        if mode not in (LONGEST, CHAINED):
+            raise ValueError(f"Unknown replacement mode: {mode}")
+        self.mode = mode
+        items = pairs.items() if isinstance(pairs, Mapping) else pairs
+        self._rules: List[Tuple[str, str]] = [
+            (pattern, replacement) for pattern, replacement in items
+            if pattern and pattern != replacement
+        ]
+        if mode == LONGEST:
+            self._build_trie()
+        else:
+            self._build_index()
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    # ==================== 序列化 ====================
+
+    def to_state(self) -> Dict:
+        """編譯結果（純 JSON 資料：規則 + 字典樹 / 索引），資源包用"""
+        state = {'mode': self.mode, 'rules': [list(rule) for rule in self._rules]}
+        if self.mode == LONGEST:
+            state['trie'] = self._root
+        else:
+            state['by_char'] = self._by_char
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'TextReplacer':
+        """
+        由 to_state() 嘅資料重建（唔使重新編譯）
+
+        資料嚟自磁碟快取，所以先檢查結構；唔啱就 raise ValueError。
+        """
+        mode = state.get('mode')
+        rules = state.get('rules')
+        if mode not in (LONGEST, CHAINED) or not isinstance(rules, list):
+            raise ValueError("invalid replacer state")
+        if not all(isinstance(rule, list) and len(rule) == 2
+                   and isinstance(rule[0], str) and isinstance(rule[1], str) and rule[0]
+                   for rule in rules):
+            raise ValueError("invalid replacer rules")
+
+        replacer = cls.__new__(cls)
+        replacer.mode = mode
+        replacer._rules = [(pattern, replacement) for pattern, replacement in rules]
+        if mode == LONGEST:
+            root = state.get('trie')
+            _check_trie(root)
+            replacer._root = root
+            replacer._start_re = re.compile("[" + "".join(re.escape(c) for c in root) + "]") if root else None
+        else:
+            by_char = state.get('by_char')
+            if not isinstance(by_char, dict):
+                raise ValueError("invalid replacer index")
+            for char, indexes in by_char.items():
+                if (len(char) != 1 or not isinstance(indexes, list)
+                        or not all(isinstance(i, int) and 0 <= i < len(rules) for i in indexes)
+                        or indexes != sorted(indexes)):
+                    raise ValueError("invalid replacer index")
+            replacer._by_char = by_char
+            replacer._index_chars = frozenset(by_char)
+        return replacer
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    # ==================== 建立 ====================
+
+    def _build_trie(self):
+        root: Dict = {}
+        for pattern, replacement in self._rules:
+            node = root
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node.setdefault(_END, replacement)
+        self._root = root
+        # 只喺可能開始一個詞嘅位置先行字典樹（C 層面跳過其他字）
+        self._start_re = re.compile("[" + "".join(re.escape(c) for c in root) + "]") if root else None
+
+    def _build_index(self):
+        # 每條規則掛喺佢最少規則用到嘅字（篩得最準）；文字冇呢個字，規則就唔會生效
+        usage: Dict[str, int] = {}
+        for pattern, _ in self._rules:
+            for char in set(pattern):
+                usage[char] = usage.get(char, 0) + 1
+        by_char: Dict[str, List[int]] = {}
+        for index, (pattern, _) in enumerate(self._rules):
+            key_char = min(pattern, key=lambda c: (usage[c], c))
+            by_char.setdefault(key_char, []).append(index)
+        self._by_char = by_char
+        self._index_chars = frozenset(by_char)
+
+    # ==================== 替換 ====================
+
+    def replace(self, text: str, fired: Optional[List[Tuple[str, str]]] = None) -> str:
+        """
+        套用成本字典
+
+        Args:
+            text: 原文
+            fired: 傳入 list 就記錄實際生效嘅 (詞, 替換)（日誌用）
+        """
+        if not text or not self._rules:
+            return text
+        if self.mode == LONGEST:
+            return self._replace_longest(text, fired)
+        return self._replace_chained(text, fired)
+
+    def _replace_longest(self, text: str, fired) -> str:
+        root = self._root
+        search = self._start_re.search
+        n = len(text)
+        pieces = []
+        last = 0
+        match = search(text)
+        while match is not None:
+            i = match.start()
+            node = root[text[i]]
+            end = -1
+            replacement = None
+            if _END in node:
+                end, replacement = i + 1, node[_END]
+            j = i + 1
+            while j < n:
+                node = node.get(text[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    end, replacement = j, node[_END]
+            if end < 0:
+                match = search(text, i + 1)
+                continue
+            pieces.append(text[last:i])
+            pieces.append(replacement)
+            if fired is not None:
+                fired.append((text[i:end], replacement))
+            last = end
+            match = search(text, end)
+        if not pieces:
+            return text
+        pieces.append(text[last:])
+        return "".join(pieces)
+
+    def _replace_chained(self, text: str, fired) -> str:
+        # 一條規則只可能喺佢嘅索引字出現喺（當時）文字入面先生效。
+        # chars 係文字出現過嘅字嘅超集：替換只會加入替換字串嘅字，所以按規則次序
+        # 行一個 heap，規則生效時再加入「索引字係新字、排喺後面」嘅規則，結果同逐條 replace 一樣。
+        rules = self._rules
+        by_char = self._by_char
+        chars = set(text)
+        heap = [index for char in chars & self._index_chars for index in by_char[char]]
+        if not heap:
+            return text
+        heapify(heap)
+        last = -1
+        while heap:
+            index = heappop(heap)
+            if index <= last:
+                continue
+            last = index
+            pattern, replacement = rules[index]
+            if pattern not in text:
+                continue
+            text = text.replace(pattern, replacement)
+            if fired is not None:
+                fired.append((pattern, replacement))
+            for char in replacement:
+                if char in chars:
+                    continue
+                chars.add(char)
+                later = by_char.get(char)
+                if later:
+                    for j in later[bisect_right(later, index):]:
+                        heappush(heap, j)
+        return text
+
+
+def _check_trie(root):
+    """字典樹結構檢查：節點係 dict，子節點 key 係單個字，終點值係字串"""
+    if not isinstance(root, dict):
+        raise ValueError("invalid replacer trie")
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for key, value in node.items():
+            if key == _END:
+                if not isinstance(value, str):
+                    raise ValueError("invalid replacer trie")
+            elif len(key) != 1 or not isinstance(value, dict):
+                raise ValueError("invalid replacer trie")
+            else:
+                stack.append(value)
+
+
+def chained_replace(text: str, pairs: Pairs) -> str:
+    """參考實現：逐條 str.replace（測試 / 基準測試對照用）"""
+    items = pairs.items() if isinstance(pairs, Mapping) else pairs
+    for pattern, replacement in items:
+        if pattern and pattern in text:
+            text = text.replace(pattern, replacement)
+    return text
@@ -0,0 +1,175 @@
+"""
+轉錄斷點續傳
+
+每完成一個 chunk 就將 ASR 結果追加寫入該 job 嘅 checkpoint 文件（JSON Lines）。
+程式崩潰或者用戶取消之後，用相同輸入同設定重新轉錄會跳過已完成嘅 chunk。
+
+Job key = 音頻內容 hash + 轉錄設定，所以改咗模型 / prompt / 模式都會開新 checkpoint。
+成功完成之後 checkpoint 會被刪除；冇再續傳嘅舊 checkpoint（失敗 / 取消後冇重試、
+改咗設定）超過 checkpoint_max_age_days 冇更新就喺下次開 job 時清走。
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Union
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+CHECKPOINT_VERSION = 1
+
+# 默認保留日數（config 冇設定時）
+DEFAULT_MAX_AGE_DAYS = 7
+
+# 每個進程每個目錄只清理一次
+_pruned_dirs = set()
+_pruned_lock = threading.Lock()
+
+
+class CheckpointSegment(SimpleNamespace):
+    """從 checkpoint 還原嘅段落（保留原本所有欄位，用屬性存取）"""
+
+
+def _to_plain(value):
+    """將 segment / word 轉成可 JSON 序列化嘅 dict"""
+    if isinstance(value, dict):
+        data = dict(value)
+    elif dataclasses.is_dataclass(value):
+        data = dataclasses.asdict(value)
+    elif hasattr(value, '_asdict'):  # namedtuple（faster-whisper Segment / Word）
+        data = value._asdict()
+    else:
+        data = dict(vars(value))
+
+    words = data.get('words')
+    if words:
+        data['words'] = [_to_plain(w) for w in words]
+    return data
+
+
+def prune_checkpoints(directory: Union[str, Path], max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+                      now: Optional[float] = None) -> int:
+    """
+    刪除超過 max_age_days 冇更新嘅 checkpoint 文件
+
+    Args:
+        directory: checkpoint 目錄
+        max_age_days: 保留日數（<= 0 代表唔清理）
+        now: 當前時間（測試用）
+
+    Returns:
+        刪除咗幾多個文件
+    """
+    directory = Path(directory)
+    if not max_age_days or max_age_days <= 0 or not directory.is_dir():
+        return 0
+    cutoff = (now if now is not None else time.time()) - max_age_days * 86400
+    removed = 0
+    for path in directory.glob("*.jsonl"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    if removed:
+        logger.info(f"🧹 清理咗 {removed} 個過期 checkpoint")
+    return removed
+
+
+def chunk_key(stage: str, start: float, end: float) -> str:
+    """chunk 嘅 checkpoint 鍵（按時間範圍，毫秒精度）"""
+    return f"{stage}:{start:.3f}-{end:.3f}"
+
+
+class TranscriptionCheckpoint:
+    """單個轉錄 job 嘅 checkpoint 文件"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._chunks: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def for_job(cls, config, audio_path: Union[str, Path], settings: Dict) -> "TranscriptionCheckpoint":
+        """
+        按音頻內容同轉錄設定打開（或新建）checkpoint
+
+        Args:
+            config: 應用配置（用 cache_dir）
+            audio_path: 轉錄用嘅音頻
+            settings: 影響 ASR 輸出嘅設定（模型、模式、prompt 等）
+        """
+        from utils.audio_cache import get_audio_cache
+
+        audio_hash = get_audio_cache(config).content_hash(audio_path)
+        payload = json.dumps(
+            {'version': CHECKPOINT_VERSION, 'audio': audio_hash, 'settings': settings},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        job_key = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+        cache_dir = config.get('cache_dir') if config is not None else None
+        base = Path(cache_dir) if cache_dir else Path(tempfile.gettempdir()) / "canto_beats_v2"
+        directory = base / "checkpoints"
+        with _pruned_lock:
+            first_open = directory not in _pruned_dirs
+            _pruned_dirs.add(directory)
+        if first_open:
+            max_age = config.get('checkpoint_max_age_days', DEFAULT_MAX_AGE_DAYS) if config is not None else DEFAULT_MAX_AGE_DAYS
+            prune_checkpoints(directory, max_age)
+        return cls(directory / f"{job_key}.jsonl")
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self._chunks[record['chunk']] = record['segments']
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # 崩潰時寫咗一半嘅最後一行，忽略
+                    continue
+        if self._chunks:
+            logger.info(f"♻️ 載入 checkpoint: {len(self._chunks)} 個已完成 chunk ({self.path.name})")
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._chunks
+
+    def get(self, key: str) -> Optional[List[CheckpointSegment]]:
+        """已完成 chunk 嘅段落；未完成返回 None"""
+        segments = self._chunks.get(key)
+        if segments is None:
+            return None
+        return [CheckpointSegment(**seg) for seg in segments]
+
+    def put(self, key: str, segments: Iterable):
+        """記錄一個已完成 chunk（追加寫入並 fsync）"""
+        plain = [_to_plain(seg) for seg in segments]
+        line = json.dumps({'chunk': key, 'segments': plain}, ensure_ascii=False, default=float)
+        with self._lock:
+            self._chunks[key] = plain
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def discard(self):
+        """job 完成，刪除 checkpoint"""
+        with self._lock:
+            self._chunks.clear()
+            self.path.unlink(missing_ok=True)
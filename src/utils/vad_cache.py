@@ -0,0 +1,175 @@
+"""
+VAD 結果快取
+
+VAD 只取決於音頻同 VAD 參數，同一段音頻（標準模式嘅 VAD 斷句、終極模式嘅 vad_presplit、
+串聯模式草稿 / 精修兩次後處理、同一個檔案再轉錄）唔使重新計：
+1. Key = 音頻內容 hash（音頻快取嘅取樣 hash）+ VAD 參數
+2. 進程內保留原本嘅段落物件（LRU）；磁碟存 JSON（cache_dir/vad），下次開程式都用得返
+3. CachingVADProcessor 包住 VADProcessor，detect_voice_segments 自動行快取，其他方法照舊
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from utils.logger import setup_logger
+from utils.transcription_checkpoint import CheckpointSegment, _to_plain
+
+logger = setup_logger()
+
+VAD_CACHE_VERSION = 1
+
+
+class VADCache:
+    """音頻 hash + VAD 參數 → 語音段落"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_memory_entries: int = 32,
+        content_hash: Optional[Callable[[Union[str, Path]], str]] = None
+    ):
+        """
+        Args:
+            cache_dir: 磁碟快取目錄（None = 只用記憶體）
+            max_memory_entries: 記憶體入面保留幾多個檔案嘅結果
+            content_hash: 音頻內容 hash 函數（預設用音頻快取嘅取樣 hash）
+        """
+        self._content_hash = content_hash
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, List]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, audio_path: Union[str, Path], params: Dict) -> str:
+        """音頻內容 + VAD 參數嘅快取 key"""
+        if self._content_hash is None:
+            from utils.audio_cache import get_audio_cache
+            self._content_hash = get_audio_cache().content_hash
+        audio_hash = self._content_hash(audio_path)
+        payload = json.dumps(
+            {'version': VAD_CACHE_VERSION, 'audio': audio_hash, 'params': params},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / f"{key}.json" if self.cache_dir is not None else None
+
+    def get(self, key: str) -> Optional[List]:
+        with self._lock:
+            segments = self._memory.get(key)
+            if segments is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return list(segments)
+
+        path = self._path(key)
+        if path is not None and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    segments = [CheckpointSegment(**seg) for seg in json.load(f)['segments']]
+            except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+                logger.warning(f"Dropping unreadable VAD cache entry {key}: {e}")
+                path.unlink(missing_ok=True)
+            else:
+                self._remember(key, segments)
+                with self._lock:
+                    self.hits += 1
+                return list(segments)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, segments: List):
+        self._remember(key, list(segments))
+        path = self._path(key)
+        if path is None:
+            return
+        tmp_path = path.with_suffix(f".tmp-{os.getpid()}-{threading.get_ident()}")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'segments': [_to_plain(seg) for seg in segments]}, f, default=float)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write VAD cache entry {key}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, segments: List):
+        with self._lock:
+            self._memory[key] = segments
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+
+class CachingVADProcessor:
+    """
+    VADProcessor 外殼：detect_voice_segments 先查 VADCache，其他屬性 / 方法轉交原本嘅 processor
+
+    同一個 key 同時只計一次（第二個線程會等第一個計完再讀快取）。
+    """
+
+    _key_locks: Dict[str, threading.Lock] = {}
+    _key_locks_guard = threading.Lock()
+
+    def __init__(self, vad_processor, params: Dict, cache: Optional[VADCache] = None):
+        """
+        Args:
+            vad_processor: 真正嘅 VADProcessor
+            params: 建立 vad_processor 用嘅參數（構成快取 key）
+            cache: VADCache（None = 用全局實例）
+        """
+        self._vad = vad_processor
+        self._params = dict(params)
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self._vad, name)
+
+    def detect_voice_segments(self, audio_path, *args, **kwargs):
+        cache = self._cache if self._cache is not None else get_vad_cache()
+        try:
+            key = cache.make_key(audio_path, {'params': self._params, 'args': args, 'kwargs': kwargs})
+        except Exception as e:
+            logger.debug(f"VAD cache key unavailable, running VAD: {e}")
+            return self._vad.detect_voice_segments(audio_path, *args, **kwargs)
+
+        with self._key_locks_guard:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                logger.info(f"♻️ VAD cache hit: {len(cached)} voice segments")
+                return cached
+            segments = self._vad.detect_voice_segments(audio_path, *args, **kwargs)
+            cache.put(key, segments)
+            return segments
+
+
+# ==================== 便利函數 ====================
+
+_cache_instance: Optional[VADCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_vad_cache(config=None) -> VADCache:
+    """獲取全局 VAD 快取實例"""
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            if config is None:
+                from core.config import Config
+                config = Config()
+            cache_dir = config.get('cache_dir')
+            _cache_instance = VADCache(Path(cache_dir) / 'vad' if cache_dir else None)
+        return _cache_instance
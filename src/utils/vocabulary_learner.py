@@ -16,6 +16,7 @@ from collections import Counter
 from datetime import datetime
 
 from utils.logger import setup_logger
+from utils.text_replacer import CHAINED, TextReplacer
 
 logger = setup_logger()
 
@@ -60,6 +61,7 @@ class VocabularyLearner:
         # 加載現有數據
         self.vocabulary: Dict[str, VocabularyEntry] = {}
         self.corrections_history: List[Dict] = []
+        self._replacer: Optional[TextReplacer] = None  # auto_correct 用，詞彙改變時重建
 
         self._load_data()
 
@@ -89,6 +91,9 @@ class VocabularyLearner:
 
     def _save_data(self):
         """保存詞彙數據"""
+        # 所有改動詞彙嘅操作都會保存：順便令 auto_correct 嘅替換表失效
+        self._replacer = None
+
         # 保存詞彙庫
         try:
             vocab_data = {
@@ -216,21 +221,8 @@ class VocabularyLearner:
         if not self.vocabulary:
             return text
 
-        result = text
         corrections_made = []
-
-        # 按頻率排序（高頻詞優先）
-        sorted_vocab = sorted(
-            self.vocabulary.items(),
-            key=lambda x: x[1].frequency,
-            reverse=True
-        )
-
-        for correct_word, entry in sorted_vocab:
-            for wrong in entry.wrong_variants:
-                if wrong in result:
-                    result = result.replace(wrong, correct_word)
-                    corrections_made.append((wrong, correct_word))
+        result = self._get_replacer().replace(text, corrections_made)
 
         if corrections_made:
             logger.info(f"📝 自動校正 {len(corrections_made)} 處")
@@ -239,6 +231,20 @@ class VocabularyLearner:
 
         return result
 
+    def _get_replacer(self) -> TextReplacer:
+        """所有錯誤變體編譯成一個替換表（按頻率排序，高頻詞優先）"""
+        if self._replacer is None:
+            sorted_vocab = sorted(
+                self.vocabulary.items(),
+                key=lambda x: x[1].frequency,
+                reverse=True
+            )
+            self._replacer = TextReplacer(
+                [(wrong, correct_word) for correct_word, entry in sorted_vocab for wrong in entry.wrong_variants],
+                mode=CHAINED
+            )
+        return self._replacer
+
     # ==================== Whisper Prompt 生成 ====================
 
     def generate_whisper_prompt(
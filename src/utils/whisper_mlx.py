@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Optional, Dict, List, Union
 from dataclasses import dataclass
 
+from utils.asr_utils import mlx_repo_id
 from utils.logger import setup_logger
 
 logger = setup_logger()
@@ -60,6 +61,9 @@ class MLXTranscriptionSegment:
     confidence: float = 1.0
     language: str = "yue"
     words: List[Dict] = None
+    avg_logprob: Optional[float] = None
+    compression_ratio: Optional[float] = None
+    no_speech_prob: float = 0.0
 
 
 class MLXWhisperASR:
@@ -75,17 +79,21 @@ class MLXWhisperASR:
     
     _mlx_available = None
     
-    def __init__(self, model_size: str = "large-v3"):
+    def __init__(self, model_size: str = "large-v3", repo_id: Optional[str] = None):
         """
         Initialize MLX Whisper ASR.
         
         Args:
             model_size: Model size (e.g., "large-v3", "medium", "small", "base", "tiny")
+            repo_id: MLX checkpoint to load instead of mlx-community/whisper-{model_size}-mlx
         """
         self.model_size = model_size
+        self.repo_id = repo_id or mlx_repo_id(model_size)
         self.model = None
         self.is_loaded = False
         self._backend_type = None
+        self._feature_cache = None
+        self._feature_cache_checked = False
     
     @classmethod
     def is_available(cls) -> bool:
@@ -208,7 +216,7 @@ class MLXWhisperASR:
         if not self.is_available():
             raise RuntimeError("MLX Whisper is not available on this system")
 
-        logger.info(f"🍎 Loading MLX Whisper model: {self.model_size}")
+        logger.info(f"🍎 Loading MLX Whisper model: {self.repo_id}")
         
         if progress_callback:
             progress_callback("正在準備 AI 工具...")
@@ -217,8 +225,7 @@ class MLXWhisperASR:
             import mlx_whisper
             from huggingface_hub import snapshot_download, try_to_load_from_cache
 
-            # MLX Whisper uses model paths like "mlx-community/whisper-large-v3-mlx"
-            model_path = f"mlx-community/whisper-{self.model_size}-mlx"
+            model_path = self.repo_id
             
             # Check if model is already cached
             cache_result = try_to_load_from_cache(model_path, "config.json")
@@ -312,6 +319,59 @@ class MLXWhisperASR:
         audio_path = Path(audio_path)
         logger.info(f"🍎 Transcribing with MLX Whisper: {audio_path.name}")
         
+        return self._transcribe_input(
+            str(audio_path), language, task, initial_prompt, word_timestamps, **kwargs
+        )
+    
+    def transcribe_array(
+        self,
+        audio,
+        sample_rate: int = 16000,
+        language: str = "yue",
+        task: str = "transcribe",
+        initial_prompt: Optional[str] = None,
+        word_timestamps: bool = True,
+        **kwargs
+    ) -> Dict:
+        """
+        Transcribe an in-memory waveform using MLX Whisper.
+        
+        Same options and return value as ``transcribe``, but skips the
+        temp-WAV write and the ffmpeg decode subprocess entirely.
+        
+        Args:
+            audio: NumPy array or torch tensor (mono or channels-first/last)
+            sample_rate: Sample rate of ``audio``; resampled to 16kHz if different
+            language: Language code (e.g., "yue" for Cantonese)
+            task: "transcribe" or "translate"
+            initial_prompt: Optional prompt to guide the model
+            word_timestamps: Enable word-level timestamps
+            **kwargs: Additional options
+            
+        Returns:
+            Dict with transcription results
+        """
+        if not self.is_loaded:
+            self.load_model()
+        
+        from utils.asr_utils import to_whisper_input
+        audio = to_whisper_input(audio, sample_rate)
+        logger.debug(f"🍎 Transcribing in-memory audio with MLX Whisper: {len(audio) / 16000:.2f}s")
+        
+        return self._transcribe_input(
+            audio, language, task, initial_prompt, word_timestamps, **kwargs
+        )
+    
+    def _transcribe_input(
+        self,
+        audio,
+        language: str,
+        task: str,
+        initial_prompt: Optional[str],
+        word_timestamps: bool,
+        **kwargs
+    ) -> Dict:
+        """Build the prompt and run mlx_whisper on a path or a 16kHz float32 array."""
         # Default Cantonese vocabulary (約 60 個常用廣東話口語字)
         DEFAULT_CANTONESE_VOCAB = (
             "佢、喺、睇、嘅、咁、啲、咗、嚟、冇、諗、唔、咩、乜、點、邊、噉、嗰、呢、哋、咪、"
@@ -395,11 +455,21 @@ class MLXWhisperASR:
             ffmpeg_full_path = get_ffmpeg_path()
             
             def _patched_load_audio(file: str, sr: int = 16000):
-                """Patched load_audio that uses full ffmpeg path."""
+                """Patched load_audio: shared audio cache first, full ffmpeg path as fallback."""
                 import subprocess
                 import numpy as np
                 import mlx.core as mx
-                
+
+                # Reuse the pipeline's decoded WAV instead of spawning ffmpeg again
+                try:
+                    import soundfile as sf
+                    from utils.audio_cache import get_audio_cache
+                    wav_path = get_audio_cache().get_wav(file, sample_rate=sr)
+                    data, _ = sf.read(str(wav_path), dtype='float32')
+                    return mx.array(data).flatten()
+                except Exception as e:
+                    logger.debug(f"Audio cache unavailable for {file}, using ffmpeg: {e}")
+
                 cmd = [
                     ffmpeg_full_path,  # Use absolute path instead of 'ffmpeg'
                     "-nostdin",
@@ -433,22 +503,38 @@ class MLXWhisperASR:
             
             # Transcribe using MLX Whisper with optimized parameters
             # NOTE: MLX Whisper doesn't support beam_size/best_of yet
+            if kwargs.pop("beam_size", None) not in (None, 1):
+                logger.debug("MLX Whisper has no beam search, decoding greedily")
+            kwargs.pop("best_of", None)
+            # Callers may request a temperature fallback schedule (e.g. adaptive decoding retries)
+            temperature = kwargs.pop("temperature", 0.0)
+
+            # Reuse cached log-mel / encoder outputs when only the prompt changed
+            from utils.feature_cache import feature_cache_scope
+            feature_cache = self._get_feature_cache()
+
             # 修復字幕辨識錯誤：調整參數以提升準確度
-            result = mlx_whisper.transcribe(
-                str(audio_path),
-                path_or_hf_repo=self.model_path,
-                language=language,
-                task=task,
-                initial_prompt=initial_prompt,
-                word_timestamps=word_timestamps,
-                # Optimization parameters (MLX compatible only)
-                temperature=0.0,                    # Deterministic output (no randomness)
-                condition_on_previous_text=True,    # Use context from previous segments
-                no_speech_threshold=0.4,            # 降低 no_speech 閾值（0.6→0.4），減少靜音誤判
-                logprob_threshold=-0.8,             # 降低 logprob 閾值（-1.0→-0.8），保留更多低信心段落
-                compression_ratio_threshold=2.4,    # 放寬壓縮率閾值（2.4→2.4），減少重複檢測誤殺
-                **kwargs
-            )
+            # MLX is not thread-safe: a background MLX Qwen prefetch must not run alongside
+            from utils.mlx_lock import MLX_LOCK
+            with MLX_LOCK, feature_cache_scope(feature_cache, self.model_path):
+                result = mlx_whisper.transcribe(
+                    audio,
+                    path_or_hf_repo=self.model_path,
+                    language=language,
+                    task=task,
+                    initial_prompt=initial_prompt,
+                    word_timestamps=word_timestamps,
+                    # Optimization parameters (MLX compatible only)
+                    temperature=temperature,            # Deterministic output (no randomness) unless a fallback is requested
+                    condition_on_previous_text=True,    # Use context from previous segments
+                    no_speech_threshold=0.4,            # 降低 no_speech 閾值（0.6→0.4），減少靜音誤判
+                    logprob_threshold=-0.8,             # 降低 logprob 閾值（-1.0→-0.8），保留更多低信心段落
+                    compression_ratio_threshold=2.4,    # 放寬壓縮率閾值（2.4→2.4），減少重複檢測誤殺
+                    **kwargs
+                )
+            if feature_cache is not None:
+                feature_cache.flush()
+                logger.debug(f"Feature cache: {feature_cache.stats()}")
             
             # Extract segments
             segment_list = self._extract_segments(result.get('segments', []), language)
@@ -470,6 +556,19 @@ class MLXWhisperASR:
             logger.error(f"MLX transcription failed: {e}")
             raise
     
+    def _get_feature_cache(self):
+        """Mel / encoder feature cache for prompt-only reruns (None if disabled or unavailable)."""
+        if not self._feature_cache_checked:
+            self._feature_cache_checked = True
+            try:
+                from utils.feature_cache import get_feature_cache, install_mlx_feature_cache
+                cache = get_feature_cache()
+                if cache is not None and install_mlx_feature_cache():
+                    self._feature_cache = cache
+            except Exception as e:
+                logger.debug(f"Feature cache unavailable: {e}")
+        return self._feature_cache
+
     def _extract_segments(self, segments: List[Dict], language: str) -> List[MLXTranscriptionSegment]:
         """
         Extract segments from MLX Whisper output with confidence filtering.
@@ -505,7 +604,10 @@ class MLXWhisperASR:
                 text=seg.get('text', ''),
                 confidence=1.0 - no_speech_prob,  # Convert to confidence score
                 language=language,
-                words=words
+                words=words,
+                avg_logprob=seg.get('avg_logprob'),
+                compression_ratio=seg.get('compression_ratio'),
+                no_speech_prob=no_speech_prob
             )
             segment_list.append(segment)
         
@@ -536,6 +638,7 @@ class MLXWhisperASR:
         """Get information about the loaded model."""
         return {
             'model_size': self.model_size,
+            'repo_id': self.repo_id,
             'is_loaded': self.is_loaded,
             'backend': 'mlx-whisper',
             'device': self.get_backend_type(),
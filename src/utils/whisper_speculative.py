@@ -0,0 +1,326 @@
+"""
+Speculative Whisper backend (CPU) - large-v3 verified against a small draft model.
+
+Uses HuggingFace transformers + PyTorch. The Cantonese fine-tunes
+(cantonese_model_flagship / cantonese_model_lite) are published as
+transformers checkpoints, so both load directly. Decoding is greedy and
+token-identical to large-v3 on its own; the draft model only reduces the
+number of large-v3 decoder passes (see utils.speculative_decoding).
+"""
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from utils.asr_utils import WHISPER_SAMPLE_RATE, to_whisper_input
+from utils.logger import setup_logger
+from utils.speculative_decoding import (
+    DecoderSession, SpeculativeStats, VocabMap, WhisperLogitFilter,
+    speculative_greedy_decode, split_timestamped_tokens
+)
+
+logger = setup_logger()
+
+try:
+    import torch
+    from transformers import WhisperForConditionalGeneration, WhisperProcessor
+    HAS_TRANSFORMERS = True
+except ImportError:
+    HAS_TRANSFORMERS = False
+
+WINDOW_SAMPLES = 30 * WHISPER_SAMPLE_RATE
+MAX_PROMPT_TOKENS = 223  # Whisper 448 token context 嘅一半留俾提示
+
+
+@dataclass
+class SpeculativeSegment:
+    """A segment of transcribed text with timing information."""
+    id: int
+    start: float
+    end: float
+    text: str
+    confidence: float = 1.0
+    language: str = "yue"
+    words: List[Dict] = field(default_factory=list)
+    avg_logprob: Optional[float] = None
+    compression_ratio: Optional[float] = None
+    no_speech_prob: Optional[float] = None
+
+
+def _crop_cache(cache, length: int):
+    """Truncate a decoder KV cache to ``length`` positions (Cache object or legacy tuples)."""
+    if hasattr(cache, 'crop'):
+        cache.crop(length)
+        return cache
+    # Legacy format: per layer (self_k, self_v, cross_k, cross_v)
+    return tuple(
+        (layer[0][:, :, :length], layer[1][:, :, :length]) + tuple(layer[2:])
+        for layer in cache
+    )
+
+
+class _WhisperModel:
+    """One transformers Whisper checkpoint plus the ids greedy decoding needs."""
+
+    def __init__(self, model_id: str, device: str = "cpu"):
+        self.model_id = model_id
+        self.device = device
+        self.processor = WhisperProcessor.from_pretrained(model_id)
+        self.model = WhisperForConditionalGeneration.from_pretrained(
+            model_id, torch_dtype=torch.float32
+        ).to(device).eval()
+
+        tokenizer = self.processor.tokenizer
+        generation = self.model.generation_config
+        self.eot = generation.eos_token_id
+        self.no_timestamps = tokenizer.convert_tokens_to_ids("<|notimestamps|>")
+        self.timestamp_begin = self.no_timestamps + 1
+        self.logit_filter = WhisperLogitFilter(
+            eot=self.eot,
+            timestamp_begin=self.timestamp_begin,
+            no_timestamps=self.no_timestamps,
+            suppress_tokens=getattr(generation, 'suppress_tokens', None) or (),
+            begin_suppress_tokens=getattr(generation, 'begin_suppress_tokens', None) or (),
+        )
+
+    def special(self, token: str) -> Optional[int]:
+        token_id = self.processor.tokenizer.convert_tokens_to_ids(token)
+        return None if token_id == self.processor.tokenizer.unk_token_id else token_id
+
+    def prompt_ids(self, language: str, task: str, initial_prompt: Optional[str]) -> List[int]:
+        """[<|startofprev|> prompt...] <|startoftranscript|> <|lang|> <|task|>"""
+        tokenizer = self.processor.tokenizer
+        ids = []
+        if initial_prompt:
+            text_ids = tokenizer.encode(" " + initial_prompt.strip(), add_special_tokens=False)
+            ids = [self.special("<|startofprev|>")] + text_ids[-MAX_PROMPT_TOKENS:]
+        # 細模型冇 <|yue|>（large-v3 先加），用 <|zh|>
+        language_id = self.special(f"<|{language}|>") or self.special("<|zh|>")
+        ids += [self.special("<|startoftranscript|>"), language_id, self.special(f"<|{task}|>")]
+        return ids
+
+    def encode(self, window: np.ndarray):
+        features = self.processor.feature_extractor(
+            window, sampling_rate=WHISPER_SAMPLE_RATE, return_tensors="pt"
+        ).input_features.to(self.device)
+        with torch.inference_mode():
+            return self.model.get_encoder()(features).last_hidden_state
+
+
+class WhisperDecoderSession(DecoderSession):
+    """Incremental transformers Whisper decoder over one encoded window (KV cached)."""
+
+    def __init__(self, whisper: _WhisperModel, encoder_out, prompt: Sequence[int]):
+        self.whisper = whisper
+        self.encoder_out = encoder_out
+        self.prompt = list(prompt)
+        self.tokens: List[int] = []
+        self._cache = None
+
+    @property
+    def length(self) -> int:
+        return len(self.tokens)
+
+    def _forward(self, ids: Sequence[int]) -> np.ndarray:
+        with torch.inference_mode():
+            out = self.whisper.model(
+                encoder_outputs=(self.encoder_out,),
+                decoder_input_ids=torch.tensor([list(ids)], device=self.whisper.device),
+                past_key_values=self._cache,
+                use_cache=True,
+            )
+        self._cache = out.past_key_values
+        return out.logits[0].float().cpu().numpy()
+
+    def start(self) -> np.ndarray:
+        logits = self._forward(self.prompt)[-1]
+        return self.whisper.logit_filter.apply([], logits)
+
+    def score(self, tokens: Sequence[int]) -> np.ndarray:
+        if not tokens:
+            raise ValueError("score() needs at least one token")
+        rows = self._forward(tokens)
+        history = self.tokens
+        filtered = np.empty_like(rows)
+        for i, token in enumerate(tokens):
+            filtered[i] = self.whisper.logit_filter.apply(history + list(tokens[:i + 1]), rows[i])
+        self.tokens = history + list(tokens)
+        return filtered
+
+    def rollback(self, length: int):
+        if length < len(self.tokens):
+            self.tokens = self.tokens[:length]
+            self._cache = _crop_cache(self._cache, len(self.prompt) + length)
+
+
+class SpeculativeWhisperASR:
+    """
+    CPU Whisper backend with optional speculative decoding.
+
+    Without a draft model this is plain greedy large-v3. With one, the draft
+    proposes ``num_draft_tokens`` tokens per step and large-v3 verifies them
+    in a single decoder pass; the transcript is the same either way.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        draft_model_id: Optional[str] = None,
+        num_draft_tokens: int = 5,
+        device: str = "cpu"
+    ):
+        """
+        Initialize speculative Whisper ASR.
+
+        Args:
+            model_id: transformers checkpoint to transcribe with (e.g. whisper-large-v3-cantonese)
+            draft_model_id: Smaller checkpoint proposing tokens; None disables speculation
+            num_draft_tokens: Tokens proposed per verification pass
+            device: torch device
+        """
+        self.model_id = model_id
+        self.draft_model_id = draft_model_id
+        self.num_draft_tokens = num_draft_tokens
+        self.device = device
+        self.target = None
+        self.draft = None
+        self.vocab_map = None
+        self.is_loaded = False
+        self.last_stats = SpeculativeStats()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return HAS_TRANSFORMERS
+
+    def get_backend_type(self) -> str:
+        return self.device
+
+    def load_model(self, progress_callback=None):
+        """Load the target (and draft) checkpoints."""
+        if self.is_loaded:
+            return
+        if not HAS_TRANSFORMERS:
+            raise RuntimeError("transformers / torch not installed, speculative Whisper unavailable")
+
+        if progress_callback:
+            progress_callback("正在加載 AI 工具...")
+        logger.info(f"Loading transformers Whisper: {self.model_id}")
+        self.target = _WhisperModel(self.model_id, self.device)
+        if self.draft_model_id:
+            logger.info(f"Loading draft model for speculative decoding: {self.draft_model_id}")
+            self.draft = _WhisperModel(self.draft_model_id, self.device)
+            self.vocab_map = VocabMap.for_whisper(
+                self.draft.eot, self.draft.timestamp_begin,
+                self.target.eot, self.target.timestamp_begin
+            )
+        self.is_loaded = True
+
+    def transcribe(self, audio_path: Union[str, Path], **kwargs) -> Dict:
+        """Transcribe an audio file (decoded to 16 kHz mono)."""
+        import soundfile as sf
+        audio, sr = sf.read(str(audio_path), dtype='float32')
+        return self.transcribe_array(audio, sample_rate=sr, **kwargs)
+
+    def transcribe_array(
+        self,
+        audio,
+        sample_rate: int = WHISPER_SAMPLE_RATE,
+        language: str = "yue",
+        task: str = "transcribe",
+        initial_prompt: Optional[str] = None,
+        use_draft: bool = True,
+        **kwargs
+    ) -> Dict:
+        """
+        Transcribe an in-memory waveform, 30 s at a time.
+
+        Args:
+            audio: Waveform (any layout accepted by to_whisper_input)
+            sample_rate: Sample rate of ``audio``
+            language: Language code
+            task: "transcribe" or "translate"
+            initial_prompt: Optional text prompt (custom_prompt is used if this is not given)
+            use_draft: Use the draft model when one is loaded (benchmarks turn it off)
+            **kwargs: Other backend options (ignored)
+
+        Returns:
+            Dict with 'segments', 'text', 'language' and 'speculative' stats
+        """
+        if not self.is_loaded:
+            self.load_model()
+
+        audio = to_whisper_input(audio, sample_rate)
+        initial_prompt = initial_prompt or kwargs.get('custom_prompt') or None
+        draft = self.draft if use_draft else None
+        target_prompt = self.target.prompt_ids(language, task, initial_prompt)
+        draft_prompt = draft.prompt_ids(language, task, initial_prompt) if draft else None
+
+        stats = SpeculativeStats()
+        segments: List[SpeculativeSegment] = []
+        seek = 0
+        while seek < len(audio) - WHISPER_SAMPLE_RATE // 10:
+            window = audio[seek:seek + WINDOW_SAMPLES]
+            offset = seek / WHISPER_SAMPLE_RATE
+            window_seconds = len(window) / WHISPER_SAMPLE_RATE
+
+            target_session = WhisperDecoderSession(self.target, self.target.encode(window), target_prompt)
+            started = time.perf_counter()
+            draft_session = None
+            if draft is not None:
+                draft_session = WhisperDecoderSession(draft, draft.encode(window), draft_prompt)
+            tokens, logprobs = speculative_greedy_decode(
+                target_session, draft_session, self.target.eot,
+                num_draft_tokens=self.num_draft_tokens, vocab_map=self.vocab_map, stats=stats
+            )
+            stats.decode_seconds += time.perf_counter() - started
+
+            pieces, consumed = split_timestamped_tokens(
+                tokens, logprobs, self.target.timestamp_begin, window_seconds
+            )
+            for start, end, text_ids, text_logprobs in pieces:
+                text = self.target.processor.tokenizer.decode(text_ids).strip()
+                if not text:
+                    continue
+                avg_logprob = float(np.mean(text_logprobs))
+                segments.append(SpeculativeSegment(
+                    id=len(segments),
+                    start=round(offset + start, 3),
+                    end=round(offset + min(end, window_seconds), 3),
+                    text=text,
+                    confidence=float(np.exp(avg_logprob)),
+                    language=language,
+                    avg_logprob=avg_logprob,
+                ))
+            seek += max(int(consumed * WHISPER_SAMPLE_RATE), WHISPER_SAMPLE_RATE)
+
+        self.last_stats = stats
+        if draft is not None:
+            logger.debug(
+                f"Speculative decoding: {stats.tokens} tokens, {stats.target_passes} large-model passes, "
+                f"acceptance {stats.acceptance_rate:.0%}"
+            )
+        return {
+            'segments': segments,
+            'text': "".join(seg.text for seg in segments),
+            'language': language,
+            'speculative': stats.to_dict(),
+        }
+
+    def unload_model(self):
+        """Release both checkpoints."""
+        self.target = None
+        self.draft = None
+        self.is_loaded = False
+
+    def get_model_info(self) -> Dict:
+        return {
+            'model_id': self.model_id,
+            'draft_model_id': self.draft_model_id,
+            'is_loaded': self.is_loaded,
+            'backend': 'transformers-speculative',
+            'device': self.device,
+            'available': self.is_available(),
+        }
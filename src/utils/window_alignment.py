@@ -0,0 +1,198 @@
+"""
+窄重疊窗口合併
+
+相鄰窗口只重疊幾秒（例如 30 秒窗口、3 秒重疊），ASR 總工作量約為音頻長度嘅 1.1 倍，
+而唔係 30/15 秒窗口嘅 2 倍。合併時將兩個窗口喺重疊區嘅文字逐字對齊：
+1. 搵兩邊重疊文字最長嘅共同片段（要夠長，或者佔重疊文字夠大比例，
+   否則「係咪」「唔係」呢類常見雙字詞會亂咁對齊）
+2. 喺共同片段中間切開：前半用左窗口，後半用右窗口（兩邊都避開窗口邊緣）
+3. 對唔齊（例如重疊區冇講嘢或者兩邊聽法唔同）就按信心分數揀一邊
+
+段落只需要 start / end / text / confidence / words 屬性（TranscriptionChunk 或同類 dataclass）。
+"""
+
+import dataclasses
+from difflib import SequenceMatcher
+from typing import Dict, List, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# 共同片段至少要咁多個字先信任文字對齊……
+MIN_ALIGN_CHARS = 4
+# ……或者短過呢個字數、但佔較短一邊重疊文字呢個比例以上（例如重疊區得三個字全部對上）
+MIN_ALIGN_FRACTION = 0.5
+# 無論如何最少兩個字
+MIN_ALIGN_FLOOR = 2
+
+
+def is_reliable_match(size: int, len_a: int, len_b: int) -> bool:
+    """共同片段夠唔夠可靠：夠長，或者佔較短一邊重疊文字夠大比例"""
+    if size < MIN_ALIGN_FLOOR:
+        return False
+    return size >= MIN_ALIGN_CHARS or size >= MIN_ALIGN_FRACTION * min(len_a, len_b)
+
+
+def plan_windows(total_duration: float, window_size: float, overlap: float) -> List[Tuple[float, float]]:
+    """固定長度窗口，相鄰窗口重疊 overlap 秒"""
+    if total_duration <= 0:
+        return []
+    step = max(window_size - overlap, 1e-3)
+    windows = []
+    start = 0.0
+    while True:
+        end = min(start + window_size, total_duration)
+        windows.append((start, end))
+        if end >= total_duration:
+            break
+        start += step
+    return windows
+
+
+def _word_fields(word) -> Tuple[str, float, float]:
+    if isinstance(word, dict):
+        return word.get('word', ''), word.get('start', 0.0), word.get('end', 0.0)
+    return getattr(word, 'word', ''), getattr(word, 'start', 0.0), getattr(word, 'end', 0.0)
+
+
+def _split_chunk(chunk, offset: int):
+    """
+    喺 text.strip() 嘅第 offset 個字切開段落
+
+    Returns:
+        (head, tail) - 空文字嗰邊返回 None
+    """
+    text = chunk.text.strip()
+    if offset <= 0:
+        return None, dataclasses.replace(chunk, text=text)
+    if offset >= len(text):
+        return dataclasses.replace(chunk, text=text), None
+
+    words = list(chunk.words or [])
+    head_words, tail_words = None, None
+
+    # 詞級時間戳同文字對得上就用詞邊界，否則按字數線性插值
+    if words and "".join(_word_fields(w)[0].strip() for w in words) == text:
+        consumed = 0
+        for k, word in enumerate(words):
+            consumed += len(_word_fields(word)[0].strip())
+            if consumed >= offset:
+                break
+        if consumed == offset and k + 1 < len(words):
+            head_words, tail_words = words[:k + 1], words[k + 1:]
+            head_end = _word_fields(words[k])[2]
+            tail_start = _word_fields(words[k + 1])[1]
+
+    if head_words is None:
+        head_end = tail_start = chunk.start + (chunk.end - chunk.start) * offset / len(text)
+        head_words = [w for w in words if sum(_word_fields(w)[1:]) / 2 < head_end]
+        tail_words = [w for w in words if sum(_word_fields(w)[1:]) / 2 >= head_end]
+
+    head = dataclasses.replace(chunk, end=head_end, text=text[:offset], words=head_words)
+    tail = dataclasses.replace(chunk, start=tail_start, text=text[offset:], words=tail_words)
+    return head, tail
+
+
+def _cut(chunks: List, char_offset: int, keep_head: bool) -> List:
+    """保留串聯文字嘅前 char_offset 個字（keep_head）或之後嘅字"""
+    kept = []
+    position = 0
+    for chunk in chunks:
+        length = len(chunk.text.strip())
+        local = char_offset - position
+        if keep_head:
+            if local >= length:
+                kept.append(chunk)
+            elif local > 0:
+                head, _ = _split_chunk(chunk, local)
+                kept.append(head)
+        else:
+            if local <= 0:
+                kept.append(chunk)
+            elif local < length:
+                _, tail = _split_chunk(chunk, local)
+                kept.append(tail)
+        position += length
+    return kept
+
+
+def _mean_confidence(chunks: List) -> float:
+    total = sum(max(c.end - c.start, 1e-3) for c in chunks)
+    return sum(c.confidence * max(c.end - c.start, 1e-3) for c in chunks) / total if total else 0.0
+
+
+def merge_adjacent(left: List, right: List, overlap_start: float, overlap_end: float) -> Tuple[List, str]:
+    """
+    合併左邊（已合併結果）同右邊窗口
+
+    Args:
+        left: 左邊段落（按時間排序，絕對時間）
+        right: 右邊窗口段落（按時間排序，絕對時間）
+        overlap_start: 右窗口開始時間
+        overlap_end: 左窗口結束時間
+
+    Returns:
+        (合併結果, 方法："aligned" / "confidence" / "none")
+    """
+    left_keep = [c for c in left if c.end <= overlap_start]
+    left_tail = [c for c in left if c.end > overlap_start]
+    right_head = [c for c in right if c.start < overlap_end]
+    right_rest = [c for c in right if c.start >= overlap_end]
+
+    if not left_tail or not right_head:
+        return left + right, "none"
+
+    text_a = "".join(c.text.strip() for c in left_tail)
+    text_b = "".join(c.text.strip() for c in right_head)
+    match = SequenceMatcher(None, text_a, text_b, autojunk=False).find_longest_match(
+        0, len(text_a), 0, len(text_b)
+    )
+
+    if is_reliable_match(match.size, len(text_a), len(text_b)):
+        # 喺共同片段中間切開，兩邊都唔使用自己窗口邊緣嘅內容
+        half = match.size // 2
+        head = _cut(left_tail, match.a + half, keep_head=True)
+        tail = _cut(right_head, match.b + half, keep_head=False)
+        if head and tail and tail[0].start < head[-1].end:
+            boundary = head[-1].end
+            tail[0] = dataclasses.replace(tail[0], start=min(boundary, tail[0].end))
+        return left_keep + head + tail + right_rest, "aligned"
+
+    # 對唔齊：重疊區用信心較高嗰邊，另一邊只保留中點喺佢覆蓋範圍以外嘅段落
+    if _mean_confidence(left_tail) >= _mean_confidence(right_head):
+        covered_until = left_tail[-1].end
+        extra = [c for c in right_head if (c.start + c.end) / 2 >= covered_until]
+        return left_keep + left_tail + extra + right_rest, "confidence"
+
+    covered_from = right_head[0].start
+    extra = [c for c in left_tail if (c.start + c.end) / 2 <= covered_from]
+    return left_keep + extra + right_head + right_rest, "confidence"
+
+
+def merge_window_results(
+    per_window: List[List],
+    windows: List[Tuple[float, float]]
+) -> Tuple[List, Dict[str, int]]:
+    """
+    由左至右合併所有窗口
+
+    Args:
+        per_window: 每個窗口嘅段落（絕對時間）
+        windows: 窗口時間範圍，同 per_window 一一對應
+
+    Returns:
+        (合併結果, 每種合併方法嘅次數)
+    """
+    stats = {"aligned": 0, "confidence": 0, "none": 0}
+    merged: List = []
+    for i, chunks in enumerate(per_window):
+        chunks = sorted(chunks, key=lambda c: c.start)
+        if i == 0:
+            merged = chunks
+            continue
+        overlap_start = windows[i][0]
+        overlap_end = windows[i - 1][1]
+        merged, method = merge_adjacent(merged, chunks, overlap_start, overlap_end)
+        stats[method] += 1
+    return merged, stats
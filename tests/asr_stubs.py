@@ -0,0 +1,93 @@
+"""
+測試共用嘅假 ASR 同時間斜坡音頻
+
+音頻係時間斜坡（audio[n] = n / SR / 1e4），所以假 ASR 由第一個樣本就知道窗口喺邊度開始，
+可以按絕對時間出段落，用嚟核對窗口切割、時間戳偏移同重轉範圍。
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+SR = 16000
+
+
+@dataclass
+class Segment:
+    """Whisper 段落嘅最小替身"""
+    start: float
+    end: float
+    text: str
+    confidence: float = 0.9
+    words: List[Dict] = field(default_factory=list)
+    avg_logprob: Optional[float] = None
+    no_speech_prob: Optional[float] = None
+    id: int = 0
+
+
+def ramp(seconds: float, sample_rate: int = SR) -> np.ndarray:
+    """時間斜坡音頻"""
+    return (np.arange(int(seconds * sample_rate)) / sample_rate / 1e4).astype(np.float32)
+
+
+def write_ramp(path, seconds: float, sample_rate: int = SR):
+    """寫時間斜坡 WAV（FLOAT，唔會量化）"""
+    import soundfile as sf
+    sf.write(path, ramp(seconds, sample_rate), sample_rate, subtype='FLOAT')
+    return path
+
+
+def window_offset(audio) -> float:
+    """由第一個樣本推算窗口起點（秒）"""
+    return round(float(audio[0]) * 1e4, 2)
+
+
+def _default_segment(t: float, start: float, end: float, kwargs: Dict) -> Segment:
+    return Segment(start, end, f"{t:.0f}")
+
+
+class RampASR:
+    """
+    按時間格仔出段落嘅假 ASR
+
+    Args:
+        step: 每段幾多秒
+        aligned: True = 格仔對齊絕對時間，只出完全喺窗口入面嘅段落；
+                 False = 由窗口起點開始切，最後一段截到窗口尾再超出 overrun 秒（Whisper 常見）
+        overrun: 見 aligned
+        make_segment: (段落絕對起點, 窗口內起點, 窗口內終點, kwargs) -> Segment
+
+    calls 記低每次調用嘅 (窗口起點, 窗口終點, kwargs)。
+    """
+
+    def __init__(self, step: float, aligned: bool = True, overrun: float = 0.0,
+                 make_segment: Callable[[float, float, float, Dict], Segment] = _default_segment):
+        self.step = step
+        self.aligned = aligned
+        self.overrun = overrun
+        self.make_segment = make_segment
+        self.calls = []
+
+    def transcribe_array(self, audio, sample_rate=SR, **kwargs):
+        offset = window_offset(audio)
+        end = offset + len(audio) / sample_rate
+        self.calls.append((offset, round(end, 2), kwargs))
+
+        segments = []
+        if self.aligned:
+            k = math.ceil(offset / self.step - 1e-9)
+            while (k + 1) * self.step <= end + 1e-6:
+                t = k * self.step
+                segments.append(self.make_segment(t, t - offset, t + self.step - offset, kwargs))
+                k += 1
+        else:
+            duration = end - offset
+            t = 0.0
+            while t < duration - 1e-6:
+                last = t + self.step >= duration
+                seg_end = min(t + self.step, duration) + (self.overrun if last else 0.0)
+                segments.append(self.make_segment(offset + t, t, seg_end, kwargs))
+                t += self.step
+        return {'segments': segments}
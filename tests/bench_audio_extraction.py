@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+音頻提取基準測試 - 串流 vs 舊版整段解碼
+
+生成一個合成長音頻（預設 2 小時，48kHz 立體聲 AAC），
+分別用舊版（整段 concatenate + scipy FFT resample）同新版串流提取器
+轉換成 16kHz 單聲道 WAV，報告每種方法嘅峰值 RSS 同耗時。
+
+每種方法喺獨立子進程執行，確保峰值 RSS 互不影響。
+
+使用方法:
+    python tests/bench_audio_extraction.py
+    python tests/bench_audio_extraction.py --hours 0.5 --skip-legacy
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加項目路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+def generate_synthetic_input(path: Path, hours: float, sample_rate: int = 48000):
+    """生成合成立體聲 AAC 音頻（正弦波 + 噪音），分塊編碼避免佔用內存"""
+    import av
+    import numpy as np
+
+    total_samples = int(hours * 3600 * sample_rate)
+    frame_size = 1024
+    rng = np.random.default_rng(0)
+
+    with av.open(str(path), mode='w') as container:
+        stream = container.add_stream('aac', rate=sample_rate)
+        stream.layout = 'stereo'
+
+        written = 0
+        while written < total_samples:
+            n = min(frame_size, total_samples - written)
+            t = (np.arange(written, written + n) / sample_rate).astype(np.float32)
+            tone = 0.3 * np.sin(2 * np.pi * 220.0 * t)
+            noise = 0.05 * rng.standard_normal(n).astype(np.float32)
+            left = (tone + noise).astype(np.float32)
+            right = (0.5 * tone + noise).astype(np.float32)
+
+            frame = av.AudioFrame.from_ndarray(
+                np.stack([left, right]), format='fltp', layout='stereo'
+            )
+            frame.sample_rate = sample_rate
+            frame.pts = written
+            for packet in stream.encode(frame):
+                container.mux(packet)
+            written += n
+
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+def _legacy_extract(input_path: str, output_path: str):
+    """舊版實現：整段解碼 → concatenate → scipy.signal.resample → 寫檔"""
+    import av
+    import numpy as np
+    import scipy.signal
+    import soundfile as sf
+
+    container = av.open(input_path)
+    audio_stream = container.streams.audio[0]
+    audio_frames = [frame.to_ndarray() for frame in container.decode(audio_stream)]
+    container.close()
+
+    audio_data = np.concatenate(audio_frames, axis=1)
+    target_sr = 16000
+    num_samples = int(len(audio_data[0]) * target_sr / audio_stream.rate)
+    audio_data = scipy.signal.resample(audio_data, num_samples, axis=1)
+    audio_data = np.mean(audio_data, axis=0) if audio_data.shape[0] > 1 else audio_data[0]
+    sf.write(output_path, audio_data, target_sr, subtype='PCM_16')
+
+
+def _streaming_extract(input_path: str, output_path: str):
+    """新版實現：AudioPreprocessor.stream_audio_to_wav"""
+    from utils.audio_utils import AudioPreprocessor
+    AudioPreprocessor.stream_audio_to_wav(input_path, output_path)
+
+
+def _run_child(method: str, input_path: str, output_path: str):
+    """子進程入口：執行一種提取方法並以 JSON 輸出結果"""
+    import resource
+
+    # 扣除 import 之後嘅基線，只計提取本身嘅增量
+    import av, numpy, soundfile  # noqa: F401
+    if method == 'streaming':
+        from utils.audio_utils import AudioPreprocessor  # noqa: F401
+    else:
+        import scipy.signal  # noqa: F401
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if method == 'streaming':
+        _streaming_extract(input_path, output_path)
+    else:
+        _legacy_extract(input_path, output_path)
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        'method': method,
+        'wall_s': elapsed,
+        'peak_rss_mb': peak_kb / 1024,
+        'delta_rss_mb': (peak_kb - baseline_kb) / 1024,
+    }))
+
+
+def run_method(method: str, input_path: Path, output_path: Path) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, '--child', method, str(input_path), str(output_path)],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        return {'method': method, 'error': proc.stderr.strip().splitlines()[-1:]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="音頻提取基準測試")
+    parser.add_argument('--hours', type=float, default=2.0, help="合成音頻長度（小時）")
+    parser.add_argument('--skip-legacy', action='store_true', help="跳過舊版實現（長音頻可能耗盡內存）")
+    parser.add_argument('--input', type=str, default=None, help="使用現有音頻/影片，而唔係生成合成輸入")
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(*args.child)
+        return
+
+    print("\n" + "=" * 60)
+    print("音頻提取基準測試")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory(prefix="canto_bench_") as tmp:
+        tmp = Path(tmp)
+        if args.input:
+            input_path = Path(args.input)
+        else:
+            input_path = tmp / "synthetic.m4a"
+            print(f"\n生成 {args.hours:g} 小時合成音頻...")
+            start = time.perf_counter()
+            generate_synthetic_input(input_path, args.hours)
+            print(f"  ✅ 完成 ({time.perf_counter() - start:.1f}s, "
+                  f"{input_path.stat().st_size / 1e6:.1f} MB)")
+
+        methods = ['streaming'] if args.skip_legacy else ['streaming', 'legacy']
+        for method in methods:
+            print(f"\n[{method}] 提取中...")
+            result = run_method(method, input_path, tmp / f"{method}.wav")
+            if 'error' in result:
+                print(f"  ❌ 失敗: {result['error']}")
+                continue
+            print(f"  耗時:       {result['wall_s']:.2f} s")
+            print(f"  峰值 RSS:   {result['peak_rss_mb']:.1f} MB")
+            print(f"  提取增量:   {result['delta_rss_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+批量 Whisper 解碼基準測試 - Real-time factor (RTF)
+
+將音頻切成多個短 chunk（模擬 VAD 語音段），用 BatchedChunkTranscriber
+以唔同 batch size 轉錄，報告 RTF = 處理時間 / 音頻時長（越低越好）。
+
+使用方法:
+    python tests/bench_batched_asr.py
+    python tests/bench_batched_asr.py --model large-v3 --input sample.wav --chunks 200
+    python tests/bench_batched_asr.py --batch-sizes 1 8 --device cuda --compute-type float16
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 添加項目路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.asr_utils import WHISPER_SAMPLE_RATE, to_whisper_input  # noqa: E402
+from utils.batched_whisper import HAS_BATCHED_PIPELINE, BatchedChunkTranscriber  # noqa: E402
+
+
+def build_chunks(total_seconds: float, n_chunks: int, rng) -> list:
+    """隨機長度（2-12 秒）嘅 chunk，中間留靜音間隔"""
+    lengths = rng.uniform(2.0, 12.0, n_chunks)
+    gaps = rng.uniform(0.3, 1.5, n_chunks)
+    scale = min(1.0, total_seconds / float(np.sum(lengths + gaps)))
+    chunks = []
+    t = 0.0
+    for length, gap in zip(lengths * scale, gaps * scale):
+        chunks.append((t, t + length))
+        t += length + gap
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量 Whisper 解碼 RTF 基準測試")
+    parser.add_argument('--model', default="tiny", help="faster-whisper 模型（tiny / small / large-v3 ...）")
+    parser.add_argument('--input', type=str, default=None, help="音頻文件（默認用合成音頻）")
+    parser.add_argument('--chunks', type=int, default=64, help="chunk 數量")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--device', default="cpu")
+    parser.add_argument('--compute-type', default="int8")
+    args = parser.parse_args()
+
+    if not HAS_BATCHED_PIPELINE:
+        print("faster-whisper 未安裝（需要 >= 1.1 嘅 BatchedInferencePipeline）")
+        sys.exit(1)
+
+    from faster_whisper import WhisperModel
+
+    rng = np.random.default_rng(0)
+    if args.input:
+        import soundfile as sf
+        audio, sr = sf.read(args.input, dtype='float32')
+        audio = to_whisper_input(audio, sr)
+    else:
+        # 合成：帶調製嘅噪音（唔係真語音，只用嚟量度吞吐量）
+        seconds = args.chunks * 8.0
+        t = np.arange(int(seconds * WHISPER_SAMPLE_RATE)) / WHISPER_SAMPLE_RATE
+        audio = (0.1 * rng.standard_normal(len(t)) * (1 + np.sin(2 * np.pi * 3 * t))).astype(np.float32)
+
+    total_seconds = len(audio) / WHISPER_SAMPLE_RATE
+    chunks = build_chunks(total_seconds, args.chunks, rng)
+    speech_seconds = sum(end - start for start, end in chunks)
+
+    print("\n" + "=" * 60)
+    print("批量 Whisper 解碼基準測試")
+    print("=" * 60)
+    print(f"模型: {args.model} ({args.device}, {args.compute_type})")
+    print(f"Chunks: {len(chunks)} 個, 語音 {speech_seconds:.1f}s / 總長 {total_seconds:.1f}s")
+
+    model = WhisperModel(args.model, device=args.device, compute_type=args.compute_type)
+    transcriber = BatchedChunkTranscriber(model)
+
+    # 預熱（排除首次加載開銷）
+    transcriber.batch_size = 1
+    transcriber.transcribe_chunks(audio, chunks[:1], language='yue')
+
+    baseline = None
+    print(f"\n{'batch':>6} {'時間(s)':>10} {'RTF':>8} {'加速':>8}")
+    for batch_size in args.batch_sizes:
+        transcriber.batch_size = batch_size
+        start = time.perf_counter()
+        transcriber.transcribe_chunks(audio, chunks, language='yue')
+        elapsed = time.perf_counter() - start
+        rtf = elapsed / speech_seconds
+        baseline = baseline or elapsed
+        print(f"{batch_size:>6} {elapsed:>10.2f} {rtf:>8.3f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
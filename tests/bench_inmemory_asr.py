@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+In-memory ASR 基準測試 - 每個 chunk 嘅額外開銷
+
+用一個唔做推理嘅 stub ASR backend，比較兩條路徑：
+1. 舊路徑：sf.write 臨時 WAV → backend 再從檔案解碼（MLX 仲要 spawn ffmpeg）
+2. 新路徑：utils.asr_utils.transcribe_array 直接傳 NumPy 陣列
+
+因為 stub 唔做推理，量度到嘅時間就係純粹嘅 I/O / 解碼 / 子進程開銷。
+
+使用方法:
+    python tests/bench_inmemory_asr.py
+    python tests/bench_inmemory_asr.py --chunks 500 --spawn
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 添加項目路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.asr_utils import transcribe_array, to_whisper_input  # noqa: E402
+
+
+class StubPathASR:
+    """只接受檔案路徑嘅 backend（模擬 faster-whisper / 舊 MLX 路徑）"""
+
+    def __init__(self, spawn_decoder: bool = False):
+        self.spawn_decoder = spawn_decoder
+
+    def transcribe(self, audio_path, **kwargs):
+        import soundfile as sf
+        if self.spawn_decoder:
+            # 模擬 mlx_whisper.audio.load_audio 每次 spawn 一個 ffmpeg 進程
+            subprocess.run(["true"], check=True)
+        audio, _ = sf.read(str(audio_path), dtype='float32')
+        return {'text': '', 'segments': [], 'samples': len(audio)}
+
+
+class StubArrayASR(StubPathASR):
+    """支援 transcribe_array 嘅 backend（模擬新版 MLXWhisperASR）"""
+
+    def transcribe_array(self, audio, sample_rate=16000, **kwargs):
+        audio = to_whisper_input(audio, sample_rate)
+        return {'text': '', 'segments': [], 'samples': len(audio)}
+
+
+def run(asr, chunks, sr, temp_dir: Path) -> float:
+    start = time.perf_counter()
+    for i, chunk in enumerate(chunks):
+        transcribe_array(asr, chunk, sr, fallback_path=temp_dir / f"chunk_{i}.wav", language='yue')
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory ASR 每 chunk 開銷基準測試")
+    parser.add_argument('--chunks', type=int, default=300, help="chunk 數量")
+    parser.add_argument('--chunk-seconds', type=float, default=8.0, help="每個 chunk 長度（秒）")
+    parser.add_argument('--spawn', action='store_true', help="舊路徑每個 chunk spawn 一個子進程（模擬 MLX 調用 ffmpeg）")
+    args = parser.parse_args()
+
+    sr = 16000
+    rng = np.random.default_rng(0)
+    audio = (0.1 * rng.standard_normal(int(args.chunks * args.chunk_seconds * sr))).astype(np.float64)
+    n = int(args.chunk_seconds * sr)
+    chunks = [audio[i * n:(i + 1) * n] for i in range(args.chunks)]
+
+    print("\n" + "=" * 60)
+    print("In-memory ASR 基準測試")
+    print("=" * 60)
+    print(f"Chunks: {args.chunks} × {args.chunk_seconds:g}s, spawn={args.spawn}")
+
+    with tempfile.TemporaryDirectory(prefix="canto_bench_") as tmp:
+        tmp = Path(tmp)
+        path_time = run(StubPathASR(spawn_decoder=args.spawn), chunks, sr, tmp)
+        array_time = run(StubArrayASR(spawn_decoder=args.spawn), chunks, sr, tmp)
+
+    print(f"\n臨時 WAV 路徑: {path_time:.3f}s 合共, {path_time / args.chunks * 1000:.2f} ms/chunk")
+    print(f"In-memory 路徑: {array_time:.3f}s 合共, {array_time / args.chunks * 1000:.2f} ms/chunk")
+    if array_time > 0:
+        print(f"加速: {path_time / array_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
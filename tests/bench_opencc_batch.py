@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+OpenCC 批量轉換 / 刪字正則基準測試
+
+用合成字幕（簡繁混合、重複段落、標點括號）比較：
+1. 簡轉繁：逐段 converter.convert vs convert_bulk（一次調用）
+2. 刪標點 / 括號：逐個字 str.replace vs str.translate vs 預編譯字符類正則
+報告總時間同每段開銷，並檢查輸出一致。
+
+使用方法:
+    python tests/bench_opencc_batch.py
+    python tests/bench_opencc_batch.py --segments 10000 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加項目路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.opencc_batch import convert_bulk  # noqa: E402
+
+WORDS = ["这个", "问题", "应该", "怎么样", "处理", "时间", "发现", "说话", "后来", "会议",
+         "我哋", "今日", "真係", "好開心", "佢", "喺度", "食咗", "頭髮", "面条", "Hello"]
+PUNCT = "，。！？、「」（）【】[]()…"
+ALL_PUNCT = '，。！？、；：,.!?;:；—…「」『』【】《》〈〉()（）﹙﹚[]'
+BRACKETS = '()（）﹙﹚[]【】「」'
+
+
+def make_corpus(segments, seed):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(segments):
+        if corpus and rng.random() < 0.1:
+            corpus.append(rng.choice(corpus))  # 重複段落（「係呀」「唔該」之類）
+            continue
+        corpus.append("".join(rng.choice(WORDS) if rng.random() < 0.8 else rng.choice(PUNCT)
+                              for _ in range(rng.randint(3, 10))))
+    return corpus
+
+
+def best_of(repeat, fn):
+    best, out = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return out, best
+
+
+def replace_loop(texts, chars):
+    result = []
+    for text in texts:
+        for char in chars:
+            text = text.replace(char, '')
+        result.append(text)
+    return result
+
+
+def report(name, segments, before, after, same):
+    print(f"{name:<22} {before * 1000:>10.1f}ms {after * 1000:>10.1f}ms "
+          f"{before / segments * 1e6:>9.2f}µs {after / segments * 1e6:>9.2f}µs "
+          f"{before / after:>7.2f}x {'✓' if same else '✗':>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenCC 批量轉換 / 刪字正則基準測試")
+    parser.add_argument('--segments', type=int, default=10000, help="合成字幕段數")
+    parser.add_argument('--repeat', type=int, default=3, help="每項重複幾次取最快")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.segments, args.seed)
+
+    print("\n" + "=" * 80)
+    print(f"OpenCC 批量轉換 / 刪字正則基準測試：{args.segments} 段合成字幕")
+    print("=" * 80)
+    print(f"{'項目':<22} {'之前':>12} {'之後':>12} {'每段(前)':>11} {'每段(後)':>11} {'加速':>8} {'一致':>5}")
+
+    try:
+        from opencc import OpenCC
+    except ImportError:
+        print(f"{'簡轉繁 (s2hk)':<22} 跳過：opencc 未安裝")
+    else:
+        converter = OpenCC('s2hk')
+        converter.convert("预热")  # 載入字典
+        before, t_before = best_of(args.repeat, lambda: [converter.convert(text) for text in corpus])
+        after, t_after = best_of(args.repeat, lambda: convert_bulk(converter, corpus))
+        report("簡轉繁 (s2hk)", args.segments, t_before, t_after, before == after)
+
+    # str.translate 只係對照：稀疏刪字時比字符類正則慢
+    from subtitle.style_processor import ALL_PUNCTUATION_RE, BRACKETS_RE
+    for name, chars, pattern in (("刪所有標點", ALL_PUNCT, ALL_PUNCTUATION_RE),
+                                 ("刪括號", BRACKETS, BRACKETS_RE)):
+        table = str.maketrans('', '', chars)
+        before, t_before = best_of(args.repeat, lambda: replace_loop(corpus, chars))
+        translated, t_translate = best_of(args.repeat, lambda: [text.translate(table) for text in corpus])
+        after, t_after = best_of(args.repeat, lambda: [pattern.sub('', text) for text in corpus])
+        report(f"{name} (translate)", args.segments, t_before, t_translate, before == translated)
+        report(f"{name} (正則)", args.segments, t_before, t_after, before == after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+重疊窗口合併 / 錨點校正基準測試
+
+模擬長音頻嘅重疊窗口輸出（30 秒窗口、15 秒步長），量度
+_merge_overlapping_results 同 _anchor_based_correction 喺唔同 chunk 數量下嘅耗時，
+檢查係咪線性增長（每 chunk 耗時應該大致不變）。細規模時同原本 O(n²) 實現對比。
+
+使用方法:
+    python tests/bench_overlap_merge.py
+    python tests/bench_overlap_merge.py --sizes 1000 10000 100000 --reference-max 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加項目路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.advanced_transcription import AdvancedTranscriber, TranscriptionChunk  # noqa: E402
+from test_overlap_merge import _reference_merge  # noqa: E402
+
+
+def build_results(n_chunks: int, rng) -> list:
+    """n_chunks 個段落，分佈喺重疊窗口入面（每個窗口兩份相同時間範圍嘅版本）"""
+    results = []
+    t = 0.0
+    while len(results) < n_chunks:
+        duration = rng.uniform(1.0, 6.0)
+        window = int(t // 15.0)
+        for w in (window, window + 1):
+            chunk = TranscriptionChunk(
+                start=t + rng.uniform(-0.2, 0.2), end=t + duration,
+                text="字" * 8, confidence=rng.random(), is_anchor=rng.random() < 0.3
+            )
+            results.append((w, chunk))
+        t += duration + rng.uniform(0.0, 1.0)
+    return results[:n_chunks]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="重疊窗口合併基準測試")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000, 100000])
+    parser.add_argument('--reference-max', type=int, default=5000,
+                        help="原本 O(n²) 實現只跑到呢個規模")
+    args = parser.parse_args()
+
+    transcriber = AdvancedTranscriber()
+    rng = random.Random(0)
+
+    print(f"{'chunks':>8} | {'merge':>9} | {'µs/chunk':>8} | {'anchors':>9} | {'µs/chunk':>8} | {'O(n²) merge':>11}")
+    print("-" * 72)
+    for n in args.sizes:
+        results = build_results(n, rng)
+        merge_s, merged = timed(transcriber._merge_overlapping_results, results, [])
+        anchors = [c for c in merged if c.is_anchor]
+        anchor_s, _ = timed(transcriber._anchor_based_correction, merged, anchors)
+
+        reference = "-"
+        if n <= args.reference_max:
+            ref_s, expected = timed(_reference_merge, transcriber, results)
+            assert [id(c) for c in merged] == [id(c) for c in expected], "output differs from reference"
+            reference = f"{ref_s:.3f}s"
+
+        print(f"{n:>8} | {merge_s:>8.3f}s | {merge_s / n * 1e6:>8.1f} | "
+              f"{anchor_s:>8.3f}s | {anchor_s / max(1, len(merged)) * 1e6:>8.1f} | {reference:>11}")
+
+
+if __name__ == '__main__':
+    main()
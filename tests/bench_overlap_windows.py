@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+寬重疊 vs 窄重疊窗口轉錄基準測試
+
+用按標準答案轉錄嘅假 ASR（窗口邊緣嘅字會聽錯）比較：
+- 寬重疊：30 秒窗口、15 秒步長，按時間重疊 + 信心揀段落
+- 窄重疊：30 秒窗口、3 秒重疊，按重疊區文字對齊合併
+
+報告 ASR 總解碼秒數 / 音頻長度（工作量）同輸出文字同標準答案嘅相似度。
+
+使用方法:
+    python tests/bench_overlap_windows.py
+    python tests/bench_overlap_windows.py --durations 60 300 1200
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# 添加項目路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.advanced_transcription import AdvancedTranscriber  # noqa: E402
+from asr_stubs import write_ramp  # noqa: E402
+from test_window_alignment import CHAR_SECONDS, _ScriptedASR, _truth  # noqa: E402
+
+
+def run(path, truth, duration, narrow):
+    asr = _ScriptedASR(truth, duration)
+    start = time.perf_counter()
+    chunks = AdvancedTranscriber().transcribe_with_overlap(path, asr, narrow_overlap=narrow)
+    elapsed = time.perf_counter() - start
+    text = "".join(c.text for c in chunks)
+    similarity = SequenceMatcher(None, truth, text, autojunk=False).ratio()
+    return asr.decoded_seconds / duration, similarity, len(text) - len(truth), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="寬 / 窄重疊窗口基準測試")
+    parser.add_argument('--durations', type=float, nargs='+', default=[60.0, 300.0, 900.0])
+    args = parser.parse_args()
+
+    print(f"{'audio':>7} | {'mode':>6} | {'decoded/audio':>13} | {'similarity':>10} | {'extra chars':>11} | {'merge':>7}")
+    print("-" * 70)
+    with tempfile.TemporaryDirectory() as tmp:
+        for duration in args.durations:
+            truth = _truth(int(duration / CHAR_SECONDS), seed=int(duration))
+            path = os.path.join(tmp, f"ramp_{int(duration)}.wav")
+            write_ramp(path, duration)
+            for narrow in (False, True):
+                workload, similarity, extra, elapsed = run(path, truth, duration, narrow)
+                mode = "narrow" if narrow else "wide"
+                print(f"{duration:>6.0f}s | {mode:>6} | {workload:>12.2f}x | {similarity:>10.3f} | "
+                      f"{extra:>+11d} | {elapsed:>6.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+資源包基準測試 - 冷啟動 StyleProcessor 建立 + 第一次處理
+
+每次量度都開一個新進程（模擬開程式）：
+1. 冇資源包：json.load 字典、重新編譯全部替換器
+2. 有資源包：由 mmap 讀返解析好嘅字典同編譯好嘅替換器
+OpenCC 字典載入另外報告（每個進程只載入一次，兩種情況一樣）。
+
+使用方法:
+    python tests/bench_resource_bundle.py
+    python tests/bench_resource_bundle.py --runs 10
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# 子進程：量度一次冷啟動（bundle 路徑空白 = 只用記憶體，即係冇資源包）
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from core.config import Config
+from core.path_setup import get_resource_path  # 預先 import，唔計入建立時間
+from utils.opencc_batch import get_s2t_converter
+from utils.resource_bundle import ResourceBundle
+from subtitle.style_processor import StyleProcessor
+
+config = Config()
+start = time.perf_counter()
+get_s2t_converter()
+opencc = time.perf_counter() - start
+
+start = time.perf_counter()
+processor = StyleProcessor(config, resource_bundle=ResourceBundle(sys.argv[2] or None))
+construct = time.perf_counter() - start
+
+segments = [{'start': 0.0, 'end': 1.0, 'text': '佢喺度食咗三個蘋果，你條仆街'}]
+start = time.perf_counter()
+processor._convert_cantonese_dict(segments[0]['text'], 'written')
+processor.process(segments, {'style': 'spoken', 'profanity': 'mask', 'punctuation': 'remove'})
+first_call = time.perf_counter() - start
+print(json.dumps({'opencc': opencc, 'construct': construct, 'first_call': first_call}))
+"""
+
+
+def run_child(bundle_path: str):
+    output = subprocess.run([sys.executable, "-c", CHILD, str(SRC_DIR), bundle_path],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median_ms(results, key):
+    return statistics.median(r[key] for r in results) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="資源包冷啟動基準測試")
+    parser.add_argument('--runs', type=int, default=5, help="每種情況開幾多次新進程")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle_path = str(Path(tmp) / "bundle.bin")
+        run_child(bundle_path)  # 第一次：建立資源包
+
+        without = [run_child("") for _ in range(args.runs)]
+        with_bundle = [run_child(bundle_path) for _ in range(args.runs)]
+        size_kb = Path(bundle_path).stat().st_size / 1024
+
+    print("\n" + "=" * 64)
+    print(f"資源包冷啟動基準測試（{args.runs} 個新進程，中位數；資源包 {size_kb:.0f} KB）")
+    print("=" * 64)
+    print(f"{'項目':<24} {'冇資源包':>12} {'有資源包':>12} {'加速':>8}")
+    for label, key in (("StyleProcessor() 建立", 'construct'), ("第一次處理", 'first_call')):
+        before, after = median_ms(without, key), median_ms(with_bundle, key)
+        print(f"{label:<24} {before:>10.2f}ms {after:>10.2f}ms {before / after:>7.1f}x")
+    print(f"{'OpenCC 字典載入（每進程一次）':<24} {median_ms(without, 'opencc'):>10.2f}ms "
+          f"{median_ms(with_bundle, 'opencc'):>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
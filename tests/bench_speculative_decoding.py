@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+推測解碼基準測試 - CPU decoder tokens/s（有 / 冇草稿模型）
+
+同一段音頻用大模型 greedy 解碼兩次：一次冇草稿，一次用細模型起草，
+報告 decoder tokens/s（唔計大模型 encoder，草稿 encoder 計入）、大模型 forward pass 次數、
+草稿接受率，並檢查兩次輸出 token 完全一樣。
+
+使用方法:
+    python tests/bench_speculative_decoding.py --input sample.wav
+    python tests/bench_speculative_decoding.py --input sample.wav --seconds 120 --draft-tokens 3 5 8
+    python tests/bench_speculative_decoding.py --input sample.wav \\
+        --model openai/whisper-large-v3 --draft openai/whisper-small
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加項目路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.asr_utils import WHISPER_SAMPLE_RATE, to_whisper_input  # noqa: E402
+from utils.whisper_speculative import HAS_TRANSFORMERS, SpeculativeWhisperASR  # noqa: E402
+
+
+def run(asr, audio, use_draft):
+    result = asr.transcribe_array(audio, language='yue', use_draft=use_draft)
+    return [seg.text for seg in result['segments']], asr.last_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="推測解碼 CPU tokens/s 基準測試")
+    parser.add_argument('--input', type=str, required=True, help="語音音頻文件（合成噪音冇意義）")
+    parser.add_argument('--seconds', type=float, default=60.0, help="只用頭幾多秒")
+    parser.add_argument('--model', default="khleeloo/whisper-large-v3-cantonese")
+    parser.add_argument('--draft', default="alvanlii/whisper-small-cantonese")
+    parser.add_argument('--draft-tokens', type=int, nargs='+', default=[5])
+    parser.add_argument('--threads', type=int, default=None, help="torch CPU 線程數")
+    args = parser.parse_args()
+
+    if not HAS_TRANSFORMERS:
+        print("transformers / torch 未安裝")
+        sys.exit(1)
+
+    import soundfile as sf
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    audio, sr = sf.read(args.input, dtype='float32')
+    audio = to_whisper_input(audio, sr)[:int(args.seconds * WHISPER_SAMPLE_RATE)]
+
+    print("\n" + "=" * 60)
+    print("推測解碼基準測試 (CPU)")
+    print("=" * 60)
+    print(f"目標模型: {args.model}")
+    print(f"草稿模型: {args.draft}")
+    print(f"音頻: {len(audio) / WHISPER_SAMPLE_RATE:.1f}s, torch 線程: {torch.get_num_threads()}")
+
+    asr = SpeculativeWhisperASR(args.model, args.draft, device="cpu")
+    asr.load_model()
+
+    # 預熱（排除首次 forward 開銷）
+    asr.transcribe_array(audio[:5 * WHISPER_SAMPLE_RATE], use_draft=True)
+
+    baseline_text, baseline = run(asr, audio, use_draft=False)
+    print(f"\n{'草稿':>8} {'tokens':>8} {'大模型 pass':>12} {'接受率':>8} {'tokens/s':>10} {'加速':>8} {'一致':>6}")
+    print(f"{'-':>8} {baseline.tokens:>8} {baseline.target_passes:>12} {'-':>8} "
+          f"{baseline.tokens_per_second:>10.2f} {'1.00x':>8} {'-':>6}")
+
+    for k in args.draft_tokens:
+        asr.num_draft_tokens = k
+        text, stats = run(asr, audio, use_draft=True)
+        speedup = stats.tokens_per_second / baseline.tokens_per_second if baseline.tokens_per_second else 0.0
+        same = "✓" if text == baseline_text else "✗"
+        print(f"{k:>8} {stats.tokens:>8} {stats.target_passes:>12} {stats.acceptance_rate:>7.0%} "
+              f"{stats.tokens_per_second:>10.2f} {speedup:>7.2f}x {same:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+多詞替換基準測試 - 逐條 str.replace vs 編譯字典（TextReplacer）
+
+用合成語料（隨機拼合字典詞、替換結果同單字）模擬字幕後處理，
+逐本字典報告舊寫法（逐條 replace）同 TextReplacer 嘅時間，並檢查輸出一致。
+
+使用方法:
+    python tests/bench_text_replacer.py
+    python tests/bench_text_replacer.py --segments 20000 --seed 1
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加項目路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.text_replacer import CHAINED, LONGEST, TextReplacer, chained_replace  # noqa: E402
+
+
+def make_corpus(pairs, segments, seed):
+    rng = random.Random(seed)
+    words = [p for p, _ in pairs] + [r for _, r in pairs if r]
+    chars = sorted(set("".join(words)) | set("，。！？ 我你佢今日真係好"))
+    return [
+        "".join(rng.choice(words) if rng.random() < 0.3 else rng.choice(chars)
+                for _ in range(rng.randint(4, 16)))
+        for _ in range(segments)
+    ]
+
+
+def load_tables():
+    """(名稱, 有序規則, 模式)：同 pipeline / StyleProcessor 用嘅一樣"""
+    tables = []
+    try:
+        from pipeline.subtitle_pipeline_v2 import SubtitlePipelineV2
+        tables.append(("CANTONESE_CORRECTIONS", list(SubtitlePipelineV2.CANTONESE_CORRECTIONS.items()), CHAINED))
+    except Exception as e:
+        print(f"⚠️ 跳過 CANTONESE_CORRECTIONS（pipeline 載入失敗: {e}）")
+
+    from subtitle.style_processor import StyleProcessor
+    processor = StyleProcessor()
+    canto = processor.cantonese_map
+    tables.append(("cantonese_map (written)",
+                   [(k, canto[k]) for k in sorted(canto, key=len, reverse=True)], CHAINED))
+    prof = processor.profanity_map
+    tables.append(("profanity_map (mild)",
+                   [(k, prof[k]) for k in sorted(prof, key=len, reverse=True)], LONGEST))
+    tables.append(("homophone fixes (spoken)",
+                   list(StyleProcessor.UNIVERSAL_HOMOPHONE_FIXES.items())
+                   + list(StyleProcessor.SPOKEN_ONLY_HOMOPHONE_FIXES.items()), CHAINED))
+    return tables
+
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    out = [fn(text) for text in corpus]
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多詞替換基準測試")
+    parser.add_argument('--segments', type=int, default=20000, help="合成字幕段數")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tables = load_tables()
+    all_words = [pair for _, pairs, _ in tables for pair in pairs]
+    corpus = make_corpus(all_words, args.segments, args.seed)
+
+    print("\n" + "=" * 78)
+    print(f"多詞替換基準測試：{args.segments} 段合成字幕")
+    print("=" * 78)
+    print(f"{'字典':<28} {'規則':>6} {'模式':>9} {'逐條 replace':>14} {'編譯':>10} {'加速':>8} {'一致':>6}")
+
+    total_before = total_after = 0.0
+    for name, pairs, mode in tables:
+        build_start = time.perf_counter()
+        replacer = TextReplacer(pairs, mode=mode)
+        build = time.perf_counter() - build_start
+
+        before, t_before = timed(lambda text: chained_replace(text, pairs), corpus)
+        after, t_after = timed(replacer.replace, corpus)
+        total_before += t_before
+        total_after += t_after
+        same = "✓" if before == after else "✗"
+        print(f"{name:<28} {len(pairs):>6} {mode:>9} {t_before * 1000:>12.1f}ms "
+              f"{t_after * 1000:>8.1f}ms {t_before / t_after:>7.1f}x {same:>6}   (建立 {build * 1000:.1f}ms)")
+
+    print("-" * 78)
+    print(f"{'合計':<28} {'':>6} {'':>9} {total_before * 1000:>12.1f}ms {total_after * 1000:>8.1f}ms "
+          f"{total_before / total_after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
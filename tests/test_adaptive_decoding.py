@@ -0,0 +1,155 @@
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from asr_stubs import SR, RampASR, Segment, ramp, write_ramp
+
+from utils.adaptive_decoding import (
+    TEMPERATURE_FALLBACK, QualityThresholds, compression_ratio, flag_reason,
+    greedy_kwargs, refine_kwargs, refine_segments
+)
+from utils.advanced_transcription import AdvancedTranscriber
+
+
+def _adaptive_asr(hard=()):
+    """
+    每 2 秒出一個段落嘅斜坡 ASR
+
+    ``hard`` 入面嘅時間點喺 greedy 解碼時 avg_logprob 好低，帶 temperature 回退嘅重新解碼就正常。
+    """
+    hard = set(hard)
+
+    def make_segment(t, start, end, kwargs):
+        refine = isinstance(kwargs.get('temperature'), tuple)
+        return Segment(start, end, f"{'精' if refine else ''}{t:.0f}",
+                       avg_logprob=-1.5 if t in hard and not refine else -0.2,
+                       words=[{'word': f"{t:.0f}", 'start': start, 'end': start + 1.0}])
+
+    return RampASR(2.0, make_segment=make_segment)
+
+
+class MLXWhisperASR:
+    pass
+
+
+class _Config:
+    def __init__(self, **values):
+        self.values = {'asr_batch_size': 1, **values}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class TestQualityFlags(unittest.TestCase):
+    def test_flag_reasons(self):
+        thresholds = QualityThresholds()
+        self.assertIsNone(flag_reason(Segment(0, 1, "你好", avg_logprob=-0.3, no_speech_prob=0.1), thresholds))
+        self.assertEqual(flag_reason(Segment(0, 1, "你好", avg_logprob=-1.4), thresholds), "logprob")
+        self.assertEqual(flag_reason(Segment(0, 1, "係咪" * 40), thresholds), "compression")
+        self.assertEqual(flag_reason({'start': 0, 'end': 1, 'text': "嗯", 'no_speech_prob': 0.8}, thresholds), "no_speech")
+
+    def test_compression_ratio(self):
+        self.assertGreater(compression_ratio("好好好" * 50), 2.4)
+        self.assertLess(compression_ratio("今日天氣好好"), 2.4)
+        self.assertEqual(compression_ratio(""), 0.0)
+
+    def test_thresholds_from_config(self):
+        thresholds = QualityThresholds.from_config(_Config(adaptive_logprob_threshold=-0.5))
+        self.assertEqual((thresholds.logprob, thresholds.compression_ratio), (-0.5, 2.4))
+
+    def test_beam_kwargs_only_for_backends_with_beam_search(self):
+        self.assertEqual(greedy_kwargs(object(), {'language': 'yue'}), {'language': 'yue', 'beam_size': 1})
+        self.assertEqual(greedy_kwargs(MLXWhisperASR(), {'language': 'yue'}), {'language': 'yue'})
+        self.assertEqual(refine_kwargs(object(), {}, beam_size=5),
+                         {'beam_size': 5, 'temperature': TEMPERATURE_FALLBACK})
+        self.assertEqual(refine_kwargs(MLXWhisperASR(), {}), {'temperature': TEMPERATURE_FALLBACK})
+
+
+class TestRefineSegments(unittest.TestCase):
+    def test_only_flagged_regions_are_redecoded(self):
+        hard = {10.0, 12.0, 40.0}
+        asr = _adaptive_asr(hard)
+        audio = ramp(60)
+        greedy = [
+            Segment(t, t + 2.0, f"{t:.0f}", avg_logprob=-1.5 if t in hard else -0.2)
+            for t in np.arange(0.0, 60.0, 2.0)
+        ]
+        refined, stats = refine_segments(asr, audio, SR, greedy, {'language': 'yue'}, beam_size=5)
+
+        self.assertEqual([(start, end) for start, end, _ in asr.calls], [(8.0, 16.0), (38.0, 44.0)])
+        self.assertEqual(asr.calls[0][2], {'language': 'yue', 'beam_size': 5, 'temperature': TEMPERATURE_FALLBACK})
+        self.assertEqual([seg.text for seg in refined if seg.text.startswith('精')], ["精10", "精12", "精40"])
+        self.assertEqual([seg.start for seg in refined], [float(t) for t in range(0, 60, 2)])
+        self.assertEqual(refined[5].words[0]['start'], 10.0)  # 詞級時間戳係絕對時間
+        self.assertEqual((stats['flagged'], stats['regions'], stats['refined_segments']), (3, 2, 3))
+        self.assertAlmostEqual(stats['refined_fraction'], 14.0 / 60.0, places=3)
+
+    def test_flagged_segments_spread_over_more_than_one_window(self):
+        # 2-26 秒同 28 秒嘅窗口合併會超過 30 秒：第二個區域要由 26 秒開始，唔可以切走 28 秒段落開頭
+        hard = [float(t) for t in range(2, 28, 2)] + [28.0]
+        asr = _adaptive_asr(hard)
+        audio = ramp(40)
+        greedy = [
+            Segment(t, t + 2.0, f"{t:.0f}", avg_logprob=-1.5 if t in hard else -0.2)
+            for t in np.arange(0.0, 40.0, 2.0)
+        ]
+        refined, stats = refine_segments(asr, audio, SR, greedy, {'language': 'yue'})
+
+        self.assertEqual([(start, end) for start, end, _ in asr.calls], [(0.0, 30.0), (26.0, 32.0)])
+        self.assertEqual([seg.text for seg in refined if seg.text.startswith('精')],
+                         [f"精{t:.0f}" for t in hard])
+        self.assertEqual([seg.start for seg in refined], [float(t) for t in range(0, 40, 2)])
+        self.assertEqual((stats['regions'], stats['refined_segments']), (2, len(hard)))
+
+    def test_nothing_flagged_skips_second_pass(self):
+        asr = _adaptive_asr()
+        audio = np.zeros(10 * SR, dtype=np.float32)
+        greedy = [Segment(0.0, 2.0, "你好", avg_logprob=-0.1)]
+        refined, stats = refine_segments(asr, audio, SR, greedy, {})
+        self.assertEqual(asr.calls, [])
+        self.assertEqual(refined, greedy)
+        self.assertEqual(stats['refined_fraction'], 0.0)
+
+
+class TestAdaptiveThreeStage(unittest.TestCase):
+    def test_greedy_stage1_and_beam_retry_on_flagged_chunks(self):
+        hard = {6.0}
+        asr = _adaptive_asr(hard)
+        config = _Config(enable_adaptive_decoding=True, beam_size=4)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_ramp(os.path.join(tmp, "ramp.wav"), 20)
+            chunks = [(0.0, 10.0), (10.0, 20.0)]
+            transcriber = AdvancedTranscriber(config)
+            with mock.patch.object(AdvancedTranscriber, 'vad_presplit', return_value=chunks):
+                results = transcriber.three_stage_transcribe(path, asr)
+
+        stage1_calls = [kwargs for _, _, kwargs in asr.calls[:2]]
+        self.assertTrue(all(kwargs['beam_size'] == 1 for kwargs in stage1_calls))
+        # 信心高但 avg_logprob 低嘅段落都會重轉，而且用 beam search + 溫度回退
+        self.assertEqual(asr.calls[2][:2], (4.0, 10.0))
+        self.assertEqual(asr.calls[2][2]['beam_size'], 4)
+        self.assertEqual([c.text for c in results if c.text.startswith('精')], ["精6"])
+        stats = transcriber.last_decode_stats
+        self.assertEqual((stats['flagged'], stats['regions']), (1, 1))
+        self.assertAlmostEqual(stats['refined_fraction'], 6.0 / 20.0, places=3)
+
+    def test_disabled_by_default(self):
+        hard = {6.0}
+        asr = _adaptive_asr(hard)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_ramp(os.path.join(tmp, "ramp.wav"), 10)
+            with mock.patch.object(AdvancedTranscriber, 'vad_presplit', return_value=[(0.0, 10.0)]):
+                AdvancedTranscriber(_Config()).three_stage_transcribe(path, asr)
+        self.assertEqual(len(asr.calls), 1)
+        self.assertNotIn('beam_size', asr.calls[0][2])
+
+
+if __name__ == '__main__':
+    unittest.main()
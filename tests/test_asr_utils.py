@@ -0,0 +1,120 @@
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from core.config import ConfigOverrides
+from utils.asr_utils import (
+    cascade_asr_overrides, resolve_asr_model_id, to_whisper_input, transcribe_array
+)
+
+
+class _PathOnlyASR:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio_path, **kwargs):
+        import soundfile as sf
+        audio, sr = sf.read(audio_path)
+        self.calls.append((audio_path, sr, len(audio), kwargs))
+        return {'segments': [], 'text': ''}
+
+
+class _ArrayASR:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio_path, **kwargs):
+        raise AssertionError("path API should not be used")
+
+    def transcribe_array(self, audio, sample_rate=16000, **kwargs):
+        self.calls.append((len(audio), sample_rate, kwargs))
+        return {'segments': [], 'text': ''}
+
+
+class TestToWhisperInput(unittest.TestCase):
+    def test_mono_float32_passthrough(self):
+        audio = np.linspace(-1, 1, 1600, dtype=np.float64)
+        out = to_whisper_input(audio)
+        self.assertEqual(out.dtype, np.float32)
+        self.assertEqual(out.shape, (1600,))
+
+    def test_channels_first_and_last_are_downmixed(self):
+        stereo = np.stack([np.ones(1000), -np.ones(1000)])
+        np.testing.assert_allclose(to_whisper_input(stereo), np.zeros(1000))
+        np.testing.assert_allclose(to_whisper_input(stereo.T), np.zeros(1000))
+
+    def test_resamples_to_16k(self):
+        audio = np.zeros(48000)
+        self.assertEqual(len(to_whisper_input(audio, 48000)), 16000)
+
+    def test_torch_tensor(self):
+        import torch
+        out = to_whisper_input(torch.zeros(3200))
+        self.assertEqual(out.shape, (3200,))
+
+
+class TestTranscribeArray(unittest.TestCase):
+    def test_uses_array_api_when_available(self):
+        asr = _ArrayASR()
+        transcribe_array(asr, np.zeros(16000), 16000, language='yue')
+        self.assertEqual(asr.calls, [(16000, 16000, {'language': 'yue'})])
+
+    def test_falls_back_to_temp_wav_and_cleans_up(self):
+        asr = _PathOnlyASR()
+        with tempfile.TemporaryDirectory() as tmp:
+            fallback = Path(tmp) / "chunk.wav"
+            transcribe_array(asr, np.zeros(8000), 16000, fallback_path=fallback, language='yue')
+            self.assertFalse(fallback.exists())
+        path, sr, n, kwargs = asr.calls[0]
+        self.assertEqual((sr, n, kwargs), (16000, 8000, {'language': 'yue'}))
+
+    def test_path_only_backend_without_fallback_raises(self):
+        with self.assertRaises(ValueError):
+            transcribe_array(_PathOnlyASR(), np.zeros(10), 16000)
+
+
+class _DictConfig:
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class TestCascadeModelIds(unittest.TestCase):
+    def _resolve(self, config, stage, backend, model_size):
+        return resolve_asr_model_id(ConfigOverrides(config, **cascade_asr_overrides(config, stage)),
+                                    backend, model_size)
+
+    def test_draft_and_refine_load_different_checkpoints(self):
+        # build_type 預設已經係 lite：精修一定要換 flagship，唔可以用返草稿模型
+        config = _DictConfig(build_type="lite", use_cantonese_model=True,
+                             cantonese_model_lite="org/lite", cantonese_model_flagship="org/flagship")
+        for backend in ("mlx", "faster-whisper"):
+            draft = self._resolve(config, "draft", backend, "small")
+            refine = self._resolve(config, "refine", backend, "large-v3")
+            self.assertEqual((draft, refine), ("org/lite", "org/flagship"))
+
+    def test_without_cantonese_model_sizes_differ(self):
+        config = _DictConfig(use_cantonese_model=False)
+        self.assertEqual(self._resolve(config, "draft", "mlx", "small"), "mlx-community/whisper-small-mlx")
+        self.assertEqual(self._resolve(config, "refine", "mlx", "large-v3"), "mlx-community/whisper-large-v3-mlx")
+        self.assertNotEqual(self._resolve(config, "draft", "faster-whisper", "small"),
+                            self._resolve(config, "refine", "faster-whisper", "large-v3"))
+
+    def test_default_resolution_follows_build_type(self):
+        config = _DictConfig(build_type="flagship")
+        self.assertEqual(resolve_asr_model_id(config, "faster-whisper", "large-v3"),
+                         "khleeloo/whisper-large-v3-cantonese")
+        self.assertEqual(resolve_asr_model_id(config, "mlx", "large-v3"), "mlx-community/whisper-large-v3-mlx")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import soundfile as sf
+
+from utils.audio_cache import AudioCache
+from utils.audio_utils import AudioPreprocessor
+
+
+def _write_source(path: Path, seconds: float, freq: float = 440.0, sample_rate: int = 44100):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * freq * t)
+    sf.write(str(path), np.stack([tone, tone], axis=1), sample_rate, subtype='FLOAT')
+
+
+class TestAudioCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.cache = AudioCache(self.root / "cache")
+        self.source = self.root / "clip.wav"
+        _write_source(self.source, 2.0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_second_request_skips_extraction(self):
+        first = self.cache.get_wav(self.source)
+        with mock.patch.object(AudioPreprocessor, 'stream_audio_to_wav') as extract:
+            second = self.cache.get_wav(self.source)
+            extract.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(sf.info(str(second)).samplerate, 16000)
+
+    def test_index_survives_new_instance(self):
+        first = self.cache.get_wav(self.source)
+        reopened = AudioCache(self.root / "cache")
+        self.assertEqual(reopened.lookup(self.source), first)
+
+    def test_sample_rate_is_part_of_key(self):
+        a = self.cache.get_wav(self.source, sample_rate=16000)
+        b = self.cache.get_wav(self.source, sample_rate=8000)
+        self.assertNotEqual(a, b)
+        self.assertEqual(sf.info(str(b)).samplerate, 8000)
+
+    def test_modified_file_is_re_extracted(self):
+        first = self.cache.get_wav(self.source)
+        _write_source(self.source, 2.0, freq=880.0)
+        os.utime(self.source, ns=(1, 1))
+        second = self.cache.get_wav(self.source)
+        self.assertNotEqual(first, second)
+
+    def test_copied_file_hits_by_content(self):
+        first = self.cache.get_wav(self.source)
+        copy = self.root / "renamed.wav"
+        copy.write_bytes(self.source.read_bytes())
+        self.assertEqual(self.cache.lookup(copy), first)
+
+    def test_target_format_wav_is_used_directly(self):
+        wav16k = self.root / "ready.wav"
+        sf.write(str(wav16k), np.zeros(16000), 16000, subtype='PCM_16')
+        self.assertEqual(self.cache.get_wav(wav16k), wav16k)
+
+    def test_lru_eviction(self):
+        sources = []
+        for i in range(3):
+            path = self.root / f"clip{i}.wav"
+            _write_source(path, 2.0, freq=300.0 + i * 100)
+            sources.append(path)
+
+        first = self.cache.get_wav(sources[0])
+        entry_size = first.stat().st_size
+        self.cache.max_bytes = entry_size * 2
+
+        self.cache.get_wav(sources[1])
+        self.cache.lookup(sources[0])  # touch: clip1 becomes least recently used
+        self.cache.get_wav(sources[2])
+
+        self.assertIsNotNone(self.cache.lookup(sources[0]))
+        self.assertIsNone(self.cache.lookup(sources[1]))
+        self.assertIsNotNone(self.cache.lookup(sources[2]))
+        self.assertLessEqual(self.cache.total_bytes(), self.cache.max_bytes)
+
+    def test_same_size_edit_anywhere_changes_hash(self):
+        # 中間未被取樣嘅位置改咗一個 byte、大小不變：都唔可以用返舊 key
+        data = bytearray(os.urandom(5 * 1024 * 1024))
+        blob = self.root / "video.bin"
+        blob.write_bytes(bytes(data))
+        before = self.cache.content_hash(blob)
+        data[1024 * 1024 + 17] ^= 0xFF
+        blob.write_bytes(bytes(data))
+        os.utime(blob, ns=(1, 1))
+        self.assertNotEqual(self.cache.content_hash(blob), before)
+
+    def test_fingerprint_memo_is_bounded(self):
+        self.cache.MAX_FINGERPRINTS = 3
+        for i in range(5):
+            self.source.write_bytes(b"version %d" % i)
+            os.utime(self.source, ns=(i + 1, i + 1))
+            self.cache.content_hash(self.source)
+        self.assertEqual(len(self.cache._fingerprints), 1)  # 同一路徑只留最新版本
+
+        for i in range(5):
+            other = self.root / f"other{i}.bin"
+            other.write_bytes(b"x%d" % i)
+            self.cache.content_hash(other)
+        self.assertEqual(len(self.cache._fingerprints), 3)
+
+    def test_hits_do_not_rewrite_index(self):
+        first = self.cache.get_wav(self.source)
+        with mock.patch.object(self.cache, '_save_index') as save:
+            for _ in range(5):
+                self.assertEqual(self.cache.lookup(self.source), first)
+            save.assert_not_called()
+
+        touched = max(entry['last_access'] for entry in self.cache._entries.values())
+        self.cache.flush()
+        reopened = AudioCache(self.root / "cache")
+        self.assertEqual(max(entry['last_access'] for entry in reopened._entries.values()), touched)
+
+    def test_index_from_older_hash_is_discarded(self):
+        first = self.cache.get_wav(self.source)
+        index = self.root / "cache" / AudioCache.INDEX_FILE
+        data = json.loads(index.read_text(encoding='utf-8'))
+        data['hash_version'] = AudioCache.HASH_VERSION - 1
+        index.write_text(json.dumps(data), encoding='utf-8')
+
+        reopened = AudioCache(self.root / "cache")
+        self.assertEqual(reopened.total_bytes(), 0)
+        self.assertFalse(first.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from utils.audio_utils import AudioPreprocessor
+
+
+def _write_stereo_aac(path: Path, seconds: float, sample_rate: int = 44100):
+    import av
+    with av.open(str(path), mode='w') as container:
+        stream = container.add_stream('aac', rate=sample_rate)
+        stream.layout = 'stereo'
+        total = int(seconds * sample_rate)
+        written = 0
+        while written < total:
+            n = min(1024, total - written)
+            t = np.arange(written, written + n, dtype=np.float32) / sample_rate
+            tone = (0.4 * np.sin(2 * np.pi * 440.0 * t)).astype(np.float32)
+            frame = av.AudioFrame.from_ndarray(np.stack([tone, tone]), format='fltp', layout='stereo')
+            frame.sample_rate = sample_rate
+            frame.pts = written
+            for packet in stream.encode(frame):
+                container.mux(packet)
+            written += n
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+class TestStreamingAudioExtraction(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmp.name)
+        self.source = self.tmp_path / "source.mp4"
+        _write_stereo_aac(self.source, seconds=3.0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_outputs_16k_mono_wav(self):
+        import soundfile as sf
+        out = self.tmp_path / "out.wav"
+        written = AudioPreprocessor.stream_audio_to_wav(self.source, out)
+
+        info = sf.info(str(out))
+        self.assertEqual(info.samplerate, 16000)
+        self.assertEqual(info.channels, 1)
+        self.assertEqual(info.frames, written)
+        # AAC priming/padding adds a few ms; duration should still be ~3s
+        self.assertAlmostEqual(written / 16000, 3.0, delta=0.1)
+
+    def test_extract_audio_from_video_uses_streaming(self):
+        import soundfile as sf
+        out = AudioPreprocessor.extract_audio_from_video(self.source, self.tmp_path / "video.wav")
+        data, sr = sf.read(str(out))
+        self.assertEqual(sr, 16000)
+        self.assertEqual(data.ndim, 1)
+        self.assertGreater(np.abs(data).max(), 0.2)
+
+
+    def test_loud_stereo_keeps_level(self):
+        # 兩個聲道都係 0.9：平均落 mono 應該仍然係 0.9（唔可以 ×√2 變 1.27 爆音）
+        import soundfile as sf
+        source = self.tmp_path / "loud.wav"
+        sf.write(str(source), np.full((44100 * 2, 2), 0.9, dtype=np.float32), 44100, subtype='FLOAT')
+        out = self.tmp_path / "loud_out.wav"
+        AudioPreprocessor.stream_audio_to_wav(source, out)
+
+        data, _ = sf.read(str(out))
+        middle = data[len(data) // 4: 3 * len(data) // 4]
+        self.assertAlmostEqual(float(middle.mean()), 0.9, delta=0.01)
+        self.assertLess(float(np.abs(data).max()), 0.95)
+
+    def test_missing_audio_stream_error_is_chinese(self):
+        import av
+        source = self.tmp_path / "silent.mp4"
+        with av.open(str(source), mode='w') as container:
+            stream = container.add_stream('mpeg4', rate=10)
+            stream.width, stream.height = 32, 32
+            frame = av.VideoFrame.from_ndarray(np.zeros((32, 32, 3), dtype=np.uint8), format='rgb24')
+            for packet in stream.encode(frame):
+                container.mux(packet)
+            for packet in stream.encode(None):
+                container.mux(packet)
+        with self.assertRaisesRegex(RuntimeError, "影片中沒有找到音頻軌道"):
+            AudioPreprocessor.stream_audio_to_wav(source, self.tmp_path / "none.wav")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+
+import sys
+import os
+import pickle
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from pipeline.batch_runner import BatchTranscriber, collect_inputs
+
+try:
+    import pipeline.subtitle_pipeline_v2  # noqa: F401  (needs models/ + torch)
+    HAS_PIPELINE = True
+except ImportError:
+    HAS_PIPELINE = False
+
+
+class _StubPipeline:
+    instances = 0
+
+    def __init__(self, config, force_cpu):
+        type(self).instances += 1
+        self.jobs = 0
+        self.cleaned = False
+        self.last_profile_report = None
+
+    def process(self, input_path):
+        self.jobs += 1
+        if "bad" in Path(input_path).name:
+            raise RuntimeError("decode error")
+        self.last_profile_report = {'rtf': 0.1, 'meta': {'audio_seconds': 10.0}}
+        return [SimpleNamespace(start=0.0, end=1.5, colloquial="你好", formal=None)]
+
+    def cleanup(self):
+        self.cleaned = True
+
+
+class _DictConfig:
+    def __init__(self, **values):
+        self.values = dict(values, cache_dir="/tmp/cache")
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        (self.tmp / "sub").mkdir()
+        for name in ("a.mp4", "b.wav", "notes.txt", "sub/c.mkv"):
+            (self.tmp / name).write_bytes(b"x" * 10)
+        _StubPipeline.instances = 0
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_collect_inputs_dirs_globs_and_recursion(self):
+        names = lambda paths: [p.name for p in paths]
+        self.assertEqual(names(collect_inputs([self.tmp])), ["a.mp4", "b.wav"])
+        self.assertEqual(names(collect_inputs([self.tmp], recursive=True)), ["a.mp4", "b.wav", "c.mkv"])
+        self.assertEqual(names(collect_inputs([str(self.tmp / "*.mp4"), self.tmp / "a.mp4"])), ["a.mp4"])
+
+    def test_plan_skips_up_to_date_outputs(self):
+        out = self.tmp / "out"
+        out.mkdir()
+        (out / "a.srt").write_text("old")
+        stale = out / "b.srt"
+        stale.write_text("old")
+        os.utime(stale, (time.time() - 3600, time.time() - 3600))
+
+        runner = BatchTranscriber(None, output_dir=out, formats=["srt"])
+        status = {job.input_path.name: job.status for job in runner.plan([self.tmp])}
+        self.assertEqual(status, {"a.mp4": "skipped", "b.wav": "pending"})
+
+        forced = BatchTranscriber(None, output_dir=out, formats=["srt"], skip_existing=False)
+        self.assertTrue(all(job.status == "pending" for job in forced.plan([self.tmp])))
+
+    def test_plan_gives_colliding_inputs_unique_outputs(self):
+        other = self.tmp / "other"
+        other.mkdir()
+        for path in (self.tmp / "a.wav", other / "a.mp4", other / "A.MP4"):
+            path.write_bytes(b"x")
+        out = self.tmp / "out"
+        runner = BatchTranscriber(None, output_dir=out, formats=["srt"])
+        jobs = runner.plan([self.tmp / "a.mp4", self.tmp / "a.wav", other / "a.mp4", other / "A.MP4"])
+        names = [job.outputs['srt'].name for job in jobs]
+        self.assertEqual(len(set(n.lower() for n in names)), len(jobs))
+        self.assertIn("a.srt", names)
+
+        # 冇 output_dir：唔同目錄各自寫返自己度，同名唔使加後綴
+        local = BatchTranscriber(None, formats=["srt"]).plan([self.tmp / "a.mp4", other / "a.mp4"])
+        self.assertEqual([job.outputs['srt'].name for job in local], ["a.srt", "a.srt"])
+
+    def test_asr_workers_split_between_batch_workers(self):
+        config = _DictConfig(asr_workers="8")
+        runner = BatchTranscriber(config, concurrency=3)
+        self.assertIs(runner._worker_config(1), config)
+        split = runner._worker_config(3)
+        self.assertEqual(split.get("asr_workers"), 2)
+        self.assertEqual(split.get("cache_dir"), "/tmp/cache")
+        # ParallelChunkTranscriber 會 pickle config 去 worker 進程
+        self.assertEqual(pickle.loads(pickle.dumps(split)).get("asr_workers"), 2)
+
+    def test_unknown_format_rejected(self):
+        with self.assertRaises(ValueError):
+            BatchTranscriber(None, formats=["vtt"])
+
+    @unittest.skipUnless(HAS_PIPELINE, "subtitle pipeline dependencies not installed")
+    def test_run_reuses_pipeline_and_reports_failures(self):
+        (self.tmp / "bad.mp3").write_bytes(b"x")
+        out = self.tmp / "out"
+        runner = BatchTranscriber(None, output_dir=out, formats=["srt", "txt"],
+                                  pipeline_factory=_StubPipeline)
+        progress = []
+        summary = runner.run(runner.plan([self.tmp]),
+                             progress_callback=lambda job, done, total: progress.append((done, total)))
+
+        self.assertEqual(_StubPipeline.instances, 1)
+        self.assertEqual(summary['counts'], {'done': 2, 'skipped': 0, 'failed': 1, 'pending': 0})
+        self.assertEqual(summary['audio_seconds'], 20.0)
+        self.assertEqual(progress[-1], (3, 3))
+        self.assertIn("你好", (out / "a.srt").read_text(encoding='utf-8'))
+        self.assertTrue((out / "b.txt").exists())
+        failed = [j for j in summary['jobs'] if j['status'] == 'failed']
+        self.assertEqual(failed[0]['error'], "decode error")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.batched_whisper import BatchedChunkTranscriber, find_faster_whisper_model
+
+
+class _FakePipeline:
+    """模擬 BatchedInferencePipeline：每個 clip 輸出兩個絕對時間段落"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, clip_timestamps=None, **kwargs):
+        self.calls.append((len(audio), clip_timestamps, kwargs))
+        segments = []
+        for i, clip in enumerate(clip_timestamps):
+            mid = (clip['start'] + clip['end']) / 2
+            word = SimpleNamespace(word='字', start=clip['start'] + 0.1, end=clip['start'] + 0.3, probability=0.9)
+            segments.append(SimpleNamespace(start=clip['start'], end=mid, text=f"{i}a", avg_logprob=0.0, words=[word]))
+            segments.append(SimpleNamespace(start=mid, end=clip['end'], text=f"{i}b", avg_logprob=-1.0, words=None))
+        return iter(segments), None
+
+
+def _make_transcriber(batch_size=4):
+    transcriber = BatchedChunkTranscriber.__new__(BatchedChunkTranscriber)
+    transcriber.pipeline = _FakePipeline()
+    transcriber.batch_size = batch_size
+    return transcriber
+
+
+class TestBatchedChunkTranscriber(unittest.TestCase):
+    def test_segments_are_grouped_per_chunk_with_relative_times(self):
+        transcriber = _make_transcriber()
+        chunks = [(0.0, 4.0), (5.0, 7.0), (10.0, 12.0)]
+        progress = []
+
+        results = transcriber.transcribe_chunks(
+            np.zeros(16000 * 12), chunks, 16000,
+            progress_callback=lambda done, total: progress.append(done)
+        )
+
+        self.assertEqual([[s.text for s in r] for r in results], [["0a", "0b"], ["1a", "1b"], ["2a", "2b"]])
+        self.assertEqual((results[1][0].start, results[1][0].end), (0.0, 1.0))
+        self.assertEqual((results[1][1].start, results[1][1].end), (1.0, 2.0))
+        self.assertAlmostEqual(results[2][0].words[0]['start'], 0.1)
+        self.assertAlmostEqual(results[0][0].confidence, 1.0)
+        self.assertAlmostEqual(results[0][1].confidence, np.exp(-1.0))
+        self.assertEqual(progress[-1], 3)
+
+        _, clips, kwargs = transcriber.pipeline.calls[0]
+        self.assertEqual(kwargs['batch_size'], 4)
+        self.assertFalse(kwargs['vad_filter'])
+        self.assertEqual(clips[2], {'start': 10.0, 'end': 12.0})
+
+    def test_resamples_and_clamps_to_audio_length(self):
+        transcriber = _make_transcriber()
+        transcriber.transcribe_chunks(np.zeros(48000 * 3), [(2.0, 5.0)], 48000)
+        n_samples, clips, _ = transcriber.pipeline.calls[0]
+        self.assertEqual(n_samples, 16000 * 3)
+        self.assertEqual(clips, [{'start': 2.0, 'end': 3.0}])
+
+    def test_non_faster_whisper_backend_has_no_batched_path(self):
+        self.assertIsNone(find_faster_whisper_model(object()))
+        self.assertIsNone(BatchedChunkTranscriber.from_asr(SimpleNamespace(model=None)))
+
+
+if __name__ == '__main__':
+    unittest.main()
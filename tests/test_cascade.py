@@ -0,0 +1,139 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+import numpy as np
+
+from asr_stubs import SR, RampASR, Segment, ramp
+from utils.cascade_refinement import (
+    USER_EDITED_KEY, RefineScheduler, RefineWindow, insert_by_start, is_user_edited, plan_refine_windows,
+    refine_windows, renumber, splice_by_span
+)
+
+
+def _refined_segment(t, start, end, kwargs):
+    return Segment(start, end, f"大{t:.0f}")
+
+
+class TestPlanRefineWindows(unittest.TestCase):
+    def test_cuts_in_pauses_and_tiles_whole_file(self):
+        spans = [(0.5, 12.0), (13.0, 25.0), (26.0, 38.0), (40.0, 55.0)]
+        windows = plan_refine_windows(spans, 60.0, max_window=30.0)
+
+        self.assertEqual([(w.start, w.end) for w in windows], [(0.0, 25.5), (25.5, 39.0), (39.0, 60.0)])
+        self.assertTrue(all(w.duration <= 30.0 for w in windows))
+
+    def test_long_segment_is_hard_cut(self):
+        windows = plan_refine_windows([(0.0, 70.0)], 70.0, max_window=30.0)
+        self.assertEqual([(w.start, w.end) for w in windows], [(0.0, 30.0), (30.0, 60.0), (60.0, 70.0)])
+
+    def test_no_draft_segments(self):
+        self.assertEqual(len(plan_refine_windows([], 45.0)), 2)
+        self.assertEqual(plan_refine_windows([], 0.0), [])
+
+
+class TestRefineScheduler(unittest.TestCase):
+    def setUp(self):
+        self.windows = [RefineWindow(i, i * 10.0, i * 10.0 + 10.0) for i in range(6)]
+
+    def test_sequential_without_focus(self):
+        scheduler = RefineScheduler(self.windows)
+        order = []
+        while (w := scheduler.next_window()) is not None:
+            order.append(w.index)
+        self.assertEqual(order, [0, 1, 2, 3, 4, 5])
+
+    def test_focus_first_then_nearest_preferring_forward(self):
+        scheduler = RefineScheduler(self.windows, focus=35.0)
+        order = [scheduler.next_window().index for _ in range(6)]
+        self.assertEqual(order, [3, 4, 2, 5, 1, 0])
+
+    def test_focus_change_takes_effect_on_next_window(self):
+        scheduler = RefineScheduler(self.windows)
+        self.assertEqual(scheduler.next_window().index, 0)
+        scheduler.set_focus(52.0)
+        self.assertEqual(scheduler.next_window().index, 5)
+        self.assertEqual(scheduler.remaining, 4)
+
+
+class TestSplice(unittest.TestCase):
+    def test_replaces_only_entries_inside_span(self):
+        draft = [Segment(0, 4, "a"), Segment(4, 9, "b"), Segment(9, 12, "c"), Segment(12, 20, "d")]
+        refined = splice_by_span(draft, [Segment(5, 10, "B")], 5.0, 12.0)
+        # 中點 6.5 / 10.5 喺範圍內被取代，中點 16 保留
+        self.assertEqual([s.text for s in refined], ["a", "B", "d"])
+
+    def test_dict_segments(self):
+        draft = [{'start': 0.0, 'end': 2.0, 'text': "草"}, {'start': 2.0, 'end': 4.0, 'text': "稿"}]
+        refined = splice_by_span(draft, [{'start': 1.5, 'end': 3.5, 'text': "精"}], 2.0, 4.0)
+        self.assertEqual([s['text'] for s in refined], ["草", "精"])
+
+    def test_user_edits_and_deletions_survive(self):
+        # 用戶改咗第二句、刪咗 6-8 秒嗰句
+        draft = [
+            {'start': 0.0, 'end': 2.0, 'text': "草"},
+            {'start': 2.0, 'end': 4.0, 'text': "改過", USER_EDITED_KEY: True},
+            {'start': 4.0, 'end': 6.0, 'text': "稿"},
+        ]
+        new = [
+            {'start': 0.0, 'end': 1.8, 'text': "精一"},
+            {'start': 1.8, 'end': 3.0, 'text': "精二"},
+            {'start': 4.0, 'end': 6.0, 'text': "精三"},
+            {'start': 6.0, 'end': 8.0, 'text': "精四"},
+        ]
+        refined = splice_by_span(draft, new, 0.0, 10.0, keep=is_user_edited, deleted_spans=[(6.0, 8.0)])
+        self.assertEqual([s['text'] for s in refined], ["精一", "改過", "精三"])
+
+        # 全片 replace（最終結果）一樣保留
+        final = splice_by_span(refined, [{'start': 0.0, 'end': 6.0, 'text': "全"}],
+                               float('-inf'), float('inf'), keep=is_user_edited)
+        self.assertEqual([s['text'] for s in final], ["改過"])
+
+    def test_appended_batches_get_unique_ids(self):
+        # 每批都由 0 編起（entries_to_segment_dicts）：插入後要重新編號，唔可以撞 id
+        first = [{'id': i, 'start': t, 'end': t + 1.0, 'text': f"a{t:.0f}"} for i, t in enumerate((0.0, 10.0))]
+        second = [{'id': i, 'start': t, 'end': t + 1.0, 'text': f"b{t:.0f}"} for i, t in enumerate((5.0, 15.0))]
+        timeline = renumber(insert_by_start(renumber(insert_by_start([], first)), second))
+
+        self.assertEqual([s['text'] for s in timeline], ["a0", "b5", "a10", "b15"])
+        self.assertEqual([s['id'] for s in timeline], [0, 1, 2, 3])
+
+        refined = renumber(splice_by_span(timeline, [{'id': 0, 'start': 4.0, 'end': 6.0, 'text': "精"}], 2.0, 12.0,
+                                          keep=is_user_edited))
+        self.assertEqual([s['text'] for s in refined], ["a0", "精", "b15"])
+        self.assertEqual([s['id'] for s in refined], [0, 1, 2])
+
+
+class TestRefineWindows(unittest.TestCase):
+    def test_refines_around_focus_and_replaces_whole_draft(self):
+        # 每 5 秒出一段；最後一段時間戳超出窗口少少（Whisper 常見）
+        asr = RampASR(5.0, aligned=False, overrun=0.3, make_segment=_refined_segment)
+        audio = ramp(60)
+        windows = plan_refine_windows([], 60.0, max_window=20.0)
+        scheduler = RefineScheduler(windows, focus=45.0)
+        draft = [Segment(t, t + 5.0, f"細{t:.0f}") for t in np.arange(0.0, 60.0, 5.0)]
+        timeline = list(draft)
+        seen = []
+
+        def on_window(window, segments):
+            nonlocal timeline
+            seen.append(window.index)
+            timeline = splice_by_span(timeline, segments, window.start, window.end)
+            if window.index == 2:
+                scheduler.set_focus(0.0)  # 用戶跳返開頭
+
+        result = refine_windows(asr, audio, SR, scheduler, {}, on_window=on_window)
+
+        self.assertEqual(seen, [2, 0, 1])
+        self.assertEqual([offset for offset, _, _ in asr.calls], [40.0, 0.0, 20.0])
+        self.assertEqual([s.text for s in result], [f"大{t}" for t in range(0, 60, 5)])
+        self.assertEqual([s.text for s in timeline], [s.text for s in result])
+        # 超出窗口嘅時間戳夾返窗口內
+        self.assertEqual(result[3].end, 20.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
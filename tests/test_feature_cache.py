@@ -0,0 +1,136 @@
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.feature_cache import (
+    KIND_ENCODER, FeatureCache, feature_cache_scope, wrap_audio_features, wrap_log_mel
+)
+
+N_FRAMES = 3000  # 30 秒 mel
+
+
+class _FakeWhisper:
+    """
+    模擬 mlx_whisper：log-mel → 每 30 秒一個 chunk 跑 encoder → decoder 用提示詞
+
+    記錄 mel / encoder 實際計算次數。
+    """
+
+    def __init__(self):
+        self.mel_calls = 0
+        self.encoder_calls = 0
+        self.log_mel = wrap_log_mel(self._log_mel)
+        self.get_audio_features = wrap_audio_features(self._get_audio_features)
+
+    def _log_mel(self, audio, n_mels=80, padding=0):
+        self.mel_calls += 1
+        audio = np.pad(np.asarray(audio, dtype=np.float32), (0, padding))
+        frames = len(audio) // 160
+        return np.outer(audio[:frames * 160:160], np.arange(1, n_mels + 1, dtype=np.float32))
+
+    def _get_audio_features(self, task, mel):
+        self.encoder_calls += 1
+        return (mel[:N_FRAMES // 2] * 2.0).astype(np.float16 if task.options.fp16 else np.float32)
+
+    def transcribe(self, audio, prompt):
+        mel = self.log_mel(audio, n_mels=80, padding=N_FRAMES * 160)
+        task = SimpleNamespace(options=SimpleNamespace(fp16=True))
+        texts = []
+        for seek in range(0, len(mel) - N_FRAMES, N_FRAMES):
+            features = self.get_audio_features(task, mel[seek:seek + N_FRAMES])
+            texts.append(f"{prompt}:{float(features.sum()):.1f}")
+        return texts
+
+
+class TestFeatureCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_roundtrip_survives_reopen_and_keeps_dtype(self):
+        cache = FeatureCache(self.root)
+        key = cache.make_key(KIND_ENCODER, "model", "abc")
+        cache.put(key, np.ones((1500, 8), dtype=np.float16))
+
+        restored = FeatureCache(self.root).get(key)
+        self.assertEqual(restored.dtype, np.float16)
+        self.assertEqual(restored.shape, (1500, 8))
+        self.assertIsNone(FeatureCache(self.root).get(cache.make_key(KIND_ENCODER, "model", "other")))
+
+    def test_lru_eviction(self):
+        array = np.zeros(1000, dtype=np.float32)  # ≈4 KB
+        cache = FeatureCache(self.root, max_bytes=10_000)
+        keys = [cache.make_key(KIND_ENCODER, i) for i in range(3)]
+        cache.put(keys[0], array)
+        cache.put(keys[1], array)
+        cache.get(keys[0])  # keys[0] 變成最近使用
+        cache.put(keys[2], array)
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertLessEqual(cache.total_bytes(), 10_000)
+
+    def test_array_digest_depends_on_content_shape_and_dtype(self):
+        a = np.arange(12, dtype=np.float32)
+        self.assertEqual(FeatureCache.array_digest(a), FeatureCache.array_digest(a.copy()))
+        self.assertNotEqual(FeatureCache.array_digest(a), FeatureCache.array_digest(a.reshape(3, 4)))
+        self.assertNotEqual(FeatureCache.array_digest(a), FeatureCache.array_digest(a.astype(np.float16)))
+
+
+class TestWhisperHooks(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = FeatureCache(self._tmp.name)
+        self.audio = np.sin(np.arange(16000 * 75) / 50.0).astype(np.float32)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_prompt_only_rerun_skips_mel_and_encoder(self):
+        whisper = _FakeWhisper()
+        with feature_cache_scope(self.cache, "large-v3"):
+            first = whisper.transcribe(self.audio, "formal")
+            mel_calls, encoder_calls = whisper.mel_calls, whisper.encoder_calls
+            rerun = whisper.transcribe(self.audio, "colloquial")
+
+        self.assertEqual((mel_calls, encoder_calls), (1, 3))
+        self.assertEqual((whisper.mel_calls, whisper.encoder_calls), (1, 3))
+        # 特徵完全一樣，只有 decoder（提示詞）唔同
+        self.assertEqual([t.split(':')[1] for t in rerun], [t.split(':')[1] for t in first])
+        self.assertEqual(self.cache.hits, {'mel': 1, 'encoder': 3})
+
+    def test_other_model_or_audio_misses(self):
+        whisper = _FakeWhisper()
+        with feature_cache_scope(self.cache, "large-v3"):
+            whisper.transcribe(self.audio, "p")
+        with feature_cache_scope(self.cache, "small"):
+            whisper.transcribe(self.audio, "p")
+        self.assertEqual((whisper.mel_calls, whisper.encoder_calls), (1, 6))
+
+        with feature_cache_scope(self.cache, "large-v3"):
+            whisper.transcribe(self.audio * 0.5, "p")
+        self.assertEqual((whisper.mel_calls, whisper.encoder_calls), (2, 9))
+
+    def test_hooks_pass_through_outside_scope(self):
+        whisper = _FakeWhisper()
+        whisper.transcribe(self.audio, "p")
+        whisper.transcribe(self.audio, "p")
+        with feature_cache_scope(None, "large-v3"):
+            whisper.transcribe(self.audio, "p")
+        self.assertEqual((whisper.mel_calls, whisper.encoder_calls), (3, 9))
+        self.assertEqual(self.cache.total_bytes(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
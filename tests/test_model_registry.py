@@ -0,0 +1,205 @@
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+from utils.asr_utils import asr_registry_key
+from utils.model_registry import POOL_RAM, POOL_VRAM, ModelRegistry, estimate_llm_gb
+
+
+class _FakeModel:
+    def __init__(self, name):
+        self.name = name
+        self.is_loaded = True
+
+    def unload_model(self):
+        self.is_loaded = False
+
+
+class _Loader:
+    """記錄加載次數嘅 loader"""
+
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return _FakeModel(self.name)
+
+
+class _DictConfig:
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class TestModelRegistry(unittest.TestCase):
+    def test_same_key_loads_once(self):
+        registry = ModelRegistry(ram_budget_gb=8, vram_budget_gb=0)
+        loader = _Loader("asr")
+        first = registry.get("asr", loader, size_gb=1.0)
+        second = registry.get("asr", loader, size_gb=1.0)
+        self.assertIs(first, second)
+        self.assertEqual(loader.calls, 1)
+
+    def test_lru_eviction_under_budget(self):
+        registry = ModelRegistry(ram_budget_gb=0, vram_budget_gb=8)
+        a = registry.get("a", _Loader("a"), size_gb=3, pool=POOL_VRAM)
+        b = registry.get("b", _Loader("b"), size_gb=3, pool=POOL_VRAM)
+        registry.get("a", _Loader("unused"))  # a 變成最近使用
+        registry.get("c", _Loader("c"), size_gb=3, pool=POOL_VRAM)
+
+        self.assertTrue(registry.is_resident("a"))
+        self.assertFalse(registry.is_resident("b"))
+        self.assertFalse(b.is_loaded)
+        self.assertTrue(a.is_loaded)
+        self.assertEqual(registry.used_gb(POOL_VRAM), 6)
+
+    def test_held_models_are_not_evicted(self):
+        registry = ModelRegistry(ram_budget_gb=4, vram_budget_gb=0)
+        registry.get("asr", _Loader("asr"), size_gb=3, pool=POOL_RAM)
+        with registry.in_use("asr"):
+            registry.get("llm", _Loader("llm"), size_gb=3, pool=POOL_RAM)
+            self.assertTrue(registry.is_resident("asr"))  # 超出預算但使用緊，照樣保留
+        registry.get("vad", _Loader("vad"), size_gb=1, pool=POOL_RAM)
+        # 釋放後 asr 啱啱用過，淘汰較舊嘅 llm
+        self.assertTrue(registry.is_resident("asr"))
+        self.assertFalse(registry.is_resident("llm"))
+
+    def test_pools_are_budgeted_separately(self):
+        registry = ModelRegistry(ram_budget_gb=1, vram_budget_gb=8)
+        registry.get("gpu", _Loader("gpu"), size_gb=6, pool=POOL_VRAM)
+        registry.get("cpu", _Loader("cpu"), size_gb=1, pool=POOL_RAM)
+        self.assertTrue(registry.is_resident("gpu"))
+        self.assertTrue(registry.is_resident("cpu"))
+
+    def test_concurrent_requests_wait_for_single_load(self):
+        registry = ModelRegistry(ram_budget_gb=8, vram_budget_gb=0)
+        loader = _Loader("asr", delay=0.1)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("asr", loader, 1.0)))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(loader.calls, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_failed_load_is_not_registered(self):
+        registry = ModelRegistry(ram_budget_gb=8, vram_budget_gb=0)
+
+        def broken():
+            raise RuntimeError("no weights")
+
+        with self.assertRaises(RuntimeError):
+            registry.get("llm", broken, size_gb=1.0)
+        self.assertFalse(registry.is_resident("llm"))
+        self.assertEqual(registry.get("llm", _Loader("llm")).name, "llm")
+
+    def test_failed_load_can_be_prefetched_later(self):
+        registry = ModelRegistry(ram_budget_gb=8, vram_budget_gb=0)
+
+        def broken():
+            raise RuntimeError("no weights")
+
+        with self.assertRaises(RuntimeError):
+            registry.get("llm", broken, size_gb=1.0)
+        # 加載失敗唔可以留低「加載緊」標記
+        thread = registry.prefetch("llm", _Loader("llm"), size_gb=1.0)
+        self.assertIsNotNone(thread)
+        thread.join()
+        self.assertTrue(registry.is_resident("llm"))
+
+    def test_unified_memory_shares_one_budget(self):
+        registry = ModelRegistry(ram_budget_gb=8, vram_budget_gb=16, unified_memory=True)
+        registry.get("vad", _Loader("vad"), size_gb=3, pool=POOL_RAM)
+        self.assertFalse(registry.fits(POOL_VRAM, 6))
+        registry.get("asr", _Loader("asr"), size_gb=6, pool=POOL_VRAM)
+        # VRAM 模型要位，淘汰 RAM pool 嘅 vad
+        self.assertFalse(registry.is_resident("vad"))
+        self.assertEqual(registry.used_gb(POOL_RAM), 6)
+
+    def test_background_warmup(self):
+        registry = ModelRegistry(ram_budget_gb=8, vram_budget_gb=0)
+        loader = _Loader("asr", delay=0.05)
+        thread = registry.warmup([lambda: registry.get("asr", loader, 1.0)])
+        # 前台請求等預熱完成，唔會重複加載
+        model = registry.get("asr", loader, 1.0)
+        thread.join()
+        self.assertIs(model, registry.peek("asr"))
+        self.assertEqual(loader.calls, 1)
+
+    def test_clear_unloads_everything(self):
+        registry = ModelRegistry(ram_budget_gb=8, vram_budget_gb=8)
+        models = [registry.get(k, _Loader(k), 1.0, pool) for k, pool in (("a", POOL_RAM), ("b", POOL_VRAM))]
+        registry.clear()
+        self.assertFalse(any(m.is_loaded for m in models))
+        self.assertEqual(registry.stats()['models'], [])
+
+    def test_prefetch_is_awaited_by_get(self):
+        registry = ModelRegistry(ram_budget_gb=0, vram_budget_gb=10)
+        loader = _Loader("llm", delay=0.1)
+        thread = registry.prefetch("llm", loader, size_gb=6.5, pool=POOL_VRAM)
+        self.assertIsNotNone(thread)
+        # 預取加載緊：get() 等佢完成，唔會再加載
+        model = registry.get("llm", _Loader("unused"), size_gb=6.5, pool=POOL_VRAM)
+        thread.join()
+        self.assertEqual(model.name, "llm")
+        self.assertEqual(loader.calls, 1)
+        self.assertIsNone(registry.prefetch("llm", loader, size_gb=6.5, pool=POOL_VRAM))
+
+    def test_prefetch_never_evicts(self):
+        registry = ModelRegistry(ram_budget_gb=0, vram_budget_gb=8)
+        asr = registry.get("asr", _Loader("asr"), size_gb=3.5, pool=POOL_VRAM)
+        loader = _Loader("llm")
+        self.assertIsNone(registry.prefetch("llm", loader, size_gb=6.5, pool=POOL_VRAM))
+        self.assertEqual(loader.calls, 0)
+        self.assertTrue(asr.is_loaded)
+        self.assertTrue(registry.fits(POOL_VRAM, 4.5))
+        self.assertFalse(registry.fits(POOL_VRAM, 4.6))
+
+    def test_failed_prefetch_falls_back_to_get(self):
+        registry = ModelRegistry(ram_budget_gb=8, vram_budget_gb=0)
+
+        def broken():
+            raise RuntimeError("download failed")
+        registry.prefetch("llm", broken, size_gb=1.0).join()
+        self.assertFalse(registry.is_resident("llm"))
+        self.assertEqual(registry.get("llm", _Loader("llm"), size_gb=1.0).name, "llm")
+
+    def test_asr_keys_follow_loaded_checkpoint(self):
+        # 只差 build_type 嘅兩個設定唔可以攞到對方已加載嘅模型
+        registry = ModelRegistry(ram_budget_gb=8, vram_budget_gb=0)
+        lite, flagship = _DictConfig(build_type="lite"), _DictConfig(build_type="flagship")
+        lite_key = asr_registry_key(lite, "faster-whisper", "large-v3", "cpu")
+        flagship_key = asr_registry_key(flagship, "faster-whisper", "large-v3", "cpu")
+        registry.get(lite_key, _Loader("lite"), size_gb=1.0)
+        flagship_loader = _Loader("flagship")
+        self.assertEqual(registry.get(flagship_key, flagship_loader, size_gb=1.0).name, "flagship")
+        self.assertEqual((flagship_loader.calls, len(registry.stats()['models'])), (1, 2))
+
+        no_cantonese = _DictConfig(build_type="lite", use_cantonese_model=False)
+        self.assertNotEqual(asr_registry_key(no_cantonese, "faster-whisper", "large-v3", "cpu"), lite_key)
+
+        # MLX：指定咗 checkpoint（串聯草稿 / 精修）就分開；冇指定就同用通用模型
+        self.assertNotEqual(asr_registry_key(_DictConfig(asr_model_id="org/lite"), "mlx", "large-v3"),
+                            asr_registry_key(_DictConfig(asr_model_id="org/flagship"), "mlx", "large-v3"))
+        self.assertEqual(asr_registry_key(lite, "mlx", "large-v3"), asr_registry_key(flagship, "mlx", "large-v3"))
+
+    def test_estimate_llm_gb(self):
+        self.assertEqual(estimate_llm_gb("mlx-community/Qwen2.5-3B-Instruct-4bit"), 2.5)
+        self.assertEqual(estimate_llm_gb("mlx-community/Qwen2.5-3B-Instruct-bf16"), 6.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+from utils.opencc_batch import BULK_SEPARATORS, convert_bulk
+
+try:
+    from opencc import OpenCC
+    HAS_OPENCC = True
+except ImportError:
+    HAS_OPENCC = False
+
+TEXTS = [
+    '这个问题应该怎么样处理',
+    '佢喺度食咗三個蘋果。',
+    '',
+    '时间 发现\n说话',
+    '这个问题应该怎么样处理',
+    'Hello, 后来会议里面!',
+    '面条好吃，头发很长',
+]
+
+
+class RecordingConverter:
+    """記錄 convert 調用嘅轉換器（將「后」轉「後」）"""
+
+    def __init__(self, drop=None):
+        self.calls = []
+        self.drop = drop
+
+    def convert(self, text):
+        self.calls.append(text)
+        if self.drop:
+            text = text.replace(self.drop, '')
+        return text.replace('后', '後')
+
+
+class TestConvertBulk(unittest.TestCase):
+    @unittest.skipUnless(HAS_OPENCC, "opencc not installed")
+    def test_same_as_per_segment_opencc(self):
+        converter = OpenCC('s2hk')
+        self.assertEqual(convert_bulk(converter, TEXTS), [converter.convert(t) for t in TEXTS])
+
+    def test_one_call_and_duplicates_converted_once(self):
+        converter = RecordingConverter()
+        result = convert_bulk(converter, ['后来', '以后', '后来'])
+        self.assertEqual(result, ['後来', '以後', '後来'])
+        self.assertEqual(converter.calls, [BULK_SEPARATORS[0].join(['后来', '以后'])])
+
+    def test_next_separator_when_text_contains_one(self):
+        converter = RecordingConverter()
+        texts = ['后' + BULK_SEPARATORS[0], '后']
+        self.assertEqual(convert_bulk(converter, texts), ['後' + BULK_SEPARATORS[0], '後'])
+        self.assertEqual(len(converter.calls), 1)
+
+    def test_fallback_per_segment(self):
+        # 所有分隔符都出現過
+        converter = RecordingConverter()
+        texts = ['后' + ''.join(BULK_SEPARATORS), '后']
+        self.assertEqual(convert_bulk(converter, texts), ['後' + ''.join(BULK_SEPARATORS), '後'])
+        self.assertEqual(converter.calls, texts)
+
+        # 轉換器食咗分隔符：段數唔啱
+        converter = RecordingConverter(drop=BULK_SEPARATORS[0])
+        self.assertEqual(convert_bulk(converter, ['后', '前']), ['後', '前'])
+        self.assertEqual(converter.calls[1:], ['后', '前'])
+
+    def test_empty_and_single(self):
+        converter = RecordingConverter()
+        self.assertEqual(convert_bulk(converter, []), [])
+        self.assertEqual(convert_bulk(converter, ['后', '后']), ['後', '後'])
+        self.assertEqual(converter.calls, ['后'])
+
+
+class TestDeletePatterns(unittest.TestCase):
+    def test_punctuation_patterns_match_replace_loops(self):
+        from subtitle.style_processor import ALL_PUNCTUATION_RE, BRACKETS_RE
+
+        text = '「你好」，（測試）[1]【標題】《書》〈章〉﹙註﹚…—嘅話,呢!?;:'
+        expected = text
+        for p in '，。！？、；：,.!?;:；—…「」『』【】《》〈〉()（）﹙﹚[]':
+            expected = expected.replace(p, '')
+        self.assertEqual(ALL_PUNCTUATION_RE.sub('', text), expected)
+
+        expected = text
+        for bracket in '()（）﹙﹚[]【】「」':
+            expected = expected.replace(bracket, '')
+        self.assertEqual(BRACKETS_RE.sub('', text), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+from utils.advanced_transcription import AdvancedTranscriber, TranscriptionChunk
+
+
+def _reference_merge(transcriber, all_results):
+    """原本嘅逐對比較實現（O(n²)），用嚟核對輸出"""
+    if not all_results:
+        return []
+    sorted_results = sorted(all_results, key=lambda x: x[1].start)
+    final_chunks = []
+    processed_times = set()
+    for window_idx, chunk in sorted_results:
+        time_key = (round(chunk.start, 1), round(chunk.end, 1))
+        if time_key in processed_times:
+            continue
+        alternatives = [
+            (idx, c) for idx, c in sorted_results
+            if idx != window_idx and transcriber._time_overlap(chunk, c) > 0.5
+        ]
+        best_chunk = chunk
+        best_confidence = chunk.confidence
+        for _, alt_chunk in alternatives:
+            if alt_chunk.confidence > best_confidence:
+                best_chunk = alt_chunk
+                best_confidence = alt_chunk.confidence
+        final_chunks.append(best_chunk)
+        processed_times.add(time_key)
+    final_chunks.sort(key=lambda x: x.start)
+    return final_chunks
+
+
+def _reference_neighbours(results):
+    """原本嘅前後搜索：每個非錨點 chunk 嘅 (prev_anchor, next_anchor)"""
+    pairs = []
+    for i, chunk in enumerate(results):
+        if chunk.is_anchor:
+            continue
+        prev_anchor = next((results[j] for j in range(i - 1, -1, -1) if results[j].is_anchor), None)
+        next_anchor = next((results[j] for j in range(i + 1, len(results)) if results[j].is_anchor), None)
+        if prev_anchor or next_anchor:
+            pairs.append((chunk, prev_anchor, next_anchor))
+    return pairs
+
+
+def _random_windows(rng, n_windows):
+    """模擬重疊窗口輸出：30 秒窗口每 15 秒一個，信心值有重複（測試平手）"""
+    results = []
+    for w in range(n_windows):
+        t = w * 15.0
+        while t < w * 15.0 + 30.0:
+            duration = rng.choice([0.0, rng.uniform(0.2, 6.0), rng.uniform(0.2, 6.0)])
+            chunk = TranscriptionChunk(
+                start=round(t, rng.choice([1, 2, 3])), end=round(t + duration, 2),
+                text=f"w{w}@{t:.2f}", confidence=rng.choice([0.5, 0.7, 0.7, 0.9, rng.random()])
+            )
+            results.append((w, chunk))
+            t += duration + rng.choice([0.0, 0.05, rng.uniform(0, 2)])
+    rng.shuffle(results)
+    return results
+
+
+class TestOverlapMerge(unittest.TestCase):
+    def setUp(self):
+        self.transcriber = AdvancedTranscriber()
+
+    def test_matches_reference_on_random_inputs(self):
+        rng = random.Random(1234)
+        for _ in range(200):
+            results = _random_windows(rng, rng.randint(1, 8))
+            expected = _reference_merge(self.transcriber, results)
+            actual = self.transcriber._merge_overlapping_results(results, [])
+            # 同一批 chunk 物件、同一順序（包括重複揀中同一個版本）
+            self.assertEqual([id(c) for c in actual], [id(c) for c in expected])
+
+    def test_long_chunk_overlapping_many_later_ones(self):
+        long_chunk = TranscriptionChunk(0.0, 100.0, "long", 0.95)
+        results = [(0, long_chunk)] + [
+            (1, TranscriptionChunk(float(t), float(t) + 1.0, f"s{t}", 0.6)) for t in range(90, 99)
+        ]
+        expected = _reference_merge(self.transcriber, results)
+        actual = self.transcriber._merge_overlapping_results(results, [])
+        self.assertEqual([id(c) for c in actual], [id(c) for c in expected])
+        self.assertTrue(all(c is long_chunk for c in actual))
+
+    def test_empty(self):
+        self.assertEqual(self.transcriber._merge_overlapping_results([], []), [])
+
+    def test_anchor_neighbours_match_reference(self):
+        rng = random.Random(7)
+        for _ in range(100):
+            results = [TranscriptionChunk(i, i + 1, str(i), 0.5, is_anchor=rng.random() < 0.2)
+                       for i in range(rng.randint(2, 40))]
+            seen = []
+            self.transcriber._correct_with_anchors = lambda c, p, n: seen.append((c, p, n)) or c
+            corrected = self.transcriber._anchor_based_correction(results, [c for c in results if c.is_anchor] or [None])
+            self.assertEqual(corrected, results)
+            self.assertEqual(seen, _reference_neighbours(results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from asr_stubs import Segment
+
+from utils.parallel_transcription import (
+    ParallelChunkTranscriber,
+    merge_chunk_results,
+    offset_segment,
+    resolve_asr_workers,
+)
+
+
+class _StubASR:
+    """每個 chunk 返回兩個 segment，文字帶 chunk 長度方便核對"""
+
+    def transcribe_array(self, audio, sample_rate=16000, **kwargs):
+        duration = len(audio) / sample_rate
+        return {'segments': [
+            Segment(0.0, duration / 2, f"a{duration:.1f}", words=[{'word': 'a', 'start': 0.1, 'end': 0.2}], id=0),
+            Segment(duration / 2, duration, f"b{duration:.1f}", id=1),
+        ]}
+
+
+def _stub_factory(config, model_size):
+    return _StubASR()
+
+
+class TestResolveWorkers(unittest.TestCase):
+    def test_explicit_values(self):
+        self.assertEqual(resolve_asr_workers(6), 6)
+        self.assertEqual(resolve_asr_workers("3"), 3)
+
+    def test_auto_scales_with_cores_and_ram(self):
+        self.assertEqual(resolve_asr_workers("auto", cpu_count=32, ram_gb=128), 8)
+        self.assertEqual(resolve_asr_workers("auto", cpu_count=32, ram_gb=7), 2)
+        self.assertEqual(resolve_asr_workers(0, cpu_count=2, ram_gb=64), 1)
+
+    def test_invalid_falls_back_to_auto(self):
+        self.assertEqual(resolve_asr_workers("lots", cpu_count=16, ram_gb=64), 4)
+
+
+class TestMerge(unittest.TestCase):
+    def test_offset_shifts_segment_and_words(self):
+        seg = Segment(1.0, 2.0, "x", words=[{'word': 'x', 'start': 1.0, 'end': 1.5}])
+        shifted = offset_segment(seg, 10.0)
+        self.assertEqual((shifted.start, shifted.end), (11.0, 12.0))
+        self.assertEqual(shifted.words[0]['start'], 11.0)
+        self.assertEqual(seg.start, 1.0)  # original untouched
+
+    def test_merge_is_independent_of_completion_order(self):
+        results = {
+            1: [Segment(30.0, 31.0, "c")],
+            0: [Segment(0.0, 1.0, "a"), Segment(5.0, 6.0, "b", id=1)],
+        }
+        merged = merge_chunk_results(results)
+        self.assertEqual([s.text for s in merged], ["a", "b", "c"])
+        self.assertEqual([s.id for s in merged], [0, 1, 2])
+
+
+class TestParallelChunkTranscriber(unittest.TestCase):
+    def test_pool_run_offsets_and_orders_segments(self):
+        sr = 16000
+        chunks = [(0.0, 2.0), (2.0, 6.0), (6.5, 7.5)]
+        with tempfile.TemporaryDirectory() as tmp:
+            audio_path = Path(tmp) / "audio.wav"
+            sf.write(str(audio_path), np.zeros(8 * sr, dtype=np.float32), sr)
+
+            progress = []
+            emitted = {}
+            with ParallelChunkTranscriber(None, "stub", workers=2, asr_factory=_stub_factory) as transcriber:
+                segments = transcriber.transcribe(
+                    str(audio_path), chunks,
+                    progress_callback=lambda done, total: progress.append((done, total)),
+                    chunk_callback=lambda index, segs: emitted.setdefault(index, [s.start for s in segs]),
+                    language='yue'
+                )
+                # 第二個檔案重用同一個進程池（唔使重新加載模型）
+                pool = transcriber._pool
+                again = transcriber.transcribe(str(audio_path), chunks[:1], language='yue')
+                self.assertIs(transcriber._pool, pool)
+            self.assertIsNone(transcriber._pool)
+            self.assertEqual([(s.start, s.text) for s in again], [(0.0, "a2.0"), (1.0, "b2.0")])
+
+        self.assertEqual(
+            [(s.start, s.end, s.text) for s in segments],
+            [(0.0, 1.0, "a2.0"), (1.0, 2.0, "b2.0"),
+             (2.0, 4.0, "a4.0"), (4.0, 6.0, "b4.0"),
+             (6.5, 7.0, "a1.0"), (7.0, 7.5, "b1.0")]
+        )
+        self.assertAlmostEqual(segments[4].words[0]['start'], 6.6)
+        self.assertEqual(progress[-1], (3, 3))
+        self.assertEqual(emitted, {0: [0.0, 1.0], 1: [2.0, 4.0], 2: [6.5, 7.0]})
+
+
+if __name__ == '__main__':
+    unittest.main()
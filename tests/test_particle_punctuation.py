@@ -0,0 +1,101 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import random
+import unittest
+
+from utils.particle_punctuation import MOVABLE_PUNCTUATION, fix_particle_punctuation
+
+# 同 SubtitlePipelineV2.SENTENCE_FINAL_PARTICLES 一樣
+PARTICLES = [
+    '嗎', '呀', '啦', '喎', '囉', '咩', '嘅', '啊', '呢', '喇',
+    '㗎', '咋', '啩', '嘛', '咯', '噃', '咧', '喏', '嚟', '㖭',
+    '唄', '嘎', '吖', '哇', '喔', '哦', '耶', '嘢'
+]
+
+
+def legacy_fix(text, particles):
+    """舊實現（逐個標點 × 逐個語氣詞 find + 切片），語氣詞按 particles 次序處理"""
+    result = text
+    movable_punctuation = ['，', ',', '。', '.', '！', '!', '？', '?']
+    demonstrative_words = {
+        '呢個', '呢啲', '呢度', '呢邊', '呢次', '呢樣', '呢陣',
+        '嗰個', '嗰啲', '嗰度', '嗰邊', '嗰次', '嗰樣', '嗰陣',
+    }
+    for punct in movable_punctuation:
+        for particle in particles:
+            wrong_pattern = f"{punct}{particle}"
+            index = 0
+            while True:
+                index = result.find(wrong_pattern, index)
+                if index == -1:
+                    break
+                char_after_index = index + len(wrong_pattern)
+                if char_after_index >= len(result):
+                    result = result[:index] + f"{particle}{punct}" + result[char_after_index:]
+                    index += len(f"{particle}{punct}")
+                    continue
+                char_after = result[char_after_index]
+                is_word = False
+                for word in demonstrative_words:
+                    if result[index + len(punct):].startswith(word):
+                        is_word = True
+                        break
+                if is_word:
+                    index += len(wrong_pattern)
+                    continue
+                if char_after in movable_punctuation or char_after.isspace():
+                    result = result[:index] + f"{particle}{punct}" + result[char_after_index:]
+                    index += len(f"{particle}{punct}")
+                else:
+                    index += len(wrong_pattern)
+    return result
+
+
+class TestParticlePunctuation(unittest.TestCase):
+    def fix(self, text):
+        return fix_particle_punctuation(text, PARTICLES)
+
+    def test_examples(self):
+        self.assertEqual(self.fix("嘅話,呢"), "嘅話呢,")
+        self.assertEqual(self.fix("咁樣，啦"), "咁樣啦，")
+        self.assertEqual(self.fix("嘅話,呢個"), "嘅話,呢個")  # 呢個係詞
+        self.assertEqual(self.fix("好，呀 你呢"), "好呀， 你呢")
+        self.assertEqual(self.fix("係咪？嘛！"), "係咪嘛？！")
+        self.assertEqual(self.fix("冇標點"), "冇標點")
+        self.assertEqual(self.fix(""), "")
+
+    def test_later_punctuation_sees_earlier_moves(self):
+        # 「，」先處理，之後「。」再遇到語氣詞（同舊實現次序一樣）
+        self.assertEqual(self.fix("。，呀"), "呀。，")
+        self.assertEqual(self.fix("，。呀"), "，呀。")
+
+    def test_adjacent_particles_left_to_right(self):
+        # 舊實現喺呢種情況嘅結果取決於 set 迭代次序；新實現固定由左到右
+        self.assertEqual(self.fix("，呀，啦"), "呀，啦，")
+
+    def test_differential_against_legacy(self):
+        rng = random.Random(2024)
+        alphabet = PARTICLES[:8] + ['呢', '嗰', '個', '啲', '好', '係', ' ', '\n'] + list(MOVABLE_PUNCTUATION) * 2
+        orders = [sorted(PARTICLES), sorted(PARTICLES, reverse=True)]
+        for seed in range(3):
+            order = list(PARTICLES)
+            random.Random(seed).shuffle(order)
+            orders.append(order)
+
+        compared = 0
+        for _ in range(6000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+            expected = {legacy_fix(text, order) for order in orders}
+            if len(expected) > 1:
+                # 舊結果依賴 set 迭代次序（冇唯一答案），見 test_adjacent_particles_left_to_right
+                continue
+            compared += 1
+            self.assertEqual(self.fix(text), expected.pop(), repr(text))
+        self.assertGreater(compared, 5700)
+
+
+if __name__ == '__main__':
+    unittest.main()
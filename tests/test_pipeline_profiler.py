@@ -0,0 +1,100 @@
+
+import sys
+import os
+import json
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from utils import pipeline_profiler
+from utils.pipeline_profiler import HAS_PSUTIL, PipelineProfiler
+
+
+class TestPipelineProfiler(unittest.TestCase):
+    def test_stage_records_time_and_counts(self):
+        profiler = PipelineProfiler("process", "/videos/clip.mp4")
+        with profiler.stage("corrections", items_in=10) as stage:
+            time.sleep(0.05)
+            sum(i * i for i in range(200000))
+            stage.items_out = 8
+            stage.extra['mode'] = 'full'
+        profiler.meta['audio_seconds'] = 10.0
+        profiler.finish()
+
+        report = profiler.report()
+        self.assertEqual(report['status'], 'ok')
+        (stage,) = report['stages']
+        self.assertEqual((stage['name'], stage['items_in'], stage['items_out']), ("corrections", 10, 8))
+        self.assertEqual(stage['extra'], {'mode': 'full'})
+        self.assertGreaterEqual(stage['wall_s'], 0.05)
+        self.assertGreater(stage['cpu_s'], 0.0)
+        self.assertAlmostEqual(report['rtf'], report['wall_s'] / 10.0, places=3)
+
+    @unittest.skipUnless(HAS_PSUTIL, "psutil not installed")
+    def test_peak_rss_delta_sees_transient_allocation(self):
+        profiler = PipelineProfiler("process")
+        with profiler.stage("asr"):
+            buf = np.ones(200 * 1024 ** 2 // 8)  # ~200 MB, freed before the stage ends
+            time.sleep(pipeline_profiler.RSS_SAMPLE_INTERVAL * 4)
+            del buf
+        self.assertGreater(profiler.stages[0].peak_rss_delta_mb, 100)
+
+    def test_failed_stage_is_still_recorded(self):
+        profiler = PipelineProfiler("process")
+        with self.assertRaises(RuntimeError):
+            with profiler.stage("extraction"):
+                raise RuntimeError("boom")
+        profiler.finish("failed")
+        self.assertEqual([s.name for s in profiler.stages], ["extraction"])
+        self.assertEqual(profiler.report()['status'], "failed")
+
+    def test_save_writes_json_and_cprofile_dump(self):
+        profiler = PipelineProfiler("process_ultimate", "clip.wav", enable_cprofile=True)
+        with profiler.stage("asr"):
+            sorted(range(1000), reverse=True)
+        profiler.finish()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = profiler.save(tmp)
+            data = json.loads(path.read_text(encoding='utf-8'))
+            self.assertEqual(data['job'], "process_ultimate")
+            self.assertEqual(data['stages'][0]['name'], "asr")
+            self.assertTrue(path.with_suffix(".prof").exists())
+
+    def test_only_one_job_owns_cprofile(self):
+        first = PipelineProfiler("process", "a.wav", enable_cprofile=True)
+        second = PipelineProfiler("process", "b.wav", enable_cprofile=True)
+        self.assertEqual((first.meta['cprofile'], second.meta['cprofile']), (True, False))
+        second.finish()
+        first.finish()
+
+        # 第一個 job 完成之後，下一個 job 可以再用 cProfile
+        third = PipelineProfiler("process", "c.wav", enable_cprofile=True)
+        self.assertTrue(third.meta['cprofile'])
+        third.finish()
+
+    def test_old_reports_are_pruned(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(5):
+                (Path(tmp) / f"old_{i}.json").write_text("{}")
+                os.utime(Path(tmp) / f"old_{i}.json", (i, i))
+            original = pipeline_profiler.MAX_REPORTS
+            pipeline_profiler.MAX_REPORTS = 3
+            try:
+                profiler = PipelineProfiler("process", "clip.wav")
+                profiler.finish()
+                profiler.save(tmp)
+            finally:
+                pipeline_profiler.MAX_REPORTS = original
+            remaining = sorted(p.name for p in Path(tmp).glob("*.json"))
+            self.assertEqual(len(remaining), 3)
+            self.assertNotIn("old_0.json", remaining)
+
+
+if __name__ == '__main__':
+    unittest.main()
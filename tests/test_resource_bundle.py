@@ -0,0 +1,190 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import json
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils.resource_bundle import _HEADER, _MAGIC, RESOURCE_BUNDLE_VERSION, ResourceBundle, fingerprint
+from utils.text_replacer import CHAINED, LONGEST, TextReplacer
+
+PAIRS = [("佢哋", "他們"), ("佢", "他"), ("喺", "在"), ("他在", "他正在")]
+
+_unpickled = []
+
+
+def _record_unpickle():
+    _unpickled.append(1)
+    return {}
+
+
+class _Planted:
+    def __reduce__(self):
+        return _record_unpickle, ()
+
+
+class TestResourceBundle(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.path = self.dir / 'bundle.bin'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entries_survive_reopen(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {'value': 1}
+
+        bundle = ResourceBundle(self.path)
+        self.assertEqual(bundle.get('x', 'fp1', build), {'value': 1})
+        bundle.save()
+
+        reopened = ResourceBundle(self.path)
+        self.assertEqual(reopened.get('x', 'fp1', build), {'value': 1})
+        self.assertEqual((len(calls), reopened.hits, reopened.misses), (1, 1, 0))
+
+        # 來源指紋改咗就重建
+        reopened.get('x', 'fp2', build)
+        self.assertEqual(len(calls), 2)
+
+    def test_json_file_follows_content(self):
+        source = self.dir / 'mapping.json'
+        source.write_text(json.dumps({"佢": "他"}, ensure_ascii=False), encoding='utf-8')
+        bundle = ResourceBundle(self.path)
+        self.assertEqual(bundle.json_file(source), {"佢": "他"})
+        bundle.save()
+
+        reopened = ResourceBundle(self.path)
+        self.assertEqual(reopened.json_file(source), {"佢": "他"})
+        self.assertEqual(reopened.misses, 0)
+
+        source.write_text(json.dumps({"佢": "她"}, ensure_ascii=False), encoding='utf-8')
+        self.assertEqual(reopened.json_file(source), {"佢": "她"})
+
+    def test_replacers_round_trip(self):
+        text = "佢哋話佢喺度，佢喺屋企"
+        bundle = ResourceBundle(self.path)
+        for mode in (LONGEST, CHAINED):
+            bundle.replacer(f'test_{mode}', PAIRS, mode=mode)
+        bundle.save()
+
+        reopened = ResourceBundle(self.path)
+        for mode in (LONGEST, CHAINED):
+            loaded = reopened.replacer(f'test_{mode}', PAIRS, mode=mode)
+            self.assertEqual(loaded.replace(text), TextReplacer(PAIRS, mode=mode).replace(text))
+        self.assertEqual(reopened.misses, 0)
+
+        # 規則次序都係指紋嘅一部分（CHAINED 結果取決於次序）
+        reopened.replacer(f'test_{CHAINED}', list(reversed(PAIRS)), mode=CHAINED)
+        self.assertEqual(reopened.misses, 1)
+
+    def test_replacer_format_change_rebuilds(self):
+        bundle = ResourceBundle(self.path)
+        bundle.replacer('test', PAIRS)
+        bundle.save()
+
+        with mock.patch('utils.resource_bundle.TEXT_REPLACER_FORMAT', -1):
+            reopened = ResourceBundle(self.path)
+            reopened.replacer('test', PAIRS)
+        self.assertEqual(reopened.misses, 1)
+
+    def test_bad_files_are_ignored(self):
+        self.path.write_bytes(b"not a bundle")
+        self.assertEqual(len(ResourceBundle(self.path)), 0)
+
+        self.path.write_bytes(b"CBRB" + (RESOURCE_BUNDLE_VERSION + 1).to_bytes(2, 'little') + b"\x80")
+        self.assertEqual(len(ResourceBundle(self.path)), 0)
+
+        # 壞檔案會喺下次 save 時被覆蓋
+        bundle = ResourceBundle(self.path)
+        bundle.get('x', fingerprint('a'), lambda: 1)
+        bundle.save()
+        self.assertEqual(ResourceBundle(self.path).get('x', fingerprint('a'), lambda: 2), 1)
+
+    def test_planted_pickle_is_never_loaded(self):
+        # 快取目錄用戶可寫：入面放 pickle 都唔會被執行，只當壞檔
+        self.path.write_bytes(_HEADER.pack(_MAGIC, RESOURCE_BUNDLE_VERSION) + pickle.dumps(_Planted()))
+        self.assertEqual(len(ResourceBundle(self.path)), 0)
+        self.assertEqual(_unpickled, [])
+
+    def test_tampered_entries_are_rebuilt(self):
+        text = "佢哋話佢喺度"
+        bundle = ResourceBundle(self.path)
+        for mode in (LONGEST, CHAINED):
+            bundle.replacer(f'test_{mode}', PAIRS, mode=mode)
+        bundle.get('json:x.json', 'fp', lambda: {'a': 1})
+        bundle.save()
+
+        raw = self.path.read_bytes()
+        entries = json.loads(raw[_HEADER.size:].decode('utf-8'))
+        entries[f'replacer:test_{LONGEST}'][1]['trie'] = {"佢": "not a node"}
+        entries[f'replacer:test_{CHAINED}'][1]['by_char'] = {"佢": [99]}
+        entries['json:x.json'][1] = [1, 2]
+        self.path.write_bytes(raw[:_HEADER.size] + json.dumps(entries, ensure_ascii=False).encode('utf-8'))
+
+        reopened = ResourceBundle(self.path)
+        for mode in (LONGEST, CHAINED):
+            replacer = reopened.replacer(f'test_{mode}', PAIRS, mode=mode)
+            self.assertEqual(replacer.replace(text), TextReplacer(PAIRS, mode=mode).replace(text))
+        reopened.get('json:x.json', 'fp', lambda: {'a': 1}, decode=dict)
+        self.assertEqual((reopened.misses, reopened.hits), (3, 0))
+
+    def test_seed_bundle_copied_to_cache(self):
+        seed = self.dir / 'seed.bin'
+        prebuilt = ResourceBundle(seed)
+        prebuilt.get('x', 'fp', lambda: 'prebuilt')
+        prebuilt.save()
+
+        bundle = ResourceBundle(self.path, seed_path=seed)
+        self.assertEqual(bundle.get('x', 'fp', lambda: 'rebuilt'), 'prebuilt')
+        bundle.save()
+        self.assertTrue(self.path.exists())
+        self.assertEqual(ResourceBundle(self.path).get('x', 'fp', lambda: 'rebuilt'), 'prebuilt')
+
+
+class TestStyleProcessorBundle(unittest.TestCase):
+    def test_second_processor_served_from_bundle(self):
+        from core.config import Config
+        from subtitle.style_processor import StyleProcessor
+
+        segments = [{'start': 0.0, 'end': 1.0, 'text': '佢喺度食咗三個蘋果，你條仆街'}]
+        options = {'style': 'spoken', 'profanity': 'mask', 'punctuation': 'remove'}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'bundle.bin'
+            first = StyleProcessor(Config(), resource_bundle=ResourceBundle(path))
+            bundle = ResourceBundle(path)
+            second = StyleProcessor(Config(), resource_bundle=bundle)
+            self.assertEqual(bundle.misses, 0)
+            self.assertGreater(bundle.hits, 0)
+            self.assertEqual(second.cantonese_map, first.cantonese_map)
+            self.assertEqual(second.process(segments, options),
+                             StyleProcessor(Config(), resource_bundle=ResourceBundle()).process(segments, options))
+
+    def test_warm_processor_does_not_rewrite_bundle(self):
+        from core.config import Config
+        from subtitle.style_processor import StyleProcessor
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'bundle.bin'
+            StyleProcessor(Config(), resource_bundle=ResourceBundle(path))
+            written = path.stat().st_mtime_ns
+            StyleProcessor(Config(), resource_bundle=ResourceBundle(path))
+            self.assertEqual(path.stat().st_mtime_ns, written)
+
+            # 記憶體資源包：完全唔寫檔
+            seeded = ResourceBundle(seed_path=path)
+            StyleProcessor(Config(), resource_bundle=seeded)
+            self.assertEqual(os.listdir(tmp), ['bundle.bin'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+import numpy as np
+
+from utils.speculative_decoding import (
+    DecoderSession, SpeculativeStats, VocabMap, WhisperLogitFilter,
+    speculative_greedy_decode, split_timestamped_tokens
+)
+
+EOT = 19
+VOCAB = 20
+
+
+def _target_next(history):
+    """目標模型：下一個 token 由成個歷史決定（測試 rollback 之後狀態啱唔啱）"""
+    if len(history) >= 40:
+        return EOT
+    return (sum(history) * 7 + len(history) * 3) % 18
+
+
+class _ToySession(DecoderSession):
+    """玩具 decoder：logits 係 next_fn(歷史) 嘅 one-hot，記錄 forward pass 次數"""
+
+    def __init__(self, next_fn, vocab=VOCAB, to_own=lambda t: t):
+        self.next_fn = next_fn
+        self.vocab = vocab
+        self.to_own = to_own
+        self.tokens = []
+        self.passes = 0
+
+    @property
+    def length(self):
+        return len(self.tokens)
+
+    def _row(self, history):
+        row = np.full(self.vocab, -5.0, dtype=np.float32)
+        row[self.to_own(self.next_fn(history))] = 5.0
+        return row
+
+    def start(self):
+        self.passes += 1
+        return self._row([])
+
+    def score(self, tokens):
+        self.passes += 1
+        rows = []
+        for token in tokens:
+            self.tokens.append(token)
+            rows.append(self._row(self.tokens))
+        return np.stack(rows)
+
+    def rollback(self, length):
+        del self.tokens[length:]
+
+
+def _draft_next(history):
+    """草稿模型：大部分時間同目標一樣，每 5 個位置錯一次"""
+    token = _target_next(history)
+    if token != EOT and len(history) % 5 == 4:
+        return (token + 1) % 18
+    return token
+
+
+class TestSpeculativeGreedy(unittest.TestCase):
+    def _greedy(self):
+        target = _ToySession(_target_next)
+        tokens, _ = speculative_greedy_decode(target, None, EOT)
+        return tokens, target.passes
+
+    def test_token_identical_to_greedy_with_fewer_target_passes(self):
+        greedy_tokens, greedy_passes = self._greedy()
+        self.assertEqual(len(greedy_tokens), 40)
+
+        for k in (1, 3, 5, 8):
+            target, draft = _ToySession(_target_next), _ToySession(_draft_next)
+            stats = SpeculativeStats()
+            tokens, logprobs = speculative_greedy_decode(target, draft, EOT, num_draft_tokens=k, stats=stats)
+            self.assertEqual(tokens, greedy_tokens, f"k={k}")
+            self.assertEqual(len(logprobs), len(tokens))
+            self.assertLess(target.passes, greedy_passes)
+            self.assertEqual(stats.target_passes, target.passes)
+            self.assertGreater(stats.acceptance_rate, 0.5)
+
+    def test_useless_draft_still_identical(self):
+        greedy_tokens, greedy_passes = self._greedy()
+        target = _ToySession(_target_next)
+        draft = _ToySession(lambda h: (_target_next(h) + 3) % 18 if _target_next(h) != EOT else EOT)
+        tokens, _ = speculative_greedy_decode(target, draft, EOT, num_draft_tokens=4)
+        self.assertEqual(tokens, greedy_tokens)
+        self.assertEqual(target.passes, greedy_passes)
+
+    def test_max_new_tokens(self):
+        target, draft = _ToySession(_target_next), _ToySession(_draft_next)
+        tokens, _ = speculative_greedy_decode(target, draft, EOT, max_new_tokens=7, num_draft_tokens=5)
+        self.assertEqual(tokens, self._greedy()[0][:7])
+
+    def test_draft_with_shifted_special_tokens(self):
+        # 草稿 tokenizer 嘅 eot 係 20（好似 small vs large-v3 特殊 token 移位）
+        vocab_map = VocabMap(text_vocab_size=18, draft_to_target={20: EOT})
+        target = _ToySession(_target_next)
+        draft = _ToySession(_draft_next, vocab=21, to_own=lambda t: 20 if t == EOT else t)
+        tokens, _ = speculative_greedy_decode(target, draft, EOT, num_draft_tokens=4, vocab_map=vocab_map)
+        self.assertEqual(tokens, self._greedy()[0])
+
+    def test_whisper_vocab_map(self):
+        # small: eot 50257, 時間戳 50364；large-v3: eot 50257, 時間戳 50365
+        vocab_map = VocabMap.for_whisper(50257, 50364, 50257, 50365)
+        self.assertEqual(vocab_map.to_target(1234), 1234)
+        self.assertEqual(vocab_map.to_target(50364 + 25), 50365 + 25)
+        self.assertEqual(vocab_map.to_draft(50365), 50364)
+        self.assertIsNone(vocab_map.to_target(50300))  # 語言 token 對應唔到
+
+
+class TestWhisperRules(unittest.TestCase):
+    def setUp(self):
+        # 文字 0-4，eot 5，notimestamps 6，時間戳由 7 開始
+        self.filter = WhisperLogitFilter(eot=5, timestamp_begin=7, no_timestamps=6,
+                                         begin_suppress_tokens=[0, 5], max_initial_timestamp_index=2)
+        self.logits = np.zeros(7 + 20, dtype=np.float32)
+
+    def allowed(self, history):
+        return set(np.flatnonzero(np.isfinite(self.filter.apply(history, self.logits))))
+
+    def test_first_token_is_early_timestamp(self):
+        self.assertEqual(self.allowed([]), {7, 8, 9})
+
+    def test_timestamps_come_in_pairs_and_never_go_back(self):
+        self.assertEqual(self.allowed([7, 1, 12]), set(range(12, 27)))  # 文字之後嘅時間戳要配對
+        self.assertEqual(self.allowed([7, 1, 12, 12]), {0, 1, 2, 3, 4, 5})  # 一對之後係文字
+        self.assertNotIn(11, self.allowed([7, 1, 12, 12, 3]))  # 唔可以倒退
+
+    def test_timestamp_forced_when_more_likely_than_text(self):
+        logits = np.zeros(27, dtype=np.float32)
+        logits[7:] = 1.0
+        self.assertTrue(all(t >= 7 for t in np.flatnonzero(np.isfinite(self.filter.apply([7, 1], logits)))))
+
+
+class TestSplitTimestamped(unittest.TestCase):
+    TS = 100
+
+    def ts(self, seconds):
+        return self.TS + int(round(seconds / 0.02))
+
+    def test_complete_segments(self):
+        tokens = [self.ts(0), 1, 2, self.ts(1.0), self.ts(1.2), 3, self.ts(2.0)]
+        segments, consumed = split_timestamped_tokens(tokens, [0.0] * len(tokens), self.TS, 30.0)
+        self.assertEqual([(s, e, t) for s, e, t, _ in segments], [(0.0, 1.0, [1, 2]), (1.2, 2.0, [3])])
+        self.assertEqual(consumed, 30.0)
+
+    def test_unfinished_tail_is_left_for_next_window(self):
+        tokens = [self.ts(0), 1, self.ts(1.0), self.ts(1.0), 4, 4]
+        segments, consumed = split_timestamped_tokens(tokens, [0.0] * len(tokens), self.TS, 30.0)
+        self.assertEqual(len(segments), 1)
+        self.assertAlmostEqual(consumed, 1.0)
+
+    def test_text_without_timestamps(self):
+        segments, consumed = split_timestamped_tokens([1, 2], [0.0, 0.0], self.TS, 12.5)
+        self.assertEqual([(s, e) for s, e, _, _ in segments], [(0.0, 12.5)])
+        self.assertEqual(consumed, 12.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+import numpy as np
+
+from utils.asr_utils import remap_segment
+from utils.speech_windows import build_window_audio, pack_speech_windows
+
+
+class TestPackSpeechWindows(unittest.TestCase):
+    def test_regions_packed_with_separator(self):
+        windows = pack_speech_windows([(10.0, 15.0), (100.0, 108.0), (200.0, 210.0)], separator=0.5)
+        self.assertEqual(len(windows), 1)
+        pieces = windows[0].pieces
+        self.assertEqual([p.window_start for p in pieces], [0.0, 5.5, 14.0])
+        self.assertAlmostEqual(windows[0].duration, 24.0)
+
+    def test_windows_never_exceed_max(self):
+        rng = np.random.default_rng(1)
+        starts = np.cumsum(rng.uniform(1, 20, 200))
+        regions = [(s, s + rng.uniform(0.2, 45)) for s in starts]
+        windows = pack_speech_windows(regions, max_window=30.0)
+        self.assertTrue(all(w.duration <= 30.0 + 1e-9 for w in windows))
+
+        # 所有語音都被覆蓋（合併重疊後總長相同）
+        merged = []
+        for s, e in sorted(regions):
+            if merged and s <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        total = sum(e - s for s, e in merged)
+        packed = sum(p.duration for w in windows for p in w.pieces)
+        self.assertAlmostEqual(total, packed, places=6)
+
+    def test_long_region_is_split(self):
+        windows = pack_speech_windows([(0.0, 70.0)], max_window=30.0)
+        self.assertEqual([w.duration for w in windows], [30.0, 30.0, 10.0])
+        self.assertEqual(windows[2].pieces[0].source_start, 60.0)
+
+    def test_remap_table(self):
+        window = pack_speech_windows([(10.0, 15.0), (100.0, 108.0)], separator=0.5)[0]
+        self.assertAlmostEqual(window.to_source(2.0), 12.0)
+        self.assertAlmostEqual(window.to_source(6.5), 101.0)
+        # 插入靜音區：開始對齊下一段，結束對齊上一段
+        self.assertAlmostEqual(window.to_source(5.2), 100.0)
+        self.assertAlmostEqual(window.to_source(5.2, is_end=True), 15.0)
+
+    def test_remap_segment_with_words(self):
+        window = pack_speech_windows([(10.0, 15.0), (100.0, 108.0)], separator=0.5)[0]
+        seg = {'start': 4.0, 'end': 7.0, 'text': 'x', 'words': [{'start': 6.0, 'end': 6.5}]}
+        mapped = remap_segment(seg, window.to_source)
+        self.assertEqual((mapped['start'], mapped['end']), (14.0, 101.5))
+        self.assertAlmostEqual(mapped['words'][0]['start'], 100.5)
+
+
+class TestBuildWindowAudio(unittest.TestCase):
+    def test_pieces_copied_with_silence_between(self):
+        sr = 100
+        audio = np.arange(1000, dtype=np.float32)
+        window = pack_speech_windows([(1.0, 2.0), (5.0, 6.0)], separator=0.5)[0]
+        out = build_window_audio(audio, sr, window)
+        self.assertEqual(len(out), 250)
+        np.testing.assert_array_equal(out[:100], audio[100:200])
+        self.assertTrue(np.all(out[100:150] == 0))
+        np.testing.assert_array_equal(out[150:], audio[500:600])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from asr_stubs import RampASR, Segment, write_ramp
+
+from utils.advanced_transcription import AdvancedTranscriber
+
+GRID = 2.5  # 假 ASR 每 2.5 秒出一個段落
+
+
+def _grid_segment(t, start, end, kwargs):
+    """第一次轉錄信心 0.3；帶 temperature 嘅重轉信心 0.8，文字加「重」字做記號"""
+    retry = 'temperature' in kwargs
+    text = f"{'重' if retry else ''}{t:.1f}"
+    return Segment(start, end, text, 0.8 if retry else 0.3,
+                   words=[{'word': text, 'start': start, 'end': start + 1.0}])
+
+
+class _Config:
+    def get(self, key, default=None):
+        return {'asr_batch_size': 1}.get(key, default)
+
+
+class TestCoalesceRetryWindows(unittest.TestCase):
+    def setUp(self):
+        self.transcriber = AdvancedTranscriber()
+
+    def test_overlapping_windows_merge(self):
+        regions = self.transcriber._coalesce_retry_windows(
+            [(5.0, 6.0), (6.5, 7.0), (8.0, 9.0), (40.0, 41.0)], total_duration=60.0
+        )
+        self.assertEqual(regions, [(3.0, 11.0, [0, 1, 2]), (38.0, 43.0, [3])])
+
+    def test_clamped_to_audio(self):
+        regions = self.transcriber._coalesce_retry_windows([(0.5, 1.0), (9.0, 9.8)], total_duration=10.0)
+        self.assertEqual(regions, [(0.0, 3.0, [0]), (7.0, 10.0, [1])])
+
+    def test_regions_respect_max_length_and_cover_member_windows(self):
+        spans = [(t, t + 1.5) for t in np.arange(0.0, 100.0, 2.0)]
+        regions = self.transcriber._coalesce_retry_windows(spans, total_duration=100.0)
+        self.assertEqual([i for _, _, members in regions for i in members], list(range(len(spans))))
+        for start, end, members in regions:
+            self.assertLessEqual(end - start, 30.0)
+            # 每個段落連前後 padding 都完整喺區域入面
+            for i in members:
+                self.assertLessEqual(start, max(0.0, spans[i][0] - 2.0))
+                self.assertGreaterEqual(end, min(100.0, spans[i][1] + 2.0))
+
+    def test_split_by_max_length_keeps_chunk_head(self):
+        # 第二段窗口 (25.5, 31) 同第一個區域 (0, 27) 重疊，但合併會超過 30 秒
+        regions = self.transcriber._coalesce_retry_windows([(2.0, 25.0), (27.5, 29.0)], total_duration=60.0)
+        self.assertEqual(regions, [(0.0, 27.0, [0]), (25.5, 31.0, [1])])
+
+
+class TestStage2Retry(unittest.TestCase):
+    def test_low_confidence_runs_are_decoded_once_per_region(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_ramp(os.path.join(tmp, "ramp.wav"), 40)
+            chunks = [(0.0, 5.0), (5.0, 10.0), (10.0, 15.0), (30.0, 35.0)]
+            asr = RampASR(GRID, make_segment=_grid_segment)
+            with mock.patch.object(AdvancedTranscriber, 'vad_presplit', return_value=chunks):
+                results = AdvancedTranscriber(_Config()).three_stage_transcribe(path, asr)
+
+        # 8 個低信心段落只解碼 2 個合併區域（原本係 8 次）
+        retry_windows = [(start, end) for start, end, kwargs in asr.calls if 'temperature' in kwargs]
+        self.assertEqual(retry_windows, [(0.0, 17.0), (28.0, 37.0)])
+        expected_starts = [0.0, 2.5, 5.0, 7.5, 10.0, 12.5, 30.0, 32.5]
+        self.assertEqual([c.start for c in results], expected_starts)
+        self.assertEqual([c.text for c in results], [f"重{t:.1f}" for t in expected_starts])
+        self.assertTrue(all(abs(c.confidence - 0.9) < 1e-9 for c in results))
+        # 詞級時間戳係絕對時間
+        self.assertEqual([c.words[0]['start'] for c in results], expected_starts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+from subtitle.style_processor import StyleProcessor
+from utils.resource_bundle import ResourceBundle
+
+SEGMENTS = [
+    {'start': 0.0, 'end': 1.0, 'text': '佢喺度食咗三個蘋果。'},
+    {'start': 1.0, 'end': 2.0, 'text': '你條仆街，今日係咪好忙呀？'},
+    {'start': 2.0, 'end': 3.0, 'text': '我哋一齊去睇戲啦'},
+]
+
+OPTIONS = {'style': 'spoken', 'english': 'keep', 'numbers': 'arabic',
+           'profanity': 'keep', 'punctuation': 'keep'}
+
+
+def _count_calls(processor, name):
+    """包住 processor 嘅方法，記錄被叫咗幾多次"""
+    calls = []
+    method = getattr(processor, name)
+
+    def wrapper(*args):
+        calls.append(args)
+        return method(*args)
+    setattr(processor, name, wrapper)
+    return calls
+
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        # 記憶體資源包：測試唔寫用戶 cache_dir
+        self.processor = StyleProcessor(resource_bundle=ResourceBundle())
+
+    def test_same_result_as_fresh_processor(self):
+        for change in ({}, {'numbers': 'chinese'}, {'profanity': 'mask'}, {'punctuation': 'remove'},
+                       {'english': 'translate'}, {}):
+            options = dict(OPTIONS, **change)
+            self.assertEqual(self.processor.process(SEGMENTS, options),
+                             StyleProcessor(resource_bundle=ResourceBundle()).process(SEGMENTS, options), options)
+
+    def test_toggle_recomputes_only_downstream(self):
+        cantonese = _count_calls(self.processor, '_convert_style_dict')
+        numbers = _count_calls(self.processor, '_format_numbers')
+        profanity = _count_calls(self.processor, '_filter_profanity')
+
+        self.processor.process(SEGMENTS, OPTIONS)
+        self.assertEqual((len(cantonese), len(numbers), len(profanity)), (3, 3, 3))
+
+        # 改 profanity：上游階段全部命中快取
+        self.processor.process(SEGMENTS, dict(OPTIONS, profanity='mask'))
+        self.assertEqual((len(cantonese), len(numbers), len(profanity)), (3, 3, 6))
+
+        # 切返轉：全部命中
+        self.processor.process(SEGMENTS, OPTIONS)
+        self.assertEqual((len(cantonese), len(numbers), len(profanity)), (3, 3, 6))
+
+    def test_ai_batch_not_rerun_for_downstream_options(self):
+        batches = []
+
+        def fake_batch(segments, style, progress_callback=None):
+            batches.append(style)
+            return {i: seg['text'] + style for i, seg in enumerate(segments)}
+        self.processor._batch_ai_convert = fake_batch
+
+        written = dict(OPTIONS, style='written')
+        first = self.processor.process(SEGMENTS, written)
+        self.processor.process(SEGMENTS, dict(written, numbers='chinese'))
+        again = self.processor.process(SEGMENTS, written)
+        self.assertEqual(batches, ['written'])
+        self.assertEqual(first, again)
+
+        # 字幕改咗就要重新轉換
+        edited = [dict(SEGMENTS[0], text='改咗')] + SEGMENTS[1:]
+        self.processor.process(edited, written)
+        self.assertEqual(batches, ['written', 'written'])
+
+    def test_failed_ai_batch_is_not_cached(self):
+        batches = []
+
+        def failing_batch(segments, style, progress_callback=None):
+            batches.append(style)
+            return None
+        self.processor._batch_ai_convert = failing_batch
+        written = dict(OPTIONS, style='written')
+        self.processor.process(SEGMENTS, written)
+        self.processor.process(SEGMENTS, written)
+        self.assertEqual(len(batches), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import json
+import random
+import tempfile
+import unittest
+
+from utils.text_replacer import CHAINED, LONGEST, TextReplacer, chained_replace
+from utils.vocabulary_learner import VocabularyLearner
+
+RESOURCES = os.path.join(os.path.dirname(__file__), '..', 'src', 'resources')
+
+
+def _random_texts(pairs, count, seed=0):
+    """隨機拼合詞典詞、替換結果同單字（製造連鎖替換同重疊）"""
+    rng = random.Random(seed)
+    words = [p for p, _ in pairs] + [r for _, r in pairs if r]
+    chars = sorted(set("".join(words)))
+    return [
+        "".join(rng.choice(words) if rng.random() < 0.5 else rng.choice(chars)
+                for _ in range(rng.randint(1, 10)))
+        for _ in range(count)
+    ]
+
+
+class TestLongest(unittest.TestCase):
+    def test_leftmost_longest(self):
+        replacer = TextReplacer({"點": "X", "點解": "為什麼", "解釋": "explain"})
+        self.assertEqual(replacer.replace("點解釋"), "為什麼釋")  # 最左邊、最長
+        self.assertEqual(replacer.replace("佢解釋點"), "佢explainX")
+
+    def test_replacements_are_not_rescanned(self):
+        replacer = TextReplacer({"a": "b", "b": "c"})
+        self.assertEqual(replacer.replace("ab"), "bc")
+
+    def test_fired_and_no_match(self):
+        replacer = TextReplacer({"仆街": "★★"})
+        fired = []
+        self.assertEqual(replacer.replace("你個仆街", fired), "你個★★")
+        self.assertEqual(fired, [("仆街", "★★")])
+        text = "冇嘢"
+        self.assertIs(replacer.replace(text), text)
+
+    def test_ignored_rules(self):
+        replacer = TextReplacer({"": "x", "收皮": "收皮"})
+        self.assertEqual(len(replacer), 0)
+        self.assertEqual(replacer.replace("收皮"), "收皮")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            TextReplacer({}, mode="fast")
+
+
+class TestChained(unittest.TestCase):
+    def test_chained_order(self):
+        # 後面嘅規則會匹配前面替換出嚟嘅字（黎 → 嚟 → 來）
+        pairs = [("黎", "嚟"), ("D", "啲"), ("嚟", "來"), ("goo啲", "good")]
+        replacer = TextReplacer(pairs, mode=CHAINED)
+        self.assertEqual(replacer.replace("黎gooD D"), "來good 啲")
+        # 次序調返轉就唔會連鎖
+        self.assertEqual(TextReplacer(pairs[::-1], mode=CHAINED).replace("黎"), "嚟")
+
+    def test_matches_sequential_replace_on_cantonese_map(self):
+        with open(os.path.join(RESOURCES, 'cantonese_mapping.json'), encoding='utf-8') as f:
+            mapping = json.load(f)
+        pairs = [(k, mapping[k]) for k in sorted(mapping, key=len, reverse=True)]
+        replacer = TextReplacer(pairs, mode=CHAINED)
+        for text in _random_texts(pairs, 3000):
+            self.assertEqual(replacer.replace(text), chained_replace(text, pairs), text)
+
+    def test_matches_sequential_replace_on_random_rules(self):
+        rng = random.Random(7)
+        alphabet = "abcde"
+        for _ in range(200):
+            pairs = [("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3))),
+                      "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3))))
+                     for _ in range(rng.randint(1, 8))]
+            replacer = TextReplacer(pairs, mode=CHAINED)
+            for _ in range(20):
+                text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+                self.assertEqual(replacer.replace(text), chained_replace(text, pairs), (pairs, text))
+
+    def test_profanity_map_longest_matches_legacy_loop(self):
+        with open(os.path.join(RESOURCES, 'profanity_mapping.json'), encoding='utf-8') as f:
+            mapping = json.load(f)
+        pairs = [(k, mapping[k]) for k in sorted(mapping, key=len, reverse=True)]
+        replacer = TextReplacer(mapping, mode=LONGEST)
+        for text in _random_texts(pairs, 2000):
+            self.assertEqual(replacer.replace(text), chained_replace(text, pairs), text)
+
+
+class TestVocabularyAutoCorrect(unittest.TestCase):
+    def test_rebuilt_when_vocabulary_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            learner = VocabularyLearner(data_dir=tmp)
+            learner.add_vocabulary("Canto Beats", ["看圖比", "看到beats"])
+            self.assertEqual(learner.auto_correct("我用看圖比"), "我用Canto Beats")
+
+            learner.add_vocabulary("零舍", ["凌射"])
+            self.assertEqual(learner.auto_correct("凌射好用看到beats"), "零舍好用Canto Beats")
+
+            learner.remove_vocabulary("零舍")
+            self.assertEqual(learner.auto_correct("凌射"), "凌射")
+
+            learner.clear_all()
+            self.assertEqual(learner.auto_correct("看圖比"), "看圖比")
+
+
+if __name__ == '__main__':
+    unittest.main()
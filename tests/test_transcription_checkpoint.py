@@ -0,0 +1,149 @@
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import soundfile as sf
+
+from asr_stubs import Segment
+
+from utils.advanced_transcription import AdvancedTranscriber
+from utils.parallel_transcription import ParallelChunkTranscriber
+from utils.transcription_checkpoint import TranscriptionCheckpoint, chunk_key, prune_checkpoints
+
+
+class _CountingASR:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe_array(self, audio, sample_rate=16000, **kwargs):
+        self.calls += 1
+        duration = len(audio) / sample_rate
+        return {'segments': [Segment(0.0, duration, f"chunk{self.calls}", words=[{'word': 'x', 'start': 0.0, 'end': 0.1}])]}
+
+
+def _failing_factory(config, model_size):
+    raise AssertionError("worker should not start when every chunk is checkpointed")
+
+
+class _Config:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def get(self, key, default=None):
+        return {'cache_dir': self.cache_dir, 'asr_batch_size': 1}.get(key, default)
+
+
+class TestTranscriptionCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_put_get_roundtrip_survives_reopen(self):
+        path = self.tmp / "job.jsonl"
+        ckpt = TranscriptionCheckpoint(path)
+        ckpt.put("stage1:0.000-5.000", [Segment(0.0, 5.0, "你好", words=[{'word': '你', 'start': 0.0, 'end': 0.4}])])
+
+        restored = TranscriptionCheckpoint(path).get("stage1:0.000-5.000")
+        self.assertEqual((restored[0].start, restored[0].end, restored[0].text), (0.0, 5.0, "你好"))
+        self.assertEqual(restored[0].confidence, 0.9)
+        self.assertEqual(restored[0].words[0]['word'], '你')
+        self.assertIsNone(TranscriptionCheckpoint(path).get("stage1:5.000-9.000"))
+
+    def test_truncated_last_line_is_ignored(self):
+        path = self.tmp / "job.jsonl"
+        TranscriptionCheckpoint(path).put("a", [Segment(0.0, 1.0, "a")])
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"chunk": "b", "segm')  # 崩潰時寫咗一半
+        ckpt = TranscriptionCheckpoint(path)
+        self.assertEqual(len(ckpt), 1)
+        self.assertIn("a", ckpt)
+
+    def test_job_key_depends_on_audio_and_settings(self):
+        config = _Config(str(self.tmp))
+        audio = self.tmp / "a.wav"
+        sf.write(str(audio), np.zeros(16000, dtype=np.float32), 16000)
+        other = self.tmp / "b.wav"
+        sf.write(str(other), np.ones(16000, dtype=np.float32) * 0.1, 16000)
+
+        p1 = TranscriptionCheckpoint.for_job(config, audio, {'model': 'large-v3'}).path
+        self.assertEqual(p1, TranscriptionCheckpoint.for_job(config, audio, {'model': 'large-v3'}).path)
+        self.assertNotEqual(p1, TranscriptionCheckpoint.for_job(config, audio, {'model': 'small'}).path)
+        self.assertNotEqual(p1, TranscriptionCheckpoint.for_job(config, other, {'model': 'large-v3'}).path)
+
+    def test_discard_removes_file(self):
+        ckpt = TranscriptionCheckpoint(self.tmp / "job.jsonl")
+        ckpt.put("a", [])
+        ckpt.discard()
+        self.assertFalse(ckpt.path.exists())
+        self.assertEqual(len(ckpt), 0)
+
+    def test_stale_checkpoints_are_pruned_on_first_open(self):
+        directory = self.tmp / "checkpoints"
+        directory.mkdir()
+        stale, recent = directory / "stale.jsonl", directory / "recent.jsonl"
+        stale.write_text("{}\n")
+        recent.write_text("{}\n")
+        old = time.time() - 8 * 86400
+        os.utime(stale, (old, old))
+
+        self.assertEqual(prune_checkpoints(directory, max_age_days=0), 0)
+        audio = self.tmp / "a.wav"
+        sf.write(str(audio), np.zeros(16000, dtype=np.float32), 16000)
+        TranscriptionCheckpoint.for_job(_Config(str(self.tmp)), audio, {'model': 'large-v3'})
+        self.assertFalse(stale.exists())
+        self.assertTrue(recent.exists())
+
+    def test_three_stage_resumes_from_checkpoint(self):
+        audio_path = self.tmp / "audio.wav"
+        sf.write(str(audio_path), np.zeros(16000 * 20, dtype=np.float32), 16000)
+        chunks = [(0.0, 5.0), (6.0, 12.0), (13.0, 19.0)]
+        transcriber = AdvancedTranscriber(_Config(str(self.tmp)))
+        path = self.tmp / "job.jsonl"
+
+        with mock.patch.object(AdvancedTranscriber, 'vad_presplit', return_value=chunks):
+            first_asr = _CountingASR()
+            first = transcriber.three_stage_transcribe(
+                str(audio_path), first_asr, checkpoint=TranscriptionCheckpoint(path)
+            )
+
+            # 模擬中途崩潰：只保留頭兩個 chunk
+            lines = path.read_text(encoding='utf-8').splitlines()
+            path.write_text("\n".join(lines[:2]) + "\n", encoding='utf-8')
+
+            resumed_asr = _CountingASR()
+            emitted = []
+            resumed = transcriber.three_stage_transcribe(
+                str(audio_path), resumed_asr, checkpoint=TranscriptionCheckpoint(path),
+                chunk_callback=lambda batch: emitted.extend(c.start for c in batch)
+            )
+
+        self.assertEqual(first_asr.calls, 3)
+        self.assertEqual(resumed_asr.calls, 1)
+        self.assertEqual(emitted, [0.0, 6.0, 13.0])  # 恢復嘅 chunk 都會逐步推送
+        self.assertEqual([(c.start, c.end) for c in resumed], [(c.start, c.end) for c in first])
+        self.assertEqual([c.text for c in resumed][:2], [c.text for c in first][:2])
+
+    def test_parallel_skips_checkpointed_chunks(self):
+        chunks = [(0.0, 2.0), (3.0, 5.0)]
+        ckpt = TranscriptionCheckpoint(self.tmp / "job.jsonl")
+        ckpt.put(chunk_key("parallel", 3.0, 5.0), [Segment(3.0, 5.0, "b")])
+        ckpt.put(chunk_key("parallel", 0.0, 2.0), [Segment(0.0, 2.0, "a")])
+
+        transcriber = ParallelChunkTranscriber(None, "stub", workers=2, asr_factory=_failing_factory)
+        segments = transcriber.transcribe("unused.wav", chunks, checkpoint=ckpt)
+        self.assertEqual([s.text for s in segments], ["a", "b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
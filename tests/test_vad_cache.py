@@ -0,0 +1,101 @@
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from utils.vad_cache import CachingVADProcessor, VADCache
+
+
+class _CountingVAD:
+    """假 VAD：記錄 detect_voice_segments 被叫咗幾多次"""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.threshold = 0.4
+
+    def detect_voice_segments(self, audio_path):
+        self.calls += 1
+        time.sleep(self.delay)
+        return [SimpleNamespace(start=0.0, end=1.5, confidence=0.9),
+                SimpleNamespace(start=2.0, end=4.25, confidence=0.8)]
+
+    def merge_with_transcription(self, voice_segments, whisper_segments):
+        return whisper_segments
+
+
+def _hash(path):
+    # 測試用：路徑就係內容
+    return f"hash-{os.path.basename(str(path))}"
+
+
+class TestCachingVADProcessor(unittest.TestCase):
+    PARAMS = {'threshold': 0.4, 'min_silence_duration_ms': 300}
+
+    def test_memory_hit(self):
+        vad = _CountingVAD()
+        cached = CachingVADProcessor(vad, self.PARAMS, VADCache(content_hash=_hash))
+        first = cached.detect_voice_segments("a.wav")
+        second = cached.detect_voice_segments("a.wav")
+        self.assertEqual(vad.calls, 1)
+        self.assertEqual([(s.start, s.end) for s in second], [(s.start, s.end) for s in first])
+
+    def test_disk_hit_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            CachingVADProcessor(_CountingVAD(), self.PARAMS, VADCache(tmp, content_hash=_hash)) \
+                .detect_voice_segments("a.wav")
+
+            # 新進程：記憶體係空嘅，讀磁碟
+            vad = _CountingVAD()
+            cache = VADCache(tmp, content_hash=_hash)
+            segments = CachingVADProcessor(vad, self.PARAMS, cache).detect_voice_segments("a.wav")
+            self.assertEqual(vad.calls, 0)
+            self.assertEqual(cache.hits, 1)
+            self.assertEqual([(s.start, s.end, s.confidence) for s in segments],
+                             [(0.0, 1.5, 0.9), (2.0, 4.25, 0.8)])
+
+    def test_different_audio_or_params_miss(self):
+        vad = _CountingVAD()
+        cache = VADCache(content_hash=_hash)
+        CachingVADProcessor(vad, self.PARAMS, cache).detect_voice_segments("a.wav")
+        CachingVADProcessor(vad, self.PARAMS, cache).detect_voice_segments("b.wav")
+        CachingVADProcessor(vad, dict(self.PARAMS, threshold=0.5), cache).detect_voice_segments("a.wav")
+        self.assertEqual(vad.calls, 3)
+
+    def test_concurrent_callers_compute_once(self):
+        # 標準模式背景 VAD 同另一個線程同時要同一段音頻
+        vad = _CountingVAD(delay=0.05)
+        cached = CachingVADProcessor(vad, self.PARAMS, VADCache(content_hash=_hash))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cached.detect_voice_segments("a.wav")))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(vad.calls, 1)
+        self.assertEqual(len(results), 4)
+
+    def test_hash_failure_runs_vad(self):
+        def broken(path):
+            raise OSError("missing")
+        vad = _CountingVAD()
+        cached = CachingVADProcessor(vad, self.PARAMS, VADCache(content_hash=broken))
+        self.assertEqual(len(cached.detect_voice_segments("a.wav")), 2)
+        self.assertEqual(vad.calls, 1)
+
+    def test_other_attributes_delegate(self):
+        vad = _CountingVAD()
+        cached = CachingVADProcessor(vad, self.PARAMS, VADCache(content_hash=_hash))
+        self.assertEqual(cached.threshold, 0.4)
+        self.assertEqual(cached.merge_with_transcription([], ["x"]), ["x"])
+
+
+if __name__ == '__main__':
+    unittest.main()
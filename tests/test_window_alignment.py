@@ -0,0 +1,154 @@
+
+import sys
+import os
+import random
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+from asr_stubs import SR, Segment, window_offset, write_ramp
+from utils.advanced_transcription import AdvancedTranscriber, TranscriptionChunk
+from utils.window_alignment import merge_adjacent, merge_window_results, plan_windows
+
+CHAR_SECONDS = 0.5  # 每個字 0.5 秒（0.4 秒發音 + 0.1 秒停頓）
+
+
+class _ScriptedASR:
+    """
+    按「標準答案」轉錄嘅假 ASR
+
+    音頻係時間斜坡（audio[n] = n / SR / 1e4），所以由第一個樣本就知道窗口喺邊度開始。
+    窗口邊緣嘅字會聽錯（換成「？」），模擬真實 ASR 喺窗口邊界嘅錯誤。
+    """
+
+    def __init__(self, truth: str, total_duration: float, segment_chars: int = 7):
+        self.truth = truth
+        self.total_duration = total_duration
+        self.segment_chars = segment_chars
+        self.decoded_seconds = 0.0
+
+    def transcribe_array(self, audio, sample_rate=SR, **kwargs):
+        offset = window_offset(audio)
+        duration = len(audio) / sample_rate
+        self.decoded_seconds += duration
+        chars = [k for k in range(len(self.truth))
+                 if offset <= (k + 0.4) * CHAR_SECONDS and (k + 0.4) * CHAR_SECONDS <= offset + duration]
+        words = []
+        for n, k in enumerate(chars):
+            text = self.truth[k]
+            at_left_edge = n == 0 and offset > 0
+            at_right_edge = n == len(chars) - 1 and offset + duration < self.total_duration
+            if at_left_edge or at_right_edge:
+                text = "？"
+            start = k * CHAR_SECONDS - offset
+            words.append({'word': text, 'start': max(0.0, start), 'end': start + 0.4 * CHAR_SECONDS})
+
+        segments = []
+        for i in range(0, len(words), self.segment_chars):
+            group = words[i:i + self.segment_chars]
+            segments.append(Segment(group[0]['start'], group[-1]['end'],
+                                    "".join(w['word'] for w in group), words=group))
+        return {'segments': segments}
+
+
+def _truth(n_chars, seed=0):
+    rng = random.Random(seed)
+    pool = [chr(0x4E00 + i) for i in range(400)]
+    return "".join(rng.choice(pool) for _ in range(n_chars))
+
+
+class TestPlanWindows(unittest.TestCase):
+    def test_covers_audio_with_narrow_overlap(self):
+        windows = plan_windows(600.0, 30.0, 3.0)
+        self.assertEqual(windows[0][0], 0.0)
+        self.assertEqual(windows[-1][1], 600.0)
+        for (_, prev_end), (start, _) in zip(windows, windows[1:]):
+            self.assertAlmostEqual(prev_end - start, 3.0)
+        decoded = sum(end - start for start, end in windows)
+        self.assertLess(decoded / 600.0, 1.15)
+
+    def test_short_and_empty_audio(self):
+        self.assertEqual(plan_windows(10.0, 30.0, 3.0), [(0.0, 10.0)])
+        self.assertEqual(plan_windows(0.0, 30.0, 3.0), [])
+
+
+class TestMergeAdjacent(unittest.TestCase):
+    def test_aligned_merge_drops_duplicate_text(self):
+        left = [TranscriptionChunk(0.0, 10.0, "今日天氣好好", 0.9),
+                TranscriptionChunk(27.0, 30.0, "我哋去飲茶", 0.9)]
+        right = [TranscriptionChunk(27.0, 30.0, "我哋去飲茶", 0.9),
+                 TranscriptionChunk(31.0, 35.0, "食蝦餃", 0.9)]
+        merged, method = merge_adjacent(left, right, overlap_start=27.0, overlap_end=30.0)
+        self.assertEqual(method, "aligned")
+        self.assertEqual("".join(c.text for c in merged), "今日天氣好好我哋去飲茶食蝦餃")
+        self.assertEqual([c.start for c in merged], sorted(c.start for c in merged))
+
+    def test_split_uses_word_boundaries(self):
+        words = [{'word': w, 'start': 27.0 + i, 'end': 27.8 + i} for i, w in enumerate("我哋去")]
+        left = [TranscriptionChunk(27.0, 29.8, "我哋去", 0.9, words=words)]
+        right = [TranscriptionChunk(27.1, 29.9, "我哋去", 0.9, words=list(words)),
+                 TranscriptionChunk(30.5, 31.0, "飲茶", 0.9)]
+        merged, method = merge_adjacent(left, right, overlap_start=27.0, overlap_end=30.0)
+        self.assertEqual(method, "aligned")
+        self.assertEqual([c.text for c in merged], ["我", "哋去", "飲茶"])
+        self.assertEqual(merged[0].end, 27.8)
+        self.assertEqual(merged[1].start, 28.0)
+        self.assertEqual([w['word'] for w in merged[1].words], ["哋", "去"])
+
+    def test_confidence_fallback_when_text_disagrees(self):
+        left = [TranscriptionChunk(26.0, 29.5, "甲乙丙", 0.4)]
+        right = [TranscriptionChunk(26.5, 29.0, "子丑寅", 0.9),
+                 TranscriptionChunk(31.0, 33.0, "卯辰", 0.9)]
+        merged, method = merge_adjacent(left, right, overlap_start=26.0, overlap_end=30.0)
+        self.assertEqual(method, "confidence")
+        self.assertEqual([c.text for c in merged], ["子丑寅", "卯辰"])
+
+    def test_common_bigram_does_not_align(self):
+        # 兩邊重疊文字唔同，只係碰啱都有「係咪」：唔應該當對齊
+        left = [TranscriptionChunk(26.0, 29.8, "佢聽日係咪要返工呀", 0.4)]
+        right = [TranscriptionChunk(26.2, 29.5, "你今晚係咪食飯先走", 0.9),
+                 TranscriptionChunk(31.0, 33.0, "卯辰", 0.9)]
+        merged, method = merge_adjacent(left, right, overlap_start=26.0, overlap_end=30.0)
+        self.assertEqual(method, "confidence")
+        self.assertEqual([c.text for c in merged], ["你今晚係咪食飯先走", "卯辰"])
+
+    def test_silent_overlap_concatenates(self):
+        left = [TranscriptionChunk(0.0, 20.0, "前面", 0.9)]
+        right = [TranscriptionChunk(40.0, 45.0, "後面", 0.9)]
+        merged, method = merge_window_results([left, right], [(0.0, 30.0), (27.0, 57.0)])
+        self.assertEqual(method, {"aligned": 0, "confidence": 0, "none": 1})
+        self.assertEqual([c.text for c in merged], ["前面", "後面"])
+
+
+class TestNarrowOverlapTranscription(unittest.TestCase):
+    def _transcribe(self, duration, narrow):
+        truth = _truth(int(duration / CHAR_SECONDS))
+        asr = _ScriptedASR(truth, duration)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ramp.wav")
+            write_ramp(path, duration)
+            chunks = AdvancedTranscriber().transcribe_with_overlap(path, asr, narrow_overlap=narrow)
+        return truth, asr, chunks
+
+    def test_recovers_transcript_without_duplicates_or_edge_errors(self):
+        truth, asr, chunks = self._transcribe(95.0, narrow=True)
+        self.assertEqual("".join(c.text for c in chunks), truth)
+        self.assertEqual([c.start for c in chunks], sorted(c.start for c in chunks))
+        # 詞級時間戳係絕對時間
+        position = 0
+        for chunk in chunks:
+            for word in chunk.words:
+                self.assertAlmostEqual(word['start'], position * CHAR_SECONDS, places=2)
+                position += 1
+        self.assertEqual(position, len(truth))
+
+    def test_decodes_far_less_audio_than_wide_overlap(self):
+        _, narrow_asr, _ = self._transcribe(95.0, narrow=True)
+        _, wide_asr, _ = self._transcribe(95.0, narrow=False)
+        self.assertLess(narrow_asr.decoded_seconds / 95.0, 1.15)
+        self.assertGreater(wide_asr.decoded_seconds / 95.0, 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()